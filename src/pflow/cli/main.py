@@ -8,6 +8,7 @@ import logging
 import os
 import signal
 import sys
+import threading
 import time
 import warnings
 from pathlib import Path
@@ -19,6 +20,7 @@ if TYPE_CHECKING:
     from pflow.core.markdown_parser import MarkdownParseError
 
 from pflow.core import StdinData
+from pflow.core.cancellation import cancel_active_runs, has_active_runs
 from pflow.core.exceptions import WorkflowExistsError, WorkflowValidationError
 from pflow.core.output_controller import OutputController
 from pflow.core.shell_integration import (
@@ -31,6 +33,7 @@ from pflow.core.validation_utils import is_valid_parameter_name
 from pflow.core.workflow_manager import WorkflowManager
 from pflow.execution import DisplayManager, ExecutionResult
 from pflow.runtime.compiler import _display_validation_warnings
+from pflow.runtime.memory_budget import SpilledValue, materialize
 
 # Import MCP CLI commands
 
@@ -42,8 +45,23 @@ logger = logging.getLogger(__name__)
 # This ensures all command groups (workflow, registry, mcp, etc.) respect the verbose flag.
 
 
+_interrupted = False
+
+
 def handle_sigint(signum: int, frame: object) -> None:
-    """Handle Ctrl+C gracefully."""
+    """Handle Ctrl+C gracefully.
+
+    The first Ctrl+C during a run cancels it, so shell commands, MCP servers
+    and batch items in flight are stopped and the trace is still written.
+    A second Ctrl+C (or one with nothing running) exits immediately.
+    """
+    global _interrupted
+    if not _interrupted and has_active_runs():
+        _interrupted = True
+        click.echo("\ncli: Cancelling workflow... (press Ctrl+C again to quit)", err=True)
+        # Cancel from a helper thread: the interrupted thread may hold locks the callbacks need
+        threading.Thread(target=cancel_active_runs, args=("interrupted by user",), daemon=True).start()
+        return
     click.echo("\ncli: Interrupted by user", err=True)
     sys.exit(130)  # Standard Unix exit code for SIGINT
 
@@ -432,7 +450,7 @@ def _find_in_namespaces(shared_storage: dict[str, Any], key: str) -> Any:
 
         # Check if this namespace contains the key
         if key in namespace_dict:
-            value = namespace_dict[key]
+            value = materialize(namespace_dict[key])
             if _is_valid_output_value(value):
                 last_value = value
 
@@ -1170,6 +1188,8 @@ def _serialize_json_result(result: dict[str, Any], verbose: bool) -> bool:
             """Custom JSON serializer for non-standard types."""
             if isinstance(obj, bytes):
                 return {"_type": "binary", "size": len(obj), "note": "Binary data not included in JSON output"}
+            if isinstance(obj, SpilledValue):
+                return obj.load()
             return str(obj)
 
         output = json.dumps(result, indent=2, ensure_ascii=False, default=json_serializer)
@@ -1617,7 +1637,8 @@ def _handle_workflow_error(
         trace_file = workflow_trace.save_to_file()
         _echo_trace(ctx, f"📊 Workflow trace saved: {trace_file}")
 
-    ctx.exit(1)
+    cancelled = any(e.get("category") == "cancelled" for e in (result.errors or []) if isinstance(e, dict))
+    ctx.exit(130 if cancelled else 1)
 
 
 def _handle_workflow_success(
@@ -2569,6 +2590,52 @@ def _process_planner_result(
         _handle_planning_failure(ctx, planner_output)
 
 
+def _planner_result_cache_key(
+    raw_input: str,
+    stdin_data: str | StdinData | None,
+    shared: dict[str, Any],
+    planner_model: str,
+) -> str | None:
+    """Build the planner result cache key, or None when the request can't be cached."""
+    # Piped input can shape the extracted parameters, so only stdin-free requests are cached
+    if stdin_data:
+        return None
+    try:
+        from pflow.planning.result_cache import get_planner_result_cache
+        from pflow.registry import Registry
+
+        return get_planner_result_cache().make_key(
+            raw_input, Registry().load(), shared.get("workflow_manager"), planner_model
+        )
+    except Exception as e:
+        logger.debug(f"Planner result cache unavailable: {e}")
+        return None
+
+
+def _restore_cached_planner_result(key: str, shared: dict[str, Any], verbose: bool) -> None:
+    """Put a cached planner result (and its prompt-cache chunks) into the planner shared store."""
+    from pflow.planning.result_cache import get_planner_result_cache
+
+    cached = get_planner_result_cache().get(key)
+    if cached is None:
+        return
+    if verbose:
+        click.echo("cli: Reusing cached planner result for identical request")
+    shared.update(cached.get("cache_chunks") or {})
+    shared["planner_output"] = cached["planner_output"]
+
+
+def _store_planner_result(key: str, raw_input: str, shared: dict[str, Any]) -> None:
+    """Cache a successful planner result for identical future requests."""
+    from pflow.planning.result_cache import CACHE_CHUNK_KEYS, get_planner_result_cache
+
+    planner_output = shared.get("planner_output")
+    if not isinstance(planner_output, dict) or not planner_output.get("success"):
+        return
+    chunks = {chunk_key: shared[chunk_key] for chunk_key in CACHE_CHUNK_KEYS if shared.get(chunk_key)}
+    get_planner_result_cache().store(key, raw_input, planner_output, chunks)
+
+
 def _execute_planner_and_workflow(
     ctx: click.Context,
     raw_input: str,
@@ -2598,11 +2665,24 @@ def _execute_planner_and_workflow(
             click.echo(get_llm_setup_help(), err=True)
             sys.exit(1)
 
-    # Create planner flow with detected/specified model
-    planner_flow = create_planner_flow(debug_context=debug_context, model=planner_model)
+    # Serve repeated requests from the planner result cache
+    result_cache_key = _planner_result_cache_key(raw_input, stdin_data, shared, planner_model)
+    if result_cache_key and not ctx.obj.get("no_planner_cache", False):
+        _restore_cached_planner_result(result_cache_key, shared, verbose)
+
+    if "planner_output" not in shared:
+        # Create planner flow with detected/specified model
+        planner_flow = create_planner_flow(
+            debug_context=debug_context,
+            model=planner_model,
+            speculative=ctx.obj.get("speculative_planner", False),
+        )
+
+        # Run planner with timeout handling
+        _run_planner_with_timeout(ctx, planner_flow, shared, trace_collector, planner_timeout, verbose)
 
-    # Run planner with timeout handling
-    _run_planner_with_timeout(ctx, planner_flow, shared, trace_collector, planner_timeout, verbose)
+        if result_cache_key:
+            _store_planner_result(result_cache_key, raw_input, shared)
 
     # Process result and execute workflow
     _process_planner_result(ctx, shared, trace_collector, metrics_collector, stdin_data, output_key, verbose)
@@ -3007,6 +3087,8 @@ def _initialize_context(
     auto_repair: bool,
     no_update: bool,
     validate_only: bool,
+    speculative_planner: bool = False,
+    no_planner_cache: bool = False,
 ) -> None:
     """Initialize the click context with configuration.
 
@@ -3025,6 +3107,8 @@ def _initialize_context(
         auto_repair: Enable automatic workflow repair on failure
         no_update: Save repairs to separate file instead of updating original
         validate_only: Validate workflow without executing
+        speculative_planner: Run independent planner stages speculatively in parallel
+        no_planner_cache: Bypass lookups in the planner result cache
     """
     if ctx.obj is None:
         ctx.obj = {}
@@ -3040,6 +3124,8 @@ def _initialize_context(
     ctx.obj["cache_planner"] = cache_planner
     # Use smart default if no model specified (will be resolved when needed)
     ctx.obj["planner_model"] = planner_model  # None triggers auto-detection later
+    ctx.obj["speculative_planner"] = speculative_planner
+    ctx.obj["no_planner_cache"] = no_planner_cache
     # GATED: Auto-repair disabled pending markdown format migration (Task 107).
     # Repair prompts assume JSON workflow format. Re-enable after prompt rewrite.
     if auto_repair:
@@ -3666,6 +3752,19 @@ def _install_anthropic_model_if_needed(verbose: bool) -> None:
             click.echo("cli: Using Anthropic SDK for planning models", err=True)
 
 
+def _install_llm_model_cache() -> None:
+    """Resolve each LLM model once per process instead of per node execution.
+
+    Skipped in tests: the cache wraps llm.get_model process-wide.
+    """
+    import os
+
+    if not os.environ.get("PYTEST_CURRENT_TEST"):
+        from pflow.core.llm_cache import install_model_cache
+
+        install_model_cache()
+
+
 def _inject_settings_env_vars() -> None:
     """Inject API keys from pflow settings into environment.
 
@@ -3814,6 +3913,18 @@ def _validate_and_join_workflow_input(workflow: tuple[str, ...]) -> str:
     hidden=True,
     help="LLM model for planning (default: auto-detect). Supports Anthropic, OpenAI, Gemini, etc.",
 )
+@click.option(
+    "--speculative-planner",
+    is_flag=True,
+    hidden=True,
+    help="Run independent planner stages in parallel with discovery (faster, may spend extra tokens)",
+)
+@click.option(
+    "--no-planner-cache",
+    is_flag=True,
+    hidden=True,
+    help="Re-plan even if an identical request was planned before (the fresh result replaces the cached one)",
+)
 # Repair options (gated - Task 107: pending markdown format migration)
 @click.option("--auto-repair", is_flag=True, hidden=True, help="Enable automatic workflow repair on failure")
 @click.option(
@@ -3837,6 +3948,8 @@ def workflow_command(
     save: bool,
     cache_planner: bool,
     planner_model: str,
+    speculative_planner: bool,
+    no_planner_cache: bool,
     auto_repair: bool,
     no_update: bool,
     validate_only: bool,
@@ -3912,6 +4025,7 @@ def workflow_command(
         # Inject API keys from pflow settings into environment
         # This must happen early, before any LLM operations
         _inject_settings_env_vars()
+        _install_llm_model_cache()
 
         # Initialize context with configuration
         trace_enabled = not no_trace
@@ -3930,6 +4044,8 @@ def workflow_command(
             auto_repair,
             no_update,
             validate_only,
+            speculative_planner,
+            no_planner_cache,
         )
 
         # Auto-discover and sync MCP servers
@@ -630,7 +630,12 @@ def info(tool: str) -> None:
 
 @mcp.command(name="serve")
 @click.option("--debug", is_flag=True, help="Enable debug logging")
-def serve(debug: bool) -> None:
+@click.option(
+    "--warm",
+    is_flag=True,
+    help="Keep registry, workflow and validation caches in memory across tool calls",
+)
+def serve(debug: bool, warm: bool) -> None:
     """Run pflow as an MCP server (stdio transport).
 
     This starts an MCP server that exposes pflow's workflow building and
@@ -648,6 +653,9 @@ def serve(debug: bool) -> None:
         # With debug logging
         pflow mcp serve --debug
 
+        # Warm mode: reuse registry/workflow snapshots across tool calls
+        pflow mcp serve --warm
+
     The server exposes 13 tools for agents to:
     - Discover existing workflows and nodes
     - Execute workflows with structured output
@@ -672,7 +680,7 @@ def serve(debug: bool) -> None:
 
     # Run the MCP server (synchronous - FastMCP manages its own event loop)
     try:
-        mcp_server_main(debug=debug)
+        mcp_server_main(debug=debug, warm=warm)
     except KeyboardInterrupt:
         # Clean exit on Ctrl+C
         sys.exit(0)
@@ -1,12 +1,10 @@
 """Implementation of read-fields command for selective field retrieval."""
 
 import sys
-from typing import Any
 
 import click
 
 from pflow.core.execution_cache import ExecutionCache
-from pflow.runtime.template_resolver import TemplateResolver
 
 
 @click.command(name="read-fields")
@@ -41,29 +39,16 @@ def read_fields(execution_id: str, field_paths: tuple[str, ...], output_format:
         pflow read-fields exec-1705234567-a1b2 result --output-format json
     """
     try:
-        # Load cached execution
+        # Read only the requested paths from the cache (path-level lookup)
         cache = ExecutionCache()
-        cache_data = cache.retrieve(execution_id)
+        field_values = cache.read_fields(execution_id, list(field_paths))
 
-        if cache_data is None:
+        if field_values is None:
             click.echo(f"❌ Execution '{execution_id}' not found in cache", err=True)
             click.echo("", err=True)
             click.echo("Run 'pflow registry run <node-type>' to execute a node and cache results.", err=True)
             sys.exit(1)
 
-        # Extract field values using TemplateResolver
-        outputs = cache_data["outputs"]
-        field_values: dict[str, Any] = {}
-
-        for field_path in field_paths:
-            try:
-                # Use TemplateResolver for consistent path parsing
-                value = TemplateResolver.resolve_value(field_path, outputs)
-                field_values[field_path] = value
-            except Exception:
-                # Invalid path or not found - store None
-                field_values[field_path] = None
-
         # Format and display results
         from pflow.execution.formatters.field_output_formatter import format_field_output
 
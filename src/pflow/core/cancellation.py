@@ -0,0 +1,226 @@
+"""Cooperative cancellation of running workflows.
+
+Each run gets a ``CancellationToken`` in its shared store under
+``CANCEL_TOKEN_KEY``. Cancelling it stops the run at the next node or batch
+item, and nodes that can interrupt work in flight register callbacks that
+fire immediately: shell commands and MCP servers are killed, streamed LLM
+responses stop reading. Requests that cannot be interrupted finish, and
+their result is discarded.
+
+Tokens form a tree. A parallel batch runs its items under a child token so
+``fail_fast`` can stop its own items without cancelling the run, while
+cancelling the run reaches every batch and nested sub-workflow below it.
+
+Runs are cancelled from outside in two ways. Code that starts runs on
+behalf of someone else (the MCP job registry) opens a ``cancellation_scope``,
+and every run started in that thread gets a token beneath the scope's token.
+``cancel_active_runs`` cancels all runs in progress, which is how the CLI
+handles Ctrl+C.
+"""
+
+import asyncio
+import logging
+import threading
+import weakref
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+# Shared-store key holding the run's CancellationToken
+CANCEL_TOKEN_KEY = "__cancel_token__"  # noqa: S105
+
+T = TypeVar("T")
+
+
+class WorkflowCancelled(BaseException):
+    """Raised inside a run once its cancellation token has been cancelled.
+
+    Derives from BaseException (like KeyboardInterrupt) so node retries,
+    ``exec_fallback`` and ``except Exception`` handlers don't swallow it.
+    """
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag with callbacks and child tokens.
+
+    Args:
+        parent: Token whose cancellation also cancels this one
+    """
+
+    def __init__(self, parent: Optional["CancellationToken"] = None) -> None:
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: dict[int, Callable[[], Any]] = {}
+        self._next_id = 0
+        self._children: weakref.WeakSet[CancellationToken] = weakref.WeakSet()
+        if parent is not None:
+            parent._adopt(self)
+
+    def __copy__(self) -> "CancellationToken":
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "CancellationToken":
+        # Batch items copy their node chain; they must still see the same token
+        return self
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token has been cancelled."""
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """Cancel the token, its children, and run registered callbacks.
+
+        Args:
+            reason: Why the work was cancelled (shown in errors)
+
+        Returns:
+            True if this call cancelled the token, False if it already was
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks.values())
+            self._callbacks.clear()
+            children = list(self._children)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Cancellation callback failed: {e}")
+        for child in children:
+            child.cancel(reason)
+        return True
+
+    def raise_if_cancelled(self) -> None:
+        """Raise WorkflowCancelled if the token has been cancelled."""
+        if self._event.is_set():
+            raise WorkflowCancelled(self.reason or "cancelled")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until cancelled or timeout; returns whether cancelled."""
+        return self._event.wait(timeout)
+
+    @contextmanager
+    def on_cancel(self, callback: Callable[[], Any]) -> Iterator[None]:
+        """Run callback if the token is cancelled while the block executes.
+
+        The callback runs in the cancelling thread (immediately, if the token
+        is already cancelled) and must be safe to call from there.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                key = self._next_id
+                self._next_id += 1
+                self._callbacks[key] = callback
+                registered = True
+            else:
+                registered = False
+        if not registered:
+            callback()
+        try:
+            yield
+        finally:
+            if registered:
+                with self._lock:
+                    self._callbacks.pop(key, None)
+
+    def _adopt(self, child: "CancellationToken") -> None:
+        with self._lock:
+            if not self._event.is_set():
+                self._children.add(child)
+                return
+        child.cancel(self.reason or "cancelled")
+
+
+def get_cancel_token(shared: Any) -> Optional[CancellationToken]:
+    """Return the run's cancellation token from a shared store, if one is installed."""
+    try:
+        token = shared.get(CANCEL_TOKEN_KEY)
+    except Exception:
+        return None
+    return token if isinstance(token, CancellationToken) else None
+
+
+def run_cancellable(coro: Coroutine[Any, Any, T], token: Optional[CancellationToken]) -> T:
+    """Run a coroutine with ``asyncio.run``, cancelling its task when token is cancelled.
+
+    Cancelling the task unwinds the coroutine's context managers, which is
+    how stdio MCP servers and SDK subprocesses get shut down.
+
+    Raises:
+        WorkflowCancelled: If the token was cancelled
+    """
+    if token is None:
+        return asyncio.run(coro, debug=False)
+    token.raise_if_cancelled()
+
+    async def main() -> T:
+        task = asyncio.ensure_future(coro)
+        loop = asyncio.get_running_loop()
+        with token.on_cancel(lambda: loop.call_soon_threadsafe(task.cancel)):
+            return await task
+
+    try:
+        return asyncio.run(main(), debug=False)
+    except asyncio.CancelledError:
+        token.raise_if_cancelled()
+        raise
+
+
+_scope = threading.local()
+_active_runs: "weakref.WeakSet[CancellationToken]" = weakref.WeakSet()
+_active_lock = threading.Lock()
+
+
+@contextmanager
+def cancellation_scope(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Make runs started in this thread children of token for the duration of the block."""
+    previous = getattr(_scope, "token", None)
+    _scope.token = token
+    try:
+        yield token
+    finally:
+        _scope.token = previous
+
+
+@contextmanager
+def run_cancellation(shared: dict[str, Any]) -> Iterator[CancellationToken]:
+    """Install the token for one run in its shared store.
+
+    The token is a child of the current thread's cancellation scope, if any,
+    and is reachable through ``cancel_active_runs`` until the block exits.
+    A token already in the store (resumed runs) is reused unless cancelled.
+    """
+    token = get_cancel_token(shared)
+    if token is None or token.cancelled:
+        token = CancellationToken(parent=getattr(_scope, "token", None))
+        shared[CANCEL_TOKEN_KEY] = token
+    with _active_lock:
+        _active_runs.add(token)
+    try:
+        yield token
+    finally:
+        with _active_lock:
+            _active_runs.discard(token)
+
+
+def has_active_runs() -> bool:
+    """Whether any run is in progress (lock-free, safe from signal handlers)."""
+    return len(_active_runs) > 0
+
+
+def cancel_active_runs(reason: str) -> int:
+    """Cancel every run in progress in this process.
+
+    Returns:
+        Number of runs that were cancelled
+    """
+    with _active_lock:
+        runs = list(_active_runs)
+    return sum(1 for token in runs if token.cancel(reason))
@@ -0,0 +1,442 @@
+"""Circuit breakers and a shared retry budget for external dependencies.
+
+Retries are configured per node, so when an API or MCP server is down every
+item of every batch retries on its own and a workflow grinds for minutes
+before failing. Leaf nodes that call out wrap the call in
+``guarded_call(key)``, keyed per dependency:
+
+- ``llm:<model>`` for LLM calls (e.g. ``llm:claude-sonnet-4-5``)
+- ``http:<host>`` for HTTP requests (e.g. ``http:api.github.com``)
+- ``mcp:<server>`` for MCP tool calls
+
+Only failures that say the dependency is down or overloaded count:
+transport errors, timeouts, HTTP 5xx and 429, and MCP connection and
+internal errors (``is_dependency_failure``). A 400 or a content-policy
+refusal means the dependency answered, so it counts as a success.
+
+A circuit opens after ``threshold`` consecutive failures. While it is open,
+calls fail at once with ``CircuitOpenError``; after ``cooldown`` seconds one
+probe call is let through, and its outcome closes or re-opens the circuit.
+
+Retries draw from a shared budget: each call adds ``retry_ratio`` of a retry
+(up to a cap) and each failure that may be retried spends one. When the
+budget is spent or the circuit is open, the failed call's exception is
+marked ``retryable = False`` and retry loops give up at once instead of
+sleeping through their remaining attempts. Retry loops wait with
+exponential backoff and jitter (``backoff_delay``).
+
+Circuits and the budget belong to one run: the executor installs a
+``CircuitBreakers`` in the shared store under ``CIRCUIT_BREAKERS_KEY`` (like
+the run's memory budget and cancellation token), and sub-workflows share
+their parent's. Concurrent runs in one process, such as the MCP server's,
+never open circuits or spend retries for each other. Calls outside a run (a
+node run on its own) use a process-wide registry.
+
+Configuration (environment variables):
+- PFLOW_CIRCUIT_BREAKER: comma-separated ``setting=value`` overrides of
+  ``threshold``, ``cooldown`` and ``retry_ratio``
+  (e.g. ``threshold=3,cooldown=60``), or ``0`` to turn breakers and the
+  retry budget off
+- PFLOW_CIRCUIT_STATE: ``1`` to share open circuits across runs through
+  ``~/.pflow/cache/circuit-breakers.json``
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared-store key holding the run's CircuitBreakers
+CIRCUIT_BREAKERS_KEY = "__circuit_breakers__"
+
+DEFAULT_SETTINGS = {
+    # Consecutive failures that open a circuit
+    "threshold": 5.0,
+    # Seconds an open circuit fails calls before letting a probe through
+    "cooldown": 30.0,
+    # Retries earned per call
+    "retry_ratio": 0.2,
+}
+
+# Retries available before any call has earned some, and the most that can be saved up
+MIN_RETRY_TOKENS = 10.0
+MAX_RETRY_TOKENS = 100.0
+
+# Longest single backoff wait in seconds
+MAX_BACKOFF_SECONDS = 30.0
+
+# HTTP statuses that mean the dependency is struggling (besides 5xx), not that the request was wrong
+FAILURE_STATUSES = frozenset({408, 429})
+
+# JSON-RPC error codes (MCP) for a dropped connection and a server-side fault
+FAILURE_RPC_CODES = frozenset({-32000, -32603})
+
+# Transport and timeout errors of the client libraries pflow calls through, matched by class or
+# base class name so this module doesn't import them: httpx, requests, the OpenAI and Anthropic
+# SDKs, and anyio streams (MCP)
+TRANSPORT_ERROR_NAMES = frozenset({
+    "TransportError",
+    "TimeoutException",
+    "ConnectionError",
+    "Timeout",
+    "APIConnectionError",
+    "ClosedResourceError",
+    "BrokenResourceError",
+    "EndOfStream",
+})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    retryable = False
+
+    def __init__(self, key: str, retry_in: float) -> None:
+        super().__init__(
+            f"'{key}' failed repeatedly; skipping calls to it for another {max(retry_in, 0):.0f}s "
+            "(circuit breaker open)"
+        )
+        self.key = key
+
+
+def backoff_delay(base: float, attempt: int) -> float:
+    """Wait before retry ``attempt + 1``: ``base * 2**attempt``, capped, times a random 0.5-1.0.
+
+    The jitter spreads out retries of items that failed together, so they
+    don't hit a recovering service at the same moment.
+    """
+    if base <= 0:
+        return 0.0
+    return float(min(base * 2**attempt, MAX_BACKOFF_SECONDS)) * random.uniform(0.5, 1.0)  # noqa: S311
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Whether an error may be retried: False if it or an error it was raised from is marked otherwise.
+
+    Nodes often re-raise a friendlier error from ``exec_fallback``, so the
+    cause chain is checked too.
+    """
+    seen: set[int] = set()
+    current: Optional[BaseException] = exc
+    while current is not None and id(current) not in seen:
+        if getattr(current, "retryable", True) is False:
+            return False
+        seen.add(id(current))
+        current = current.__cause__ or current.__context__
+    return True
+
+
+def is_dependency_failure(exc: BaseException) -> bool:
+    """Whether an error means the dependency is down or overloaded, and should count against its circuit.
+
+    Transport errors, timeouts, HTTP 5xx/408/429 and MCP connection or internal
+    errors count. Other errors (a 400, a content-policy refusal, invalid tool
+    arguments, a bug in pflow) mean the dependency answered. The cause chain
+    and exception groups are searched for the underlying error.
+    """
+    seen: set[int] = set()
+    pending: list[BaseException] = [exc]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+
+        status = _status_code(current)
+        if status is not None:
+            return status >= 500 or status in FAILURE_STATUSES
+        code = getattr(getattr(current, "error", None), "code", None)
+        if isinstance(code, int) and not isinstance(code, bool):
+            return code in FAILURE_RPC_CODES or code in FAILURE_STATUSES
+        if isinstance(current, (TimeoutError, ConnectionError, asyncio.TimeoutError)) or any(
+            cls.__name__ in TRANSPORT_ERROR_NAMES for cls in type(current).__mro__
+        ):
+            return True
+
+        pending.extend(getattr(current, "exceptions", None) or ())
+        pending.extend(e for e in (current.__cause__, current.__context__) if e is not None)
+    return False
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    """HTTP status of an error raised for a response (requests, httpx, SDK status errors), if any."""
+    response = getattr(exc, "response", None)
+    for value in (getattr(exc, "status_code", None), getattr(response, "status_code", None)):
+        if isinstance(value, int) and not isinstance(value, bool) and 100 <= value < 600:
+            return value
+    return None
+
+
+def parse_settings(spec: str) -> Optional[dict[str, float]]:
+    """Parse a ``setting=value,...`` spec, skipping malformed entries.
+
+    Args:
+        spec: Value of PFLOW_CIRCUIT_BREAKER
+
+    Returns:
+        Settings merged over ``DEFAULT_SETTINGS``, or None if breakers are turned off
+    """
+    if spec.strip().lower() in ("0", "off", "false"):
+        return None
+    settings = dict(DEFAULT_SETTINGS)
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        name, _, raw = entry.partition("=")
+        try:
+            value = float(raw)
+        except ValueError:
+            value = -1.0
+        if name.strip() not in DEFAULT_SETTINGS or value < 0:
+            logger.warning(f"Ignoring invalid PFLOW_CIRCUIT_BREAKER entry {entry.strip()!r}")
+            continue
+        settings[name.strip()] = value
+    return settings
+
+
+def _mark_not_retryable(exc: Exception) -> None:
+    # Exceptions with __slots__ keep their normal retries
+    with contextlib.suppress(AttributeError):
+        exc.retryable = False  # type: ignore[attr-defined]
+
+
+class CallOutcome:
+    """Handle for a guarded call, to report failures that didn't raise (e.g. HTTP 503)."""
+
+    def __init__(self) -> None:
+        self.failure: Optional[str] = None
+
+    def failed(self, reason: str) -> None:
+        """Count the call as a failure of the dependency even though it returned."""
+        self.failure = reason
+
+
+class _Breaker:
+    """State of one circuit (guarded by the registry's lock)."""
+
+    def __init__(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.rejected = 0
+
+
+class CircuitBreakers:
+    """Thread-safe registry of circuit breakers and the shared retry budget.
+
+    Args:
+        settings: threshold, cooldown and retry_ratio (default: ``DEFAULT_SETTINGS``);
+            None turns breakers and the budget off
+        state_path: File that shares open circuits across runs (default: not shared)
+    """
+
+    def __init__(
+        self,
+        settings: Optional[dict[str, float]] = DEFAULT_SETTINGS,
+        state_path: Optional[Path] = None,
+    ) -> None:
+        self.enabled = settings is not None
+        settings = settings or DEFAULT_SETTINGS
+        self.threshold = max(1, int(settings["threshold"]))
+        self.cooldown = settings["cooldown"]
+        self.retry_ratio = settings["retry_ratio"]
+        self.state_path = state_path
+        self._retry_tokens = MIN_RETRY_TOKENS
+        self._retries_denied = 0
+        self._breakers: dict[str, _Breaker] = {}
+        self._lock = threading.Lock()
+        self._saved: Optional[dict[str, float]] = None
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreakers":
+        """Create the registry from PFLOW_CIRCUIT_BREAKER and PFLOW_CIRCUIT_STATE."""
+        settings = parse_settings(os.environ.get("PFLOW_CIRCUIT_BREAKER", ""))
+        state_path = None
+        if os.environ.get("PFLOW_CIRCUIT_STATE", "0") == "1":
+            state_path = Path.home() / ".pflow" / "cache" / "circuit-breakers.json"
+        return cls(settings, state_path)
+
+    @contextmanager
+    def guard(self, key: str) -> Iterator[CallOutcome]:
+        """Run one call to a dependency through its circuit breaker.
+
+        Exceptions raised in the block count as failures of the dependency if
+        ``is_dependency_failure`` says so; so does ``outcome.failed()``. Other
+        exceptions, like cancellation (BaseException), don't.
+
+        Args:
+            key: Dependency key, e.g. ``http:api.github.com``
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        outcome = CallOutcome()
+        if not self.enabled:
+            yield outcome
+            return
+
+        self._before_call(key)
+        try:
+            yield outcome
+        except Exception as e:
+            self._after_call(key, str(e) if is_dependency_failure(e) else None, e)
+            raise
+        except BaseException:
+            # Outcome unknown; let the next call probe instead
+            with self._lock:
+                self._breakers[key].probing = False
+            raise
+        self._after_call(key, outcome.failure, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Return per-circuit state, trips and rejected calls, plus the retry budget."""
+        with self._lock:
+            return {
+                "circuits": {
+                    key: {"state": b.state, "failures": b.failures, "trips": b.trips, "rejected": b.rejected}
+                    for key, b in self._breakers.items()
+                },
+                "retry_tokens": round(self._retry_tokens, 2),
+                "retries_denied": self._retries_denied,
+            }
+
+    def _before_call(self, key: str) -> None:
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = self._restore(key)
+            if breaker.state != "closed":
+                remaining = breaker.opened_at + self.cooldown - time.monotonic()
+                if remaining > 0 or breaker.probing:
+                    breaker.rejected += 1
+                    raise CircuitOpenError(key, remaining)
+                # Cooldown over: this call probes whether the dependency is back
+                breaker.state = "half_open"
+                breaker.probing = True
+            self._retry_tokens = min(MAX_RETRY_TOKENS, self._retry_tokens + self.retry_ratio)
+
+    def _after_call(self, key: str, failure: Optional[str], exc: Optional[Exception]) -> None:
+        with self._lock:
+            breaker = self._breakers[key]
+            was_probe, breaker.probing = breaker.probing, False
+            if failure is None:
+                breaker.failures = 0
+                if breaker.state != "closed":
+                    logger.info(f"Circuit for '{key}' closed: the dependency is responding again")
+                    breaker.state = "closed"
+                    self._forget(key)
+                return
+
+            breaker.failures += 1
+            if was_probe or breaker.failures >= self.threshold:
+                if breaker.state == "closed":
+                    breaker.trips += 1
+                    logger.warning(
+                        f"Circuit for '{key}' opened after {breaker.failures} consecutive failures; "
+                        f"failing calls to it for {self.cooldown:.0f}s. Last error: {failure}"
+                    )
+                breaker.state = "open"
+                breaker.opened_at = time.monotonic()
+                self._remember(key)
+            if exc is None:
+                return
+            if breaker.state == "open":
+                _mark_not_retryable(exc)
+            elif self._retry_tokens >= 1:
+                self._retry_tokens -= 1
+            else:
+                self._retries_denied += 1
+                logger.debug(f"Retry budget spent; not retrying '{key}': {failure}")
+                _mark_not_retryable(exc)
+
+    def _restore(self, key: str) -> _Breaker:
+        """New breaker for key, open if another run opened it recently (state sharing only)."""
+        breaker = _Breaker()
+        opened_at = self._load_saved().get(key)
+        if opened_at is not None:
+            elapsed = time.time() - opened_at
+            if elapsed < self.cooldown:
+                breaker.state = "open"
+                breaker.opened_at = time.monotonic() - elapsed
+        return breaker
+
+    def _remember(self, key: str) -> None:
+        if self.state_path is not None:
+            self._load_saved()[key] = time.time()
+            self._save()
+
+    def _forget(self, key: str) -> None:
+        if self.state_path is not None and self._load_saved().pop(key, None) is not None:
+            self._save()
+
+    def _load_saved(self) -> dict[str, float]:
+        if self._saved is None:
+            self._saved = {}
+            if self.state_path is not None:
+                try:
+                    data = json.loads(self.state_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    data = {}
+                if isinstance(data, dict):
+                    self._saved = {k: v for k, v in data.items() if isinstance(v, (int, float))}
+        return self._saved
+
+    def _save(self) -> None:
+        if self.state_path is None:
+            return
+        now = time.time()
+        saved = {key: opened for key, opened in self._load_saved().items() if now - opened < self.cooldown}
+        temp_path = None
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic replace: concurrent runs may save at the same time (last one wins)
+            fd, temp_path = tempfile.mkstemp(dir=self.state_path.parent, prefix=".circuit-breakers.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(saved, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.debug(f"Could not save circuit breaker state: {e}")
+            if temp_path:
+                Path(temp_path).unlink(missing_ok=True)
+
+
+_breakers: Optional[CircuitBreakers] = None
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breakers(shared: Any = None) -> CircuitBreakers:
+    """Return the run's registry from a shared store, or the process-wide one outside a run.
+
+    The process-wide registry is created from the environment on first use.
+    """
+    try:
+        breakers = shared.get(CIRCUIT_BREAKERS_KEY) if shared is not None else None
+    except Exception:
+        breakers = None
+    if isinstance(breakers, CircuitBreakers):
+        return breakers
+
+    global _breakers
+    if _breakers is None:
+        with _breakers_lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers.from_env()
+    return _breakers
+
+
+def guarded_call(key: str, breakers: Optional[CircuitBreakers] = None) -> AbstractContextManager[CallOutcome]:
+    """Guard a call with the run's registry, or the process-wide one (see ``CircuitBreakers.guard``)."""
+    return (breakers or get_circuit_breakers()).guard(key)
@@ -0,0 +1,226 @@
+"""Process-wide concurrency governor with named resource pools.
+
+``max_concurrent`` bounds the threads of one batch node, but batches nest: a
+parallel batch whose inner node is a workflow containing parallel batches
+runs up to max_concurrent² items at once, each opening its own API
+connection or subprocess. The governor bounds the work that actually
+consumes resources, wherever it runs from, by making leaf nodes hold a slot
+from a named pool while they execute:
+
+- ``llm:<provider>`` for LLM and Claude Code calls (e.g. ``llm:anthropic``)
+- ``http:<host>`` for HTTP requests (e.g. ``http:api.github.com``)
+- ``mcp:<server>`` for MCP tool calls
+- ``shell`` for shell commands
+- ``cpu`` for code nodes
+
+Slots are granted first come, first served, so a wide batch cannot starve a
+later one. Nesting cannot deadlock: only leaf nodes acquire slots, only
+around their exec (never while waiting on nested work), and a thread that
+already holds a slot passes straight through any nested acquire.
+
+Configuration (environment variables):
+- PFLOW_CONCURRENCY_LIMITS: comma-separated ``pool=limit`` overrides, where
+  pool is a name or a ``prefix:*`` pattern and 0 means unlimited
+  (e.g. ``llm:anthropic=8,http:*=16,shell=4``)
+"""
+
+import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+_CPU_COUNT = os.cpu_count() or 4
+
+# Limits for pools not configured explicitly (0 = unlimited)
+DEFAULT_LIMITS = {
+    "llm:*": 16,
+    "http:*": 32,
+    "mcp:*": 8,
+    "shell": 2 * _CPU_COUNT,
+    "cpu": _CPU_COUNT,
+}
+
+# Model name prefixes that identify an LLM provider
+_MODEL_PROVIDERS = (
+    ("claude", "anthropic"),
+    ("anthropic", "anthropic"),
+    ("gpt", "openai"),
+    ("chatgpt", "openai"),
+    ("o1", "openai"),
+    ("o3", "openai"),
+    ("o4", "openai"),
+    ("gemini", "google"),
+)
+
+
+def llm_pool(model: str) -> str:
+    """Return the pool name for an LLM model (``llm:<provider>``)."""
+    name = model.lower()
+    if "/" in name:
+        # Plugin-qualified names like "openrouter/anthropic/claude-3" go through the plugin's provider
+        return f"llm:{name.split('/', 1)[0]}"
+    for prefix, provider in _MODEL_PROVIDERS:
+        if name.startswith(prefix):
+            return f"llm:{provider}"
+    return f"llm:{name.split('-', 1)[0]}"
+
+
+def http_pool(url: str) -> str:
+    """Return the pool name for an HTTP URL (``http:<host>``)."""
+    return f"http:{urlsplit(url).hostname or 'unknown'}"
+
+
+def parse_limits(spec: str) -> dict[str, int]:
+    """Parse a ``pool=limit,...`` spec, skipping malformed entries.
+
+    Args:
+        spec: Value of PFLOW_CONCURRENCY_LIMITS
+
+    Returns:
+        Mapping of pool names or patterns to limits
+    """
+    limits: dict[str, int] = {}
+    for entry in spec.split(","):
+        if not entry.strip():
+            continue
+        pool, _, raw = entry.rpartition("=")
+        try:
+            limit = int(raw)
+        except ValueError:
+            limit = -1
+        if not pool.strip() or limit < 0:
+            logger.warning(f"Ignoring invalid PFLOW_CONCURRENCY_LIMITS entry {entry.strip()!r}")
+            continue
+        limits[pool.strip()] = limit
+    return limits
+
+
+class _Pool:
+    """Slot accounting for one named pool (guarded by the governor's lock)."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self.peak = 0
+        self.waits = 0
+        self.waiters: deque[threading.Event] = deque()
+
+
+class ConcurrencyGovernor:
+    """Thread-safe registry of named, FIFO-fair concurrency pools.
+
+    Args:
+        limits: Pool limits by name or ``prefix:*`` pattern, overriding
+            ``DEFAULT_LIMITS``
+    """
+
+    def __init__(self, limits: Optional[dict[str, int]] = None) -> None:
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._pools: dict[str, _Pool] = {}
+        self._lock = threading.Lock()
+        self._held = threading.local()
+
+    @classmethod
+    def from_env(cls) -> "ConcurrencyGovernor":
+        """Create a governor with overrides from PFLOW_CONCURRENCY_LIMITS."""
+        return cls(parse_limits(os.environ.get("PFLOW_CONCURRENCY_LIMITS", "")))
+
+    def limit_for(self, pool: str) -> int:
+        """Return the limit for a pool (0 = unlimited)."""
+        if pool in self.limits:
+            return self.limits[pool]
+        prefix = pool.split(":", 1)[0]
+        return self.limits.get(f"{prefix}:*", 0)
+
+    @contextmanager
+    def slot(self, pool: str) -> Iterator[None]:
+        """Hold a slot from a pool for the duration of the block.
+
+        Blocks until a slot is free. Re-entrant per thread: if the calling
+        thread already holds a slot, nested acquires don't wait.
+
+        Args:
+            pool: Pool name, e.g. ``llm:anthropic`` or ``shell``
+        """
+        if getattr(self._held, "depth", 0) or self.limit_for(pool) == 0:
+            self._held.depth = getattr(self._held, "depth", 0) + 1
+            try:
+                yield
+            finally:
+                self._held.depth -= 1
+            return
+
+        self._acquire(pool)
+        self._held.depth = 1
+        try:
+            yield
+        finally:
+            self._held.depth = 0
+            self._release(pool)
+
+    def usage(self) -> dict[str, dict[str, int]]:
+        """Return per-pool limit, active slots, peak and number of waits."""
+        with self._lock:
+            return {
+                name: {"limit": p.limit, "active": p.active, "peak": p.peak, "waits": p.waits}
+                for name, p in self._pools.items()
+            }
+
+    def _acquire(self, pool: str) -> None:
+        with self._lock:
+            state = self._pools.get(pool)
+            if state is None:
+                state = self._pools[pool] = _Pool(self.limit_for(pool))
+            if state.active < state.limit and not state.waiters:
+                state.active += 1
+                state.peak = max(state.peak, state.active)
+                return
+            turn = threading.Event()
+            state.waiters.append(turn)
+            state.waits += 1
+        logger.debug(f"Waiting for a '{pool}' slot ({state.limit} in use)")
+        # The releasing thread hands its slot over directly, so FIFO order holds
+        try:
+            turn.wait()
+        except BaseException:
+            # Interrupted while queued: leave the queue, or pass on a slot handed over meanwhile
+            with self._lock:
+                handed_over = turn not in state.waiters
+                if not handed_over:
+                    state.waiters.remove(turn)
+            if handed_over:
+                self._release(pool)
+            raise
+
+    def _release(self, pool: str) -> None:
+        with self._lock:
+            state = self._pools[pool]
+            if state.waiters:
+                state.waiters.popleft().set()
+            else:
+                state.active -= 1
+
+
+_governor: Optional[ConcurrencyGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_concurrency_governor() -> ConcurrencyGovernor:
+    """Return the process-wide governor, creating it from the environment on first use."""
+    global _governor
+    if _governor is None:
+        with _governor_lock:
+            if _governor is None:
+                _governor = ConcurrencyGovernor.from_env()
+    return _governor
+
+
+def concurrency_slot(pool: str) -> AbstractContextManager[None]:
+    """Hold a slot from the process-wide governor (see ``ConcurrencyGovernor.slot``)."""
+    return get_concurrency_governor().slot(pool)
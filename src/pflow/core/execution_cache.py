@@ -4,19 +4,62 @@ Stores node execution results to enable two-phase retrieval:
 1. Execute node → return structure-only + execution_id
 2. Read specific fields → retrieve values from cache
 
-Cache location: ~/.pflow/cache/registry-run/{execution_id}.json
-TTL: 24 hours (stored but not enforced in MVP)
+Cache location: ~/.pflow/cache/registry-run/cache.db (SQLite)
+
+Metadata (node type, timestamp, size, last access) lives in its own table so
+listing executions never touches output payloads. Outputs are stored as compact
+JSON text and individual field paths are extracted with SQLite's JSON1
+functions, so ``read_fields`` only materializes the values that were asked for.
+
+Entries expire after ``ttl_hours`` (default 24) and the total payload size is
+capped with least-recently-used eviction.
 """
 
 import base64
 import json
+import logging
+import re
 import secrets
+import sqlite3
 import time
+from contextlib import closing
 from pathlib import Path
 from typing import Any, Optional
 
+from pflow.core import sqlite_cache
 from pflow.core.security_utils import is_sensitive_parameter, mask_sensitive_value
 
+logger = logging.getLogger(__name__)
+
+# Default time-to-live for cache entries
+DEFAULT_TTL_HOURS = 24
+
+# Default cap on total cached output bytes before LRU eviction kicks in
+DEFAULT_MAX_SIZE_BYTES = 256 * 1024 * 1024
+
+# Name of the SQLite database inside the cache directory
+CACHE_DB_NAME = "cache.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    execution_id TEXT PRIMARY KEY,
+    node_type TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    ttl_hours REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    params TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS payloads (
+    execution_id TEXT PRIMARY KEY REFERENCES executions(execution_id) ON DELETE CASCADE,
+    outputs TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_executions_last_accessed ON executions(last_accessed);
+"""
+
+# Field path segment: name followed by optional [n] indices (same grammar as TemplateResolver)
+_PATH_PART_PATTERN = re.compile(r"^([^\[\]\"]+)((?:\[\d+\])*)$")
+
 
 class ExecutionCache:
     """Manage cached node execution results for structure-only mode.
@@ -25,14 +68,30 @@ class ExecutionCache:
     1. See data structure without actual values (structure-only mode)
     2. Selectively retrieve specific field values when needed
 
-    Cache entries are stored as JSON files with 24-hour TTL metadata
-    (automatic cleanup deferred to post-MVP).
+    Cache entries are stored in a SQLite database with separate metadata and
+    payload tables. Expired entries are purged on write and ignored on read.
     """
 
-    def __init__(self) -> None:
-        """Initialize cache with default directory."""
+    def __init__(
+        self,
+        ttl_hours: float = DEFAULT_TTL_HOURS,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+    ) -> None:
+        """Initialize cache with default directory.
+
+        Args:
+            ttl_hours: Hours before an entry expires
+            max_size_bytes: Maximum total size of cached outputs (LRU eviction beyond this)
+        """
         self.cache_dir = Path.home() / ".pflow" / "cache" / "registry-run"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_hours = ttl_hours
+        self.max_size_bytes = max_size_bytes
+
+    @property
+    def db_path(self) -> Path:
+        """Path to the SQLite database backing this cache."""
+        return self.cache_dir / CACHE_DB_NAME
 
     @staticmethod
     def generate_execution_id() -> str:
@@ -48,6 +107,10 @@ class ExecutionCache:
         random_hex = secrets.token_hex(4)  # 8 hex characters
         return f"exec-{timestamp}-{random_hex}"
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database, creating the schema if needed."""
+        return sqlite_cache.connect(self.db_path, _SCHEMA, foreign_keys=True)
+
     def store(
         self,
         execution_id: str,
@@ -64,7 +127,7 @@ class ExecutionCache:
             outputs: Node execution outputs (will be encoded if binary)
 
         Raises:
-            OSError: If cache file cannot be written
+            OSError: If cache database cannot be written
 
         Note:
             Sensitive parameters (api_key, password, token, etc.) are automatically
@@ -80,77 +143,239 @@ class ExecutionCache:
             else {}
         )
 
-        cache_data = {
+        payload = json.dumps(encoded_outputs, separators=(",", ":"), default=str)
+        now = time.time()
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO executions "
+                    "(execution_id, node_type, timestamp, ttl_hours, last_accessed, size_bytes, params) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        execution_id,
+                        node_type,
+                        now,
+                        self.ttl_hours,
+                        now,
+                        len(payload),
+                        json.dumps(masked_params, default=str),
+                    ),
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO payloads (execution_id, outputs) VALUES (?, ?)",
+                    (execution_id, payload),
+                )
+                self._evict(conn, now, keep=execution_id)
+        except sqlite3.Error as e:
+            raise OSError(f"Failed to write execution cache: {e}") from e
+
+    def retrieve(self, execution_id: str) -> Optional[dict[str, Any]]:
+        """Retrieve cached execution results.
+
+        Args:
+            execution_id: Execution ID from previous registry run
+
+        Returns:
+            Cache data dict with decoded binary data, or None if not found or expired
+        """
+        try:
+            with closing(self._connect()) as conn, conn:
+                if not self._touch(conn, execution_id):
+                    return None
+                row = conn.execute(
+                    "SELECT e.node_type, e.timestamp, e.ttl_hours, e.params, p.outputs "
+                    "FROM executions e JOIN payloads p USING (execution_id) WHERE e.execution_id = ?",
+                    (execution_id,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to read execution cache: {e}")
+            return None
+        if row is None:
+            return None
+
+        node_type, timestamp, ttl_hours, params, outputs = row
+        return {
             "execution_id": execution_id,
             "node_type": node_type,
-            "timestamp": time.time(),
-            "ttl_hours": 24,  # Stored but not enforced in MVP
-            "params": masked_params,
-            "outputs": encoded_outputs,
+            "timestamp": timestamp,
+            "ttl_hours": ttl_hours,
+            "params": json.loads(params),
+            "outputs": self._decode_binary(json.loads(outputs)),
         }
 
-        filepath = self.cache_dir / f"{execution_id}.json"
+    def read_fields(self, execution_id: str, field_paths: list[str]) -> Optional[dict[str, Any]]:
+        """Read specific field paths from a cached execution.
 
-        # Write cache file with UTF-8 encoding
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(cache_data, f, indent=2, default=str)
-
-    def retrieve(self, execution_id: str) -> Optional[dict[str, Any]]:
-        """Retrieve cached execution results.
+        Each path is extracted inside SQLite so only the requested values are
+        deserialized. Paths that cannot be expressed as a JSON path, or that
+        need pflow's JSON-string auto-parsing, fall back to full resolution via
+        TemplateResolver so results match workflow template semantics.
 
         Args:
             execution_id: Execution ID from previous registry run
+            field_paths: Field paths to read (e.g., ["result[0].title"])
 
         Returns:
-            Cache data dict with decoded binary data, or None if not found
+            Dict mapping each field path to its value (None if unresolvable),
+            or None if the execution is not found or expired
+        """
+        field_values: dict[str, Any] = {}
+        unresolved: list[str] = []
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                if not self._touch(conn, execution_id):
+                    return None
+                for field_path in field_paths:
+                    json_path = self._to_json_path(field_path)
+                    if json_path is None:
+                        unresolved.append(field_path)
+                        continue
+                    row = conn.execute(
+                        "SELECT json_type(outputs, ?), json_extract(outputs, ?) FROM payloads WHERE execution_id = ?",
+                        (json_path, json_path, execution_id),
+                    ).fetchone()
+                    if row is None or row[0] is None:
+                        unresolved.append(field_path)
+                        continue
+                    field_values[field_path] = self._decode_extracted(row[0], row[1])
+        except sqlite3.Error as e:
+            logger.debug(f"Path-level cache lookup failed, falling back to full load: {e}")
+            unresolved = [p for p in field_paths if p not in field_values]
+
+        if unresolved:
+            cache_data = self.retrieve(execution_id)
+            if cache_data is None:
+                return None
+            outputs = cache_data["outputs"]
+
+            from pflow.runtime.template_resolver import TemplateResolver
+
+            for field_path in unresolved:
+                try:
+                    # Use TemplateResolver for consistent path parsing
+                    field_values[field_path] = TemplateResolver.resolve_value(field_path, outputs)
+                except Exception:
+                    # Invalid path or not found - store None
+                    field_values[field_path] = None
+
+        # Preserve requested order
+        return {field_path: field_values.get(field_path) for field_path in field_paths}
+
+    def list_cached_executions(self) -> list[dict[str, Any]]:
+        """List all cached executions with metadata.
+
+        Returns:
+            List of dicts with execution_id, node_type, timestamp (newest first)
 
         Note:
-            TTL checking is not enforced in MVP - all cache entries
-            are returned regardless of age.
+            This reads only the metadata table, not outputs.
         """
-        filepath = self.cache_dir / f"{execution_id}.json"
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute(
+                    "SELECT execution_id, node_type, timestamp FROM executions "
+                    "WHERE timestamp + ttl_hours * 3600 > ? ORDER BY timestamp DESC",
+                    (time.time(),),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to list execution cache: {e}")
+            return []
+
+        return [{"execution_id": row[0], "node_type": row[1], "timestamp": row[2]} for row in rows]
+
+    def cleanup(self) -> int:
+        """Remove expired entries and enforce the size cap.
 
-        if not filepath.exists():
-            return None
+        Returns:
+            Number of entries removed
+        """
+        with closing(self._connect()) as conn, conn:
+            return self._evict(conn, time.time())
 
-        with open(filepath, encoding="utf-8") as f:
-            cache_data = json.load(f)
+    @staticmethod
+    def _touch(conn: sqlite3.Connection, execution_id: str) -> bool:
+        """Mark an entry as recently used, deleting it if expired.
 
-        # Decode binary data
-        cache_data["outputs"] = self._decode_binary(cache_data["outputs"])
+        Args:
+            conn: Open connection (caller owns the transaction)
+            execution_id: Entry to touch
 
-        # Type assertion for mypy (_decode_binary returns Any but we know structure is preserved)
-        return cache_data  # type: ignore[no-any-return]
+        Returns:
+            True if the entry exists and has not expired
+        """
+        now = time.time()
+        row = conn.execute(
+            "SELECT timestamp, ttl_hours FROM executions WHERE execution_id = ?",
+            (execution_id,),
+        ).fetchone()
+        if row is None:
+            return False
+        timestamp, ttl_hours = row
+        if timestamp + ttl_hours * 3600 <= now:
+            conn.execute("DELETE FROM executions WHERE execution_id = ?", (execution_id,))
+            return False
+        conn.execute("UPDATE executions SET last_accessed = ? WHERE execution_id = ?", (now, execution_id))
+        return True
+
+    def _evict(self, conn: sqlite3.Connection, now: float, keep: Optional[str] = None) -> int:
+        """Delete expired entries, then least-recently-used ones until under the size cap.
 
-    def list_cached_executions(self) -> list[dict[str, Any]]:
-        """List all cached executions with metadata.
+        Args:
+            conn: Open connection (caller owns the transaction)
+            now: Current time
+            keep: Execution ID that must not be evicted (the one just stored)
 
         Returns:
-            List of dicts with execution_id, node_type, timestamp
+            Number of entries removed
+        """
+        return sqlite_cache.evict(
+            conn,
+            "executions",
+            "execution_id",
+            "timestamp + ttl_hours * 3600 <= ?",
+            (now,),
+            self.max_size_bytes,
+            keep=keep,
+        )
 
-        Note:
-            This reads only the metadata, not full outputs.
+    @staticmethod
+    def _to_json_path(field_path: str) -> Optional[str]:
+        """Convert a template-style field path to a SQLite JSON path.
+
+        Args:
+            field_path: Path like "result[0].title"
+
+        Returns:
+            JSON path like '$."result"[0]."title"', or None if the path uses
+            syntax that cannot be expressed safely
+        """
+        json_path = "$"
+        for part in re.split(r"\.(?![^\[]*\])", field_path):
+            match = _PATH_PART_PATTERN.match(part)
+            if not match:
+                return None
+            json_path += f'."{match.group(1)}"{match.group(2)}'
+        return json_path
+
+    def _decode_extracted(self, json_type: str, value: Any) -> Any:
+        """Convert a json_extract() result back to the Python value.
+
+        Args:
+            json_type: Result of json_type() for the same path
+            value: Result of json_extract() (SQL scalar or JSON text)
+
+        Returns:
+            Decoded value with binary markers converted to bytes
         """
-        executions = []
-
-        for filepath in self.cache_dir.glob("exec-*.json"):
-            try:
-                with open(filepath, encoding="utf-8") as f:
-                    cache_data = json.load(f)
-
-                executions.append({
-                    "execution_id": cache_data["execution_id"],
-                    "node_type": cache_data["node_type"],
-                    "timestamp": cache_data["timestamp"],
-                })
-            except (json.JSONDecodeError, KeyError):
-                # Skip malformed cache files
-                continue
-
-        # Sort by timestamp (newest first)
-        executions.sort(key=lambda x: x["timestamp"], reverse=True)
-
-        return executions
+        if json_type in ("object", "array"):
+            return self._decode_binary(json.loads(value))
+        if json_type == "true":
+            return True
+        if json_type == "false":
+            return False
+        return value
 
     def _encode_binary(self, data: Any) -> Any:
         """Recursively encode binary data to base64.
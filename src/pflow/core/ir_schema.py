@@ -171,7 +171,62 @@ BATCH_CONFIG_SCHEMA: dict[str, Any] = {
             "type": "number",
             "minimum": 0,
             "default": 0,
-            "description": "Seconds to wait between retries (default: 0)",
+            "description": "Seconds to wait before the first retry, doubled for each later retry (default: 0)",
+        },
+        "submit": {
+            "type": "string",
+            "enum": ["realtime", "provider"],
+            "default": "realtime",
+            "description": "How llm items are sent: 'realtime' calls per item, 'provider' submits one provider batch job",
+        },
+        "poll_interval": {
+            "type": "number",
+            "minimum": 0,
+            "default": 30,
+            "description": "Seconds between provider batch job status checks when submit='provider' (default: 30)",
+        },
+        # Tail-latency controls for parallel batches
+        "order": {
+            "type": "string",
+            "enum": ["input", "longest_first"],
+            "default": "input",
+            "description": "Submission order of parallel items: 'longest_first' starts items expected to take longest first",
+        },
+        "hedge": {
+            "oneOf": [
+                {"type": "boolean"},
+                {
+                    "type": "object",
+                    "properties": {
+                        "percentile": {"type": "number", "minimum": 50, "maximum": 99.9},
+                        "delay": {"type": "number", "minimum": 0},
+                        "max_hedges": {"type": "integer", "minimum": 0},
+                    },
+                    "additionalProperties": False,
+                },
+            ],
+            "default": False,
+            "description": (
+                "Re-issue parallel llm/http/MCP items still running after the given percentile of item times "
+                "(default 95) or a fixed delay in seconds, keeping the first result"
+            ),
+        },
+        "dedupe": {
+            "type": "boolean",
+            "default": False,
+            "description": "Run items whose resolved params are identical once and copy the result to the others",
+        },
+        "pack": {
+            "type": "integer",
+            "minimum": 1,
+            "maximum": 100,
+            "default": 1,
+            "description": "llm nodes only: answer up to this many items per model call, split from a JSON array",
+        },
+        "checkpoint": {
+            "type": "boolean",
+            "default": False,
+            "description": "Save each finished item to disk so a rerun of a failed batch only runs the remaining items",
         },
     },
     "required": ["items"],
@@ -0,0 +1,95 @@
+"""Process-wide cache of LLM model objects and Anthropic SDK clients.
+
+``llm.get_model()`` re-runs plugin discovery and alias resolution on every
+call, and every ``Anthropic(...)`` client owns its own connection pool, so
+LLM nodes, batch items and planner stages each paid for a fresh lookup and,
+for SDK clients, fresh TCP/TLS connections.
+
+- ``install_model_cache()`` wraps ``llm.get_model`` so each model name is
+  resolved once. Callers get a shallow copy of the cached model: tracing
+  and debug interceptors patch ``model.prompt`` on the returned object, and
+  copies keep those patches from leaking between calls while still sharing
+  the model's keys, options and clients.
+- ``get_anthropic_client()`` returns one thread-safe ``Anthropic`` client per
+  API key, so connection pools are reused. Keys are resolved by callers on
+  every use, so rotated keys get a new client.
+"""
+
+import copy
+import hashlib
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+
+_models: dict[tuple[str, bool], Any] = {}
+_clients: dict[str, "Anthropic"] = {}
+_lock = threading.Lock()
+
+# Marks the installed wrapper so installation is idempotent
+_CACHE_MARKER = "_pflow_model_cache"
+
+
+def install_model_cache() -> None:
+    """Wrap ``llm.get_model`` with the process-wide model cache (idempotent).
+
+    Install before other ``llm.get_model`` wrappers (e.g. the planner's
+    Anthropic wrapper) so it sits closest to the llm library.
+    """
+    import llm
+
+    with _lock:
+        if getattr(llm.get_model, _CACHE_MARKER, False):
+            return
+        original_get_model = llm.get_model
+
+        def get_model_cached(name: Optional[str] = None, _skip_async: bool = False) -> Any:
+            # The default model (name=None) follows llm's config, so it's never cached
+            if name is None:
+                return original_get_model(name, _skip_async)
+
+            key = (name, _skip_async)
+            model = _models.get(key)
+            if model is None:
+                # Unknown models raise here and are not cached
+                model = original_get_model(name, _skip_async)
+                with _lock:
+                    model = _models.setdefault(key, model)
+            return copy.copy(model)
+
+        setattr(get_model_cached, _CACHE_MARKER, True)
+        llm.get_model = get_model_cached
+
+
+def get_anthropic_client(api_key: Optional[str]) -> "Anthropic":
+    """Return the shared Anthropic SDK client for an API key.
+
+    Args:
+        api_key: Resolved API key (default: ANTHROPIC_API_KEY)
+
+    Returns:
+        A client that is safe to share across threads
+    """
+    from anthropic import Anthropic
+
+    api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+    # Hash so raw keys aren't kept as dict keys
+    key = hashlib.sha256((api_key or "").encode()).hexdigest()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = Anthropic(api_key=api_key)
+            _clients[key] = client
+        return client
+
+
+def clear_llm_caches() -> None:
+    """Drop cached models and close cached SDK clients."""
+    with _lock:
+        _models.clear()
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
@@ -9,6 +9,9 @@ from typing import Any
 # Version tracking for pricing updates
 PRICING_VERSION = "2025-12-19"
 
+# Multiplier for requests run through a provider batch API (batch.submit: provider)
+PROVIDER_BATCH_DISCOUNT = 0.5
+
 # Comprehensive model pricing per million tokens
 # Prices are in USD per million tokens for input and output
 MODEL_PRICING: dict[str, dict[str, float]] = {
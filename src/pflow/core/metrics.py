@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from typing import Any, Optional
 
 # Import pricing from centralized module
-from pflow.core.llm_pricing import calculate_llm_cost
+from pflow.core.llm_pricing import PROVIDER_BATCH_DISCOUNT, calculate_llm_cost
 
 
 @dataclass
@@ -22,6 +22,10 @@ class MetricsCollector:
     planner_nodes: dict[str, float] = field(default_factory=dict)
     workflow_nodes: dict[str, float] = field(default_factory=dict)
 
+    # Bytes each workflow node wrote to the shared store (node_id -> bytes)
+    workflow_node_bytes: dict[str, int] = field(default_factory=dict)
+    shared_store_usage: Optional[dict[str, Any]] = None
+
     def record_planner_start(self) -> None:
         """Mark the start of planner execution."""
         self.planner_start = time.perf_counter()
@@ -51,6 +55,23 @@ class MetricsCollector:
         else:
             self.workflow_nodes[node_id] = duration_ms
 
+    def record_node_bytes_written(self, node_id: str, bytes_written: int) -> None:
+        """Record how many bytes a workflow node wrote to the shared store.
+
+        Args:
+            node_id: Unique identifier for the node
+            bytes_written: Estimated size of the values the node wrote
+        """
+        self.workflow_node_bytes[node_id] = self.workflow_node_bytes.get(node_id, 0) + bytes_written
+
+    def record_shared_store_usage(self, usage: dict[str, Any]) -> None:
+        """Record the shared store's size at the end of the run.
+
+        Args:
+            usage: Summary from MemoryBudget.usage()
+        """
+        self.shared_store_usage = usage
+
     def calculate_costs(self, llm_calls: list[dict[str, Any]]) -> dict[str, Any]:
         """Calculate total cost from accumulated LLM calls.
 
@@ -93,7 +114,10 @@ class MetricsCollector:
                     cache_read_tokens=call.get("cache_read_input_tokens", 0),
                     thinking_tokens=call.get("thinking_tokens", 0),
                 )
-                total_cost += cost_breakdown["total_cost_usd"]
+                cost = cost_breakdown["total_cost_usd"]
+                if call.get("provider_batch"):
+                    cost *= PROVIDER_BATCH_DISCOUNT
+                total_cost += cost
             except ValueError as e:
                 # Track unknown models but don't crash
                 unavailable_models.add(model)
@@ -197,6 +221,10 @@ class MetricsCollector:
         if tokens["thinking_budget"] > 0:
             metrics["thinking_budget"] = tokens["thinking_budget"]
 
+        # Add shared-store writes if any were accounted
+        if not is_planner and self.workflow_node_bytes:
+            metrics["node_bytes_written"] = self.workflow_node_bytes
+
         return metrics
 
     def _add_cache_performance(self, summary: dict[str, Any], total_tokens: dict[str, int]) -> None:
@@ -236,6 +264,51 @@ class MetricsCollector:
                 "thinking_utilization_pct": round(thinking_utilization, 1),
             }
 
+    def _add_streaming_performance(self, summary: dict[str, Any], llm_calls: list[dict[str, Any]]) -> None:
+        """Add streaming latency metrics to summary if any LLM call was streamed.
+
+        Args:
+            summary: Summary dict to update
+            llm_calls: List of LLM call data
+        """
+        ttfts = [call["time_to_first_token_ms"] for call in llm_calls if "time_to_first_token_ms" in call]
+        if not ttfts:
+            return
+        rates = [call["tokens_per_second"] for call in llm_calls if "tokens_per_second" in call]
+
+        summary["streaming_performance"] = {
+            "streamed_calls": len(ttfts),
+            "avg_time_to_first_token_ms": round(sum(ttfts) / len(ttfts), 2),
+            "avg_tokens_per_second": round(sum(rates) / len(rates), 2) if rates else None,
+        }
+
+    def _add_speculation_waste(self, summary: dict[str, Any], llm_calls: list[dict[str, Any]]) -> None:
+        """Add the cost of discarded speculative planner calls to summary if there were any.
+
+        Args:
+            summary: Summary dict to update
+            llm_calls: List of LLM call data
+        """
+        wasted = [call for call in llm_calls if call.get("speculative_wasted")]
+        if not wasted:
+            return
+        tokens = self._aggregate_token_counts(wasted)
+
+        summary["speculation"] = {
+            "wasted_calls": len(wasted),
+            "wasted_tokens": tokens["input"] + tokens["output"],
+            "wasted_cost_usd": self.calculate_costs(wasted).get("total_cost_usd"),
+        }
+
+    def _add_shared_store_usage(self, summary: dict[str, Any]) -> None:
+        """Add shared-store size to summary if anything was written to it.
+
+        Args:
+            summary: Summary dict to update
+        """
+        if self.shared_store_usage and self.shared_store_usage.get("peak_bytes"):
+            summary["shared_store"] = self.shared_store_usage
+
     def get_summary(self, llm_calls: list[dict[str, Any]]) -> dict[str, Any]:
         """Generate metrics summary for JSON output.
 
@@ -320,5 +393,8 @@ class MetricsCollector:
         # Add performance summaries
         self._add_cache_performance(summary, total_tokens)
         self._add_thinking_performance(summary, total_tokens)
+        self._add_streaming_performance(summary, llm_calls)
+        self._add_speculation_waste(summary, llm_calls)
+        self._add_shared_store_usage(summary)
 
         return summary
@@ -53,6 +53,9 @@ class OutputController:
         else:
             self.stdout_tty = sys.stdout.isatty()
 
+        # True while streamed node output is on screen (the node's line was broken)
+        self._stream_open = False
+
     def is_interactive(self) -> bool:
         """Determine if running in interactive mode.
 
@@ -79,6 +82,34 @@ class OutputController:
         """
         click.echo(f"{indent}  {node_id}...", err=True, nl=False)
 
+    def _handle_node_stream(self, text_chunk: Optional[str]) -> None:
+        """Handle node_stream event - write streamed output as it arrives.
+
+        The first chunk ends the "node..." line so output starts on its own line.
+
+        Args:
+            text_chunk: Text produced by the node since the previous event
+        """
+        if not text_chunk:
+            return
+        if not self._stream_open:
+            click.echo("", err=True)
+            self._stream_open = True
+        click.echo(text_chunk, err=True, nl=False)
+
+    def _close_stream(self, node_id: str, indent: str) -> None:
+        """Re-open the node's status line after streamed output, before completion is shown.
+
+        Args:
+            node_id: The node identifier
+            indent: Indentation string based on depth
+        """
+        if not self._stream_open:
+            return
+        self._stream_open = False
+        click.echo("", err=True)
+        click.echo(f"{indent}  {node_id}", err=True, nl=False)
+
     def _handle_batch_progress(
         self,
         node_id: str,
@@ -188,7 +219,7 @@ class OutputController:
         """
         click.echo(f"{indent}Executing workflow ({node_id} nodes):", err=True)
 
-    def create_progress_callback(self) -> Optional[Callable]:
+    def create_progress_callback(self) -> Optional[Callable]:  # noqa: C901
         """Create progress callback for workflow execution.
 
         Returns:
@@ -212,12 +243,15 @@ class OutputController:
             batch_success: Optional[bool] = None,
             is_batch: bool = False,
             batch_success_count: Optional[int] = None,
+            # Streaming parameters
+            text_chunk: Optional[str] = None,
         ) -> None:
             """Display progress for node execution.
 
             Args:
                 node_id: The node identifier or count for workflow_start
-                event: Event type (node_start, node_complete, node_cached, workflow_start, batch_progress)
+                event: Event type (node_start, node_complete, node_cached, workflow_start, batch_progress,
+                    node_stream)
                 duration_ms: Execution duration in milliseconds (for complete events)
                 depth: Nesting depth for indentation
                 error_message: Error message for failed nodes
@@ -229,13 +263,17 @@ class OutputController:
                 batch_success: Whether just-completed item succeeded (for batch_progress)
                 is_batch: Whether this is a batch node (for node_complete)
                 batch_success_count: Number of successful items (for node_complete)
+                text_chunk: Streamed output text (for node_stream)
             """
             indent = "  " * depth
 
             # Dispatch to appropriate handler based on event type
             if event == "node_start":
                 self._handle_node_start(node_id, indent)
+            elif event == "node_stream":
+                self._handle_node_stream(text_chunk)
             elif event == "node_complete":
+                self._close_stream(node_id, indent)
                 self._handle_node_complete(
                     duration_ms,
                     error_message,
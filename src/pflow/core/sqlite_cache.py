@@ -0,0 +1,78 @@
+"""SQLite storage shared by pflow's on-disk caches.
+
+Each cache keeps its entries in one table with ``timestamp``,
+``last_accessed`` and ``size_bytes`` columns. Expired entries are deleted on
+write, then the least recently used until the total size fits under the
+cache's cap. Table and column names are interpolated into SQL, so they must
+come from code, never from user input.
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Optional
+
+# SQLite busy timeout (seconds) - concurrent CLI runs and the MCP server may share a database
+DB_TIMEOUT_SECONDS = 5.0
+
+
+def connect(db_path: Path, schema: str, foreign_keys: bool = False) -> sqlite3.Connection:
+    """Open a cache database in WAL mode, creating its directory and schema if needed.
+
+    Args:
+        db_path: Database file
+        schema: CREATE ... IF NOT EXISTS statements for the cache's tables
+        foreign_keys: Enforce foreign keys (e.g. payload rows that cascade on delete)
+
+    Returns:
+        Open connection (the caller closes it)
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=DB_TIMEOUT_SECONDS)
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(schema)
+    return conn
+
+
+def evict(
+    conn: sqlite3.Connection,
+    table: str,
+    key_column: str,
+    expired: str,
+    expired_args: tuple[Any, ...],
+    max_size_bytes: int,
+    keep: Optional[str] = None,
+) -> int:
+    """Delete expired entries, then least-recently-used ones until under the size cap.
+
+    Args:
+        conn: Open connection (caller owns the transaction)
+        table: Entries table
+        key_column: Primary key column of ``table``
+        expired: SQL condition matching expired rows, e.g. ``"timestamp + ? <= ?"``
+        expired_args: Parameters for ``expired``
+        max_size_bytes: Total ``size_bytes`` to stay under
+        keep: Key that must not be evicted (the entry just stored)
+
+    Returns:
+        Number of entries removed
+    """
+    removed = conn.execute(f"DELETE FROM {table} WHERE {expired}", expired_args).rowcount  # noqa: S608
+
+    total = conn.execute(f"SELECT COALESCE(SUM(size_bytes), 0) FROM {table}").fetchone()[0]  # noqa: S608
+    if total <= max_size_bytes:
+        return int(removed)
+
+    candidates = conn.execute(
+        f"SELECT {key_column}, size_bytes FROM {table} WHERE {key_column} != ? ORDER BY last_accessed ASC",  # noqa: S608
+        (keep or "",),
+    ).fetchall()
+    for candidate_key, size_bytes in candidates:
+        if total <= max_size_bytes:
+            break
+        conn.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (candidate_key,))  # noqa: S608
+        total -= size_bytes
+        removed += 1
+
+    return int(removed)
@@ -259,31 +259,7 @@ class WorkflowManager:
             raise WorkflowNotFoundError(f"Workflow '{name}' not found")
 
         try:
-            content = file_path.read_text(encoding="utf-8")
-            result = parse_markdown(content)
-
-            # Build flat metadata structure from frontmatter
-            fm = result.metadata or {}
-            loaded: dict[str, Any] = {
-                "name": fm.get("name", name),
-                "description": result.description or "",
-                "ir": result.ir,
-                "created_at": fm.get("created_at"),
-                "updated_at": fm.get("updated_at"),
-                "version": fm.get("version"),
-                # Execution tracking (was in rich_metadata, now flat)
-                "execution_count": fm.get("execution_count", 0),
-                "last_execution_timestamp": fm.get("last_execution_timestamp"),
-                "last_execution_success": fm.get("last_execution_success"),
-                "last_execution_duration_seconds": fm.get("last_execution_duration_seconds"),
-                "average_execution_duration_seconds": fm.get("average_execution_duration_seconds"),
-                "last_execution_params": fm.get("last_execution_params"),
-                # Discovery metadata (was in rich_metadata, now flat)
-                "search_keywords": fm.get("search_keywords"),
-                "capabilities": fm.get("capabilities"),
-                "typical_use_cases": fm.get("typical_use_cases"),
-            }
-
+            loaded = self._read_workflow_file(file_path, name)
             logger.debug(f"Loaded workflow '{name}' from {file_path}")
             return loaded
 
@@ -294,6 +270,47 @@ class WorkflowManager:
                 raise
             raise WorkflowValidationError(f"Failed to load workflow '{name}': {e}") from e
 
+    def _read_workflow_file(self, file_path: Path, name: str) -> dict[str, Any]:
+        """Parse a workflow file into the flat metadata structure.
+
+        Shared by load() and list_all(). Subclasses may override this to
+        cache parsed results.
+
+        Args:
+            file_path: Path to the .pflow.md file
+            name: Workflow name (used when frontmatter has no name)
+
+        Returns:
+            Flat metadata dict (see load())
+
+        Raises:
+            MarkdownParseError: If the workflow content is invalid
+            OSError: If the file cannot be read
+        """
+        content = file_path.read_text(encoding="utf-8")
+        result = parse_markdown(content)
+        fm = result.metadata or {}
+
+        return {
+            "name": fm.get("name", name),
+            "description": result.description or "",
+            "ir": result.ir,
+            "created_at": fm.get("created_at"),
+            "updated_at": fm.get("updated_at"),
+            "version": fm.get("version"),
+            # Execution tracking (was in rich_metadata, now flat)
+            "execution_count": fm.get("execution_count", 0),
+            "last_execution_timestamp": fm.get("last_execution_timestamp"),
+            "last_execution_success": fm.get("last_execution_success"),
+            "last_execution_duration_seconds": fm.get("last_execution_duration_seconds"),
+            "average_execution_duration_seconds": fm.get("average_execution_duration_seconds"),
+            "last_execution_params": fm.get("last_execution_params"),
+            # Discovery metadata (was in rich_metadata, now flat)
+            "search_keywords": fm.get("search_keywords"),
+            "capabilities": fm.get("capabilities"),
+            "typical_use_cases": fm.get("typical_use_cases"),
+        }
+
     def load_ir(self, name: str) -> dict[str, Any]:
         """Load just the IR dict from a workflow.
 
@@ -331,28 +348,7 @@ class WorkflowManager:
         for file_path in self.workflows_dir.glob("*.pflow.md"):
             try:
                 name = self._name_from_path(file_path)
-                content = file_path.read_text(encoding="utf-8")
-                result = parse_markdown(content)
-                fm = result.metadata or {}
-
-                workflow_meta: dict[str, Any] = {
-                    "name": fm.get("name", name),
-                    "description": result.description or "",
-                    "ir": result.ir,
-                    "created_at": fm.get("created_at"),
-                    "updated_at": fm.get("updated_at"),
-                    "version": fm.get("version"),
-                    "execution_count": fm.get("execution_count", 0),
-                    "last_execution_timestamp": fm.get("last_execution_timestamp"),
-                    "last_execution_success": fm.get("last_execution_success"),
-                    "last_execution_duration_seconds": fm.get("last_execution_duration_seconds"),
-                    "average_execution_duration_seconds": fm.get("average_execution_duration_seconds"),
-                    "last_execution_params": fm.get("last_execution_params"),
-                    "search_keywords": fm.get("search_keywords"),
-                    "capabilities": fm.get("capabilities"),
-                    "typical_use_cases": fm.get("typical_use_cases"),
-                }
-                workflows.append(workflow_meta)
+                workflows.append(self._read_workflow_file(file_path, name))
             except Exception as e:
                 logger.warning(f"Failed to load workflow from {file_path}: {e}")
                 continue
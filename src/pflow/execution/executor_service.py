@@ -6,6 +6,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 
+from pflow.core.cancellation import WorkflowCancelled, run_cancellation
 from pflow.core.workflow_manager import WorkflowManager
 from pflow.core.workflow_status import WorkflowStatus
 from pflow.mcp_server.utils.errors import sanitize_parameters
@@ -89,13 +90,23 @@ class WorkflowExecutorService:
         Returns:
             ExecutionResult with success status and execution details
         """
+        from pflow.core.circuit_breaker import CIRCUIT_BREAKERS_KEY, CircuitBreakers
         from pflow.registry import Registry
         from pflow.runtime.compiler import compile_ir_to_flow
+        from pflow.runtime.memory_budget import MEMORY_BUDGET_KEY, MemoryBudget
+        from pflow.runtime.output_liveness import RETAIN_OUTPUTS_KEY
 
         start_time = time.time()
 
         # Initialize shared store and registry
         shared_store = self._initialize_shared_store(shared_store, execution_params, stdin_data, metrics_collector)
+        if output_key:
+            # The key may name a node namespace, which must outlive its last consumer
+            shared_store[RETAIN_OUTPUTS_KEY] = [output_key]
+        # Resumed runs keep the budget (and spill files) of the run they continue
+        budget = shared_store.setdefault(MEMORY_BUDGET_KEY, MemoryBudget.from_env())
+        # Circuits and the retry budget are per run: concurrent runs (MCP server) don't trip each other's
+        shared_store.setdefault(CIRCUIT_BREAKERS_KEY, CircuitBreakers.from_env())
         registry = Registry()
 
         try:
@@ -108,7 +119,9 @@ class WorkflowExecutorService:
                 metrics_collector=metrics_collector,
                 trace_collector=trace_collector,
             )
-            action_result = flow.run(shared_store)
+            # Ctrl+C in the CLI and workflow_cancel in the MCP server cancel the run's token
+            with run_cancellation(shared_store):
+                action_result = flow.run(shared_store)
 
             # Process execution results
             success, status = self._determine_workflow_status(action_result, shared_store)
@@ -119,7 +132,7 @@ class WorkflowExecutorService:
             execution_duration = time.time() - start_time
             self._update_workflow_metadata(success, workflow_name, execution_params, execution_duration)
 
-        except Exception as e:
+        except (Exception, WorkflowCancelled) as e:
             result = self._handle_execution_exception(e, shared_store)
             success = result["success"]
             status = WorkflowStatus.FAILED  # Exceptions always mean failure
@@ -130,6 +143,7 @@ class WorkflowExecutorService:
         finally:
             if metrics_collector:
                 metrics_collector.record_workflow_end()
+                metrics_collector.record_shared_store_usage(budget.usage())
 
         duration = time.time() - start_time
 
@@ -532,7 +546,7 @@ class WorkflowExecutorService:
             )
 
     def _handle_execution_exception(
-        self, exception: Exception, shared_store: dict[str, Any] | None = None
+        self, exception: BaseException, shared_store: dict[str, Any] | None = None
     ) -> dict[str, Any]:
         """Handle exceptions during workflow execution.
 
@@ -570,13 +584,23 @@ class WorkflowExecutorService:
                     # This is a best guess - better than "unknown"
                     logger.debug(f"No failed_node in execution state, completed nodes: {completed}")
 
-        error_dict = {
-            "source": "runtime",
-            "category": "exception",
-            "message": str(exception),
-            "exception_type": type(exception).__name__,
-            "fixable": self._is_fixable_error(exception),
-        }
+        if isinstance(exception, WorkflowCancelled):
+            # Nodes that finished keep their outputs in the shared store (partial results)
+            error_dict = {
+                "source": "runtime",
+                "category": "cancelled",
+                "message": f"Workflow cancelled: {exception}",
+                "exception_type": type(exception).__name__,
+                "fixable": False,
+            }
+        else:
+            error_dict = {
+                "source": "runtime",
+                "category": "exception",
+                "message": str(exception),
+                "exception_type": type(exception).__name__,
+                "fixable": self._is_fixable_error(exception),
+            }
 
         # Add node_id if we found it
         if failed_node:
@@ -709,6 +733,8 @@ class WorkflowExecutorService:
         Returns:
             The extracted output as a string, or None if not found
         """
+        from pflow.runtime.memory_budget import materialize
+
         nodes = workflow_ir.get("nodes", [])
         if not nodes:
             return None
@@ -724,11 +750,11 @@ class WorkflowExecutorService:
         output_keys = ["result", "output", "response"]
         for key in output_keys:
             if key in node_output:
-                return str(node_output[key])
+                return str(materialize(node_output[key]))
 
         return None
 
-    def _is_fixable_error(self, exception: Exception) -> bool:
+    def _is_fixable_error(self, exception: BaseException) -> bool:
         """Determine if an error can be fixed by repair.
 
         This method categorizes errors into fixable and non-fixable based
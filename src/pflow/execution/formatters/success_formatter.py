@@ -7,6 +7,7 @@ ensuring CLI and MCP return identical output structures.
 from typing import Any, Optional
 
 from pflow.core.workflow_status import WorkflowStatus
+from pflow.runtime.memory_budget import materialize
 
 
 def format_execution_success(
@@ -124,7 +125,7 @@ def _collect_outputs(
     if output_key:
         # Specific key requested
         if output_key in shared_storage:
-            result[output_key] = parse_json_or_original(shared_storage[output_key])
+            result[output_key] = parse_json_or_original(materialize(shared_storage[output_key]))
 
     elif workflow_ir and "outputs" in workflow_ir and workflow_ir["outputs"]:
         # Collect ALL declared outputs
@@ -132,13 +133,13 @@ def _collect_outputs(
 
         for output_name in declared:
             if output_name in shared_storage:
-                result[output_name] = parse_json_or_original(shared_storage[output_name])
+                result[output_name] = parse_json_or_original(materialize(shared_storage[output_name]))
 
     else:
         # Fallback: Use auto-detection
         key_found, value = _find_auto_output(shared_storage)
         if key_found:
-            result[key_found] = parse_json_or_original(value)
+            result[key_found] = parse_json_or_original(materialize(value))
 
     return result
 
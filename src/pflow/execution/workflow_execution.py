@@ -346,6 +346,11 @@ def _attempt_repair(
     return True, repaired_ir
 
 
+def _was_cancelled(result: ExecutionResult) -> bool:
+    """Whether a run failed because it was cancelled."""
+    return any(error.get("category") == "cancelled" for error in result.errors)
+
+
 def _execute_with_repair_loop(
     workflow_ir: dict,
     execution_params: dict,
@@ -408,7 +413,8 @@ def _execute_with_repair_loop(
         if runtime_attempt == 0 and not result.success:
             original_result = result
 
-        if result.success:
+        # A cancelled run was stopped on purpose, there is nothing to repair
+        if result.success or _was_cancelled(result):
             return result, current_workflow_ir, was_runtime_repaired
 
         # Runtime execution failed
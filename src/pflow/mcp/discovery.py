@@ -169,6 +169,11 @@ class MCPDiscovery:
                             schema = schema.model_dump()
                         tool_def["outputSchema"] = dict(schema)
 
+                    # Behavior hints (readOnlyHint, idempotentHint, ...)
+                    annotations = self._extract_annotations(tool)
+                    if annotations:
+                        tool_def["annotations"] = annotations
+
                     tools_list.append(tool_def)
 
                 logger.info(f"Discovered {len(tools_list)} tools from {server_name}")
@@ -244,6 +249,11 @@ class MCPDiscovery:
                             schema = schema.model_dump()
                         tool_def["outputSchema"] = dict(schema)
 
+                    # Behavior hints (readOnlyHint, idempotentHint, ...) (same as stdio)
+                    annotations = self._extract_annotations(tool)
+                    if annotations:
+                        tool_def["annotations"] = annotations
+
                     tools_list.append(tool_def)
 
                 logger.info(f"Discovered {len(tools_list)} tools from HTTP server {server_name}")
@@ -254,6 +264,22 @@ class MCPDiscovery:
 
         return tools_list
 
+    def _extract_annotations(self, tool: Any) -> dict[str, Any]:
+        """Extract a tool's behavior hints, leaving out the ones the server didn't set.
+
+        Args:
+            tool: Tool from the server's list_tools response
+
+        Returns:
+            Annotations dict (empty if the server sent none)
+        """
+        annotations = getattr(tool, "annotations", None)
+        if not annotations:
+            return {}
+        if hasattr(annotations, "model_dump"):
+            return dict(annotations.model_dump(exclude_none=True))
+        return dict(annotations)
+
     def _build_auth_headers(self, config: dict[str, Any]) -> dict[str, str]:
         """Build authentication headers from configuration.
 
@@ -250,6 +250,7 @@ class MCPRegistrar:
                     "server": server_name,
                     "tool": tool["name"],
                     "original_schema": tool.get("inputSchema", {}),
+                    "annotations": tool.get("annotations", {}),
                 },
             },
         }
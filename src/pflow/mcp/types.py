@@ -51,6 +51,7 @@ class ToolSchema(TypedDict, total=False):
     server: str
     inputSchema: dict[str, Any]
     outputSchema: Optional[dict[str, Any]]
+    annotations: Optional[dict[str, Any]]
 
 
 class ParamSchema(TypedDict, total=False):
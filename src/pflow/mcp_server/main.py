@@ -43,6 +43,13 @@ def run_server() -> None:
         inject_settings_env_vars()
         logger.info("Injected environment variables from pflow settings")
 
+    # Resolve each LLM model once per process; must wrap llm.get_model before
+    # the Anthropic wrapper below so the cache sits next to the llm library
+    if not os.environ.get("PYTEST_CURRENT_TEST"):
+        from pflow.core.llm_cache import install_model_cache
+
+        install_model_cache()
+
     # Install Anthropic model wrapper (REQUIRED for planning nodes)
     # This monkey-patches llm.get_model() to return AnthropicLLMModel
     # for Claude models, enabling prompt caching and thinking tokens
@@ -82,6 +89,9 @@ def run_server() -> None:
         logger.error(f"MCP server error: {e}", exc_info=True)
         sys.exit(1)
     finally:
+        from .utils.execution_manager import get_execution_manager
+
+        get_execution_manager().shutdown(wait=False)
         logger.info("MCP server shutdown complete")
 
 
@@ -109,14 +119,20 @@ def configure_logging(debug: bool = False) -> None:
         logging.getLogger("mcp").setLevel(logging.INFO)
 
 
-def main(debug: bool = False) -> None:
+def main(debug: bool = False, warm: bool = False) -> None:
     """Main entry point for running the server.
 
     Args:
         debug: Enable debug logging if True
+        warm: Keep in-memory caches across tool calls (see utils.warm_state)
     """
     configure_logging(debug)
 
+    if warm:
+        from .utils.warm_state import enable_warm_mode
+
+        enable_warm_mode()
+
     try:
         # No asyncio.run() here - FastMCP manages its own event loop
         run_server()
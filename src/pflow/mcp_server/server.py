@@ -51,6 +51,7 @@ def register_tools() -> None:
     from .tools import (
         discovery_tools,
         execution_tools,
+        job_tools,
         registry_tools,
         # settings_tools,  # DISABLED - code kept for future use
         # test_tools,  # DISABLED - development only
@@ -61,6 +62,7 @@ def register_tools() -> None:
     _ = (
         discovery_tools,
         execution_tools,
+        job_tools,
         registry_tools,
         # settings_tools,  # DISABLED
         # test_tools,  # DISABLED
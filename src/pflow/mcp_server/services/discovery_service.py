@@ -7,6 +7,7 @@ ComponentBrowsingNode) to provide intelligent discovery capabilities.
 import logging
 from datetime import datetime
 
+from ..utils.warm_state import get_workflow_manager
 from .base_service import BaseService, ensure_stateless
 
 logger = logging.getLogger(__name__)
@@ -33,12 +34,11 @@ class DiscoveryService(BaseService):
             Markdown formatted string with discovery results (same as CLI)
         """
         from pflow.core.llm_config import get_model_for_feature
-        from pflow.core.workflow_manager import WorkflowManager
         from pflow.planning.nodes import WorkflowDiscoveryNode
 
         # Create fresh instances (CRITICAL for stateless pattern)
         node = WorkflowDiscoveryNode()
-        workflow_manager = WorkflowManager()
+        workflow_manager = get_workflow_manager()
 
         # Set model via params (PocketFlow convention)
         discovery_model = get_model_for_feature("discovery")
@@ -101,12 +101,11 @@ class DiscoveryService(BaseService):
             Markdown formatted string with selected components (same as CLI)
         """
         from pflow.core.llm_config import get_model_for_feature
-        from pflow.core.workflow_manager import WorkflowManager
         from pflow.planning.nodes import ComponentBrowsingNode
 
         # Create fresh instances
         node = ComponentBrowsingNode()
-        workflow_manager = WorkflowManager()
+        workflow_manager = get_workflow_manager()
 
         # Set model via params (PocketFlow convention)
         discovery_model = get_model_for_feature("discovery")
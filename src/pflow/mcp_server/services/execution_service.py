@@ -12,9 +12,9 @@ from typing import Any
 
 from pflow.core.ir_schema import normalize_ir
 from pflow.core.metrics import MetricsCollector
-from pflow.core.workflow_manager import WorkflowManager
 from pflow.core.workflow_validator import WorkflowValidator
 from pflow.execution.null_output import NullOutput
+from pflow.execution.output_interface import OutputInterface
 from pflow.execution.workflow_execution import execute_workflow
 from pflow.registry import Registry
 from pflow.runtime.compiler import import_node_class
@@ -24,6 +24,7 @@ from ..utils.validation import (
     generate_dummy_parameters,
     validate_execution_parameters,
 )
+from ..utils.warm_state import cached_validation, get_registry, get_workflow_manager
 from .base_service import BaseService, ensure_stateless
 
 logger = logging.getLogger(__name__)
@@ -209,7 +210,12 @@ class ExecutionService(BaseService):
 
     @classmethod
     @ensure_stateless
-    def execute_workflow(cls, workflow: Any, parameters: dict[str, Any] | None = None) -> str:
+    def execute_workflow(
+        cls,
+        workflow: Any,
+        parameters: dict[str, Any] | None = None,
+        output: OutputInterface | None = None,
+    ) -> str:
         """Execute a workflow with agent-optimized defaults.
 
         Built-in behaviors (no flags needed):
@@ -221,6 +227,7 @@ class ExecutionService(BaseService):
         Args:
             workflow: Workflow name, path, or IR dict
             parameters: Execution parameters
+            output: Output interface receiving progress (default: silent)
 
         Returns:
             Formatted text output matching CLI (success or error)
@@ -247,7 +254,7 @@ class ExecutionService(BaseService):
             _, _, source = resolve_workflow(workflow)
 
             # Create fresh instances
-            workflow_manager = WorkflowManager()
+            workflow_manager = get_workflow_manager()
             metrics_collector = MetricsCollector()
 
             # Execute with agent defaults (mypy now knows workflow_ir is not None)
@@ -257,7 +264,7 @@ class ExecutionService(BaseService):
                 workflow_ir=workflow_ir,
                 execution_params=validated_params,
                 enable_repair=False,  # Always False for agents
-                output=NullOutput(),  # Silent execution
+                output=output or NullOutput(),  # Silent unless a progress sink is given
                 workflow_manager=workflow_manager,
                 workflow_name=workflow_name,
                 metrics_collector=metrics_collector,
@@ -330,18 +337,23 @@ class ExecutionService(BaseService):
 
         # Use comprehensive validator (same as CLI)
         try:
-            registry = Registry()
+            registry = get_registry()
 
             # Run all 4 validation checks:
             # 1. Structural validation (IR schema compliance)
             # 2. Data flow validation (execution order, cycles)
             # 3. Template validation (${variable} resolution)
             # 4. Node type validation (registry verification)
-            errors, _warnings = WorkflowValidator.validate(
-                workflow_ir=workflow_ir,
-                extracted_params=dummy_params,
-                registry=registry,
-                skip_node_types=False,
+            # In warm mode, identical IR against an unchanged registry reuses the result
+            errors, _warnings = cached_validation(
+                workflow_ir,
+                registry,
+                lambda: WorkflowValidator.validate(
+                    workflow_ir=workflow_ir,
+                    extracted_params=dummy_params,
+                    registry=registry,
+                    skip_node_types=False,
+                ),
             )
 
             # Use shared formatter for validation display
@@ -5,10 +5,8 @@ supporting the structure-only mode introduced in Task 89.
 """
 
 import logging
-from typing import Any
 
 from pflow.core.execution_cache import ExecutionCache
-from pflow.runtime.template_resolver import TemplateResolver
 
 from .base_service import BaseService, ensure_stateless
 
@@ -51,10 +49,11 @@ class FieldService(BaseService):
         # Create fresh cache instance (stateless pattern)
         cache = ExecutionCache()
 
-        # Retrieve cached execution
-        cache_data = cache.retrieve(execution_id)
+        # Read only the requested paths (invalid or missing paths map to None,
+        # matching CLI behavior - graceful degradation)
+        field_values = cache.read_fields(execution_id, field_paths)
 
-        if cache_data is None:
+        if field_values is None:
             # Provide helpful error message
             raise ValueError(
                 f"Execution '{execution_id}' not found in cache.\n"
@@ -62,21 +61,6 @@ class FieldService(BaseService):
                 "Run registry_run tool first to execute a node and cache results.",
             )
 
-        # Extract field values using TemplateResolver
-        outputs = cache_data["outputs"]
-        field_values: dict[str, Any] = {}
-
-        for field_path in field_paths:
-            try:
-                # Use TemplateResolver for consistent path parsing
-                # (same logic as template resolution in workflows)
-                value = TemplateResolver.resolve_value(field_path, outputs)
-                field_values[field_path] = value
-            except Exception:
-                # Invalid path or field not found - store None
-                # This matches CLI behavior (graceful degradation)
-                field_values[field_path] = None
-
         # Import formatter locally (not at module level)
         # This is the MCP service pattern to avoid circular imports
         from pflow.execution.formatters.field_output_formatter import format_field_output
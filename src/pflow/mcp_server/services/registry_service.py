@@ -6,8 +6,7 @@ All operations are stateless with fresh Registry instances.
 
 import logging
 
-from pflow.registry import Registry
-
+from ..utils.warm_state import get_registry
 from .base_service import BaseService, ensure_stateless
 
 logger = logging.getLogger(__name__)
@@ -37,7 +36,7 @@ class RegistryService(BaseService):
         from pflow.planning.context_builder import build_planning_context
 
         # Load registry
-        registry = Registry()  # Fresh instance
+        registry = get_registry()  # Fresh instance (snapshot-backed in warm mode)
         registry_metadata = registry.load()
 
         # Validate all node IDs exist
@@ -74,7 +73,7 @@ class RegistryService(BaseService):
         Returns:
             Formatted markdown string with nodes (grouped or filtered)
         """
-        registry = Registry()  # Fresh instance
+        registry = get_registry()  # Fresh instance (snapshot-backed in warm mode)
 
         # If filter provided, use search (relevance-sorted)
         if filter_pattern:
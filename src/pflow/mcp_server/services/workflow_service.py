@@ -6,8 +6,7 @@ All operations are stateless with fresh WorkflowManager instances.
 
 import logging
 
-from pflow.core.workflow_manager import WorkflowManager
-
+from ..utils.warm_state import get_workflow_manager
 from .base_service import BaseService, ensure_stateless
 
 logger = logging.getLogger(__name__)
@@ -33,7 +32,7 @@ class WorkflowService(BaseService):
         Returns:
             Formatted markdown string with workflow list
         """
-        manager = WorkflowManager()  # Fresh instance
+        manager = get_workflow_manager()  # Fresh instance (index-backed in warm mode)
         all_workflows = manager.list_all()
 
         # Track original count for better messaging
@@ -88,7 +87,7 @@ Found {total_count} total {plural}. Try:
         Raises:
             ValueError: If workflow not found (includes suggestions)
         """
-        manager = WorkflowManager()  # Fresh instance
+        manager = get_workflow_manager()  # Fresh instance (index-backed in warm mode)
 
         # Check if workflow exists
         if not manager.exists(name):
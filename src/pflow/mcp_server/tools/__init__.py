@@ -9,6 +9,7 @@ with the FastMCP server instance via decorators.
 from . import (
     discovery_tools,  # Phase 2: Discovery tools
     execution_tools,  # Phase 3: Execution tools
+    job_tools,  # Background workflow jobs
     registry_tools,  # Phase 4: Registry tools
     # settings_tools,  # Phase 4: Settings tools (DISABLED - code kept for future use)
     # test_tools,  # Phase 1: Test tools (DISABLED - development only)
@@ -21,6 +22,7 @@ from . import (
 __all__ = [
     "discovery_tools",
     "execution_tools",
+    "job_tools",
     "registry_tools",
     # "settings_tools",  # DISABLED
     # "test_tools",  # DISABLED
@@ -8,10 +8,12 @@ import asyncio
 import logging
 from typing import Annotated, Any
 
+from mcp.server.fastmcp import Context
 from pydantic import Field
 
 from ..server import mcp
 from ..services.execution_service import ExecutionService
+from ..utils.execution_manager import PRIORITY_HIGH, client_id_from_context, get_execution_manager
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,7 @@ async def workflow_execute(
         dict[str, Any] | None,
         Field(description="Input parameters as key-value pairs matching the workflow's declared inputs"),
     ] = None,
+    ctx: Context | None = None,
 ) -> str:
     """Execute a workflow with natural language output.
 
@@ -75,8 +78,8 @@ async def workflow_execute(
         """Synchronous execution operation."""
         return ExecutionService.execute_workflow(workflow, parameters)
 
-    # Run in thread pool to avoid blocking
-    result = await asyncio.to_thread(_sync_execute)
+    # Run through the execution manager (bounded workers, per-client limits, queueing)
+    result = await get_execution_manager().run(_sync_execute, client_id=client_id_from_context(ctx))
 
     # Log based on result content
     if result.startswith("✓"):
@@ -211,6 +214,7 @@ async def registry_run(
         dict[str, Any] | None,
         Field(description="Node-specific input parameters as key-value pairs"),
     ] = None,
+    ctx: Context | None = None,
 ) -> str:
     """Execute a single node with real data to test/discover its output structure and available template variables.
 
@@ -260,8 +264,8 @@ async def registry_run(
         """Synchronous node execution."""
         return ExecutionService.run_registry_node(node_type, parameters)
 
-    # Run in thread pool
-    result = await asyncio.to_thread(_sync_run)
+    # Single-node runs are short and interactive, so they jump ahead of queued workflows
+    result = await get_execution_manager().run(_sync_run, priority=PRIORITY_HIGH, client_id=client_id_from_context(ctx))
 
     logger.info(f"Node '{node_type}' execution completed, returning formatted output")
     return result
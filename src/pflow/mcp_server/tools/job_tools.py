@@ -0,0 +1,162 @@
+"""Asynchronous workflow job tools for the MCP server.
+
+These tools run workflows in the background so long workflows don't hit
+client timeouts: workflow_start returns a job ID immediately, and the agent
+polls with workflow_status / workflow_result or stops the run with
+workflow_cancel. Node-level progress is also pushed to the client as MCP
+log notifications (logger "pflow.workflow").
+"""
+
+import asyncio
+import logging
+from typing import Annotated, Any
+
+from mcp.server.fastmcp import Context
+from pydantic import Field
+
+from ..server import mcp
+from ..services.execution_service import ExecutionService
+from ..utils.execution_manager import client_id_from_context
+from ..utils.jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JobProgressOutput,
+    Notifier,
+    format_job_status,
+    get_job_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for workflow_result long-polling
+MAX_WAIT_SECONDS = 60.0
+
+
+def _make_notifier(ctx: Context | None) -> Notifier | None:
+    """Build a thread-safe notifier that sends progress as MCP log notifications."""
+    if ctx is None:
+        return None
+    try:
+        session = ctx.session
+    except Exception:
+        return None
+    loop = asyncio.get_running_loop()
+
+    def notify(payload: dict[str, Any]) -> None:
+        asyncio.run_coroutine_threadsafe(
+            session.send_log_message(level="info", data=payload, logger="pflow.workflow"),
+            loop,
+        )
+
+    return notify
+
+
+def _job_not_found(job_id: str) -> ValueError:
+    return ValueError(f"Job '{job_id}' not found. Jobs are kept in memory and lost when the server restarts.")
+
+
+@mcp.tool()
+async def workflow_start(
+    workflow: Annotated[
+        str | dict[str, Any],
+        Field(description="Workflow name from library, path to workflow file, or workflow IR object"),
+    ],
+    parameters: Annotated[
+        dict[str, Any] | None,
+        Field(description="Input parameters as key-value pairs matching the workflow's declared inputs"),
+    ] = None,
+    ctx: Context | None = None,
+) -> str:
+    """Start a workflow in the background and return a job ID immediately.
+
+    Same inputs as workflow_execute. Use this for long-running workflows so
+    you can keep working while it runs. Node progress is sent as log
+    notifications while the job runs.
+
+    Follow up with:
+    - workflow_status(job_id): current node, batch progress, elapsed time
+    - workflow_result(job_id, wait_seconds): final output (same text as workflow_execute)
+    - workflow_cancel(job_id): stop the job
+
+    Returns:
+        Job ID and next steps
+    """
+    registry = get_job_registry()
+    label = workflow if isinstance(workflow, str) and "\n" not in workflow else "<inline workflow>"
+
+    def run(output: JobProgressOutput) -> str:
+        return ExecutionService.execute_workflow(workflow, parameters, output=output)
+
+    job = registry.start(run, workflow_label=label, client_id=client_id_from_context(ctx), notifier=_make_notifier(ctx))
+    logger.info(f"Started workflow job {job.job_id} for {label}")
+
+    return (
+        f"Started job {job.job_id}\n\n"
+        f'Check progress with workflow_status(job_id="{job.job_id}") '
+        f'or wait for the output with workflow_result(job_id="{job.job_id}", wait_seconds=30).'
+    )
+
+
+@mcp.tool()
+async def workflow_status(
+    job_id: Annotated[str, Field(description="Job ID returned by workflow_start")],
+) -> str:
+    """Show the state of a background workflow job.
+
+    Returns:
+        Status (queued, running, completed, failed, cancelled), elapsed time,
+        current node and batch progress while running
+    """
+    job = get_job_registry().get(job_id)
+    if job is None:
+        raise _job_not_found(job_id)
+    return format_job_status(job)
+
+
+@mcp.tool()
+async def workflow_result(
+    job_id: Annotated[str, Field(description="Job ID returned by workflow_start")],
+    wait_seconds: Annotated[
+        float,
+        Field(description="Seconds to wait for the job to finish before returning (max 60)"),
+    ] = 0,
+) -> str:
+    """Get the output of a background workflow job.
+
+    Returns the same text as workflow_execute once the job has finished.
+    If the job is still running after wait_seconds, returns its status instead.
+
+    Returns:
+        Workflow output text, or current status if not finished
+    """
+    registry = get_job_registry()
+    timeout = max(0.0, min(float(wait_seconds), MAX_WAIT_SECONDS))
+    job = await asyncio.to_thread(registry.wait, job_id, timeout)
+    if job is None:
+        raise _job_not_found(job_id)
+
+    if job.status == JOB_COMPLETED:
+        return job.result or ""
+    if job.status == JOB_FAILED:
+        # Same contract as workflow_execute: failures surface as tool errors
+        raise RuntimeError(job.error or "Workflow execution failed")
+    return format_job_status(job)
+
+
+@mcp.tool()
+async def workflow_cancel(
+    job_id: Annotated[str, Field(description="Job ID returned by workflow_start")],
+) -> str:
+    """Cancel a background workflow job.
+
+    Queued jobs never start. A job that is already running is stopped:
+    in-flight shell commands and MCP calls are killed and no further nodes run.
+
+    Returns:
+        Final job status
+    """
+    job = get_job_registry().cancel(job_id)
+    if job is None:
+        raise _job_not_found(job_id)
+    logger.info(f"Cancel requested for workflow job {job_id} (status: {job.status})")
+    return format_job_status(job)
@@ -0,0 +1,279 @@
+"""Admission-controlled execution of blocking work for the MCP server.
+
+Tool handlers used to push every workflow run onto asyncio's default thread
+pool, so concurrent agents competed without limits or ordering. The
+ExecutionManager replaces that with:
+
+- A bounded pool of dedicated worker threads (one run per thread at a time,
+  so thread-keyed state like trace LLM interception stays per-run)
+- A priority queue (lower number runs first, FIFO within a priority)
+- Per-client concurrency limits so one agent can't starve the others
+- A bounded queue that rejects new work when full (admission control)
+- Cancellation of queued work, including when the MCP request is cancelled
+
+Configuration (environment variables, read when the manager is created;
+invalid values are logged and replaced by the default):
+- PFLOW_MCP_MAX_WORKERS: concurrent executions (default 4, at least 1)
+- PFLOW_MCP_MAX_PER_CLIENT: concurrent executions per client (default 2, at least 1)
+- PFLOW_MCP_MAX_QUEUE: queued executions before rejecting (default 32, at least 0)
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Priorities (lower runs first)
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PER_CLIENT = 2
+DEFAULT_MAX_QUEUE = 32
+
+# Client key used when the MCP session has no identifiable client
+ANONYMOUS_CLIENT = "anonymous"
+
+
+def _env_int(name: str, default: int, minimum: int) -> int:
+    """Read an integer setting, falling back to the default if invalid and clamping to the minimum."""
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={raw!r}, using {default}")
+        return default
+    if value < minimum:
+        logger.warning(f"{name}={value} is below {minimum}, using {minimum}")
+        return minimum
+    return value
+
+
+class ExecutionRejectedError(RuntimeError):
+    """Raised when the execution queue is full."""
+
+
+@dataclass(order=True)
+class _Job:
+    """A queued unit of work (ordered by priority, then submission order)."""
+
+    priority: int
+    sequence: int
+    client_id: str = field(compare=False)
+    func: Callable[[], Any] = field(compare=False)
+    future: "Future[Any]" = field(compare=False)
+
+
+class ExecutionManager:
+    """Bounded, priority-ordered, per-client-limited executor for blocking work.
+
+    Args:
+        max_workers: Maximum concurrent executions (default: PFLOW_MCP_MAX_WORKERS)
+        max_per_client: Maximum concurrent executions for a single client (default: PFLOW_MCP_MAX_PER_CLIENT)
+        max_queue: Maximum queued (not yet running) executions (default: PFLOW_MCP_MAX_QUEUE)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_per_client: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ) -> None:
+        if max_workers is None:
+            max_workers = _env_int("PFLOW_MCP_MAX_WORKERS", DEFAULT_MAX_WORKERS, minimum=1)
+        if max_per_client is None:
+            max_per_client = _env_int("PFLOW_MCP_MAX_PER_CLIENT", DEFAULT_MAX_PER_CLIENT, minimum=1)
+        if max_queue is None:
+            max_queue = _env_int("PFLOW_MCP_MAX_QUEUE", DEFAULT_MAX_QUEUE, minimum=0)
+        if max_workers < 1 or max_per_client < 1 or max_queue < 0:
+            raise ValueError("max_workers and max_per_client must be >= 1 and max_queue >= 0")
+
+        self.max_workers = max_workers
+        self.max_per_client = max_per_client
+        self.max_queue = max_queue
+
+        self._condition = threading.Condition()
+        self._queue: list[_Job] = []
+        self._sequence = itertools.count()
+        self._running_per_client: dict[str, int] = {}
+        self._running = 0
+        self._workers: list[threading.Thread] = []
+        self._shutdown = False
+
+    def submit(
+        self,
+        func: Callable[[], T],
+        priority: int = PRIORITY_NORMAL,
+        client_id: Optional[str] = None,
+    ) -> "Future[T]":
+        """Queue a callable for execution.
+
+        Args:
+            func: Blocking callable to run on a worker thread
+            priority: Lower values run first
+            client_id: Client the work belongs to (for per-client limits)
+
+        Returns:
+            Future resolved with the callable's result. Cancelling it before
+            the job starts removes it from the queue.
+
+        Raises:
+            ExecutionRejectedError: If the queue is full or the manager is shut down
+        """
+        future: Future[T] = Future()
+        job = _Job(priority, next(self._sequence), client_id or ANONYMOUS_CLIENT, func, future)
+
+        with self._condition:
+            if self._shutdown:
+                raise ExecutionRejectedError("Execution manager is shut down")
+            if len(self._queue) >= self.max_queue and not self._has_free_slot(job.client_id):
+                raise ExecutionRejectedError(
+                    f"Server busy: {self._running} executions running and {len(self._queue)} queued. Retry later."
+                )
+            self._queue.append(job)
+            self._ensure_workers()
+            self._condition.notify_all()
+
+        return future
+
+    async def run(
+        self,
+        func: Callable[[], T],
+        priority: int = PRIORITY_NORMAL,
+        client_id: Optional[str] = None,
+    ) -> T:
+        """Run a callable through the manager from async code.
+
+        If the awaiting task is cancelled while the job is still queued, the
+        job is dropped without running.
+        """
+        future = self.submit(func, priority=priority, client_id=client_id)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of current load (for logging and diagnostics)."""
+        with self._condition:
+            return {
+                "running": self._running,
+                "queued": len(self._queue),
+                "running_per_client": dict(self._running_per_client),
+                "max_workers": self.max_workers,
+                "max_per_client": self.max_per_client,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work, cancel queued jobs, and stop workers."""
+        with self._condition:
+            self._shutdown = True
+            for job in self._queue:
+                job.future.cancel()
+            self._queue.clear()
+            self._condition.notify_all()
+            workers = list(self._workers)
+
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def _has_free_slot(self, client_id: str) -> bool:
+        """Whether a job for this client could start immediately (caller holds lock)."""
+        return self._running < self.max_workers and self._running_per_client.get(client_id, 0) < self.max_per_client
+
+    def _ensure_workers(self) -> None:
+        """Start worker threads lazily up to max_workers (caller holds lock)."""
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"pflow-mcp-exec-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_eligible_job(self) -> Optional[_Job]:
+        """Pop the highest-priority job whose client is under its limit (caller holds lock)."""
+        # Drop jobs cancelled while queued
+        self._queue = [job for job in self._queue if not job.future.cancelled()]
+
+        eligible = [job for job in self._queue if self._running_per_client.get(job.client_id, 0) < self.max_per_client]
+        if not eligible:
+            return None
+        job = min(eligible)
+        self._queue.remove(job)
+        return job
+
+    def _worker_loop(self) -> None:
+        """Worker thread: take eligible jobs and run them until shutdown."""
+        while True:
+            with self._condition:
+                job = None
+                while not self._shutdown:
+                    job = self._next_eligible_job()
+                    if job is not None:
+                        break
+                    self._condition.wait()
+                if job is None:
+                    return
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                self._running += 1
+                self._running_per_client[job.client_id] = self._running_per_client.get(job.client_id, 0) + 1
+
+            try:
+                job.future.set_result(job.func())
+            except BaseException as e:  # Propagate everything to the awaiting caller
+                job.future.set_exception(e)
+            finally:
+                with self._condition:
+                    self._running -= 1
+                    remaining = self._running_per_client[job.client_id] - 1
+                    if remaining:
+                        self._running_per_client[job.client_id] = remaining
+                    else:
+                        del self._running_per_client[job.client_id]
+                    self._condition.notify_all()
+
+
+_manager: Optional[ExecutionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_execution_manager() -> ExecutionManager:
+    """Return the process-wide execution manager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ExecutionManager()
+        return _manager
+
+
+def client_id_from_context(ctx: Any) -> str:
+    """Derive a stable client key from an MCP request context.
+
+    Prefers the client-supplied ID from request metadata and falls back to
+    the session object identity (one stdio connection = one client).
+    """
+    if ctx is None:
+        return ANONYMOUS_CLIENT
+    try:
+        client_id = ctx.client_id
+        if client_id:
+            return str(client_id)
+        return f"session-{id(ctx.session)}"
+    except Exception:
+        return ANONYMOUS_CLIENT
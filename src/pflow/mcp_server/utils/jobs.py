@@ -0,0 +1,334 @@
+"""In-process registry of asynchronous workflow jobs for the MCP server.
+
+workflow_execute blocks until the workflow finishes, which breaks down for
+multi-minute workflows (client timeouts, blocked agents). Jobs let agents
+start a workflow, keep working, and poll for status and results.
+
+Each job runs through the ExecutionManager (same admission control as
+workflow_execute) and receives a JobProgressOutput, whose node callback is
+installed as ``__progress_callback__`` by the executor. Progress events are
+recorded on the job and optionally forwarded to a notifier (the MCP tool
+layer uses it to send log notifications to the client).
+
+Each job runs inside a cancellation scope, so cancelling a running job
+cancels its workflow run (see pflow.core.cancellation).
+"""
+
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from pflow.core.cancellation import CancellationToken, cancellation_scope
+
+from .execution_manager import ExecutionManager, get_execution_manager
+
+logger = logging.getLogger(__name__)
+
+# Job states
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINISHED_STATES = frozenset({JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED})
+
+# Keep at most this many finished jobs (oldest dropped first)
+MAX_FINISHED_JOBS = 100
+
+# Progress events retained per job
+MAX_PROGRESS_EVENTS = 200
+
+Notifier = Callable[[dict[str, Any]], None]
+
+
+@dataclass
+class WorkflowJob:
+    """State of one asynchronous workflow run."""
+
+    job_id: str
+    workflow_label: str
+    client_id: str
+    created_at: float = field(default_factory=time.time)
+    status: str = JOB_QUEUED
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    current_node: Optional[str] = None
+    nodes_completed: int = 0
+    batch_progress: Optional[tuple[int, int]] = None
+    events: deque = field(default_factory=lambda: deque(maxlen=MAX_PROGRESS_EVENTS))
+    result: Optional[str] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    future: Optional["Future[Any]"] = None
+
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job has reached a terminal state."""
+        return self.status in FINISHED_STATES
+
+    def elapsed_seconds(self) -> float:
+        """Seconds spent running (or waiting, if not started yet)."""
+        start = self.started_at or self.created_at
+        end = self.finished_at or time.time()
+        return end - start
+
+
+class JobProgressOutput:
+    """OutputInterface that records node progress on a job.
+
+    Only create_node_callback() does real work; the display methods are
+    no-ops because job output is read back through workflow_status.
+    """
+
+    def __init__(self, job: WorkflowJob, lock: threading.Lock, notifier: Optional[Notifier] = None) -> None:
+        self._job = job
+        self._lock = lock
+        self._notifier = notifier
+
+    def show_progress(self, message: str, is_error: bool = False) -> None:
+        """Discard progress message."""
+
+    def show_result(self, data: str) -> None:
+        """Discard result data."""
+
+    def show_error(self, title: str, details: Optional[str] = None) -> None:
+        """Discard error message."""
+
+    def show_success(self, message: str) -> None:
+        """Discard success message."""
+
+    def show_warning(self, message: str) -> None:
+        """Discard warning message."""
+
+    def is_interactive(self) -> bool:
+        """Jobs are never interactive."""
+        return False
+
+    def create_node_callback(self) -> Optional[Callable[..., None]]:
+        """Create the progress callback installed as ``__progress_callback__``."""
+        return self._on_progress
+
+    def _on_progress(
+        self,
+        node_id: str,
+        event: str,
+        duration_ms: Optional[float] = None,
+        depth: int = 0,
+        **kwargs: Any,
+    ) -> None:
+        """Record a progress event and forward it to the notifier."""
+        payload: dict[str, Any] = {
+            "job_id": self._job.job_id,
+            "node_id": node_id,
+            "event": event,
+            "depth": depth,
+        }
+        if duration_ms is not None:
+            payload["duration_ms"] = round(duration_ms, 1)
+
+        if event == "node_stream":
+            # Streamed text is forwarded live but not kept in the job's event log
+            payload["text"] = kwargs.get("text_chunk") or ""
+            self._notify(payload)
+            return
+
+        with self._lock:
+            if event == "node_start" and depth == 0:
+                self._job.current_node = node_id
+                self._job.batch_progress = None
+            elif event in ("node_complete", "node_cached") and depth == 0:
+                self._job.nodes_completed += 1
+                if kwargs.get("is_error"):
+                    payload["is_error"] = True
+            elif event == "batch_progress":
+                current, total = kwargs.get("batch_current"), kwargs.get("batch_total")
+                if current is not None and total is not None:
+                    self._job.batch_progress = (current, total)
+                    payload["batch_current"] = current
+                    payload["batch_total"] = total
+            self._job.events.append(payload)
+
+        self._notify(payload)
+
+    def _notify(self, payload: dict[str, Any]) -> None:
+        if self._notifier is not None:
+            try:
+                self._notifier(payload)
+            except Exception as e:
+                # Never let notification failures break execution
+                logger.debug(f"Failed to send progress notification for {self._job.job_id}: {e}")
+
+
+class JobRegistry:
+    """Thread-safe registry of workflow jobs.
+
+    Args:
+        max_finished: Finished jobs to retain for status/result lookups
+        manager: Execution manager to run jobs on (defaults to the process-wide one)
+    """
+
+    def __init__(self, max_finished: int = MAX_FINISHED_JOBS, manager: Optional[ExecutionManager] = None) -> None:
+        self._jobs: OrderedDict[str, WorkflowJob] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_finished = max_finished
+        self._manager = manager
+
+    def start(
+        self,
+        run: Callable[[JobProgressOutput], str],
+        workflow_label: str,
+        client_id: str,
+        notifier: Optional[Notifier] = None,
+    ) -> WorkflowJob:
+        """Create a job and queue it on the execution manager.
+
+        Args:
+            run: Callable executing the workflow with the given output; returns
+                result text and raises on failure (error text in the exception)
+            workflow_label: Human-readable workflow reference for status output
+            client_id: Client that owns the job (for admission control)
+            notifier: Optional sink for progress events
+
+        Returns:
+            The created job
+
+        Raises:
+            ExecutionRejectedError: If the execution queue is full
+        """
+        job = WorkflowJob(
+            job_id=f"job-{int(time.time())}-{secrets.token_hex(4)}", workflow_label=workflow_label, client_id=client_id
+        )
+        output = JobProgressOutput(job, self._lock, notifier)
+
+        def execute() -> None:
+            with self._lock:
+                if job.cancel_requested:
+                    return
+                job.status = JOB_RUNNING
+                job.started_at = time.time()
+            try:
+                with cancellation_scope(job.cancel_token):
+                    result = run(output)
+            except Exception as e:
+                self._finish(job, JOB_FAILED, error=str(e))
+            else:
+                self._finish(job, JOB_COMPLETED, result=result)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+        try:
+            manager = self._manager or get_execution_manager()
+            job.future = manager.submit(execute, client_id=client_id)
+        except Exception:
+            with self._lock:
+                del self._jobs[job.job_id]
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[WorkflowJob]:
+        """Look up a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[WorkflowJob]:
+        """Cancel a job.
+
+        Queued jobs are removed before they start. Running jobs are marked as
+        cancelled and their workflow run is cancelled: it stops before the next
+        node or batch item, and in-flight shell commands and MCP calls are
+        killed.
+
+        Returns:
+            The job, or None if not found
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return job
+            job.cancel_requested = True
+            was_queued = job.status == JOB_QUEUED
+
+        if was_queued and job.future is not None:
+            job.future.cancel()
+        job.cancel_token.cancel("cancelled by client")
+        self._finish(job, JOB_CANCELLED)
+        return job
+
+    def wait(self, job_id: str, timeout: float) -> Optional[WorkflowJob]:
+        """Wait up to timeout seconds for a job to finish."""
+        job = self.get(job_id)
+        if job is None or job.is_finished or job.future is None or timeout <= 0:
+            return job
+        deadline = time.monotonic() + timeout
+        while not job.is_finished and time.monotonic() < deadline:
+            time.sleep(min(0.1, max(0.0, deadline - time.monotonic())))
+        return job
+
+    def _finish(
+        self,
+        job: WorkflowJob,
+        status: str,
+        result: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Move a job to a terminal state (first terminal state wins)."""
+        with self._lock:
+            if job.is_finished:
+                return
+            if job.cancel_requested and status != JOB_CANCELLED:
+                status = JOB_CANCELLED
+                result = error = None
+            job.status = status
+            job.finished_at = time.time()
+            job.result = result
+            job.error = error
+            self._prune()
+
+    def _prune(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit (caller holds lock)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[: max(0, len(finished) - self._max_finished)]:
+            del self._jobs[job_id]
+
+
+_registry: Optional[JobRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_job_registry() -> JobRegistry:
+    """Return the process-wide job registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = JobRegistry()
+        return _registry
+
+
+def format_job_status(job: WorkflowJob) -> str:
+    """Format job state for agents (text, like other MCP tool output)."""
+    lines = [f"Job {job.job_id}: {job.status}", f"Workflow: {job.workflow_label}"]
+    lines.append(f"Elapsed: {job.elapsed_seconds():.1f}s")
+
+    if job.status == JOB_RUNNING:
+        if job.current_node:
+            lines.append(f"Current node: {job.current_node}")
+        if job.batch_progress:
+            current, total = job.batch_progress
+            lines.append(f"Batch progress: {current}/{total}")
+    if job.nodes_completed:
+        lines.append(f"Nodes completed: {job.nodes_completed}")
+
+    if job.status == JOB_QUEUED:
+        lines.append("\nWaiting for a free worker.")
+    elif job.is_finished:
+        lines.append("\nUse workflow_result to fetch the output.")
+    else:
+        lines.append("\nPoll again with workflow_status, or wait with workflow_result.")
+    return "\n".join(lines)
@@ -12,6 +12,8 @@ from pflow.core.markdown_parser import MarkdownParseError, parse_markdown
 from pflow.core.suggestion_utils import find_similar_items
 from pflow.core.workflow_manager import WorkflowManager
 
+from .warm_state import get_workflow_manager
+
 logger = logging.getLogger(__name__)
 
 
@@ -94,7 +96,7 @@ def _resolve_by_name(workflow: str) -> tuple[dict[str, Any] | None, str | None,
         Tuple of (workflow_ir, error_message, source)
     """
     # Try as saved workflow name
-    manager = WorkflowManager()
+    manager = get_workflow_manager()
     if manager.exists(workflow):
         logger.debug(f"Loading workflow from library: {workflow}")
         try:
@@ -133,7 +135,7 @@ def get_workflow_suggestions(query: str, manager: WorkflowManager | None = None)
         List of suggested workflow names
     """
     if manager is None:
-        manager = WorkflowManager()
+        manager = get_workflow_manager()
 
     try:
         all_workflows = manager.list_all()
@@ -0,0 +1,201 @@
+"""Opt-in warm state for long-lived MCP server processes.
+
+By default every tool call builds fresh Registry and WorkflowManager
+instances and re-reads everything from disk (the stateless pattern). In
+warm mode (``pflow mcp serve --warm`` or ``PFLOW_MCP_WARM=1``) the server
+process keeps in-memory snapshots that are reused across tool calls:
+
+- Registry snapshot: keyed by registry.json and settings.json fingerprints
+- Workflow index: parsed .pflow.md files keyed by per-file fingerprints
+- Validation results: keyed by IR content hash and registry fingerprint
+
+Fingerprints are (mtime_ns, size) pairs, so any write through the CLI, the
+MCP server, or a text editor invalidates the affected entry on the next call.
+
+Per-request isolation is preserved: callers receive copies of cached data,
+and compiled flows, shared stores and metrics collectors are never reused
+because nodes carry per-run state.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from pflow.core.workflow_manager import WorkflowManager
+from pflow.registry import Registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Environment variable that enables warm mode
+WARM_MODE_ENV_VAR = "PFLOW_MCP_WARM"
+
+# Maximum number of cached validation results
+MAX_VALIDATION_CACHE_ENTRIES = 256
+
+Fingerprint = Optional[tuple[int, int]]
+
+_warm_enabled = False
+
+
+def enable_warm_mode() -> None:
+    """Enable warm mode for this process."""
+    global _warm_enabled
+    _warm_enabled = True
+    logger.info("MCP server warm mode enabled")
+
+
+def is_warm_mode() -> bool:
+    """Check whether warm mode is enabled (flag or environment variable)."""
+    return _warm_enabled or os.environ.get(WARM_MODE_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def reset_warm_state() -> None:
+    """Drop all cached state and disable warm mode (used by tests)."""
+    global _warm_enabled
+    _warm_enabled = False
+    _registry_cache.clear()
+    _workflow_cache.clear()
+    _validation_cache.clear()
+
+
+def file_fingerprint(path: Path) -> Fingerprint:
+    """Return (mtime_ns, size) for a file, or None if it doesn't exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class FingerprintCache:
+    """Thread-safe cache whose entries are valid while their fingerprint matches.
+
+    Args:
+        max_entries: Optional bound; least recently used entries are dropped beyond it
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._entries: OrderedDict[Any, tuple[Any, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+
+    def get_or_compute(self, key: Any, fingerprint: Any, compute: Callable[[], T]) -> T:
+        """Return the cached value for key, recomputing if the fingerprint changed.
+
+        The compute function runs outside the lock so slow loads don't block
+        unrelated lookups; concurrent misses may compute the same value twice.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return entry[1]  # type: ignore[no-any-return]
+
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+            self._entries.move_to_end(key)
+            if self._max_entries is not None:
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_registry_cache = FingerprintCache()
+_workflow_cache = FingerprintCache()
+_validation_cache = FingerprintCache(max_entries=MAX_VALIDATION_CACHE_ENTRIES)
+
+
+class SnapshotRegistry(Registry):
+    """Registry that serves load() from the process-wide snapshot.
+
+    Writes (save, set_metadata, ...) go straight to disk and change the file
+    fingerprint, so the next load() picks them up.
+    """
+
+    def load(self, include_filtered: bool = False) -> dict[str, dict[str, Any]]:
+        """Load registry nodes, reusing the snapshot while files are unchanged."""
+        fingerprint = registry_fingerprint(self)
+        key = (str(self.registry_path), include_filtered)
+        nodes = _registry_cache.get_or_compute(
+            key, fingerprint, lambda: super(SnapshotRegistry, self).load(include_filtered)
+        )
+        # Shallow copy keeps callers from adding/removing entries in the snapshot
+        return dict(nodes)
+
+
+class IndexedWorkflowManager(WorkflowManager):
+    """WorkflowManager that reuses parsed workflow files across calls."""
+
+    def _read_workflow_file(self, file_path: Path, name: str) -> dict[str, Any]:
+        """Parse a workflow file, reusing the cached parse while the file is unchanged."""
+        fingerprint = file_fingerprint(file_path)
+        parsed = _workflow_cache.get_or_compute(
+            str(file_path),
+            fingerprint,
+            lambda: super(IndexedWorkflowManager, self)._read_workflow_file(file_path, name),
+        )
+        # Deep copy: callers mutate IR dicts (normalization, template injection)
+        return copy.deepcopy(parsed)
+
+
+def registry_fingerprint(registry: Registry) -> tuple[Fingerprint, Fingerprint]:
+    """Fingerprint a registry by its file and the settings that filter it."""
+    return (
+        file_fingerprint(registry.registry_path),
+        file_fingerprint(registry.settings_manager.settings_path),
+    )
+
+
+def get_registry() -> Registry:
+    """Return a Registry for one request (snapshot-backed in warm mode)."""
+    if is_warm_mode():
+        return SnapshotRegistry()
+    return Registry()
+
+
+def get_workflow_manager() -> WorkflowManager:
+    """Return a WorkflowManager for one request (index-backed in warm mode)."""
+    if is_warm_mode():
+        return IndexedWorkflowManager()
+    return WorkflowManager()
+
+
+def cached_validation(
+    workflow_ir: dict[str, Any],
+    registry: Registry,
+    validate: Callable[[], T],
+) -> T:
+    """Run a validation function, reusing the result for identical IR in warm mode.
+
+    Args:
+        workflow_ir: Normalized workflow IR being validated
+        registry: Registry used for validation (its files key the cache)
+        validate: Function that performs the validation
+
+    Returns:
+        Validation result (cached in warm mode)
+    """
+    if not is_warm_mode():
+        return validate()
+
+    ir_hash = hashlib.sha256(json.dumps(workflow_ir, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return _validation_cache.get_or_compute(ir_hash, registry_fingerprint(registry), validate)
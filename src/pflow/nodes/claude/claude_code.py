@@ -39,6 +39,8 @@ import os
 import re
 from typing import Any, Optional
 
+from pflow.core.cancellation import get_cancel_token, run_cancellable
+from pflow.core.concurrency import concurrency_slot
 from pflow.pocketflow import Node
 
 # Import Claude Agent SDK (renamed from Claude Code SDK)
@@ -392,6 +394,7 @@ class ClaudeCodeNode(Node):
             "resume": resume,
             "timeout": timeout,
             "sandbox": sandbox,
+            "cancel_token": get_cancel_token(shared),
         }
 
     def exec(self, prep_res: dict[str, Any]) -> dict[str, Any]:
@@ -408,8 +411,10 @@ class ClaudeCodeNode(Node):
         logger.info(f"Executing Claude Code node with model: {prep_res['model']}")
 
         # Run async code in sync context using asyncio.run()
-        # This creates a new event loop for each execution
-        result = asyncio.run(self._exec_async(prep_res), debug=False)
+        # This creates a new event loop for each execution; cancelling the run
+        # cancels the task, which stops the Claude Code subprocess
+        with concurrency_slot("llm:anthropic"):
+            result = run_cancellable(self._exec_async(prep_res), prep_res.get("cancel_token"))
 
         return result
 
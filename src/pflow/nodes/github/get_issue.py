@@ -3,6 +3,7 @@
 import json
 import subprocess
 import sys
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -11,6 +12,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
 
 from pflow.pocketflow import Node
 
+from .gh_client import ensure_gh_authenticated, get_issue_batcher
+
 
 class GetIssueNode(Node):
     """
@@ -48,16 +51,8 @@ class GetIssueNode(Node):
 
     def prep(self, shared: dict[str, Any]) -> dict[str, Any]:
         """Extract and validate inputs from shared store with parameter fallback."""
-        # Check authentication first
-        auth_result = subprocess.run(
-            ["gh", "auth", "status"],  # noqa: S607
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-
-        if auth_result.returncode != 0:
-            raise ValueError("GitHub CLI not authenticated. Please run 'gh auth login' to authenticate with GitHub.")
+        # Check authentication first (probed once per process, shared across nodes and batch items)
+        ensure_gh_authenticated()
 
         # Extract issue number from params
         issue_number = self.params.get("issue_number")
@@ -78,6 +73,15 @@ class GetIssueNode(Node):
 
     def exec(self, prep_res: dict[str, Any]) -> dict[str, Any]:
         """Execute GitHub CLI call - NO try/except blocks! Let exceptions bubble up."""
+        # Lookups from parallel batch items are coalesced into one gh api graphql call
+        issue_data = get_issue_batcher().fetch(
+            prep_res["repo"], prep_res["issue_number"], partial(self._view_issue, prep_res)
+        )
+
+        return {"issue_data": issue_data}
+
+    def _view_issue(self, prep_res: dict[str, Any]) -> dict[str, Any]:
+        """Fetch a single issue with gh issue view."""
         # Build command
         cmd = [
             "gh",
@@ -107,9 +111,8 @@ class GetIssueNode(Node):
             raise subprocess.CalledProcessError(result.returncode, cmd, output=result.stdout, stderr=result.stderr)
 
         # Parse JSON response
-        issue_data = json.loads(result.stdout)
-
-        return {"issue_data": issue_data}
+        issue_data: dict[str, Any] = json.loads(result.stdout)
+        return issue_data
 
     def post(self, shared: dict[str, Any], prep_res: dict[str, Any], exec_res: dict[str, Any]) -> str:
         """Store results in shared store."""
@@ -0,0 +1,265 @@
+"""Shared GitHub CLI access for the GitHub nodes.
+
+Every GitHub node used to run ``gh auth status`` in ``prep`` before its real
+``gh`` call, and ``github-get-issue`` spawned one ``gh issue view`` per issue.
+A 100-item batch over issues therefore spawned 200 processes. This module
+cuts that down:
+
+- Authentication is probed once per process and remembered for
+  ``AUTH_TTL_SECONDS`` (keyed on the gh token/host environment). Concurrent
+  callers share a single probe; failed probes are not remembered, so a
+  ``gh auth login`` takes effect immediately.
+- Issue lookups are coalesced. A lookup with no other lookup in flight for
+  the same repository runs ``gh issue view`` right away, as before. Lookups
+  that arrive while one is in flight (parallel batch items) queue up and are
+  then fetched together with a single ``gh api graphql`` call, returning the
+  same fields and shape as ``gh issue view --json``.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+# Seconds a successful ``gh auth status`` probe is trusted
+AUTH_TTL_SECONDS = 300.0
+
+# Environment variables that change which GitHub identity gh uses
+_AUTH_ENV_VARS = (
+    "GH_TOKEN",
+    "GITHUB_TOKEN",
+    "GH_ENTERPRISE_TOKEN",
+    "GITHUB_ENTERPRISE_TOKEN",
+    "GH_HOST",
+    "GH_CONFIG_DIR",
+)
+
+# Issues fetched per GraphQL query (each pulls up to 100 labels and assignees)
+MAX_ISSUES_PER_QUERY = 50
+
+_ISSUE_FIELDS = """
+fragment IssueFields on Issue {
+  number title body state createdAt updatedAt
+  author { __typename login ... on User { id name } ... on Bot { id } }
+  labels(first: 100) { nodes { id name description color } }
+  assignees(first: 100) { nodes { id login name } }
+}
+"""
+
+
+class _AuthProbe:
+    """Process-wide, TTL-cached ``gh auth status`` check."""
+
+    def __init__(self, ttl_seconds: float = AUTH_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._verified: dict[tuple[Optional[str], ...], float] = {}
+        self._lock = threading.Lock()
+
+    def ensure_authenticated(self) -> None:
+        """Raise ValueError unless gh is authenticated (probing at most once per TTL)."""
+        key = tuple(os.environ.get(name) for name in _AUTH_ENV_VARS)
+        # Held across the probe so concurrent batch items wait for one probe instead of each spawning gh
+        with self._lock:
+            verified_at = self._verified.get(key)
+            if verified_at is not None and time.monotonic() - verified_at < self.ttl_seconds:
+                return
+
+            auth_result = subprocess.run(
+                ["gh", "auth", "status"],  # noqa: S607
+                capture_output=True,
+                text=True,
+                timeout=10,
+            )
+            if auth_result.returncode != 0:
+                raise ValueError(
+                    "GitHub CLI not authenticated. Please run 'gh auth login' to authenticate with GitHub."
+                )
+            self._verified[key] = time.monotonic()
+
+    def reset(self) -> None:
+        """Forget all successful probes."""
+        with self._lock:
+            self._verified.clear()
+
+
+_auth_probe = _AuthProbe()
+
+
+def ensure_gh_authenticated() -> None:
+    """Check that the GitHub CLI is authenticated, reusing a recent successful check.
+
+    Raises:
+        ValueError: If ``gh auth status`` fails
+    """
+    _auth_probe.ensure_authenticated()
+
+
+def reset_gh_auth_cache() -> None:
+    """Forget cached authentication checks (e.g. after switching accounts)."""
+    _auth_probe.reset()
+
+
+@dataclass(eq=False)
+class _Lookup:
+    number: str
+    fetch_one: Callable[[], dict[str, Any]]
+    result: Optional[dict[str, Any]] = None
+    error: Optional[BaseException] = None
+    done: bool = False
+    # Set when this lookup's thread must run a queued batch (itself included)
+    batch: Optional[list["_Lookup"]] = None
+
+
+class IssueBatcher:
+    """Coalesces concurrent issue lookups per repository into GraphQL queries."""
+
+    def __init__(self, max_batch: int = MAX_ISSUES_PER_QUERY) -> None:
+        self.max_batch = max_batch
+        self._cond = threading.Condition()
+        self._busy: set[str] = set()
+        self._pending: dict[str, list[_Lookup]] = {}
+
+    def fetch(self, repo: Optional[str], number: str, fetch_one: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """Fetch one issue, batching with lookups that queue up behind an in-flight one.
+
+        Args:
+            repo: Repository in owner/repo format (None for the current repository)
+            number: Issue number
+            fetch_one: Fetches this issue alone (used when no batching happens)
+
+        Returns:
+            Issue data in ``gh issue view --json`` shape
+        """
+        if not number.isdigit():
+            return fetch_one()
+
+        key = repo or ""
+        lookup = _Lookup(number, fetch_one)
+        with self._cond:
+            if key in self._busy:
+                self._pending.setdefault(key, []).append(lookup)
+                self._cond.wait_for(lambda: lookup.done or lookup.batch is not None)
+                batch = lookup.batch
+            else:
+                self._busy.add(key)
+                batch = [lookup]
+
+        if batch is not None:
+            try:
+                self._run(repo, batch)
+            finally:
+                self._hand_off(key)
+
+        if lookup.error is not None:
+            raise lookup.error
+        return lookup.result  # type: ignore[return-value]
+
+    def _hand_off(self, key: str) -> None:
+        """Pass the queued lookups for ``key`` to one of their threads, or mark the repo idle."""
+        with self._cond:
+            pending = self._pending.get(key)
+            if not pending:
+                self._pending.pop(key, None)
+                self._busy.discard(key)
+            else:
+                batch, self._pending[key] = pending[: self.max_batch], pending[self.max_batch :]
+                batch[0].batch = batch
+            self._cond.notify_all()
+
+    def _run(self, repo: Optional[str], batch: list[_Lookup]) -> None:
+        try:
+            if len(batch) == 1:
+                batch[0].result = batch[0].fetch_one()
+            else:
+                self._fetch_many(repo, batch)
+        except BaseException as e:
+            for lookup in batch:
+                if not lookup.done:
+                    lookup.error = e
+        finally:
+            with self._cond:
+                for lookup in batch:
+                    lookup.done = True
+
+    def _fetch_many(self, repo: Optional[str], batch: list[_Lookup]) -> None:
+        aliases = "\n".join(
+            f"i{i}: issue(number: {lookup.number}) {{ ...IssueFields }}" for i, lookup in enumerate(batch)
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            f"  repository(owner: $owner, name: $name) {{\n{aliases}\n  }}\n}}\n{_ISSUE_FIELDS}"
+        )
+        cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+        if repo:
+            owner, name = repo.split("/", 1)
+            cmd += ["-f", f"owner={owner}", "-f", f"name={name}"]
+        else:
+            # gh resolves {owner}/{repo} from the current directory, like gh issue view without --repo.
+            # It only fills placeholders in -F/--field values, not in -f/--raw-field ones
+            cmd += ["-F", "owner={owner}", "-F", "name={repo}"]
+
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            shell=False,
+            timeout=60,
+        )
+
+        # gh exits non-zero when any alias failed but still prints the partial data
+        try:
+            response = json.loads(result.stdout)
+        except json.JSONDecodeError:
+            response = None
+        if not isinstance(response, dict):
+            response = {}
+        repository = (response.get("data") or {}).get("repository")
+        if repository is None:
+            raise subprocess.CalledProcessError(result.returncode or 1, cmd, output=result.stdout, stderr=result.stderr)
+
+        errors = {
+            str(error["path"][-1]): error.get("message", "")
+            for error in response.get("errors") or []
+            if error.get("path")
+        }
+        for i, lookup in enumerate(batch):
+            issue = repository.get(f"i{i}")
+            if issue is None:
+                message = errors.get(f"i{i}") or f"Could not resolve to an Issue with the number of {lookup.number}."
+                lookup.error = subprocess.CalledProcessError(1, cmd, output="", stderr=message)
+            else:
+                lookup.result = _to_issue_view(issue)
+
+
+def _to_issue_view(issue: dict[str, Any]) -> dict[str, Any]:
+    """Convert a GraphQL issue to the ``gh issue view --json`` shape."""
+    author = issue.get("author")
+    if author is not None:
+        author = {
+            "id": author.get("id", ""),
+            "is_bot": author.get("__typename") == "Bot",
+            "login": author.get("login", ""),
+            "name": author.get("name", ""),
+        }
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "body": issue["body"],
+        "state": issue["state"],
+        "author": author,
+        "labels": issue["labels"]["nodes"],
+        "assignees": issue["assignees"]["nodes"],
+        "createdAt": issue["createdAt"],
+        "updatedAt": issue["updatedAt"],
+    }
+
+
+_issue_batcher = IssueBatcher()
+
+
+def get_issue_batcher() -> IssueBatcher:
+    """Return the process-wide issue batcher."""
+    return _issue_batcher
@@ -11,6 +11,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
 
 from pflow.pocketflow import Node
 
+from .gh_client import ensure_gh_authenticated
+
 
 class ListPrsNode(Node):
     """
@@ -46,16 +48,8 @@ class ListPrsNode(Node):
 
     def prep(self, shared: dict[str, Any]) -> dict[str, Any]:
         """Extract and validate inputs from shared store with parameter fallback."""
-        # Check authentication first
-        auth_result = subprocess.run(
-            ["gh", "auth", "status"],  # noqa: S607
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-
-        if auth_result.returncode != 0:
-            raise ValueError("GitHub CLI not authenticated. Please run 'gh auth login' to authenticate with GitHub.")
+        # Check authentication first (probed once per process, shared across nodes and batch items)
+        ensure_gh_authenticated()
 
         # Extract repo from params (gh CLI uses current repo if None)
         repo = self.params.get("repo")
@@ -6,8 +6,13 @@ from typing import Any
 
 import requests
 
+from pflow.core.cancellation import get_cancel_token
+from pflow.core.circuit_breaker import get_circuit_breakers, guarded_call
+from pflow.core.concurrency import concurrency_slot, http_pool
 from pflow.pocketflow import Node
 
+from .session_pool import CREDENTIAL_HEADERS, get_session_pool
+
 
 class HttpNode(Node):
     """
@@ -109,21 +114,49 @@ class HttpNode(Node):
             "headers": headers,
             "params": params,
             "timeout": timeout,
+            # Parallel batches publish their concurrency so the connection pool can match it
+            "pool_size": shared.get("__batch_concurrency__"),
+            "cancel_token": get_cancel_token(shared),
+            "circuit_breakers": get_circuit_breakers(shared),
         }
 
     def exec(self, prep_res: dict[str, Any]) -> dict[str, Any]:
         """Execute HTTP request - NO try/except! Let exceptions bubble up."""
-        # Make the request - NO try/except! Let exceptions bubble up for retry mechanism
-        response = requests.request(
-            method=prep_res["method"],
-            url=prep_res["url"],
+        # Reuse a keep-alive session per host and credentials (avoids a TLS handshake per request)
+        credential_headers = CREDENTIAL_HEADERS
+        if self.params.get("api_key"):
+            credential_headers = credential_headers | {self.params.get("api_key_header", "X-API-Key").lower()}
+        session = get_session_pool().get_session(
+            prep_res["url"],
             headers=prep_res.get("headers"),
-            json=prep_res.get("body") if isinstance(prep_res.get("body"), dict) else None,
-            data=prep_res.get("body") if isinstance(prep_res.get("body"), str) else None,
-            params=prep_res.get("params"),
-            timeout=prep_res["timeout"],
+            credential_headers=credential_headers,
+            pool_size=prep_res.get("pool_size"),
         )
 
+        cancel_token = prep_res.get("cancel_token")
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+        # Make the request - NO try/except! Let exceptions bubble up for retry mechanism
+        pool = http_pool(prep_res["url"])
+        with guarded_call(pool, prep_res.get("circuit_breakers")) as call, concurrency_slot(pool):
+            response = session.request(
+                method=prep_res["method"],
+                url=prep_res["url"],
+                headers=prep_res.get("headers"),
+                json=prep_res.get("body") if isinstance(prep_res.get("body"), dict) else None,
+                data=prep_res.get("body") if isinstance(prep_res.get("body"), str) else None,
+                params=prep_res.get("params"),
+                timeout=prep_res["timeout"],
+            )
+            # Overload and server errors mean the host is struggling; other statuses mean it answered
+            if response.status_code >= 500 or response.status_code == 429:
+                call.failed(f"HTTP {response.status_code}")
+
+        # A request can't be interrupted mid-flight; drop its response if the run was cancelled meanwhile
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
         # Parse response based on Content-Type (handle various JSON content types)
         content_type = response.headers.get("content-type", "").lower()
 
@@ -0,0 +1,132 @@
+"""Process-wide pool of HTTP sessions for the HTTP node.
+
+Module-level ``requests.request()`` builds a throwaway Session per call, so
+every request pays a fresh TCP + TLS handshake. A parallel batch of 1,000
+items against one API host spends much of its time there. This pool keeps
+one keep-alive Session per (scheme, host, credentials) and reuses its
+connections across requests, nodes and batch threads.
+
+Sessions are isolated by credentials so different tokens never share a
+session, and cookies are not persisted so pooled sessions carry no state
+between requests (matching the stateless behavior of ``requests.request()``).
+
+Configuration (environment variables):
+- PFLOW_HTTP_POOL_SIZE: connections kept per host (default 10)
+- PFLOW_HTTP_MAX_POOL_SIZE: upper bound when batches ask for more (default 100)
+"""
+
+import hashlib
+import os
+import threading
+from collections.abc import Mapping
+from http.cookiejar import DefaultCookiePolicy
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_SIZE = int(os.environ.get("PFLOW_HTTP_POOL_SIZE", "10"))
+MAX_POOL_SIZE = int(os.environ.get("PFLOW_HTTP_MAX_POOL_SIZE", "100"))
+
+# Headers that identify the caller; sessions are never shared across them
+CREDENTIAL_HEADERS = frozenset({"authorization", "proxy-authorization", "cookie"})
+
+
+class HttpSessionPool:
+    """Thread-safe registry of pooled ``requests`` sessions.
+
+    Args:
+        pool_size: Connections kept per host for new sessions
+        max_pool_size: Upper bound for pool sizes requested by callers
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_pool_size: int = MAX_POOL_SIZE) -> None:
+        self.pool_size = max(1, pool_size)
+        self.max_pool_size = max(self.pool_size, max_pool_size)
+        self._sessions: dict[tuple[str, str, str], tuple[requests.Session, int]] = {}
+        self._lock = threading.Lock()
+
+    def get_session(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        credential_headers: frozenset[str] = CREDENTIAL_HEADERS,
+        pool_size: Optional[int] = None,
+    ) -> requests.Session:
+        """Return the shared session for a URL's host and credentials.
+
+        Args:
+            url: Request URL (scheme and host select the session)
+            headers: Request headers (credential headers select the session)
+            credential_headers: Lower-cased header names treated as credentials
+            pool_size: Expected concurrency (e.g. batch max_concurrent); the
+                session's pool grows to fit it, up to max_pool_size
+
+        Returns:
+            A keep-alive session; pass per-request headers to ``session.request``
+        """
+        key = (*self._origin(url), self._credential_key(headers, credential_headers))
+        wanted = min(max(pool_size or 0, self.pool_size), self.max_pool_size)
+
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is not None and entry[1] >= wanted:
+                return entry[0]
+            # Existing sessions grow in place: in-flight requests on the old
+            # adapter finish normally and its idle connections are dropped.
+            session = self._new_session() if entry is None else entry[0]
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=wanted)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._sessions[key] = (session, wanted)
+            return session
+
+    def close(self) -> None:
+        """Close all pooled sessions and their connections."""
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        session = requests.Session()
+        # Don't persist cookies: pooled sessions are shared by unrelated requests
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    @staticmethod
+    def _origin(url: str) -> tuple[str, str]:
+        parts = urlsplit(url)
+        return parts.scheme.lower(), parts.netloc.lower()
+
+    @staticmethod
+    def _credential_key(headers: Optional[Mapping[str, str]], credential_headers: frozenset[str]) -> str:
+        if not headers:
+            return ""
+        credentials = sorted(
+            f"{name.lower()}:{value}" for name, value in headers.items() if name.lower() in credential_headers
+        )
+        if not credentials:
+            return ""
+        # Hash so raw tokens aren't kept as dict keys
+        return hashlib.sha256("\n".join(credentials).encode()).hexdigest()
+
+
+_pool: Optional[HttpSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> HttpSessionPool:
+    """Return the process-wide session pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpSessionPool()
+        return _pool
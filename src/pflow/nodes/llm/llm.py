@@ -1,6 +1,8 @@
 """General-purpose LLM node for text processing."""
 
+import contextlib
 import sys
+import time
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +11,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent))
 
 import llm
 
+from pflow.core.cancellation import get_cancel_token
+from pflow.core.circuit_breaker import CircuitOpenError, get_circuit_breakers, guarded_call
+from pflow.core.concurrency import concurrency_slot, llm_pool
 from pflow.pocketflow import Node
 
 
@@ -30,9 +35,12 @@ class LLMNode(Node):
         - total_tokens: int  # Total tokens (input + output)
         - cache_creation_input_tokens: int  # Tokens used for cache creation
         - cache_read_input_tokens: int  # Tokens read from cache
+        - time_to_first_token_ms: float  # Latency until the first streamed chunk (stream: true only)
+        - tokens_per_second: float  # Output tokens per second after the first chunk (stream: true only)
     - Params: model: str  # Model to use (optional - always use smart default unless user requests specific model)
     - Params: temperature: float  # Sampling temperature (default: 1.0)
     - Params: max_tokens: int  # Max response tokens (optional)
+    - Params: stream: bool  # Stream the response to progress output as it is generated (default: false)
     - Actions: default (always)
     """
 
@@ -134,14 +142,33 @@ class LLMNode(Node):
             "system": system,
             "max_tokens": self.params.get("max_tokens"),
             "attachments": attachments,
+            "stream": bool(self.params.get("stream", False)),
+            # Set per node by the runtime; None outside instrumented execution
+            "on_chunk": shared.get("__stream_callback__"),
+            # Set by batch nodes with submit: provider (collect, then replay)
+            "provider_batch": shared.get("__llm_provider_batch__"),
+            # Set by batch nodes with pack: K (collect, then replay)
+            "pack": shared.get("__llm_pack__"),
+            "batch_index": shared.get("__index__"),
+            # Set by the runtime; streams stop reading once the run is cancelled
+            "cancel_token": get_cancel_token(shared),
+            "circuit_breakers": get_circuit_breakers(shared),
         }
 
     def exec(self, prep_res: dict[str, Any]) -> dict[str, Any]:
         """Execute LLM call - NO try/except blocks! Let exceptions bubble up."""
+        if prep_res.get("provider_batch") is not None:
+            return self._exec_provider_batch(prep_res)
+        if prep_res.get("pack") is not None:
+            packed = self._exec_packed(prep_res)
+            if packed is not None:
+                return packed
+
         # Use llm library directly - NO try/except! Let exceptions bubble up
         model = llm.get_model(prep_res["model"])
 
-        kwargs = {"stream": False, "temperature": prep_res["temperature"]}
+        stream = prep_res.get("stream", False)
+        kwargs = {"stream": stream, "temperature": prep_res["temperature"]}
 
         # Only add optional parameters if not None
         if prep_res["system"] is not None:
@@ -153,14 +180,29 @@ class LLMNode(Node):
         if prep_res["attachments"]:
             kwargs["attachments"] = prep_res["attachments"]
 
-        # Let exceptions bubble up for retry mechanism
-        response = model.prompt(prep_res["prompt"], **kwargs)
+        cancel_token = prep_res.get("cancel_token")
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+        # Fail fast while the model keeps failing; hold a provider slot while the call is in flight
+        breakers = prep_res.get("circuit_breakers")
+        with guarded_call(f"llm:{prep_res['model']}", breakers), concurrency_slot(llm_pool(prep_res["model"])):
+            # Let exceptions bubble up for retry mechanism
+            started = time.perf_counter()
+            response = model.prompt(prep_res["prompt"], **kwargs)
+
+            if stream:
+                return self._consume_stream(response, prep_res, started)
+
+            # CRITICAL: Force evaluation with text()
+            text = response.text()
 
-        # CRITICAL: Force evaluation with text()
-        text = response.text()
+            # Capture usage data (may return None)
+            usage_obj = response.usage()
 
-        # Capture usage data (may return None)
-        usage_obj = response.usage()
+        # A request can't be interrupted mid-flight; drop its result if the run was cancelled meanwhile
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
 
         return {
             "response": text,
@@ -168,6 +210,92 @@ class LLMNode(Node):
             "model": prep_res["model"],
         }
 
+    @staticmethod
+    def _exec_provider_batch(prep_res: dict[str, Any]) -> dict[str, Any]:
+        """Record the request for a provider batch job, or return the job's result for this item."""
+        provider_batch = prep_res["provider_batch"]
+        if prep_res["attachments"]:
+            raise ValueError("Images are not supported with batch submit: provider")
+
+        if provider_batch.collecting:
+            provider_batch.add_request(
+                prep_res["batch_index"],
+                {
+                    "model": prep_res["model"],
+                    "prompt": prep_res["prompt"],
+                    "system": prep_res["system"],
+                    "temperature": prep_res["temperature"],
+                    "max_tokens": prep_res["max_tokens"],
+                },
+            )
+            return {"response": "", "usage": None, "model": prep_res["model"]}
+
+        result = provider_batch.get_result(prep_res["batch_index"])
+        if result["error"]:
+            # Provider-side failures are final; retrying the replay can't change them
+            return {"status": "error", "error": result["error"], "model": prep_res["model"]}
+        return {
+            "response": result["text"],
+            "usage": result["usage"],
+            "model": prep_res["model"],
+            "provider_batch": True,
+        }
+
+    @staticmethod
+    def _exec_packed(prep_res: dict[str, Any]) -> dict[str, Any] | None:
+        """Record the request for a packed call, or return this item's packed answer.
+
+        Returns None when the item has no packed answer and must call the model itself.
+        """
+        pack = prep_res["pack"]
+        if pack.collecting:
+            # Items with images can't be packed; they make their own call on replay
+            if not prep_res["attachments"]:
+                pack.add_request(
+                    prep_res["batch_index"],
+                    {
+                        "model": prep_res["model"],
+                        "prompt": prep_res["prompt"],
+                        "system": prep_res["system"],
+                        "temperature": prep_res["temperature"],
+                        "max_tokens": prep_res["max_tokens"],
+                    },
+                )
+            return {"response": "", "usage": None, "model": prep_res["model"]}
+
+        answer = pack.get_answer(prep_res["batch_index"])
+        if answer is None:
+            return None
+        return {"response": answer["text"], "usage": answer["usage"], "model": prep_res["model"], "packed": True}
+
+    @staticmethod
+    def _consume_stream(response: Any, prep_res: dict[str, Any], started: float) -> dict[str, Any]:
+        """Iterate a streaming response, forwarding chunks and timing the first token."""
+        on_chunk = prep_res.get("on_chunk")
+        cancel_token = prep_res.get("cancel_token")
+        chunks: list[str] = []
+        first_chunk_at = None
+        for chunk in response:
+            if cancel_token is not None:
+                # Stop reading (and generating) as soon as the run is cancelled
+                cancel_token.raise_if_cancelled()
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+            chunks.append(chunk)
+            if on_chunk is not None:
+                # Display is best-effort; it must never fail the LLM call
+                with contextlib.suppress(Exception):
+                    on_chunk(chunk)
+        finished = time.perf_counter()
+
+        return {
+            "response": "".join(chunks),
+            "usage": response.usage(),
+            "model": prep_res["model"],
+            "time_to_first_token_ms": None if first_chunk_at is None else (first_chunk_at - started) * 1000,
+            "generation_seconds": None if first_chunk_at is None else finished - first_chunk_at,
+        }
+
     def post(self, shared: dict[str, Any], prep_res: dict[str, Any], exec_res: dict[str, Any]) -> str:
         """Store results in shared store."""
         # Check for error first
@@ -214,12 +342,28 @@ class LLMNode(Node):
                 "cache_creation_input_tokens": cache_creation,
                 "cache_read_input_tokens": cache_read,
             }
+            self._add_stream_timing(shared["llm_usage"], exec_res)
+            if exec_res.get("provider_batch"):
+                shared["llm_usage"]["provider_batch"] = True
+            if exec_res.get("packed"):
+                shared["llm_usage"]["packed"] = True
         else:
             # Empty dict per spec when usage unavailable
             shared["llm_usage"] = {}
 
         return "default"  # Always return "default"
 
+    @staticmethod
+    def _add_stream_timing(usage: dict[str, Any], exec_res: dict[str, Any]) -> None:
+        """Add time-to-first-token and throughput for streamed responses."""
+        ttft_ms = exec_res.get("time_to_first_token_ms")
+        if ttft_ms is None:
+            return
+        usage["time_to_first_token_ms"] = round(ttft_ms, 2)
+        generation_seconds = exec_res.get("generation_seconds") or 0
+        if generation_seconds > 0 and usage["output_tokens"]:
+            usage["tokens_per_second"] = round(usage["output_tokens"] / generation_seconds, 2)
+
     def exec_fallback(self, prep_res: dict[str, Any], exc: Exception) -> dict[str, Any]:
         """Handle errors after all retries exhausted."""
         # Enhanced error messages
@@ -239,6 +383,8 @@ class LLMNode(Node):
                 )
             else:
                 error_detail = f"Unknown model: {prep_res['model']}. Run 'llm models' to see available models."
+        elif isinstance(exc, CircuitOpenError):
+            error_detail = f"LLM call skipped. Model: {prep_res['model']}. Error: {error_msg}"
         elif exc_type == "NeedsKeyException" or "NeedsKeyException" in error_msg:
             error_detail = (
                 f"API key required for model: {prep_res['model']}. "
@@ -7,6 +7,9 @@ import os
 from pathlib import Path
 from typing import Any, Optional
 
+from pflow.core.cancellation import get_cancel_token, run_cancellable
+from pflow.core.circuit_breaker import get_circuit_breakers, guarded_call
+from pflow.core.concurrency import concurrency_slot
 from pflow.mcp.auth_utils import build_auth_headers, expand_env_vars_nested
 from pflow.pocketflow import Node
 
@@ -165,7 +168,15 @@ class MCPNode(Node):
         verbose = shared.get("__verbose__", False)
         logger.debug(f"MCP Node prep: verbose={verbose}, __verbose__ in shared={shared.get('__verbose__')}")
 
-        return {"server": server, "tool": tool, "config": config, "arguments": tool_args, "verbose": verbose}
+        return {
+            "server": server,
+            "tool": tool,
+            "config": config,
+            "arguments": tool_args,
+            "verbose": verbose,
+            "cancel_token": get_cancel_token(shared),
+            "circuit_breakers": get_circuit_breakers(shared),
+        }
 
     def exec(self, prep_res: dict) -> dict:
         """Execute MCP tool using async-to-sync wrapper.
@@ -183,8 +194,11 @@ class MCPNode(Node):
 
         # NO try/except here - let exceptions bubble up for PocketFlow retry mechanism!
         # Run async code in sync context using asyncio.run()
-        # This creates a new event loop for each execution
-        result = asyncio.run(self._exec_async(prep_res), debug=False)
+        # This creates a new event loop for each execution; cancelling the run
+        # cancels the task, which shuts down a stdio server process
+        server_key = f"mcp:{prep_res['server']}"
+        with guarded_call(server_key, prep_res.get("circuit_breakers")), concurrency_slot(server_key):
+            result = run_cancellable(self._exec_async(prep_res), prep_res.get("cancel_token"))
         return result
 
     async def _exec_async(self, prep_res: dict) -> dict:
@@ -0,0 +1,97 @@
+"""Per-thread stdout/stderr capture for in-process code execution.
+
+``contextlib.redirect_stdout`` swaps the process-global ``sys.stdout``, so
+code nodes running in parallel batch threads interleave, steal each other's
+output, and can leave the CLI's own stream pointing at a finished node's
+buffer. Instead, while any capture is active, ``sys.stdout``/``sys.stderr``
+are replaced by routing proxies: writes from a capturing thread go to that
+thread's buffers, writes from every other thread go to the original stream.
+The proxies are removed again when the last capture ends.
+
+Output from threads spawned by user code is not captured (it goes to the
+original stream), matching what a thread-local mechanism can see.
+"""
+
+import io
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Optional, TextIO
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_active_captures = 0
+
+
+class _ThreadRoutedStream:
+    """File-like proxy that routes writes to the current thread's capture buffer."""
+
+    def __init__(self, name: str, original: TextIO) -> None:
+        self._name = name
+        self._original = original
+
+    def _target(self) -> Any:
+        buffers: Optional[dict[str, io.StringIO]] = getattr(_local, "buffers", None)
+        if buffers is not None:
+            return buffers[self._name]
+        return self._original
+
+    def write(self, s: str) -> int:
+        result: int = self._target().write(s)
+        return result
+
+    def writelines(self, lines: Any) -> None:
+        self._target().writelines(lines)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, attr: str) -> Any:
+        # encoding, isatty, fileno, buffer, ... from whichever stream is active
+        return getattr(self._target(), attr)
+
+
+def _install() -> None:
+    """Install routing proxies (caller holds _install_lock)."""
+    if not isinstance(sys.stdout, _ThreadRoutedStream):
+        sys.stdout = _ThreadRoutedStream("stdout", sys.stdout)
+    if not isinstance(sys.stderr, _ThreadRoutedStream):
+        sys.stderr = _ThreadRoutedStream("stderr", sys.stderr)
+
+
+def _uninstall() -> None:
+    """Restore the original streams if our proxies are still in place (caller holds _install_lock)."""
+    if isinstance(sys.stdout, _ThreadRoutedStream):
+        sys.stdout = sys.stdout._original
+    if isinstance(sys.stderr, _ThreadRoutedStream):
+        sys.stderr = sys.stderr._original
+
+
+@contextmanager
+def capture_output() -> Iterator[tuple[io.StringIO, io.StringIO]]:
+    """Capture stdout/stderr written by the current thread.
+
+    Safe to use from many threads at once; each thread only sees its own
+    output and other threads keep writing to the real streams.
+
+    Yields:
+        (stdout_buffer, stderr_buffer)
+    """
+    global _active_captures
+    stdout_buf = io.StringIO()
+    stderr_buf = io.StringIO()
+    previous = getattr(_local, "buffers", None)
+
+    with _install_lock:
+        _install()
+        _active_captures += 1
+    _local.buffers = {"stdout": stdout_buf, "stderr": stderr_buf}
+    try:
+        yield stdout_buf, stderr_buf
+    finally:
+        _local.buffers = previous
+        with _install_lock:
+            _active_captures -= 1
+            if _active_captures == 0:
+                _uninstall()
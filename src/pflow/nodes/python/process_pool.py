@@ -0,0 +1,289 @@
+"""Warm worker-process pool for process-isolated code nodes.
+
+The default code node runs user code with exec() in a helper thread, so a
+parallel batch of CPU-bound items is serialized by the GIL, and code that
+times out keeps running as a zombie thread. With ``isolation: process``
+the code runs in one of these worker processes instead:
+
+- Workers are started once (forkserver where available) and reused, so
+  imports done by user code stay warm across items and runs
+- Each call checks out a whole worker, so parallel batch threads fan out
+  across cores
+- Timeouts are enforced by killing the worker; a replacement is started on
+  the next call
+- Messages use pickle protocol 5; buffer-protocol objects (bytearray,
+  NumPy arrays, ...) travel as out-of-band frames instead of being copied
+  into the pickle stream
+
+Configuration (environment variables):
+- PFLOW_CODE_MAX_PROCESSES: worker processes (default: CPU count)
+"""
+
+import atexit
+import io
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from functools import lru_cache
+from multiprocessing.connection import Connection
+from typing import Any, Optional
+
+DEFAULT_MAX_PROCESSES = int(os.environ.get("PFLOW_CODE_MAX_PROCESSES", "0")) or (os.cpu_count() or 4)
+
+# Attribute carrying the user-code line number on exceptions from workers
+# (tracebacks don't survive pickling)
+CODE_LINENO_ATTR = "_pflow_code_lineno"
+
+# NameError.name lives in a slot that pickling drops; it is shipped separately
+_NAME_ATTR = "_pflow_exc_name"
+
+_HEADER_BYTES = 4
+
+# Code objects kept per worker (batches send the same code for every item)
+_WORKER_CODE_CACHE_SIZE = 256
+
+
+def _dumps(obj: Any) -> list[Any]:
+    """Serialize obj into frames: header (buffer count + pickle), then out-of-band buffers."""
+    buffers: list[pickle.PickleBuffer] = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    header = len(buffers).to_bytes(_HEADER_BYTES, "little") + payload
+    return [header, *(buffer.raw() for buffer in buffers)]
+
+
+def _send_frames(conn: Connection, frames: list[Any]) -> None:
+    for frame in frames:
+        conn.send_bytes(frame)
+
+
+def _recv(conn: Connection) -> Any:
+    header = conn.recv_bytes()
+    count = int.from_bytes(header[:_HEADER_BYTES], "little")
+    buffers = [conn.recv_bytes() for _ in range(count)]
+    return pickle.loads(memoryview(header)[_HEADER_BYTES:], buffers=buffers)  # noqa: S301
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+
+def _code_lineno(exc: BaseException) -> Optional[int]:
+    """Line number of the innermost user-code frame in exc's traceback."""
+    frames = [f for f in traceback.extract_tb(exc.__traceback__) if f.filename == "<code>"]
+    return frames[-1].lineno if frames else None
+
+
+def _portable_exception(exc: BaseException) -> BaseException:
+    """Return exc if it survives a pickle round trip, else a RuntimeError with the same text.
+
+    SystemExit is always converted so sys.exit() in user code can't end the parent.
+    """
+    portable: BaseException
+    if isinstance(exc, SystemExit):
+        portable = RuntimeError(f"Code called sys.exit({exc.code!r})")
+    else:
+        try:
+            pickle.loads(pickle.dumps(exc, protocol=5))  # noqa: S301
+            portable = exc
+        except Exception:
+            portable = RuntimeError(f"{type(exc).__name__}: {exc}")
+    setattr(portable, CODE_LINENO_ATTR, _code_lineno(exc))
+    if isinstance(portable, NameError):
+        setattr(portable, _NAME_ATTR, portable.name)
+    return portable
+
+
+@lru_cache(maxsize=_WORKER_CODE_CACHE_SIZE)
+def _compile_user_code(code: str) -> Any:
+    return compile(code, "<code>", "exec")
+
+
+def _run_request(code: str, inputs: dict[str, Any]) -> tuple[str, Any, str, str]:
+    """Execute one code request; returns (status, payload, stdout, stderr)."""
+    namespace: dict[str, Any] = {"__builtins__": __builtins__}
+    namespace.update(inputs)
+    stdout_buf = io.StringIO()
+    stderr_buf = io.StringIO()
+    try:
+        compiled = _compile_user_code(code)
+        with redirect_stdout(stdout_buf), redirect_stderr(stderr_buf):
+            exec(compiled, namespace)  # noqa: S102
+    except (Exception, SystemExit) as e:
+        return ("error", _portable_exception(e), stdout_buf.getvalue(), stderr_buf.getvalue())
+
+    payload = {"result": namespace["result"]} if "result" in namespace else {}
+    return ("ok", payload, stdout_buf.getvalue(), stderr_buf.getvalue())
+
+
+def _worker_main(conn: Connection) -> None:
+    """Worker process loop: run requests until the pipe closes or None arrives."""
+    # Ctrl-C is handled by the parent, which kills workers as needed
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            request = _recv(conn)
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+
+        status, payload, stdout, stderr = _run_request(*request)
+        try:
+            frames = _dumps((status, payload, stdout, stderr))
+        except Exception as e:
+            result_type = type(payload.get("result")).__name__ if status == "ok" else type(payload).__name__
+            error = TypeError(f"Result of type {result_type} can't be returned from a process-isolated code node: {e}")
+            frames = _dumps(("error", error, stdout, stderr))
+        _send_frames(conn, frames)
+
+
+# ----------------------------------------------------------------------
+# Parent side
+# ----------------------------------------------------------------------
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe."""
+
+    def __init__(self, ctx: Any) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), name="pflow-code-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        """Terminate immediately (timeouts, broken pipes)."""
+        self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it doesn't."""
+        try:
+            _send_frames(self.conn, _dumps(None))
+            self.process.join(timeout=1)
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+
+class CodeProcessPool:
+    """Pool of reusable worker processes for code node execution.
+
+    Args:
+        max_workers: Maximum worker processes (and concurrent executions)
+        start_method: multiprocessing start method (default: forkserver where
+            available, else spawn)
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_PROCESSES, start_method: Optional[str] = None) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.max_workers = max_workers
+        self._ctx = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(max_workers)
+        self._idle: list[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def run(self, code: str, inputs: dict[str, Any], timeout: float) -> dict[str, Any]:
+        """Execute code in a worker process.
+
+        Blocks until a worker is free; the timeout only covers execution.
+
+        Args:
+            code: Python source to execute
+            inputs: Variables to bind before execution (must be picklable)
+            timeout: Seconds before the worker is killed
+
+        Returns:
+            Dict with ``stdout``, ``stderr`` and, if the code set it, ``result``
+
+        Raises:
+            TimeoutError: If execution exceeds timeout
+            TypeError: If inputs can't be pickled
+            RuntimeError: If the worker process dies
+            Exception: Whatever the user code raised (line number attached as
+                ``CODE_LINENO_ATTR``)
+        """
+        try:
+            frames = _dumps((code, inputs))
+        except Exception as e:
+            raise TypeError(f"Inputs for a process-isolated code node must be picklable: {e}") from e
+
+        with self._slots:
+            worker = self._checkout()
+            try:
+                _send_frames(worker.conn, frames)
+                if not worker.conn.poll(timeout):
+                    worker.kill()
+                    raise TimeoutError(f"Code execution timed out after {timeout} seconds")
+                status, payload, stdout, stderr = _recv(worker.conn)
+            except TimeoutError:  # An OSError subclass; keep it out of the branch below
+                raise
+            except (EOFError, OSError) as e:
+                worker.kill()
+                raise RuntimeError(
+                    f"Code worker process exited unexpectedly (exit code {worker.process.exitcode})"
+                ) from e
+            except BaseException:
+                # Unknown worker state (e.g. KeyboardInterrupt mid-call)
+                worker.kill()
+                raise
+            self._checkin(worker)
+
+        if status == "error":
+            if isinstance(payload, NameError):
+                payload.name = getattr(payload, _NAME_ATTR, None)
+            raise payload
+        return {**payload, "stdout": stdout, "stderr": stderr}
+
+    def close(self) -> None:
+        """Stop idle workers and reject new work."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Code process pool is closed")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.conn.close()
+        return _Worker(self._ctx)
+
+    def _checkin(self, worker: _Worker) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append(worker)
+                return
+        worker.stop()
+
+
+_pool: Optional[CodeProcessPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_code_process_pool() -> CodeProcessPool:
+    """Return the process-wide code worker pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = CodeProcessPool()
+            atexit.register(_pool.close)
+        return _pool
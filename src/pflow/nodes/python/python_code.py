@@ -24,16 +24,23 @@ Example workflow usage (.pflow.md):
 """
 
 import ast
-import io
 import logging
 import traceback
+from collections.abc import Mapping
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FuturesTimeoutError
-from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+from functools import lru_cache
+from types import CodeType, MappingProxyType
 from typing import Any
 
+from pflow.core.cancellation import get_cancel_token
+from pflow.core.concurrency import concurrency_slot
 from pflow.pocketflow import Node
 
+from .output_capture import capture_output
+from .process_pool import CODE_LINENO_ATTR, get_code_process_pool
+
 logger = logging.getLogger(__name__)
 
 # Mapping from type annotation strings to Python types for isinstance() checks.
@@ -51,6 +58,43 @@ _TYPE_MAP: dict[str, type | tuple[type, ...]] = {
     "bytes": bytes,
 }
 
+# Where code runs: in a helper thread of this process, or in a pooled worker process
+_ISOLATION_MODES = ("thread", "process")
+
+# Distinct code strings kept parsed + compiled (batches repeat the same code per item)
+_CODE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class _CompiledCode:
+    """Parse/compile results for one code string (shared, read-only)."""
+
+    annotations: Mapping[str, str]
+    code_object: CodeType
+    declares_result: bool
+
+
+@lru_cache(maxsize=_CODE_CACHE_SIZE)
+def _compile_code(code: str) -> _CompiledCode:
+    """Parse, compile and analyze a code string once.
+
+    Cached across node instances and threads, so a batch running the same
+    code for every item parses and compiles it only once.
+
+    Raises:
+        SyntaxError: If the code contains invalid Python syntax (not cached).
+    """
+    tree = ast.parse(code, filename="<code>")
+    annotations: dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            annotations[node.target.id] = ast.unparse(node.annotation)
+    return _CompiledCode(
+        annotations=MappingProxyType(annotations),
+        code_object=compile(tree, "<code>", "exec"),
+        declares_result="result" in annotations,
+    )
+
 
 def _extract_annotations(code: str) -> dict[str, str]:
     """Extract type annotations from Python code using AST parsing.
@@ -69,12 +113,7 @@ def _extract_annotations(code: str) -> dict[str, str]:
     Raises:
         SyntaxError: If the code contains invalid Python syntax.
     """
-    tree = ast.parse(code)
-    annotations: dict[str, str] = {}
-    for node in ast.walk(tree):
-        if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
-            annotations[node.target.id] = ast.unparse(node.annotation)
-    return annotations
+    return dict(_compile_code(code).annotations)
 
 
 def _get_outer_type(type_str: str) -> type | tuple[type, ...] | None:
@@ -92,7 +131,8 @@ def _extract_error_location(exc: Exception, code: str, code_source_line: int = 0
     """Extract a human-readable error location from an exception's traceback.
 
     Filters traceback to frames from user code (filename='<code>') and
-    returns the line number with the source text for context.
+    returns the line number with the source text for context. Exceptions
+    from worker processes carry the line number as an attribute instead.
 
     When *code_source_line* is set (the 1-based line in the .pflow.md file
     where the code block content starts), the workflow-file line is included
@@ -101,18 +141,10 @@ def _extract_error_location(exc: Exception, code: str, code_source_line: int = 0
     Returns empty string if no location info is available (e.g. TimeoutError
     has no traceback from user code).
     """
-    tb = getattr(exc, "__traceback__", None)
-    if tb is None:
-        return ""
-
     # Filter to frames from user code only
-    frames = traceback.extract_tb(tb)
-    user_frames = [f for f in frames if f.filename == "<code>"]
-    if not user_frames:
-        return ""
-
-    last = user_frames[-1]
-    lineno = last.lineno
+    tb = getattr(exc, "__traceback__", None)
+    user_frames = [f for f in traceback.extract_tb(tb) if f.filename == "<code>"] if tb is not None else []
+    lineno = user_frames[-1].lineno if user_frames else getattr(exc, CODE_LINENO_ATTR, None)
     if lineno is None:
         return ""
 
@@ -143,6 +175,7 @@ class PythonCodeNode(Node):
     - Params: inputs: dict  # Variable name to value mapping (optional, default: {})
     - Params: timeout: int  # Execution timeout in seconds (optional, default: 30)
     - Params: requires: list  # Package dependencies for documentation (optional)
+    - Params: isolation: str  # "thread" (default) or "process" for CPU-bound code: runs in a worker process, uses all cores in parallel batches, inputs/result must be picklable (optional)
     - Writes: shared["result"]: any  # Value of result variable after execution
     - Writes: shared["stdout"]: str  # Captured print() output
     - Writes: shared["stderr"]: str  # Captured stderr output
@@ -174,16 +207,18 @@ class PythonCodeNode(Node):
         code = self._validate_code()
         timeout = self._validate_timeout()
         inputs = self._validate_inputs()
+        isolation = self._validate_isolation()
         requires = self.params.get("requires", [])
 
-        # Parse code — SyntaxError propagates with line info
-        annotations = _extract_annotations(code)
+        # Parse + compile (cached per code string) — SyntaxError propagates with line info
+        compiled = _compile_code(code)
+        annotations = compiled.annotations
 
         # Validate annotations exist for every input variable
         self._check_input_annotations(inputs, annotations)
 
         # Validate result annotation exists
-        if "result" not in annotations:
+        if not compiled.declares_result:
             raise ValueError("Code must declare result type annotation: result: <type> = ...")
 
         # Validate input types against annotations
@@ -193,9 +228,12 @@ class PythonCodeNode(Node):
             "code": code,
             "inputs": inputs,
             "timeout": timeout,
+            "isolation": isolation,
             "requires": requires,
-            "annotations": annotations,
+            "annotations": dict(annotations),
+            "compiled": compiled.code_object,
             "code_source_line": self.params.get("_code_source_line", 0),
+            "cancel_token": get_cancel_token(shared),
         }
 
     # ------------------------------------------------------------------
@@ -203,13 +241,23 @@ class PythonCodeNode(Node):
     # ------------------------------------------------------------------
 
     def exec(self, prep_res: dict[str, Any]) -> dict[str, Any]:
-        """Execute Python code in a thread with timeout.
+        """Execute Python code in a thread (or worker process) with timeout.
 
         NO try/except — let exceptions bubble up for PocketFlow retry mechanism.
         """
         code = prep_res["code"]
         inputs = prep_res["inputs"]
         timeout = prep_res["timeout"]
+        if prep_res.get("cancel_token") is not None:
+            prep_res["cancel_token"].raise_if_cancelled()
+
+        if prep_res.get("isolation") == "process":
+            # Worker is killed on timeout, so no zombie thread is left behind
+            with concurrency_slot("cpu"):
+                outcome = get_code_process_pool().run(code, inputs, timeout)
+            if "result" not in outcome:
+                raise ValueError("Code must set 'result' variable. Add: result = <your_value>")
+            return outcome
 
         # Build namespace with unrestricted builtins + input variables
         namespace: dict[str, Any] = {"__builtins__": __builtins__}
@@ -220,9 +268,10 @@ class PythonCodeNode(Node):
         # shutdown(wait=True) which blocks until the thread finishes, defeating
         # the timeout for truly stuck code (infinite loops, blocking I/O).
         pool = ThreadPoolExecutor(max_workers=1)
-        future = pool.submit(self._execute_code, code, namespace)
         try:
-            future.result(timeout=timeout)
+            with concurrency_slot("cpu"):
+                future = pool.submit(self._execute_code, prep_res.get("compiled") or code, namespace)
+                future.result(timeout=timeout)
         finally:
             # wait=False: don't block if the thread is still running (zombie
             # thread is an acceptable tradeoff — documented in spec).
@@ -303,19 +352,19 @@ class PythonCodeNode(Node):
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _execute_code(code: str, namespace: dict[str, Any]) -> None:
-        """Execute code string with stdout/stderr capture.
+    def _execute_code(code: str | CodeType, namespace: dict[str, Any]) -> None:
+        """Execute code with stdout/stderr capture.
 
         Runs in a worker thread via ThreadPoolExecutor. Captured output is
         stored in the namespace under ``__stdout__`` and ``__stderr__`` keys.
 
-        Uses compile() with filename='<code>' so traceback frames from user
+        Code is compiled with filename='<code>' so traceback frames from user
         code are identifiable and line numbers can be extracted for error messages.
+        Accepts the pre-compiled code object from prep() or a source string.
         """
-        compiled = compile(code, "<code>", "exec")
-        stdout_buf = io.StringIO()
-        stderr_buf = io.StringIO()
-        with redirect_stdout(stdout_buf), redirect_stderr(stderr_buf):
+        compiled = code if isinstance(code, CodeType) else _compile_code(code).code_object
+        # Per-thread capture: parallel batch items don't see each other's output
+        with capture_output() as (stdout_buf, stderr_buf):
             exec(compiled, namespace)  # noqa: S102
         namespace["__stdout__"] = stdout_buf.getvalue()
         namespace["__stderr__"] = stderr_buf.getvalue()
@@ -343,6 +392,13 @@ class PythonCodeNode(Node):
             raise ValueError(f"Timeout must be a positive number, got {timeout}")
         return timeout
 
+    def _validate_isolation(self) -> str:
+        """Extract and validate the isolation parameter."""
+        isolation = self.params.get("isolation") or "thread"
+        if isolation not in _ISOLATION_MODES:
+            raise ValueError(f"Invalid isolation {isolation!r}. Allowed: {', '.join(_ISOLATION_MODES)}")
+        return str(isolation)
+
     def _validate_inputs(self) -> dict[str, Any]:
         """Extract and validate the inputs parameter."""
         inputs = self.params.get("inputs", {})
@@ -351,7 +407,7 @@ class PythonCodeNode(Node):
         return inputs
 
     @staticmethod
-    def _check_input_annotations(inputs: dict[str, Any], annotations: dict[str, str]) -> None:
+    def _check_input_annotations(inputs: dict[str, Any], annotations: Mapping[str, str]) -> None:
         """Verify every input variable has a type annotation in the code."""
         missing = [name for name in inputs if name not in annotations]
         if missing:
@@ -361,7 +417,7 @@ class PythonCodeNode(Node):
             )
 
     @staticmethod
-    def _check_input_types(inputs: dict[str, Any], annotations: dict[str, str]) -> None:
+    def _check_input_types(inputs: dict[str, Any], annotations: Mapping[str, str]) -> None:
         """Validate each input value matches its declared outer type."""
         for var_name, value in inputs.items():
             type_str = annotations.get(var_name)
@@ -3,9 +3,13 @@
 import base64
 import logging
 import os
+import signal
 import subprocess
-from typing import Any, ClassVar
+import sys
+from typing import Any, ClassVar, Optional
 
+from pflow.core.cancellation import CancellationToken, get_cancel_token
+from pflow.core.concurrency import concurrency_slot
 from pflow.pocketflow import Node
 
 logger = logging.getLogger(__name__)
@@ -504,6 +508,7 @@ class ShellNode(Node):
             "timeout": timeout,
             "ignore_errors": ignore_errors,
             "strip_newline": strip_newline,
+            "cancel_token": get_cancel_token(shared),
         }
 
     def exec(self, prep_res: dict[str, Any]) -> dict[str, Any]:
@@ -533,18 +538,8 @@ class ShellNode(Node):
             # Encode stdin to bytes for text=False mode
             stdin_bytes = stdin.encode("utf-8") if stdin else None
 
-            # Execute the command with shell=True for full shell power
-            # Security: shell=True is intentional - this is a shell node that provides full shell access
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=False,
-                input=stdin_bytes,
-                cwd=cwd,
-                env=full_env,
-                timeout=timeout,
-            )
+            with concurrency_slot("shell"):
+                result = self._run_command(command, stdin_bytes, cwd, full_env, timeout, prep_res.get("cancel_token"))
 
             logger.info(
                 f"[AUDIT] Command completed with exit code {result.returncode}",
@@ -599,6 +594,55 @@ class ShellNode(Node):
             logger.exception("Command execution failed", extra={"phase": "exec", "error": str(e)})
             raise
 
+    @staticmethod
+    def _run_command(
+        command: str,
+        stdin_bytes: Optional[bytes],
+        cwd: Optional[str],
+        env: Optional[dict[str, str]],
+        timeout: float,
+        cancel_token: Optional[CancellationToken],
+    ) -> subprocess.CompletedProcess:
+        """Run the command, killing it and everything it started if the run is cancelled."""
+        if cancel_token is None:
+            # Execute the command with shell=True for full shell power
+            # Security: shell=True is intentional - this is a shell node that provides full shell access
+            return subprocess.run(
+                command,
+                shell=True,
+                capture_output=True,
+                text=False,
+                input=stdin_bytes,
+                cwd=cwd,
+                env=env,
+                timeout=timeout,
+            )
+
+        cancel_token.raise_if_cancelled()
+        # Own process group (POSIX) so pipelines and background children can be killed as a group
+        with (
+            subprocess.Popen(
+                command,
+                shell=True,
+                stdin=subprocess.PIPE if stdin_bytes is not None else None,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                **_process_group_args(),
+            ) as process,
+            cancel_token.on_cancel(lambda: _kill_process_group(process)),
+        ):
+            try:
+                stdout, stderr = process.communicate(stdin_bytes, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                # Same as subprocess.run(), but for the whole group
+                _kill_process_group(process)
+                process.wait()
+                raise
+        cancel_token.raise_if_cancelled()
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
     def post(self, shared: dict, prep_res: dict[str, Any], exec_res: dict[str, Any]) -> str:
         """Store results in shared store and determine action.
 
@@ -734,3 +778,28 @@ class ShellNode(Node):
             "exit_code": -2,  # Convention for execution failure
             "error": f"Failed to execute command: {exc}",
         }
+
+
+def _process_group_args() -> dict[str, Any]:
+    """Popen arguments that start a command in its own process group (POSIX).
+
+    Unlike a new session, the command keeps pflow's session and controlling
+    terminal, so prompts that open /dev/tty (sudo, ssh, git credentials, gpg)
+    still work and a terminal hangup still reaches it.
+    """
+    if os.name != "posix":
+        return {}
+    if sys.version_info >= (3, 11):
+        return {"process_group": 0}
+    return {"preexec_fn": os.setpgrp}
+
+
+def _kill_process_group(process: subprocess.Popen) -> None:
+    """Kill a command started in its own process group, including processes it spawned."""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass  # Already exited
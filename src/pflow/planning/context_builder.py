@@ -2,15 +2,21 @@
 
 This module transforms node registry metadata into LLM-optimized markdown
 documentation that enables natural language workflow composition.
+
+Rendered blocks (nodes list, workflows list, per-node planning sections) are
+cached by content hash in ``context_cache``, so repeated planning requests
+only format what changed.
 """
 
 import json
 import logging
 import os
+from functools import partial
 from pathlib import Path
 from typing import Any, Optional
 
 from ..core.workflow_manager import WorkflowManager
+from .context_cache import get_context_cache, workflow_library_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -423,6 +429,7 @@ def _extract_workflow_description(workflow: dict[str, Any]) -> str:
 def build_nodes_context(
     node_ids: Optional[list[str]] = None,
     registry_metadata: Optional[dict[str, dict[str, Any]]] = None,
+    registry_fingerprint: Optional[str] = None,
 ) -> str:
     """Build context containing only node information as a numbered list.
 
@@ -430,6 +437,9 @@ def build_nodes_context(
         node_ids: List of node IDs to include (None = all nodes)
         registry_metadata: Optional registry metadata dict. If not provided,
                           will attempt to load from default registry.
+        registry_fingerprint: Registry.fingerprint of the registry that
+                          registry_metadata was loaded from. Keys the cache
+                          without hashing the metadata itself.
 
     Returns:
         Numbered list of nodes with descriptions
@@ -440,7 +450,17 @@ def build_nodes_context(
 
         registry = Registry()
         registry_metadata = registry.load()  # Now returns filtered nodes by default
+        registry_fingerprint = registry.fingerprint
+
+    # Metadata from elsewhere (no fingerprint) is keyed by its content
+    registry_key = ["registry", registry_fingerprint] if registry_fingerprint else registry_metadata
+    return get_context_cache().get_or_build(
+        "nodes", [registry_key, node_ids], lambda: _render_nodes_context(registry_metadata, node_ids)
+    )
+
 
+def _render_nodes_context(registry_metadata: dict[str, dict[str, Any]], node_ids: Optional[list[str]]) -> str:
+    """Render the numbered nodes list (uncached)."""
     # Process nodes to get metadata
     processed_nodes, _ = _process_nodes(registry_metadata)
 
@@ -625,8 +645,20 @@ def build_workflows_context(
         Numbered list of workflows with descriptions
     """
     manager = workflow_manager if workflow_manager else _get_workflow_manager()
-    saved_workflows = manager.list_all()
 
+    # Fingerprint from file stats so unchanged libraries skip parsing every workflow
+    library = workflow_library_fingerprint(manager)
+    if library is None:
+        return _render_workflows_context(manager.list_all(), workflow_names)
+    return get_context_cache().get_or_build(
+        "workflows",
+        [library, workflow_names],
+        lambda: _render_workflows_context(manager.list_all(), workflow_names),
+    )
+
+
+def _render_workflows_context(saved_workflows: list[dict[str, Any]], workflow_names: Optional[list[str]]) -> str:
+    """Render the numbered workflows list (uncached)."""
     if workflow_names is not None:
         filtered_workflows = [w for w in saved_workflows if w["name"] in workflow_names]
     else:
@@ -706,11 +738,17 @@ def _validate_planning_inputs(
 def _format_planning_nodes(selected_node_ids: list[str], processed_nodes: dict[str, dict]) -> list[str]:
     """Format nodes section for planning context."""
     markdown_sections = []
+    context_cache = get_context_cache()
 
     for node_id in sorted(selected_node_ids):
         if node_id in processed_nodes:
             node_data = processed_nodes[node_id]
-            section = _format_node_section_enhanced(node_id, node_data)
+            # Sections are cached per node, so any selection reuses them
+            section = context_cache.get_or_build(
+                "node",
+                [node_id, node_data],
+                partial(_format_node_section_enhanced, node_id, node_data),
+            )
             markdown_sections.append(section)
 
     return markdown_sections
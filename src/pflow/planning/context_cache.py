@@ -0,0 +1,203 @@
+"""On-disk cache for rendered planner context blocks.
+
+Every planning request used to rebuild the same context text: the nodes list
+from the whole registry, the workflows list from every saved workflow file,
+and a detailed section for each selected node. Rendered blocks are now stored
+under ``~/.pflow/cache/planner-context/`` keyed by a hash of their inputs:
+
+- nodes list: registry fingerprint (+ selected node ids)
+- workflows list: workflow-library fingerprint (file names and stats)
+- node sections: the node's processed interface data, one entry per node
+
+Keys also cover the context builder source, so a formatting change never
+serves stale text. Identical inputs always produce identical bytes, which
+keeps prompt prefixes stable for provider-side prompt caching.
+
+Every registry or library change writes new entries, so the directory is
+pruned once per process: entries unused for ``MAX_DISK_AGE_SECONDS`` are
+removed, then the least recently used beyond ``MAX_DISK_ENTRIES``.
+
+Configuration (environment variables):
+- PFLOW_PLANNER_CONTEXT_CACHE: set to "0" to disable the disk cache
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from pflow.core.workflow_manager import WorkflowManager
+
+logger = logging.getLogger(__name__)
+
+# Rendered blocks kept in memory per process (node sections dominate the count)
+MAX_MEMORY_ENTRIES = 1024
+
+# Disk entries not read or written for this long are removed
+MAX_DISK_AGE_SECONDS = 30 * 24 * 3600
+
+# Disk entries kept (least recently used are removed first)
+MAX_DISK_ENTRIES = 4096
+
+
+@cache
+def _builder_version() -> str:
+    """Hash of the context builder source; changes whenever formatting changes."""
+    source = Path(__file__).with_name("context_builder.py")
+    try:
+        return hashlib.sha256(source.read_bytes()).hexdigest()[:16]
+    except OSError:
+        return "unknown"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable hash of JSON-like values (dict key order doesn't matter)."""
+    encoded = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def workflow_library_fingerprint(manager: Any) -> Optional[str]:
+    """Fingerprint of a workflow library from file stats, without parsing any file.
+
+    Returns:
+        Hash of (name, size, mtime, inode) for every saved workflow, or None when the
+        manager isn't backed by a workflow directory (e.g. test doubles)
+    """
+    if not isinstance(manager, WorkflowManager):
+        return None
+    try:
+        stats = sorted(
+            # Saves replace files atomically, so the inode changes even within one mtime tick
+            (path.name, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+            for path in manager.workflows_dir.glob("*.pflow.md")
+            for stat in (path.stat(),)
+        )
+    except OSError:
+        return None
+    return fingerprint(str(manager.workflows_dir), stats)
+
+
+class ContextCache:
+    """Two-level (memory, then disk) cache of rendered context text.
+
+    Args:
+        cache_dir: Directory for cached blocks (default: ~/.pflow/cache/planner-context)
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        self.cache_dir = cache_dir or Path.home() / ".pflow" / "cache" / "planner-context"
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pruned = False
+
+    @property
+    def disk_enabled(self) -> bool:
+        return os.environ.get("PFLOW_PLANNER_CONTEXT_CACHE", "1") != "0"
+
+    def get_or_build(self, kind: str, inputs: Any, build: Callable[[], str]) -> str:
+        """Return the cached block for ``inputs``, building and storing it on a miss.
+
+        Args:
+            kind: Block kind (namespaces keys, e.g. "nodes", "workflows", "node")
+            inputs: JSON-like values the block is rendered from
+            build: Renders the block on a miss
+
+        Returns:
+            The rendered block
+        """
+        key = f"{kind}-{fingerprint(_builder_version(), inputs)}"
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                return text
+
+        text = self._read(key)
+        if text is None:
+            text = build()
+            self._write(key, text)
+        self._remember(key, text)
+        return text
+
+    def clear(self) -> None:
+        """Drop all cached blocks (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir.is_dir():
+            for path in self.cache_dir.glob("*.md"):
+                path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, text: str) -> None:
+        with self._lock:
+            self._memory[key] = text
+            self._memory.move_to_end(key)
+            while len(self._memory) > MAX_MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[str]:
+        if not self.disk_enabled:
+            return None
+        path = self.cache_dir / f"{key}.md"
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            return None
+        # Mark the entry as used so pruning keeps it
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return text
+
+    def _write(self, key: str, text: str) -> None:
+        if not self.disk_enabled:
+            return
+        temp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Atomic replace: concurrent planners may write the same key
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key}.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, self.cache_dir / f"{key}.md")
+        except OSError as e:
+            logger.debug(f"Could not write planner context cache entry {key}: {e}")
+            if temp_path:
+                Path(temp_path).unlink(missing_ok=True)
+        if not self._pruned:
+            self._pruned = True
+            self._prune()
+
+    def _prune(self) -> None:
+        """Remove stale entries, then the least recently used beyond MAX_DISK_ENTRIES."""
+        cutoff = time.time() - MAX_DISK_AGE_SECONDS
+        try:
+            entries = []
+            for path in self.cache_dir.glob("*.md"):
+                mtime = path.stat().st_mtime
+                if mtime < cutoff:
+                    path.unlink(missing_ok=True)
+                else:
+                    entries.append((mtime, path))
+            entries.sort(reverse=True)
+            for _, path in entries[MAX_DISK_ENTRIES:]:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Could not prune planner context cache: {e}")
+
+
+_context_cache: Optional[ContextCache] = None
+
+
+def get_context_cache() -> ContextCache:
+    """Return the process-wide planner context cache."""
+    global _context_cache
+    if _context_cache is None:
+        _context_cache = ContextCache()
+    return _context_cache
@@ -7,6 +7,7 @@ execution data, display progress, and save trace files for debugging.
 """
 
 import json
+import threading
 import time
 import uuid
 from dataclasses import dataclass
@@ -390,13 +391,15 @@ class DebugWrapper:
             self.trace._current_shared = shared
 
         # Install interceptor only once (first node that uses LLM)
-        if not self.trace._llm_interceptor_installed:
-            original_get_model = llm.get_model
-            trace = self.trace  # Capture trace in closure
+        # Locked because speculative planner stages set up interception from another thread
+        with _interceptor_lock:
+            if not self.trace._llm_interceptor_installed:
+                original_get_model = llm.get_model
+                trace = self.trace  # Capture trace in closure
 
-            llm.get_model = self._create_model_interceptor(original_get_model, trace)
-            self.trace._llm_interceptor_installed = True
-            self.trace._original_get_model = original_get_model
+                llm.get_model = self._create_model_interceptor(original_get_model, trace)
+                self.trace._llm_interceptor_installed = True
+                self.trace._original_get_model = original_get_model
 
     def exec(self, prep_res: dict[str, Any]) -> Any:
         """Wrap exec phase with LLM interception."""
@@ -431,10 +434,47 @@ class DebugWrapper:
         return result
 
 
+_interceptor_lock = threading.Lock()
+
+
+class _ThreadLocalAttribute:
+    """Per-thread instance attribute (AttributeError when unset in this thread).
+
+    Speculative planner stages make LLM calls from a background thread while
+    the flow continues, so the node being intercepted, its shared store and
+    the pending LLM call must not leak between threads.
+    """
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__["_thread_local"].__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__["_thread_local"].__dict__[self.name] = value
+
+    def __delete__(self, instance: Any) -> None:
+        try:
+            del instance.__dict__["_thread_local"].__dict__[self.name]
+        except KeyError:
+            raise AttributeError(self.name) from None
+
+
 class TraceCollector:
     """Collects execution trace data for debugging."""
 
+    current_node = _ThreadLocalAttribute()
+    current_llm_call = _ThreadLocalAttribute()
+    _current_shared = _ThreadLocalAttribute()
+
     def __init__(self, user_input: str) -> None:
+        self._thread_local = threading.local()
         self.execution_id: str = str(uuid.uuid4())
         self.start_time: datetime = datetime.now(timezone.utc)
         self.user_input: str = user_input
@@ -444,10 +484,10 @@ class TraceCollector:
         self.final_status: str = "running"
         self.path_taken: Optional[str] = None  # Will be "A" or "B"
         # Dynamic attributes for LLM interception
-        self.current_node: Optional[str] = None
+        self.current_node = None
         self._llm_interceptor_installed: bool = False
         self._original_get_model: Optional[Callable[..., Any]] = None
-        self._current_shared: Optional[dict[str, Any]] = None  # For storing shared reference during LLM interception
+        self._current_shared = None  # For storing shared reference during LLM interception
 
     def record_node_execution(self, node: str, duration: float, status: str, error: Optional[str] = None) -> None:
         """Record node execution with timing and status."""
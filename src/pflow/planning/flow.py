@@ -75,6 +75,7 @@ def create_planner_flow(
     debug_context: Optional["DebugContext"] = None,
     wait: int = 1,
     model: Optional[str] = None,
+    speculative: bool = False,
 ) -> "Flow":
     """Create the complete planner meta-workflow.
 
@@ -95,6 +96,10 @@ def create_planner_flow(
                available API keys (Anthropic > Gemini > OpenAI), with fallback
                to claude-sonnet-4-5 for library usage. Supports any model from
                llm library: Anthropic, OpenAI, Gemini, etc.
+        speculative: Start the first Path B stages (parameter discovery, requirements,
+               component browsing) in the background while discovery runs. Results are
+               adopted when discovery routes to Path B and discarded otherwise; discarded
+               LLM calls are reported as wasted in metrics.
 
     Returns:
         The complete planner flow ready for execution
@@ -171,6 +176,14 @@ def create_planner_flow(
         metadata_generation = DebugWrapper(metadata_generation, debug_context)  # type: ignore[assignment]
         result_preparation = DebugWrapper(result_preparation, debug_context)  # type: ignore[assignment]
 
+    # Speculative mode: wrap discovery and the Path B stages that only depend on user input
+    if speculative:
+        from pflow.planning.speculation import speculative_chain
+
+        discovery_node, parameter_discovery, requirements_analysis, component_browsing = speculative_chain(
+            discovery_node, parameter_discovery, requirements_analysis, component_browsing
+        )
+
     # Create flow with start node
     flow = Flow(start=discovery_node)
 
@@ -532,9 +532,11 @@ class ComponentBrowsingNode(Node):
         temperature = self.params.get("temperature", 0.0)
 
         # Instantiate Registry directly (PocketFlow pattern)
+        registry_fingerprint = None
         try:
             registry = Registry()
             registry_metadata = registry.load()  # Now returns filtered nodes by default
+            registry_fingerprint = registry.fingerprint
             if not registry_metadata:
                 logger.warning("Registry returned empty metadata, using empty dict", extra={"phase": "prep"})
                 registry_metadata = {}
@@ -551,6 +553,7 @@ class ComponentBrowsingNode(Node):
             nodes_context = build_nodes_context(
                 node_ids=None,  # All nodes
                 registry_metadata=registry_metadata,
+                registry_fingerprint=registry_fingerprint,
             )
             workflows_context = build_workflows_context(
                 workflow_names=None,  # All workflows
@@ -0,0 +1,228 @@
+"""Cache of successful planner results for repeated natural-language requests.
+
+Agents often re-issue the same request, and every run used to pay for the full
+multi-call planner pipeline. Successful planner outputs (validated workflow IR,
+execution parameters, metadata) are stored with the planner's prompt-cache
+chunks, so a repeat request skips planning and repair still gets its context.
+
+Entries are keyed on:
+- the user input, with whitespace normalized (case is kept: parameters such
+  as file names are extracted from it verbatim)
+- a hash of the registry as the planner sees it
+- the workflow-library fingerprint (saving or editing a workflow invalidates)
+- the planner model and the pflow version
+
+Cache location: ~/.pflow/cache/planner-results/cache.db (SQLite). Entries
+expire after ``ttl_hours`` (default 7 days) and the total payload size is
+capped with least-recently-used eviction.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+import unicodedata
+from contextlib import closing
+from functools import cache
+from pathlib import Path
+from typing import Any, Optional
+
+from pflow.core import sqlite_cache
+from pflow.planning.context_cache import fingerprint, workflow_library_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Default time-to-live for cached planner results
+DEFAULT_TTL_HOURS = 24 * 7
+
+# Default cap on total cached payload bytes before LRU eviction kicks in
+DEFAULT_MAX_SIZE_BYTES = 64 * 1024 * 1024
+
+# Name of the SQLite database inside the cache directory
+CACHE_DB_NAME = "cache.db"
+
+# Planner shared-store keys holding prompt-cache chunks (used by repair)
+CACHE_CHUNK_KEYS = ("planner_accumulated_blocks", "planner_extended_blocks", "planner_base_blocks")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    user_input TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_last_accessed ON results(last_accessed);
+"""
+
+
+@cache
+def _pflow_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("pflow-cli")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def normalize_user_input(user_input: str) -> str:
+    """Normalize a request so trivially different spellings share an entry.
+
+    Args:
+        user_input: Natural-language request as typed
+
+    Returns:
+        NFC-normalized input with runs of whitespace collapsed and ends trimmed
+    """
+    return " ".join(unicodedata.normalize("NFC", user_input).split())
+
+
+class PlannerResultCache:
+    """Manage cached planner results.
+
+    Args:
+        cache_dir: Directory for the database (default: ~/.pflow/cache/planner-results)
+        ttl_hours: Hours before an entry expires
+        max_size_bytes: Maximum total size of cached payloads (LRU eviction beyond this)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_hours: float = DEFAULT_TTL_HOURS,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+    ) -> None:
+        self.cache_dir = cache_dir or Path.home() / ".pflow" / "cache" / "planner-results"
+        self.ttl_hours = ttl_hours
+        self.max_size_bytes = max_size_bytes
+
+    @property
+    def db_path(self) -> Path:
+        """Path to the SQLite database backing this cache."""
+        return self.cache_dir / CACHE_DB_NAME
+
+    def make_key(
+        self,
+        user_input: str,
+        registry_metadata: dict[str, Any],
+        workflow_manager: Any,
+        model: Optional[str],
+    ) -> Optional[str]:
+        """Build the cache key for a planner request.
+
+        Args:
+            user_input: Natural-language request
+            registry_metadata: Registry nodes visible to the planner
+            workflow_manager: Workflow manager the planner searches
+            model: Planner model name
+
+        Returns:
+            Cache key, or None when the workflow library can't be fingerprinted
+            (results would not be invalidated by library changes)
+        """
+        library = workflow_library_fingerprint(workflow_manager)
+        if library is None:
+            return None
+        return fingerprint(
+            normalize_user_input(user_input), fingerprint(registry_metadata), library, model, _pflow_version()
+        )
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """Look up a cached result.
+
+        Args:
+            key: Key from ``make_key``
+
+        Returns:
+            Dict with ``planner_output`` and ``cache_chunks``, or None if missing or expired
+        """
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute("SELECT timestamp, payload FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if row[0] + self.ttl_hours * 3600 <= now:
+                    conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE results SET last_accessed = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.debug(f"Failed to read planner result cache: {e}")
+            return None
+
+        try:
+            payload: dict[str, Any] = json.loads(row[1])
+        except json.JSONDecodeError:
+            return None
+        return payload
+
+    def store(
+        self,
+        key: str,
+        user_input: str,
+        planner_output: dict[str, Any],
+        cache_chunks: Optional[dict[str, Any]] = None,
+    ) -> bool:
+        """Store a successful planner result.
+
+        Args:
+            key: Key from ``make_key``
+            user_input: Request the result was planned for (kept for inspection)
+            planner_output: The planner's ``planner_output`` (must be successful)
+            cache_chunks: Prompt-cache chunk lists by planner shared-store key
+
+        Returns:
+            True if the result was stored
+        """
+        if not planner_output.get("success"):
+            return False
+
+        payload = json.dumps(
+            {"planner_output": planner_output, "cache_chunks": cache_chunks or {}},
+            separators=(",", ":"),
+            default=str,
+        )
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, user_input, timestamp, last_accessed, size_bytes, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, user_input, now, now, len(payload), payload),
+                )
+                self._evict(conn, now, keep=key)
+        except (OSError, sqlite3.Error) as e:
+            logger.debug(f"Failed to write planner result cache: {e}")
+            return False
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("DELETE FROM results")
+        except (OSError, sqlite3.Error) as e:
+            logger.debug(f"Failed to clear planner result cache: {e}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the cache database, creating the schema if needed."""
+        return sqlite_cache.connect(self.db_path, _SCHEMA)
+
+    def _evict(self, conn: sqlite3.Connection, now: float, keep: str) -> None:
+        """Delete expired entries, then least-recently-used ones until under the size cap."""
+        sqlite_cache.evict(
+            conn, "results", "key", "timestamp + ? <= ?", (self.ttl_hours * 3600, now), self.max_size_bytes, keep=keep
+        )
+
+
+_result_cache: Optional[PlannerResultCache] = None
+
+
+def get_planner_result_cache() -> PlannerResultCache:
+    """Return the process-wide planner result cache."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = PlannerResultCache()
+    return _result_cache
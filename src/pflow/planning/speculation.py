@@ -0,0 +1,223 @@
+"""Speculative execution of planner stages.
+
+Discovery decides between reusing a saved workflow (Path A) and generating a
+new one (Path B). The first Path B stages (parameter discovery, requirements
+analysis, component browsing) depend only on the user input and on each
+other, so in speculative mode they start in a background thread while
+discovery's LLM call is in flight:
+
+- Speculated stages run prep/exec/post against a private copy of the shared
+  store, following the flow's own routing from one stage to the next.
+- When the flow reaches a speculated stage, its prep runs on the real shared
+  store as usual. If the inputs equal the speculative ones, the speculative
+  exec result is used instead of a new LLM call; post always runs on the
+  real store, so routing and stored results are unchanged.
+- When routing leaves the chain (discovery found a workflow, or a stage took
+  a different action), the remaining results are discarded. Their LLM calls
+  are still appended to ``shared["__llm_calls__"]``, tagged
+  ``speculative_wasted``, so metrics report what speculation cost.
+"""
+
+import copy
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from pflow.pocketflow import Node
+
+logger = logging.getLogger(__name__)
+
+# Shared-store key holding the active Speculation while the flow is inside the chain
+SPECULATION_KEY = "__planner_speculation__"
+
+
+@dataclass
+class _StageResult:
+    prep_res: Any
+    exec_res: Any
+    llm_calls: list[dict[str, Any]] = field(default_factory=list)
+
+
+def _innermost(node: Any) -> Any:
+    """Unwrap DebugWrapper layers down to the planner node."""
+    while "_wrapped" in vars(node):
+        node = node._wrapped
+    return node
+
+
+def _exec_phase(node: Any) -> Callable[[Any], Any]:
+    """Exec entry point that keeps retries and debug LLM interception."""
+    # DebugWrapper.exec installs interception and calls the wrapped node's _exec (with retries)
+    return node.exec if "_wrapped" in vars(node) else node._exec  # type: ignore[no-any-return]
+
+
+class SpeculativeNode(Node):
+    """Flow node wrapper that takes part in a speculation chain.
+
+    Position 0 is the trigger (discovery): running it starts speculation of
+    the later positions. Later positions adopt the speculative result when
+    their inputs match. Use ``speculative_chain`` to create the wrappers.
+
+    Args:
+        node: Planner node to wrap (may be a DebugWrapper)
+        chain: All wrappers of the chain, trigger first
+        position: Index of this wrapper in the chain
+    """
+
+    def __init__(self, node: Any, chain: list["SpeculativeNode"], position: int) -> None:
+        super().__init__()
+        self.node = node
+        self.chain = chain
+        self.position = position
+
+    @property
+    def name(self) -> str:
+        return str(getattr(self.node, "name", type(self.node).__name__))
+
+    def _run(self, shared: dict[str, Any]) -> Any:
+        node = copy.copy(self.node)  # Fresh instance per step, like Flow does for plain nodes
+
+        speculation: Optional[Speculation]
+        if self.position == 0:
+            speculation = Speculation(self.chain, shared)
+            shared[SPECULATION_KEY] = speculation
+            speculation.start()
+        else:
+            speculation = shared.get(SPECULATION_KEY)
+            if speculation is not None:
+                self._reuse_speculative_exec(node, speculation)
+
+        try:
+            action = node._run(shared)
+        except BaseException:
+            if speculation is not None:
+                speculation.discard(shared)
+            raise
+
+        if speculation is not None and not speculation.follows_chain(self.position, action):
+            speculation.discard(shared)
+        return action
+
+    def _reuse_speculative_exec(self, node: Any, speculation: "Speculation") -> None:
+        """Route the node's exec phase through the speculation."""
+        inner = _innermost(node)
+        original_exec = inner._exec
+        position = self.position
+        inner._exec = lambda prep_res: speculation.exec_stage(position, prep_res, original_exec)
+
+
+def speculative_chain(trigger: Any, *stages: Any) -> list[SpeculativeNode]:
+    """Wrap a trigger node and the stages to speculate while it runs.
+
+    Args:
+        trigger: Node whose execution starts speculation
+        *stages: Nodes that follow the trigger, in flow order
+
+    Returns:
+        Wrappers to wire into the flow in place of the original nodes
+    """
+    chain: list[SpeculativeNode] = []
+    for position, node in enumerate((trigger, *stages)):
+        chain.append(SpeculativeNode(node, chain, position))
+    return chain
+
+
+class Speculation:
+    """One background run of the chain's stages for one planner execution.
+
+    Args:
+        chain: Chain wrappers, trigger first
+        shared: The planner's shared store (snapshotted when started)
+    """
+
+    def __init__(self, chain: list[SpeculativeNode], shared: dict[str, Any]) -> None:
+        self._chain = chain
+        self._shared = shared
+        self._results: dict[int, _StageResult] = {}
+        self._calls: list[dict[str, Any]] = []
+        self._adopted: set[int] = set()
+        self._cond = threading.Condition()
+        self._finished = False
+        self._discarded = False
+        self._flushed = False
+
+    def start(self) -> None:
+        """Start running the stages in a background thread."""
+        private = {k: v for k, v in self._shared.items() if k != SPECULATION_KEY}
+        if isinstance(private.get("__llm_calls__"), list):
+            # Keep speculative calls apart until we know whether they're used
+            private["__llm_calls__"] = self._calls
+        # Daemon: a discarded speculation must never delay process exit
+        threading.Thread(target=self._run_stages, args=(private,), name="planner-speculation", daemon=True).start()
+
+    def _run_stages(self, shared: dict[str, Any]) -> None:
+        try:
+            for position in range(1, len(self._chain)):
+                if self._discarded:
+                    break
+                node = copy.copy(self._chain[position].node)
+                calls_before = len(self._calls)
+                prep_res = node.prep(shared)
+                exec_res = _exec_phase(node)(prep_res)
+                action = node.post(shared, prep_res, exec_res)
+                with self._cond:
+                    self._results[position] = _StageResult(prep_res, exec_res, self._calls[calls_before:])
+                    self._cond.notify_all()
+                if not self.follows_chain(position, action):
+                    break
+        except Exception as e:
+            # The real flow re-runs the stage and handles the error itself
+            logger.debug(f"Speculative planner stage failed: {e}")
+        finally:
+            with self._cond:
+                self._finished = True
+                self._cond.notify_all()
+                flush = self._discarded
+            if flush:
+                self._flush_wasted()
+
+    def follows_chain(self, position: int, action: Any) -> bool:
+        """Whether ``action`` routes from ``position`` to the next stage of the chain."""
+        if position + 1 >= len(self._chain):
+            return False
+        return self._chain[position].successors.get(action or "default") is self._chain[position + 1]
+
+    def exec_stage(self, position: int, prep_res: Any, exec_fn: Callable[[Any], Any]) -> Any:
+        """Exec phase of a stage in the real flow: reuse the speculative result or run ``exec_fn``."""
+        with self._cond:
+            self._cond.wait_for(lambda: position in self._results or self._finished)
+            result = self._results.get(position)
+            adopt = result is not None and result.prep_res == prep_res
+            if adopt:
+                self._adopted.add(position)
+
+        if result is not None and adopt:
+            logger.debug(f"Using speculative result for planner stage {self._chain[position].name}")
+            llm_calls = self._shared.get("__llm_calls__")
+            if isinstance(llm_calls, list):
+                llm_calls.extend(result.llm_calls)
+            return result.exec_res
+        return exec_fn(prep_res)
+
+    def discard(self, shared: dict[str, Any]) -> None:
+        """Leave the chain: stop after the current stage and record unused calls as wasted."""
+        shared.pop(SPECULATION_KEY, None)
+        with self._cond:
+            self._discarded = True
+            flush = self._finished
+        if flush:
+            self._flush_wasted()
+
+    def _flush_wasted(self) -> None:
+        with self._cond:
+            if self._flushed:
+                return
+            self._flushed = True
+            adopted = {id(call) for position in self._adopted for call in self._results[position].llm_calls}
+
+        wasted = [{**call, "speculative_wasted": True} for call in self._calls if id(call) not in adopted]
+        llm_calls = self._shared.get("__llm_calls__")
+        if wasted and isinstance(llm_calls, list):
+            llm_calls.extend(wasted)
+            logger.debug(f"Discarded {len(wasted)} speculative planner LLM call(s)")
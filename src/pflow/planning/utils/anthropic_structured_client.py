@@ -14,6 +14,7 @@ from typing import Any, Optional
 from pydantic import BaseModel, ValidationError
 
 from pflow.core.exceptions import PflowError as PlannerException
+from pflow.core.llm_cache import get_anthropic_client
 
 
 class AnthropicStructuredClient:
@@ -34,7 +35,7 @@ class AnthropicStructuredClient:
                     or llm library key storage.
         """
         try:
-            from anthropic import Anthropic
+            import anthropic  # noqa: F401
         except ImportError as e:
             raise PlannerException(
                 "Anthropic SDK not installed. Please install with: pip install anthropic>=0.40.0"
@@ -63,7 +64,8 @@ class AnthropicStructuredClient:
                 "or configure with: llm keys set anthropic"
             )
 
-        self.client = Anthropic(api_key=api_key)
+        # Shared per key: reuses the connection pool across planner stages and runs
+        self.client = get_anthropic_client(api_key)
         self.model = "claude-sonnet-4-20250514"  # Model specified in requirements
 
     def _build_tool_definition(self, response_model: type[BaseModel]) -> tuple[str, dict[str, Any]]:
@@ -1,5 +1,6 @@
 import asyncio
 import copy
+import random
 import time
 import warnings
 
@@ -64,15 +65,20 @@ class Node(BaseNode):
     def exec_fallback(self, prep_res, exc):
         raise exc
 
+    def _retry_delay(self):
+        # pflow: exponential backoff with jitter instead of a fixed wait (capped at 30s)
+        return min(self.wait * 2**self.cur_retry, 30) * random.uniform(0.5, 1.0)
+
     def _exec(self, prep_res):
         for self.cur_retry in range(self.max_retries):
             try:
                 return self.exec(prep_res)
             except Exception as e:
-                if self.cur_retry == self.max_retries - 1:
+                # pflow: errors marked retryable=False (e.g. open circuit breaker) skip the remaining retries
+                if self.cur_retry == self.max_retries - 1 or getattr(e, "retryable", True) is False:
                     return self.exec_fallback(prep_res, e)
                 if self.wait > 0:
-                    time.sleep(self.wait)
+                    time.sleep(self._retry_delay())
 
 
 class BatchNode(Node):
@@ -142,10 +148,10 @@ class AsyncNode(Node):
             try:
                 return await self.exec_async(prep_res)
             except Exception as e:
-                if self.cur_retry == self.max_retries - 1:
+                if self.cur_retry == self.max_retries - 1 or getattr(e, "retryable", True) is False:
                     return await self.exec_fallback_async(prep_res, e)
                 if self.wait > 0:
-                    await asyncio.sleep(self.wait)
+                    await asyncio.sleep(self._retry_delay())
 
     async def run_async(self, shared):
         if self.successors:
@@ -1,5 +1,6 @@
 """Registry for managing discovered pflow nodes."""
 
+import hashlib
 import json
 import logging
 from collections.abc import Collection
@@ -28,10 +29,15 @@ class Registry:
         # Add caching
         self._cached_nodes: Optional[dict[str, dict[str, Any]]] = None
         self._registry_version: Optional[str] = None
+        self._fingerprint: Optional[str] = None
 
         # Lazy load settings manager to avoid circular import
         self._settings_manager: Optional[Any] = None
 
+    def __deepcopy__(self, memo: dict[int, Any]) -> "Registry":
+        # Shared handle: parallel batch items deep-copy node params, which carry the registry
+        return self
+
     @property
     def settings_manager(self) -> Any:
         """Lazy load SettingsManager to avoid circular imports."""
@@ -80,10 +86,32 @@ class Registry:
                 module_path = node_data.get("module_path") or node_data.get("module") or node_data.get("file_path", "")
                 if self.settings_manager.should_include_node(node_name, module_path):
                     filtered_nodes[node_name] = node_data
+            self._fingerprint = self._compute_fingerprint(filtered_nodes)
             return filtered_nodes
 
+        self._fingerprint = self._compute_fingerprint(nodes)
         return nodes
 
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """Fingerprint of the nodes returned by the last load().
+
+        Changes whenever the registry file is rewritten or settings change
+        which nodes are included. None before the first load or when the
+        registry file can't be read.
+        """
+        return self._fingerprint
+
+    def _compute_fingerprint(self, nodes: dict[str, dict[str, Any]]) -> Optional[str]:
+        """Hash the registry file's stats and the loaded node names, without re-encoding any metadata."""
+        try:
+            stat = self.registry_path.stat()
+        except OSError:
+            return None
+        # Saves rewrite the file, so size/mtime/inode cover content changes
+        encoded = json.dumps([str(self.registry_path), stat.st_size, stat.st_mtime_ns, stat.st_ino, sorted(nodes)])
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
     def _load_from_file(self) -> dict[str, dict[str, Any]]:
         """Load registry from JSON file without auto-discovery.
 
@@ -0,0 +1,138 @@
+"""Per-item checkpoints for resumable batches (``batch.checkpoint``).
+
+A batch node writes its output only after every item has finished, and the
+workflow checkpoint in ``shared["__execution__"]`` is per node, so a batch
+that fails at item 4,800 of 5,000 (or whose process is killed) reruns all of
+its items. With ``checkpoint: true`` each item's result is appended to a file
+as soon as the item succeeds, and the next run of the batch (a rerun, a
+resumed run or a repair iteration) restores those items and only runs the
+missing and failed ones.
+
+- Files live in ``~/.pflow/cache/batch-checkpoints/``, one per batch node,
+  named by a hash of the node's id and params. Editing the node's params
+  starts a fresh checkpoint.
+- Items are keyed by a hash of the params they resolve to (see
+  ``PflowBatchNode._params_key``), so an item is only restored if it would
+  run exactly as before, including values from upstream nodes.
+- The file is append-only JSON lines. A line cut short by a killed process
+  is skipped on load.
+- The file is deleted once the batch finishes with no failed items, and
+  files untouched for ``MAX_CHECKPOINT_AGE_SECONDS`` are ignored and removed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Checkpoints older than this are stale: their run is not coming back
+MAX_CHECKPOINT_AGE_SECONDS = 7 * 24 * 3600
+
+
+def checkpoint_name(scope: Any) -> str:
+    """File name of a batch node's checkpoint (dict key order doesn't matter)."""
+    encoded = json.dumps(scope, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32] + ".jsonl"
+
+
+class BatchCheckpoint:
+    """Results of one batch node's finished items, as an append-only JSON lines file.
+
+    Args:
+        path: Checkpoint file
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Return saved results by item key (empty if there is no usable checkpoint)."""
+        try:
+            if time.time() - self.path.stat().st_mtime > MAX_CHECKPOINT_AGE_SECONDS:
+                self.discard()
+                return {}
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            return {}
+
+        results: dict[str, dict[str, Any]] = {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and isinstance(entry.get("key"), str) and isinstance(entry.get("result"), dict):
+                results[entry["key"]] = entry["result"]
+        return results
+
+    def save(self, key: str, result: dict[str, Any]) -> None:
+        """Append an item's result (thread-safe; results that aren't JSON are skipped)."""
+        try:
+            line = json.dumps({"key": key, "result": result}, separators=(",", ":")) + "\n"
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Batch item result not checkpointed: {e}")
+            return
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Results may hold fetched or generated content: readable by the user only
+                fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+                with os.fdopen(fd, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                logger.debug(f"Could not write batch checkpoint {self.path}: {e}")
+
+    def discard(self) -> None:
+        """Delete the checkpoint (the batch finished, or the checkpoint is stale)."""
+        with self._lock:
+            try:
+                self.path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.debug(f"Could not delete batch checkpoint {self.path}: {e}")
+
+
+class BatchCheckpoints:
+    """Directory of batch checkpoints.
+
+    Args:
+        directory: Where checkpoints are kept (default: ~/.pflow/cache/batch-checkpoints)
+    """
+
+    def __init__(self, directory: Optional[Path] = None) -> None:
+        self.directory = directory or Path.home() / ".pflow" / "cache" / "batch-checkpoints"
+        self._pruned = False
+
+    def open(self, scope: Any) -> BatchCheckpoint:
+        """Return the checkpoint of the batch node identified by ``scope``."""
+        if not self._pruned:
+            self._pruned = True
+            self._prune()
+        return BatchCheckpoint(self.directory / checkpoint_name(scope))
+
+    def _prune(self) -> None:
+        """Remove stale checkpoints left by batches that were never rerun."""
+        cutoff = time.time() - MAX_CHECKPOINT_AGE_SECONDS
+        try:
+            for path in self.directory.glob("*.jsonl"):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.debug(f"Could not prune batch checkpoints: {e}")
+
+
+_checkpoints: Optional[BatchCheckpoints] = None
+
+
+def get_batch_checkpoints() -> BatchCheckpoints:
+    """Return the process-wide checkpoint directory."""
+    global _checkpoints
+    if _checkpoints is None:
+        _checkpoints = BatchCheckpoints()
+    return _checkpoints
@@ -8,7 +8,9 @@ Key Design Decisions:
 - **Thread-safe retry**: Uses local `retry` variable instead of `self.cur_retry`
 - **Deep copy for parallel**: Each thread gets its own node chain copy to avoid
   TemplateAwareNodeWrapper race condition on `inner_node.params`
-- **Isolated context per item**: Each item gets `item_shared = dict(shared)`
+- **Isolated context per item**: Each item gets a shallow copy of `shared`
+  without the run's memory budget; the aggregated results are accounted once
+  in `post`
 
 IR Syntax:
     ```json
@@ -22,7 +24,9 @@ IR Syntax:
         "max_concurrent": 5,
         "max_retries": 3,
         "retry_wait": 1.0,
-        "error_handling": "continue"
+        "error_handling": "continue",
+        "dedupe": true,
+        "checkpoint": true
       },
       "params": {"prompt": "Summarize: ${file}"}
     }
@@ -48,6 +52,10 @@ Output Structure:
             "max_retries": 3,
             "retry_wait": 1.0,      # Only when > 0
             "execution_mode": "parallel",
+            "hedging": {...},       # Only with hedge: hedged, hedge_wins, wasted_ms, wasted_cost_usd
+            "deduplicated_count": 4,  # Only with dedupe: items that reused another item's result
+            "packing": {...},       # Only with pack: size, calls, packed_items, unpacked_items
+            "resumed_count": 4800,  # Only with checkpoint: items restored from an earlier run
             "timing": {
                 "total_items_ms": 234.56,
                 "avg_item_ms": 78.19,
@@ -71,15 +79,28 @@ Thread Safety:
 
 import contextlib
 import copy
+import hashlib
+import json
 import logging
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any
 
+from pflow.core.cancellation import CANCEL_TOKEN_KEY, CancellationToken, WorkflowCancelled, get_cancel_token
+from pflow.core.circuit_breaker import backoff_delay, get_circuit_breakers, is_retryable
 from pflow.core.json_utils import try_parse_json
 from pflow.pocketflow import Node
+from pflow.runtime.batch_checkpoint import BatchCheckpoint, get_batch_checkpoints
+from pflow.runtime.batch_scheduling import Attempt, HedgePolicy, Hedger, get_timing_history, longest_first, timing_key
+from pflow.runtime.llm_pack import LLM_PACK_KEY, PackedCalls
+from pflow.runtime.memory_budget import MEMORY_BUDGET_KEY, get_memory_budget
+from pflow.runtime.node_wrapper import TemplateAwareNodeWrapper
+from pflow.runtime.provider_batch import DEFAULT_POLL_INTERVAL, PROVIDER_BATCH_KEY, ProviderBatch
 from pflow.runtime.template_resolver import TemplateResolver
 
+if TYPE_CHECKING:
+    from pflow.runtime.batch_pipeline import BatchPipelineStage
+
 logger = logging.getLogger(__name__)
 
 
@@ -102,7 +123,16 @@ class PflowBatchNode(Node):
         parallel: Whether to execute items concurrently (default: False)
         max_concurrent: Maximum concurrent workers when parallel=True (default: 10)
         max_retries: Maximum retry attempts per item (default: 1, no retry)
-        retry_wait: Seconds to wait between retries (default: 0)
+        retry_wait: Seconds before the first retry, doubled per retry with jitter (default: 0)
+        submit: "realtime" (default) or "provider" to run llm items as one provider batch job
+        poll_interval: Seconds between provider job status checks (default: 30)
+        order: "input" (default) or "longest_first" to submit parallel items expected to take longest first
+        hedge: When to re-issue straggling parallel items (None: never); see pflow.runtime.batch_scheduling
+        dedupe: Run items whose resolved params are identical once and share the result (default: False)
+        pack: Answer up to this many llm items per model call (default: 1, no packing)
+        checkpoint: Save each finished item so a rerun only runs the rest (default: False)
+        feeds: Pipeline stage of the next batch node, fed each result as it completes
+        fed_by: This node's own pipeline stage, prefetched by the previous batch node
     """
 
     def __init__(self, inner_node: Any, node_id: str, batch_config: dict[str, Any]):
@@ -119,6 +149,13 @@ class PflowBatchNode(Node):
                 - max_concurrent (optional): Max workers when parallel (default: 10)
                 - max_retries (optional): Max retry attempts per item (default: 1)
                 - retry_wait (optional): Seconds between retries (default: 0)
+                - submit (optional): "realtime" or "provider" (default: "realtime")
+                - poll_interval (optional): Seconds between provider job checks (default: 30)
+                - order (optional): "input" or "longest_first" (default: "input")
+                - hedge (optional): true or {percentile, delay, max_hedges} (default: off)
+                - dedupe (optional): Run items with identical resolved params once (default: False)
+                - pack (optional): llm items answered per model call (default: 1)
+                - checkpoint (optional): Resume from items saved by an earlier run (default: False)
         """
         super().__init__()  # Initialize params, successors from BaseNode
         self.inner_node = inner_node
@@ -134,6 +171,39 @@ class PflowBatchNode(Node):
         self.max_concurrent = self._coerce_int(batch_config.get("max_concurrent", 10), "max_concurrent", default=10)
         self.max_retries = self._coerce_int(batch_config.get("max_retries", 1), "max_retries", default=1)
         self.retry_wait = self._coerce_float(batch_config.get("retry_wait", 0), "retry_wait", default=0.0)
+        self.submit = batch_config.get("submit", "realtime")
+        self.poll_interval = self._coerce_float(
+            batch_config.get("poll_interval", DEFAULT_POLL_INTERVAL), "poll_interval", default=DEFAULT_POLL_INTERVAL
+        )
+        self._provider_job_id: str | None = None
+
+        # Tail-latency controls for parallel items (see pflow.runtime.batch_scheduling)
+        self.order = batch_config.get("order", "input")
+        self.hedge = HedgePolicy.from_config(batch_config.get("hedge", False))
+        self._hedger: Hedger | None = None
+        self._hedge_stats: dict[str, Any] | None = None
+
+        # Items with identical resolved params run once (realtime batches only)
+        self.dedupe = self._coerce_bool(batch_config.get("dedupe", False), "dedupe", default=False)
+        self._deduplicated_count = 0
+
+        # Several llm items per model call (see pflow.runtime.llm_pack)
+        self.pack = self._coerce_int(batch_config.get("pack", 1), "pack", default=1)
+        self._pack_stats: dict[str, Any] | None = None
+
+        # Finished items saved to disk so reruns skip them (see pflow.runtime.batch_checkpoint)
+        self.checkpoint = self._coerce_bool(batch_config.get("checkpoint", False), "checkpoint", default=False)
+        self._checkpoint: BatchCheckpoint | None = None
+        self._item_keys: list[str | None] = []
+        self._resumed: dict[int, dict[str, Any]] = {}
+
+        # Item-level pipelining with adjacent batch nodes (linked by the compiler)
+        self.feeds: BatchPipelineStage | None = None
+        self.fed_by: BatchPipelineStage | None = None
+        self._pipelined = False
+
+        # Cancels this batch's in-flight parallel items (child of the run's token)
+        self._batch_token: CancellationToken | None = None
 
         # Instance state for current batch execution
         self._shared: dict[str, Any] = {}
@@ -341,6 +411,20 @@ class PflowBatchNode(Node):
             item_shared: The isolated shared store for this batch item
             idx: The index of this item in the batch (for tracing)
         """
+        llm_usage = self._item_llm_usage(item_shared)
+        if llm_usage:
+            # Copy the usage data and add batch context
+            llm_call_data = llm_usage.copy()
+            llm_call_data["node_id"] = self.node_id
+            llm_call_data["batch_item_index"] = idx
+
+            # Append to shared __llm_calls__ list (GIL-protected for thread safety)
+            llm_calls = self._shared.get("__llm_calls__")
+            if isinstance(llm_calls, list):
+                llm_calls.append(llm_call_data)
+
+    def _item_llm_usage(self, item_shared: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the llm_usage an item's inner node wrote, if any."""
         llm_usage = None
 
         # Check root level (for non-namespaced inner nodes)
@@ -350,16 +434,22 @@ class PflowBatchNode(Node):
         elif self.node_id in item_shared and isinstance(item_shared[self.node_id], dict):
             llm_usage = item_shared[self.node_id].get("llm_usage")
 
-        if llm_usage and isinstance(llm_usage, dict):
-            # Copy the usage data and add batch context
-            llm_call_data = llm_usage.copy()
-            llm_call_data["node_id"] = self.node_id
-            llm_call_data["batch_item_index"] = idx
+        return llm_usage if llm_usage and isinstance(llm_usage, dict) else None
 
-            # Append to shared __llm_calls__ list (GIL-protected for thread safety)
-            llm_calls = self._shared.get("__llm_calls__")
-            if isinstance(llm_calls, list):
-                llm_calls.append(llm_call_data)
+    def _item_store(self, idx: int, item: Any) -> dict[str, Any]:
+        """Return an isolated shared store for one item.
+
+        The copy shares ``__llm_calls__`` and the other run-wide objects, but
+        not the memory budget: item outputs are collected into ``results`` and
+        accounted (and spilled if need be) as a whole in ``post``. Spilling
+        inside an item would leave handles in ``results`` after the item's
+        store is discarded.
+        """
+        item_shared = {key: value for key, value in self._shared.items() if key != MEMORY_BUDGET_KEY}
+        item_shared[self.node_id] = {}
+        item_shared[self.item_alias] = item
+        item_shared["__index__"] = idx  # 0-based batch item index
+        return item_shared
 
     def _exec_single(self, idx: int, item: Any) -> tuple[dict[str, Any] | None, dict[str, Any] | None, float]:
         """Execute single item with thread-safe retry logic.
@@ -382,10 +472,7 @@ class PflowBatchNode(Node):
         for retry in range(self.max_retries):
             try:
                 # Create isolated context for this item
-                item_shared = dict(self._shared)
-                item_shared[self.node_id] = {}
-                item_shared[self.item_alias] = item
-                item_shared["__index__"] = idx  # 0-based batch item index
+                item_shared = self._item_store(idx, item)
 
                 # Execute inner node
                 self.inner_node._run(item_shared)
@@ -419,9 +506,10 @@ class PflowBatchNode(Node):
 
             except Exception as e:
                 last_exception = e
-                if retry < self.max_retries - 1:
+                # Errors marked retryable=False (open circuit, spent retry budget) aren't retried
+                if retry < self.max_retries - 1 and is_retryable(e):
                     if self.retry_wait > 0:
-                        time.sleep(self.retry_wait)
+                        time.sleep(backoff_delay(self.retry_wait, retry))
                     logger.debug(
                         f"Batch item {idx} retry {retry + 1}/{self.max_retries}: {e}",
                         extra={
@@ -500,9 +588,10 @@ class PflowBatchNode(Node):
 
             except Exception as e:
                 last_exception = e
-                if retry < self.max_retries - 1:
+                # Errors marked retryable=False (open circuit, spent retry budget) aren't retried
+                if retry < self.max_retries - 1 and is_retryable(e):
                     if self.retry_wait > 0:
-                        time.sleep(self.retry_wait)
+                        time.sleep(backoff_delay(self.retry_wait, retry))
                     logger.debug(
                         f"Batch item {idx} retry {retry + 1}/{self.max_retries}: {e}",
                         extra={
@@ -521,26 +610,34 @@ class PflowBatchNode(Node):
             duration_ms,
         )
 
-    def _exec_sequential(self, items: list[Any]) -> list[dict[str, Any] | None]:
+    def _exec_sequential(self, items: list[Any], indices: list[int] | None = None) -> list[dict[str, Any] | None]:
         """Execute items sequentially using _exec_single.
 
         Args:
             items: List of items to process
+            indices: Indices of the items to run (default: all); the others are left as None
 
         Returns:
             List of results in same order as input
         """
-        results: list[dict[str, Any] | None] = []
-        total = len(items)
+        results: list[dict[str, Any] | None] = [None] * len(items)
+        to_run = list(range(len(items))) if indices is None else indices
+        total = len(to_run)
 
         # Get progress callback from shared store for batch progress reporting
         callback = self._shared.get("__progress_callback__")
         depth = self._shared.get("_pflow_depth", 0)
 
-        for idx, item in enumerate(items):
+        token = get_cancel_token(self._shared)
+        for done, idx in enumerate(to_run):
+            item = items[idx]
+            self._check_cancelled(token, done, total)
             result, error, duration_ms = self._exec_single(idx, item)
-            results.append(result)
+            results[idx] = result
             self._item_timings.append(duration_ms)
+            self._save_item(idx, result, error)
+            if self.feeds is not None:
+                self.feeds.offer(idx, result)
 
             # Report batch progress after each item
             if callable(callback):
@@ -550,7 +647,7 @@ class PflowBatchNode(Node):
                         "batch_progress",
                         duration_ms,
                         depth,
-                        batch_current=idx + 1,
+                        batch_current=done + 1,
                         batch_total=total,
                         batch_success=(error is None),
                     )
@@ -577,10 +674,91 @@ class PflowBatchNode(Node):
         """
         self._errors = []
         self._item_timings = []
+        self._pipelined = False
+        self._hedge_stats = None
+        self._deduplicated_count = 0
+        self._pack_stats = None
+        self._checkpoint = None
+        self._item_keys = []
+        self._resumed = {}
+
+        try:
+            return self._exec_items(items)
+        except BaseException:
+            # Cancel whatever the next batch node already started from our results
+            if self.feeds is not None:
+                self.feeds.abort()
+            raise
+
+    def _exec_items(self, items: list[Any]) -> list[dict[str, Any] | None]:
+        """Dispatch to pipelined, provider, packed or real-time execution."""
+        # Items already started while the previous batch node was running
+        if self.fed_by is not None:
+            prefetched = self.fed_by.take(items)
+            if prefetched is not None:
+                return self._exec_prefetched(items, prefetched)
 
         if not items:
             return []
 
+        if self.submit == "provider":
+            return self._exec_provider(items)
+        if self.checkpoint:
+            self._resume(items)
+        results = self._exec_packed(items) if self.pack > 1 else self._exec_realtime(items)
+        if self._checkpoint is not None and not self._errors:
+            # Every item succeeded: nothing left to resume
+            self._checkpoint.discard()
+        return results
+
+    def _resume(self, items: list[Any]) -> None:
+        """Open this batch's checkpoint and restore the items an earlier run finished."""
+        # Templates, not resolved values, name the file; runtime params are skipped
+        scope = [self.node_id, {k: v for k, v in self.params.items() if not k.startswith("__")}]
+        self._checkpoint = get_batch_checkpoints().open(scope)
+        saved = self._checkpoint.load()
+
+        template_node = self._template_node()
+        self._item_keys = [self._params_key(template_node, idx, item) for idx, item in enumerate(items)]
+        self._resumed = {
+            idx: {**saved[key], "item": items[idx]}
+            for idx, key in enumerate(self._item_keys)
+            if key is not None and key in saved
+        }
+        if self._resumed:
+            logger.info(
+                f"Batch node '{self.node_id}' resuming: {len(self._resumed)} of {len(items)} items "
+                "restored from an earlier run",
+                extra={"node_id": self.node_id, "resumed_count": len(self._resumed)},
+            )
+
+    def _save_item(self, idx: int, result: dict[str, Any] | None, error: dict[str, Any] | None) -> None:
+        """Checkpoint a successful item (no-op unless the batch uses checkpoint)."""
+        if self._checkpoint is None or error is not None or result is None:
+            return
+        key = self._item_keys[idx]
+        if key is not None:
+            self._checkpoint.save(key, result)
+
+    def _exec_realtime(self, items: list[Any]) -> list[dict[str, Any] | None]:
+        """Run items in parallel or sequentially, one node run per (distinct) item."""
+        if self.feeds is not None:
+            self.feeds.start(self._shared)
+
+        duplicates = self._duplicate_groups(items) if self.dedupe else {}
+        indices = None
+        if duplicates:
+            skipped = {idx for group in duplicates.values() for idx in group}
+            indices = [idx for idx in range(len(items)) if idx not in skipped]
+            self._deduplicated_count = len(skipped)
+            logger.debug(
+                f"Batch node '{self.node_id}' running {len(indices)} unique items of {len(items)}",
+                extra={"node_id": self.node_id, "deduplicated_count": len(skipped)},
+            )
+        if self._resumed:
+            to_run = range(len(items)) if indices is None else indices
+            indices = [idx for idx in to_run if idx not in self._resumed]
+
         if self.parallel:
             logger.debug(
                 f"Batch node '{self.node_id}' executing {len(items)} items in parallel "
@@ -591,13 +769,172 @@ class PflowBatchNode(Node):
                     "max_concurrent": self.max_concurrent,
                 },
             )
-            return self._exec_parallel(items)
+            results = self._exec_parallel(items, indices)
         else:
             logger.debug(
                 f"Batch node '{self.node_id}' executing {len(items)} items sequentially",
                 extra={"node_id": self.node_id, "parallel": False},
             )
+            results = self._exec_sequential(items, indices)
+
+        for idx, result in self._resumed.items():
+            results[idx] = result
+        if duplicates:
+            self._fan_out(items, results, duplicates)
+        return results
+
+    def _duplicate_groups(self, items: list[Any]) -> dict[int, list[int]]:
+        """Group items whose inner node would run with identical resolved params.
+
+        Items are compared by the params they resolve to, not the items
+        themselves, so items that differ only in fields the node doesn't use
+        still match. Nodes without template params are compared by item.
+
+        Returns:
+            Index of the first item of each group mapped to the indices of its
+            later duplicates (groups without duplicates are left out)
+        """
+        template_node = self._template_node()
+        first_by_key: dict[str, int] = {}
+        groups: dict[int, list[int]] = {}
+        for idx, item in enumerate(items):
+            key = self._params_key(template_node, idx, item)
+            if key is None:
+                continue
+            first = first_by_key.setdefault(key, idx)
+            if first != idx:
+                groups.setdefault(first, []).append(idx)
+        return groups
+
+    def _params_key(self, template_node: TemplateAwareNodeWrapper | None, idx: int, item: Any) -> str | None:
+        """Hash of the params the inner node would run with for an item (None: always run it).
+
+        Used to find duplicate items and to match items against a checkpoint.
+        """
+        try:
+            if template_node is None or not template_node.template_params:
+                value = item
+            else:
+                context = dict(self._shared)
+                context[self.item_alias] = item
+                context["__index__"] = idx
+                value = template_node.preview_params(context)
+            encoded = json.dumps(value, sort_keys=True, default=str)
+        except Exception as e:
+            # Resolution errors surface when the item runs
+            logger.debug(f"Batch item {idx} not deduplicated or checkpointed: {e}", extra={"node_id": self.node_id})
+            return None
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def _template_node(self) -> TemplateAwareNodeWrapper | None:
+        """Find the template wrapper in the inner node chain."""
+        node = self.inner_node
+        while node is not None and not isinstance(node, TemplateAwareNodeWrapper):
+            # vars() avoids the wrappers' attribute delegation
+            attributes = vars(node)
+            node = attributes.get("inner_node", attributes.get("_inner_node"))
+        return node
+
+    def _fan_out(
+        self, items: list[Any], results: list[dict[str, Any] | None], duplicates: dict[int, list[int]]
+    ) -> None:
+        """Copy each first item's result and error to its duplicates, keeping their own item."""
+        for first, group in duplicates.items():
+            source = results[first]
+            for idx in group:
+                results[idx] = None if source is None else {**source, "item": items[idx]}
+        for error in [e for e in self._errors if e["index"] in duplicates]:
+            self._errors.extend({**error, "index": idx, "item": items[idx]} for idx in duplicates[error["index"]])
+
+    def _exec_provider(self, items: list[Any]) -> list[dict[str, Any] | None]:
+        """Execute llm items as one provider batch job (see pflow.runtime.provider_batch).
+
+        Items run through the node chain twice: once to collect resolved
+        requests, then, after the job finishes, to replay its results through
+        the node's normal post() so outputs match real-time execution.
+
+        Args:
+            items: List of items to process
+
+        Returns:
+            List of results in same order as input
+        """
+        provider_batch = ProviderBatch(self.node_id)
+        self._shared[PROVIDER_BATCH_KEY] = provider_batch
+        try:
+            for idx in self._collect_requests(items):
+                if not provider_batch.has_request(idx):
+                    raise ValueError(f"Batch '{self.node_id}': submit: provider is only supported for llm nodes")
+
+            logger.debug(
+                f"Batch node '{self.node_id}' submitting {len(items)} items as a provider batch job",
+                extra={"node_id": self.node_id, "submit": "provider"},
+            )
+            execution = self._shared.setdefault("__execution__", {})
+            self._provider_job_id = (
+                provider_batch.run(execution, poll_interval=self.poll_interval, token=get_cancel_token(self._shared))
+                or None
+            )
+
             return self._exec_sequential(items)
+        finally:
+            self._shared.pop(PROVIDER_BATCH_KEY, None)
+
+    def _exec_packed(self, items: list[Any]) -> list[dict[str, Any] | None]:
+        """Answer llm items several per model call (see pflow.runtime.llm_pack).
+
+        Items run through the node chain twice: once to collect resolved
+        requests, then, after the packed calls, to replay each answer through
+        the node's normal post(). Items left without an answer call the model
+        during the replay, with normal retries and error handling.
+
+        Args:
+            items: List of items to process
+
+        Returns:
+            List of results in same order as input
+        """
+        packed = PackedCalls(self.node_id, self.pack, get_circuit_breakers(self._shared))
+        self._shared[LLM_PACK_KEY] = packed
+        try:
+            self._collect_requests(items)
+            logger.debug(
+                f"Batch node '{self.node_id}' packing {len(items)} items, up to {self.pack} per call",
+                extra={"node_id": self.node_id, "pack": self.pack},
+            )
+            packed.run(max_workers=self.max_concurrent if self.parallel else 1, token=get_cancel_token(self._shared))
+            self._pack_stats = {
+                "size": self.pack,
+                "calls": packed.calls,
+                "packed_items": packed.packed_items,
+                "unpacked_items": len(items) - len(self._resumed) - packed.packed_items,
+            }
+            return self._exec_realtime(items)
+        finally:
+            self._shared.pop(LLM_PACK_KEY, None)
+
+    def _collect_requests(self, items: list[Any]) -> list[int]:
+        """Run every item through the node chain so the llm node records its resolved request.
+
+        Items restored from a checkpoint are skipped.
+
+        Returns:
+            Indices of the items that ran without raising
+        """
+        collected = []
+        for idx, item in enumerate(items):
+            if idx in self._resumed:
+                continue
+            item_shared = self._item_store(idx, item)
+            try:
+                self.inner_node._run(item_shared)
+            except Exception:
+                # The replay pass reports this item's error with normal retry/error handling
+                if self.error_handling == "fail_fast":
+                    raise
+                continue
+            collected.append(idx)
+        return collected
 
     def _collect_parallel_results(  # noqa: C901
         self,
@@ -677,8 +1014,7 @@ class PflowBatchNode(Node):
                     pending_errors.append(error)
                     if self.error_handling == "fail_fast":
                         should_stop = True
-                        for f in future_to_idx:
-                            f.cancel()
+                        self._stop_items(future_to_idx, idx)
 
             except Exception as e:
                 idx = future_to_idx[future]
@@ -705,12 +1041,23 @@ class PflowBatchNode(Node):
                         )
                 if self.error_handling == "fail_fast":
                     should_stop = True
-                    for f in future_to_idx:
-                        f.cancel()
+                    self._stop_items(future_to_idx, idx)
 
         return should_stop
 
-    def _exec_parallel(self, items: list[Any]) -> list[dict[str, Any] | None]:
+    def _stop_items(self, future_to_idx: dict, failed_idx: int) -> None:
+        """Cancel queued items and interrupt running ones after a fail_fast error."""
+        for f in future_to_idx:
+            f.cancel()
+        if self._batch_token is not None:
+            self._batch_token.cancel(f"batch '{self.node_id}' failed at item [{failed_idx}]")
+
+    def _check_cancelled(self, token: CancellationToken | None, done: int, total: int) -> None:
+        """Stop the batch if the run was cancelled, reporting how far it got."""
+        if token is not None and token.cancelled:
+            raise WorkflowCancelled(f"{token.reason} (batch '{self.node_id}' finished {done} of {total} items)")
+
+    def _exec_parallel(self, items: list[Any], indices: list[int] | None = None) -> list[dict[str, Any] | None]:
         """Execute items in parallel using ThreadPoolExecutor.
 
         Each thread gets:
@@ -722,26 +1069,105 @@ class PflowBatchNode(Node):
 
         Args:
             items: List of items to process
+            indices: Indices of the items to run (default: all); the others are left as None
 
         Returns:
             List of results in same order as input (preserves ordering)
 
         Note:
-            fail_fast cancellation only prevents new items from starting.
-            Already-running items will complete (LLM/HTTP calls can't be interrupted).
+            fail_fast cancels queued items and the batch's cancellation token,
+            which kills running shell commands and MCP servers and stops
+            streamed LLM responses. Non-streamed LLM and HTTP requests that are
+            already in flight complete, and their results are discarded.
+
+            With ``order: longest_first`` items are submitted by expected
+            duration, and with ``hedge`` straggling items are re-issued (see
+            pflow.runtime.batch_scheduling). Neither changes result order.
         """
         results: list[dict[str, Any] | None] = [None] * len(items)
         timings: list[float] = [0.0] * len(items)
         pending_errors: list[dict[str, Any]] = []
         should_stop = False
+        run_token = get_cancel_token(self._shared)
+        self._batch_token = CancellationToken(parent=run_token)
+
+        keys, expected_ms = self._recorded_timings(items)
+        order = longest_first(items, expected_ms) if self.order == "longest_first" else list(range(len(items)))
+        if indices is not None:
+            selected = set(indices)
+            order = [idx for idx in order if idx in selected]
+        if self.hedge is not None:
+            self._hedger = Hedger(self.hedge, len(order), self.max_concurrent, list(expected_ms.values()))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+                # Submit all items (the pool starts them in submission order)
+                future_to_idx = {executor.submit(self._process_item, idx, items[idx]): idx for idx in order}
+
+                # Collect results as they complete
+                should_stop = self._collect_parallel_results(
+                    future_to_idx, items, results, timings, pending_errors, should_stop
+                )
+        finally:
+            if self._hedger is not None:
+                self._hedger.shutdown()
+                self._hedge_stats = self._hedger.stats()
+                self._hedger = None
+
+        if keys:
+            failed = {error["index"] for error in pending_errors}
+            get_timing_history().record({
+                key: timings[idx] for idx, key in enumerate(keys) if idx not in failed and results[idx] is not None
+            })
+        self._check_cancelled(run_token, self._count_finished(order, pending_errors), len(order))
+        return self._finish_parallel(results, [timings[idx] for idx in order], pending_errors)
+
+    def _recorded_timings(self, items: list[Any]) -> tuple[list[str], dict[int, float]]:
+        """Look up item times from earlier runs when ordering or hedging uses them.
+
+        Returns:
+            Timing keys of the items (empty when neither is enabled) and the
+            recorded time of each item that has one, by index
+        """
+        if self.order != "longest_first" and self.hedge is None:
+            return [], {}
+        # Templates, not resolved values, so the key is stable across runs; runtime params are skipped
+        scope = [self.node_id, {k: v for k, v in self.params.items() if not k.startswith("__")}]
+        keys = [timing_key(scope, item) for item in items]
+        recorded = get_timing_history().lookup(keys)
+        return keys, {idx: recorded[key] for idx, key in enumerate(keys) if key in recorded}
+
+    def _process_item(self, idx: int, item: Any) -> tuple[int, dict[str, Any] | None, dict[str, Any] | None, float]:
+        """Process single item in a worker thread. Returns (index, result, error, duration_ms)."""
+        hedger = self._hedger
+        if hedger is not None:
+            result, error, duration_ms, _ = hedger.run(
+                lambda token: self._run_attempt(idx, item, token), self._batch_token
+            )
+        else:
+            result, error, duration_ms, _ = self._run_attempt(idx, item, self._batch_token)
+        self._save_item(idx, result, error)
+
+        # Hand the result straight to the next batch node instead of waiting for the whole batch
+        if self.feeds is not None:
+            self.feeds.offer(idx, result)
+        return (idx, result, error, duration_ms)
+
+    def _run_attempt(self, idx: int, item: Any, token: CancellationToken | None) -> Attempt:
+        """Run one attempt at an item on its own copy of the node chain.
+
+        Returns:
+            Tuple of (result, error, duration_ms, llm_usage)
+        """
+        # Create isolated shared store (shallow copy shares __llm_calls__)
+        item_shared = self._item_store(idx, item)
+        item_shared["__batch_concurrency__"] = self.max_concurrent  # Sizing hint for connection pools
+        if token is not None:
+            item_shared[CANCEL_TOKEN_KEY] = token
 
-        def process_item(idx: int, item: Any) -> tuple[int, dict[str, Any] | None, dict[str, Any] | None, float]:
-            """Process single item in thread. Returns (index, result, error, duration_ms)."""
-            # Create isolated shared store (shallow copy shares __llm_calls__)
-            item_shared = dict(self._shared)
-            item_shared[self.node_id] = {}
-            item_shared[self.item_alias] = item
-            item_shared["__index__"] = idx  # 0-based batch item index
+        try:
+            if token is not None:
+                token.raise_if_cancelled()
 
             # CRITICAL: Deep copy node chain to avoid TemplateAwareNodeWrapper race condition
             # Each thread gets its own copy of the wrapper chain
@@ -749,17 +1175,48 @@ class PflowBatchNode(Node):
 
             # Execute with thread-local node
             result, error, duration_ms = self._exec_single_with_node(idx, item, item_shared, thread_node)
-            return (idx, result, error, duration_ms)
+        except WorkflowCancelled as e:
+            error = {"index": idx, "item": item, "error": f"Cancelled: {e}", "exception": e, "cancelled": True}
+            return None, error, 0.0, None
+        return result, error, duration_ms, self._item_llm_usage(item_shared)
 
-        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
-            # Submit all items
-            future_to_idx = {executor.submit(process_item, idx, item): idx for idx, item in enumerate(items)}
+    def _exec_prefetched(self, items: list[Any], future_to_idx: dict[Future, int]) -> list[dict[str, Any] | None]:
+        """Collect items the pipeline started while the previous batch node was running.
 
-            # Collect results as they complete
-            should_stop = self._collect_parallel_results(
-                future_to_idx, items, results, timings, pending_errors, should_stop
-            )
+        Args:
+            items: List of items from prep() (the previous node's results)
+            future_to_idx: Prefetched futures from the pipeline stage
 
+        Returns:
+            List of results in same order as input
+        """
+        logger.debug(
+            f"Batch node '{self.node_id}' collecting {len(items)} pipelined items",
+            extra={"node_id": self.node_id, "pipelined": True},
+        )
+        self._pipelined = True
+        results: list[dict[str, Any] | None] = [None] * len(items)
+        timings: list[float] = [0.0] * len(items)
+        pending_errors: list[dict[str, Any]] = []
+        self._batch_token = self.fed_by.token if self.fed_by is not None else None
+        try:
+            self._collect_parallel_results(future_to_idx, items, results, timings, pending_errors, False)
+        finally:
+            if self.fed_by is not None:
+                self.fed_by.close()
+
+        self._check_cancelled(get_cancel_token(self._shared), self._count_finished(items, pending_errors), len(items))
+        return self._finish_parallel(results, timings, pending_errors)
+
+    @staticmethod
+    def _count_finished(items: list[Any], pending_errors: list[dict[str, Any]]) -> int:
+        """Count items that ran to completion (successfully or not) rather than being cancelled."""
+        return len(items) - sum(1 for error in pending_errors if error.get("cancelled"))
+
+    def _finish_parallel(
+        self, results: list[dict[str, Any] | None], timings: list[float], pending_errors: list[dict[str, Any]]
+    ) -> list[dict[str, Any] | None]:
+        """Record timings and errors of collected items, raising the first error in fail_fast mode."""
         # Store timings for batch metadata
         self._item_timings = timings
 
@@ -818,22 +1275,46 @@ class PflowBatchNode(Node):
                 "max_item_ms": round(max(self._item_timings), 2),
             }
 
-        # Write aggregated results to shared store
+        batch_metadata: dict[str, Any] = {
+            "parallel": self.parallel,
+            "max_concurrent": self.max_concurrent if self.parallel else None,
+            "max_retries": self.max_retries,
+            "retry_wait": self.retry_wait if self.retry_wait > 0 else None,
+            "execution_mode": "parallel" if self.parallel else "sequential",
+            "timing": timing_stats,
+        }
+        if self.submit == "provider":
+            batch_metadata["execution_mode"] = "provider"
+            batch_metadata["provider_job_id"] = self._provider_job_id
+        if self._pipelined:
+            batch_metadata["pipelined"] = True
+        if self.parallel and self.order == "longest_first":
+            batch_metadata["order"] = "longest_first"
+        if self._hedge_stats is not None:
+            batch_metadata["hedging"] = self._hedge_stats
+        if self.dedupe:
+            batch_metadata["deduplicated_count"] = self._deduplicated_count
+        if self._pack_stats is not None:
+            batch_metadata["packing"] = self._pack_stats
+        if self.checkpoint and self.submit != "provider":
+            batch_metadata["resumed_count"] = len(self._resumed)
+
+        # Write aggregated results to shared store, accounting them against the run's budget
+        results: Any = exec_res
+        budget = get_memory_budget(shared)
+        if budget is not None:
+            previous = shared.get(self.node_id)
+            results = budget.account(
+                self.node_id, exec_res, previous.get("results") if isinstance(previous, dict) else None
+            )
         shared[self.node_id] = {
-            "results": exec_res,
+            "results": results,
             "count": len(exec_res),
             "success_count": success_count,
             "error_count": len(self._errors),
             "errors": self._errors if self._errors else None,
             # Batch execution metadata for tracing/debugging
-            "batch_metadata": {
-                "parallel": self.parallel,
-                "max_concurrent": self.max_concurrent if self.parallel else None,
-                "max_retries": self.max_retries,
-                "retry_wait": self.retry_wait if self.retry_wait > 0 else None,
-                "execution_mode": "parallel" if self.parallel else "sequential",
-                "timing": timing_stats,
-            },
+            "batch_metadata": batch_metadata,
         }
 
         logger.debug(
@@ -0,0 +1,241 @@
+"""Item-level pipelining between consecutive batch nodes.
+
+When batch node B iterates over the results of batch node A
+(``"items": "${A.results}"``), B normally waits for every item of A, so the
+slowest item of A delays all of B. For such chains the compiler links A to a
+``BatchPipelineStage`` for B: as soon as an item of A completes, B starts
+processing it, and so on down longer chains (A -> B -> C).
+
+Results are unchanged. A still writes its full ``results`` array, B still
+resolves ``${A.results}`` when the flow reaches it, and B's results are
+assembled in item order. B only uses the prefetched items if the resolved
+array is exactly the one A produced; otherwise the stage is discarded and B
+runs as usual.
+
+A pair is pipelined when all of these hold:
+
+- both nodes are batch nodes that run in real time (not ``submit: provider``)
+  and run every item on its own (not ``dedupe: true`` or ``pack``)
+- B's ``batch.items`` is exactly ``${A.results}``
+- A's only edge leads to B and B's only incoming edge comes from A
+- B's params don't reference A (they can only see A's results via the item)
+- namespacing is enabled
+
+Prefetched items run at most ``max_concurrent`` at a time (one at a time for
+sequential batches) under the stage's own cancellation token. If A fails,
+prefetched work downstream is cancelled, including items already running.
+
+Configuration (environment variables):
+- PFLOW_PIPELINE_BATCHES: set to "0" to run chained batches one after another
+"""
+
+import copy
+import logging
+import os
+import re
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
+
+from pflow.core.cancellation import CancellationToken, get_cancel_token
+
+from .output_liveness import collect_strings, referenced_nodes
+
+logger = logging.getLogger(__name__)
+
+_RESULTS_TEMPLATE = re.compile(r"^\$\{\s*([A-Za-z_][\w-]*)\.results\s*\}$")
+
+
+def plan_batch_pipelines(ir_dict: dict[str, Any]) -> list[tuple[str, str]]:
+    """Find consecutive batch nodes whose items can flow through one by one.
+
+    Args:
+        ir_dict: Validated workflow IR
+
+    Returns:
+        (upstream, downstream) node id pairs to pipeline
+    """
+    if os.environ.get("PFLOW_PIPELINE_BATCHES", "1") == "0" or not ir_dict.get("enable_namespacing", True):
+        return []
+
+    nodes = {node["id"]: node for node in ir_dict.get("nodes", [])}
+    outgoing: dict[str, list[dict[str, Any]]] = {}
+    incoming: dict[str, list[dict[str, Any]]] = {}
+    for edge in ir_dict.get("edges", []):
+        source, target = edge.get("source") or edge.get("from"), edge.get("target") or edge.get("to")
+        outgoing.setdefault(source, []).append(edge)
+        incoming.setdefault(target, []).append(edge)
+
+    pairs = []
+    for node_id, node in nodes.items():
+        batch = node.get("batch")
+        if not _is_pipelinable_batch(batch):
+            continue
+        match = _RESULTS_TEMPLATE.match(batch["items"]) if isinstance(batch["items"], str) else None
+        upstream = match.group(1) if match else None
+        if upstream is None or upstream == node_id or not _is_pipelinable_batch(nodes.get(upstream, {}).get("batch")):
+            continue
+        edges_out, edges_in = outgoing.get(upstream, []), incoming.get(node_id, [])
+        if len(edges_out) != 1 or len(edges_in) != 1 or edges_out[0] is not edges_in[0]:
+            continue
+        if edges_out[0].get("action", "default") != "default":
+            continue
+        strings: list[str] = []
+        collect_strings(node.get("params", {}), strings)
+        if upstream in referenced_nodes(strings, set(nodes)):
+            continue
+        pairs.append((upstream, node_id))
+    return pairs
+
+
+def _is_pipelinable_batch(batch: Any) -> bool:
+    # Deduplicated and checkpointed batches skip items, so their results don't map one-to-one
+    # onto runs; packed batches need all their items before the first call
+    return (
+        isinstance(batch, dict)
+        and "items" in batch
+        and batch.get("submit", "realtime") != "provider"
+        and not batch.get("dedupe")
+        and not batch.get("checkpoint")
+        and batch.get("pack", 1) in (None, 1)
+    )
+
+
+class BatchPipelineStage:
+    """Runs a downstream batch node's items as its upstream batch produces them.
+
+    Shared by the upstream node (which offers items) and the downstream node
+    (which collects the prefetched results when the flow reaches it). Flow
+    copies nodes per step, so all run state lives here rather than on them.
+    """
+
+    def __init__(self, node: Any) -> None:
+        """Initialize the stage.
+
+        Args:
+            node: The downstream PflowBatchNode
+        """
+        self.node = node
+        self._lock = threading.Lock()
+        self._active = False
+        self._run_node: Any = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._items: dict[int, Any] = {}
+        self._futures: dict[int, Future] = {}
+        self._ready: deque[int] = deque()
+        self._in_flight = 0
+        self._workers = 1
+        self.token: Optional[CancellationToken] = None
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> "BatchPipelineStage":
+        # Run state is shared by every copy of the linked nodes
+        return self
+
+    def start(self, shared: dict[str, Any]) -> None:
+        """Begin accepting items for a new run (discarding any previous one).
+
+        Args:
+            shared: The workflow's shared store
+        """
+        self.abort()
+        completed = shared.get("__execution__", {}).get("completed_nodes", [])
+        if self.node.node_id in completed:
+            # Resumed run: the downstream node will be restored from its checkpoint
+            return
+
+        run_node = copy.copy(self.node)
+        run_node._shared = shared
+        run_node._batch_token = self.token = CancellationToken(parent=get_cancel_token(shared))
+        if "__llm_calls__" not in shared:
+            shared["__llm_calls__"] = []
+        with self._lock:
+            self._run_node = run_node
+            self._workers = self.node.max_concurrent if self.node.parallel else 1
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix=f"pflow-pipeline-{self.node.node_id}"
+            )
+            self._items, self._futures, self._ready, self._in_flight = {}, {}, deque(), 0
+            self._active = True
+        if self.node.feeds is not None:
+            self.node.feeds.start(shared)
+
+    def offer(self, idx: int, item: Any) -> None:
+        """Queue an upstream result for processing by the downstream node.
+
+        Args:
+            idx: Index of the item in the upstream batch
+            item: The upstream result (the downstream node's item)
+        """
+        with self._lock:
+            if not self._active:
+                return
+            self._items[idx] = item
+            self._futures[idx] = Future()
+            self._ready.append(idx)
+            self._pump()
+
+    def take(self, items: list[Any]) -> Optional[dict[Future, int]]:
+        """Hand prefetched work to the downstream node if it matches its items.
+
+        Args:
+            items: Items the downstream node resolved in prep()
+
+        Returns:
+            Mapping of futures to item indices, or None if the downstream node
+            must run its items itself
+        """
+        with self._lock:
+            matches = (
+                self._active
+                and len(self._items) == len(items)
+                and all(self._items.get(idx, _MISSING) is item for idx, item in enumerate(items))
+            )
+            if matches:
+                self._active = False
+                return {future: idx for idx, future in self._futures.items()}
+        self.abort()
+        return None
+
+    def close(self) -> None:
+        """Release the worker threads once all taken futures are done."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def abort(self) -> None:
+        """Cancel queued items and stop accepting new ones (cascades downstream)."""
+        with self._lock:
+            was_active, self._active = self._active, False
+            for future in self._futures.values():
+                future.cancel()
+            self._ready.clear()
+        if was_active and self.token is not None:
+            self.token.cancel(f"batch '{self.node.node_id}' stopped before its items were used")
+        self.close()
+        if was_active and self.node.feeds is not None:
+            self.node.feeds.abort()
+
+    def _pump(self) -> None:
+        """Submit ready items while fewer than the worker count are in flight (lock held)."""
+        while self._ready and self._in_flight < self._workers and self._executor is not None:
+            idx = self._ready.popleft()
+            self._in_flight += 1
+            self._executor.submit(self._process, idx)
+
+    def _process(self, idx: int) -> None:
+        future = self._futures[idx]
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._run_node._process_item(idx, self._items[idx]))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._pump()
+
+
+_MISSING = object()
@@ -0,0 +1,383 @@
+"""Tail-latency controls for parallel batches: longest-first order and hedging.
+
+A parallel batch finishes when its slowest item does, so a few stragglers
+set its completion time. Two opt-in batch settings go after them:
+
+- ``order: longest_first`` submits the items expected to take longest
+  first, so they don't start last and then run alone at the end. The
+  expected duration is the item's time in earlier runs, or its input size
+  when it has no history.
+- ``hedge`` re-issues an item whose call is still running after the p-th
+  percentile (default p95) of the item times seen so far, and keeps
+  whichever attempt finishes first. The other attempt is cancelled. Since
+  the call may run twice, only llm, http (idempotent methods) and MCP tools
+  their server marks read-only or idempotent can be hedged, and at most
+  ``max_hedges`` items are hedged per batch (default: 10% of the items).
+
+Item times are kept in ``~/.pflow/cache/batch-timings.json``, keyed by a hash
+of the batch node's id and params and the item, and only for batches that
+use either setting.
+
+Configuration (environment variables):
+- PFLOW_BATCH_TIMINGS: set to "0" to keep item times out of the disk cache
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable, Optional
+
+from pflow.core.cancellation import CancellationToken
+
+logger = logging.getLogger(__name__)
+
+# Item times kept on disk (least recently seen are dropped first)
+MAX_TIMING_ENTRIES = 20_000
+
+# Fraction of a batch's items that may be hedged when max_hedges isn't set
+DEFAULT_HEDGE_FRACTION = 0.1
+
+# Item times needed before the percentile delay is trusted
+MIN_HEDGE_SAMPLES = 5
+
+# How often a straggler re-checks the delay while samples are still coming in
+_HEDGE_POLL_SECONDS = 0.05
+
+# HTTP methods that are safe to send twice
+IDEMPOTENT_HTTP_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# (result, error, duration_ms, llm_usage) of one attempt at an item
+Attempt = tuple[Optional[dict[str, Any]], Optional[dict[str, Any]], float, Optional[dict[str, Any]]]
+
+
+def is_hedgeable(node_type: str) -> bool:
+    """Whether items of this node type may be hedged (their call may run twice)."""
+    return node_type in ("llm", "http") or node_type.startswith("mcp-")
+
+
+def is_repeatable_mcp_tool(interface: Optional[dict[str, Any]]) -> bool:
+    """Whether an MCP tool's server marks it safe to call twice (read-only or idempotent).
+
+    The hints are stored in the registry by ``pflow mcp sync``; tools without
+    them are assumed to have side effects.
+    """
+    annotations = ((interface or {}).get("mcp_metadata") or {}).get("annotations") or {}
+    return bool(annotations.get("readOnlyHint") or annotations.get("idempotentHint"))
+
+
+def timing_key(scope: Any, item: Any) -> str:
+    """Stable key for an item's timing (dict key order doesn't matter)."""
+    encoded = json.dumps([scope, item], sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()[:32]
+
+
+def item_size(item: Any) -> int:
+    """Input size of an item, the fallback estimate of how long it takes."""
+    if isinstance(item, (str, bytes)):
+        return len(item)
+    return len(json.dumps(item, default=str))
+
+
+def longest_first(items: list[Any], expected_ms: dict[int, float]) -> list[int]:
+    """Order item indices by expected duration, longest first.
+
+    Items without a recorded time are estimated from their input size, scaled
+    by the time per byte of the items that have one.
+
+    Args:
+        items: Batch items
+        expected_ms: Recorded time of items by index
+
+    Returns:
+        Item indices in submission order (ties keep input order)
+    """
+    sizes = [item_size(item) for item in items]
+    rates = [ms / sizes[idx] for idx, ms in expected_ms.items() if sizes[idx] > 0]
+    ms_per_unit = median(rates) if rates else 1.0
+
+    def estimate(idx: int) -> float:
+        return expected_ms.get(idx, sizes[idx] * ms_per_unit)
+
+    return sorted(range(len(items)), key=lambda idx: -estimate(idx))
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class TimingHistory:
+    """Per-item times from earlier runs, stored as one JSON file.
+
+    Args:
+        path: File to use (default: ~/.pflow/cache/batch-timings.json)
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or Path.home() / ".pflow" / "cache" / "batch-timings.json"
+        self._entries: Optional[dict[str, list[float]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return os.environ.get("PFLOW_BATCH_TIMINGS", "1") != "0"
+
+    def lookup(self, keys: list[str]) -> dict[str, float]:
+        """Return the recorded time (ms) of each key that has one."""
+        with self._lock:
+            entries = self._load()
+            return {key: entries[key][0] for key in keys if key in entries}
+
+    def record(self, timings: dict[str, float]) -> None:
+        """Blend new item times into the history and save it.
+
+        Args:
+            timings: Item time in ms by key
+        """
+        if not timings:
+            return
+        now = time.time()
+        with self._lock:
+            entries = self._load()
+            for key, ms in timings.items():
+                previous = entries.get(key)
+                # Smooth run-to-run noise while still following real changes
+                entries[key] = [ms if previous is None else (previous[0] + ms) / 2, now]
+            if len(entries) > MAX_TIMING_ENTRIES:
+                keep = sorted(entries.items(), key=lambda entry: entry[1][1])[-MAX_TIMING_ENTRIES:]
+                self._entries = entries = dict(keep)
+            self._save(entries)
+
+    def _load(self) -> dict[str, list[float]]:
+        if self._entries is None:
+            self._entries = {}
+            if self.enabled:
+                try:
+                    data = json.loads(self.path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    data = {}
+                if isinstance(data, dict):
+                    self._entries = {
+                        key: value
+                        for key, value in data.items()
+                        if isinstance(value, list)
+                        and len(value) == 2
+                        and all(isinstance(v, (int, float)) for v in value)
+                    }
+        return self._entries
+
+    def _save(self, entries: dict[str, list[float]]) -> None:
+        if not self.enabled:
+            return
+        temp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic replace: concurrent runs may save at the same time (last one wins)
+            fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".batch-timings.", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f, separators=(",", ":"))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Could not save batch timings: {e}")
+            if temp_path:
+                Path(temp_path).unlink(missing_ok=True)
+
+
+_timing_history: Optional[TimingHistory] = None
+
+
+def get_timing_history() -> TimingHistory:
+    """Return the process-wide item timing history."""
+    global _timing_history
+    if _timing_history is None:
+        _timing_history = TimingHistory()
+    return _timing_history
+
+
+class HedgePolicy:
+    """When to hedge a batch item, parsed from the ``hedge`` batch setting.
+
+    Args:
+        percentile: Hedge items still running after this percentile of item times
+        delay: Fixed delay in seconds (overrides percentile)
+        max_hedges: Maximum items hedged per batch (default: 10% of the items, at least 1)
+    """
+
+    def __init__(self, percentile: float = 95.0, delay: Optional[float] = None, max_hedges: Optional[int] = None):
+        self.percentile = percentile
+        self.delay = delay
+        self.max_hedges = max_hedges
+
+    @classmethod
+    def from_config(cls, value: Any) -> Optional["HedgePolicy"]:
+        """Parse ``hedge: true`` or ``hedge: {percentile, delay, max_hedges}`` (None when off)."""
+        if isinstance(value, dict):
+            delay = value.get("delay")
+            max_hedges = value.get("max_hedges")
+            return cls(
+                percentile=float(value.get("percentile", 95.0)),
+                delay=None if delay is None else float(delay),
+                max_hedges=None if max_hedges is None else int(max_hedges),
+            )
+        return cls() if value is True else None
+
+    def budget(self, item_count: int) -> int:
+        """Maximum number of items to hedge in a batch of item_count items."""
+        if self.max_hedges is not None:
+            return self.max_hedges
+        return max(1, math.ceil(item_count * DEFAULT_HEDGE_FRACTION))
+
+    def hedge_after(self, samples: list[float]) -> Optional[float]:
+        """Seconds after which a running item is hedged, or None until enough items finished."""
+        if self.delay is not None:
+            return self.delay
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        return percentile(samples, self.percentile) / 1000
+
+
+class Hedger:
+    """Runs a batch's items as a race between the first attempt and, if it straggles, a hedge.
+
+    Attempts run on the hedger's own threads, so the batch can move on as
+    soon as one attempt of an item finishes. The losing attempt is cancelled.
+    Calls that can't be interrupted finish in the background, and their
+    results are discarded.
+
+    Args:
+        policy: When to hedge
+        item_count: Items in the batch (sets the hedge budget)
+        workers: The batch's max_concurrent
+        seed_ms: Times of the batch's items from earlier runs, used until
+            enough items of this run have finished
+    """
+
+    def __init__(self, policy: HedgePolicy, item_count: int, workers: int, seed_ms: list[float]) -> None:
+        self.policy = policy
+        self._budget = policy.budget(item_count)
+        self._samples = list(seed_ms)
+        self._seeded = len(seed_ms)
+        self._lock = threading.Lock()
+        # Each hedge adds one attempt in flight, and may leave one loser finishing in the background
+        self._executor = ThreadPoolExecutor(max_workers=workers + 2 * self._budget, thread_name_prefix="pflow-hedge")
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.wasted_ms = 0.0
+        self.wasted_usage: list[dict[str, Any]] = []
+
+    def run(self, attempt: Callable[[CancellationToken], Attempt], parent: Optional[CancellationToken]) -> Attempt:
+        """Run one item, hedging it if it takes longer than the policy allows.
+
+        Args:
+            attempt: Runs the item once under the given cancellation token
+            parent: The batch's cancellation token
+
+        Returns:
+            The first successful attempt, or the first failed one if all failed
+        """
+        started = time.perf_counter()
+        launched: dict[Future, tuple[CancellationToken, float]] = {}
+
+        def launch() -> Future:
+            token = CancellationToken(parent=parent)
+            future = self._executor.submit(attempt, token)
+            launched[future] = (token, time.perf_counter())
+            return future
+
+        pending = {launch()}
+        hedge: Optional[Future] = None
+        finished: list[tuple[Future, Attempt]] = []
+        while pending:
+            timeout = None
+            if hedge is None:
+                delay = self._hedge_after()
+                timeout = _HEDGE_POLL_SECONDS if delay is None else max(0.0, delay - (time.perf_counter() - started))
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            finished.extend((future, future.result()) for future in done)
+            if any(result[1] is None for _, result in finished):
+                break
+            if hedge is None and pending and self._should_hedge(started):
+                hedge = launch()
+                pending.add(hedge)
+
+        # First success wins; if every attempt failed, report the first failure
+        winner, outcome = next(((f, result) for f, result in finished if result[1] is None), finished[0])
+        self._settle(launched, winner, outcome, hedge, started)
+        return outcome
+
+    def shutdown(self) -> None:
+        """Release the hedger's threads without waiting for cancelled losers."""
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Hedging summary for batch_metadata."""
+        from pflow.core.metrics import MetricsCollector
+
+        wasted_cost = None
+        if self.wasted_usage:
+            costs = MetricsCollector().calculate_costs(self.wasted_usage)
+            wasted_cost = costs["total_cost_usd"] if costs["pricing_available"] else costs.get("partial_cost_usd")
+        return {
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "budget": self._budget,
+            "wasted_ms": round(self.wasted_ms, 2),
+            "wasted_cost_usd": wasted_cost,
+        }
+
+    def _hedge_after(self) -> Optional[float]:
+        with self._lock:
+            return self.policy.hedge_after(self._samples)
+
+    def _should_hedge(self, started: float) -> bool:
+        delay = self._hedge_after()
+        if delay is None or time.perf_counter() - started < delay:
+            return False
+        with self._lock:
+            if self.hedged >= self._budget:
+                return False
+            self.hedged += 1
+        return True
+
+    def _settle(
+        self,
+        launched: dict[Future, tuple[CancellationToken, float]],
+        winner: Future,
+        outcome: Attempt,
+        hedge: Optional[Future],
+        started: float,
+    ) -> None:
+        """Cancel the losing attempt and record the item's time and hedging cost."""
+        now = time.perf_counter()
+        wasted = 0.0
+        for future, (token, launched_at) in launched.items():
+            if future is winner:
+                continue
+            token.cancel("hedged batch item: another attempt finished first")
+            future.cancel()
+            wasted += (now - launched_at) * 1000
+        with self._lock:
+            if outcome[1] is None:
+                self._samples.append((now - started) * 1000)
+                if self._seeded and len(self._samples) - self._seeded >= MIN_HEDGE_SAMPLES:
+                    # Enough items of this run finished: stop relying on earlier runs
+                    del self._samples[: self._seeded]
+                    self._seeded = 0
+            if hedge is None:
+                return
+            self.wasted_ms += wasted
+            if winner is hedge:
+                self.hedge_wins += 1
+            if outcome[3]:
+                # The duplicate sent the same request, so price it like the attempt that won
+                self.wasted_usage.append(outcome[3])
@@ -20,8 +20,10 @@ from pflow.core.validation_utils import get_parameter_validation_error, is_valid
 from pflow.pocketflow import BaseNode, Flow
 from pflow.registry import Registry
 
+from .batch_pipeline import BatchPipelineStage, plan_batch_pipelines
 from .namespaced_wrapper import NamespacedNodeWrapper
 from .node_wrapper import TemplateAwareNodeWrapper
+from .output_liveness import plan_output_readers, plan_output_release
 from .template_resolver import TemplateResolver
 from .template_validator import TemplateValidator, ValidationWarning
 from .workflow_validator import prepare_inputs, validate_ir_structure
@@ -682,6 +684,15 @@ def _create_single_node(
     if batch_config:
         from pflow.runtime.batch_node import PflowBatchNode
 
+        if batch_config.get("submit") == "provider":
+            _validate_batch_provider(node_id, node_type, batch_config)
+
+        if batch_config.get("hedge"):
+            _validate_batch_hedge(node_id, node_type, batch_config, params, interface_metadata)
+
+        if batch_config.get("pack", 1) != 1:
+            _validate_batch_pack(node_id, node_type, batch_config)
+
         logger.debug(
             f"Wrapping node '{node_id}' for batch processing",
             extra={
@@ -726,6 +737,105 @@ def _create_single_node(
     return node_instance
 
 
+def _validate_batch_provider(node_id: str, node_type: str, batch_config: dict[str, Any]) -> None:
+    """Check that a batch submitted as a provider job runs llm items without its own checkpoint.
+
+    Raises:
+        CompilationError: If the batch can't be submitted as a provider job
+    """
+    if node_type != "llm":
+        raise CompilationError(
+            f"batch.submit: provider is only supported for llm nodes, not '{node_type}'",
+            phase="node_instantiation",
+            node_id=node_id,
+            node_type=node_type,
+            suggestion="Remove 'submit: provider' to run this batch in real time",
+        )
+    if batch_config.get("checkpoint"):
+        raise CompilationError(
+            "batch.checkpoint can't be combined with submit: provider",
+            phase="node_instantiation",
+            node_id=node_id,
+            node_type=node_type,
+            suggestion="Remove 'checkpoint': provider jobs are already resumed from their job id",
+        )
+
+
+def _validate_batch_hedge(
+    node_id: str,
+    node_type: str,
+    batch_config: dict[str, Any],
+    params: dict[str, Any],
+    interface_metadata: Optional[dict[str, Any]] = None,
+) -> None:
+    """Check that a hedged batch runs in parallel and only repeats calls that are safe to send twice.
+
+    Raises:
+        CompilationError: If the batch can't be hedged
+    """
+    from pflow.runtime.batch_scheduling import IDEMPOTENT_HTTP_METHODS, is_hedgeable, is_repeatable_mcp_tool
+
+    if not batch_config.get("parallel"):
+        raise CompilationError(
+            "batch.hedge requires parallel: true",
+            phase="node_instantiation",
+            node_id=node_id,
+            node_type=node_type,
+            suggestion="Add 'parallel: true' to the batch, or remove 'hedge'",
+        )
+    if not is_hedgeable(node_type):
+        raise CompilationError(
+            f"batch.hedge is only supported for llm, http and MCP nodes, not '{node_type}'",
+            phase="node_instantiation",
+            node_id=node_id,
+            node_type=node_type,
+            suggestion="Remove 'hedge' from this batch",
+        )
+    if node_type == "http":
+        method = params.get("method") or ("POST" if params.get("body") else "GET")
+        # Templated methods are only known at runtime; hedging them is the author's call
+        if isinstance(method, str) and "${" not in method and method.upper() not in IDEMPOTENT_HTTP_METHODS:
+            raise CompilationError(
+                f"batch.hedge would send {method.upper()} requests twice",
+                phase="node_instantiation",
+                node_id=node_id,
+                node_type=node_type,
+                suggestion=f"Only hedge idempotent requests ({', '.join(sorted(IDEMPOTENT_HTTP_METHODS))})",
+            )
+    if node_type.startswith("mcp-") and not is_repeatable_mcp_tool(interface_metadata):
+        raise CompilationError(
+            f"batch.hedge would call MCP tool '{node_type}' twice, and its server doesn't mark it read-only or idempotent",
+            phase="node_instantiation",
+            node_id=node_id,
+            node_type=node_type,
+            suggestion="Remove 'hedge' from this batch (run 'pflow mcp sync' if the server has since added the hints)",
+        )
+
+
+def _validate_batch_pack(node_id: str, node_type: str, batch_config: dict[str, Any]) -> None:
+    """Check that a packed batch runs llm items in real time.
+
+    Raises:
+        CompilationError: If the batch can't be packed
+    """
+    if node_type != "llm":
+        raise CompilationError(
+            f"batch.pack is only supported for llm nodes, not '{node_type}'",
+            phase="node_instantiation",
+            node_id=node_id,
+            node_type=node_type,
+            suggestion="Remove 'pack' from this batch",
+        )
+    if batch_config.get("submit") == "provider":
+        raise CompilationError(
+            "batch.pack can't be combined with submit: provider",
+            phase="node_instantiation",
+            node_id=node_id,
+            node_type=node_type,
+            suggestion="Use either 'pack' or 'submit: provider'",
+        )
+
+
 def _instantiate_nodes(
     ir_dict: dict[str, Any],
     registry: Registry,
@@ -787,6 +897,29 @@ def _instantiate_nodes(
                 e.node_id = node_id
             raise
 
+    # Drop outputs from the shared store once no later node or declared output reads them
+    release_plan = plan_output_release(ir_dict)
+    if release_plan:
+        for node_id, producers in release_plan.items():
+            nodes[node_id].release_after = producers
+
+    # A resumed run re-executes a node whose outputs were released only if a node that still runs reads them
+    readers, pinned = plan_output_readers(ir_dict)
+    for producer, reader_ids in readers.items():
+        nodes[producer].read_by = tuple(nodes[reader_id] for reader_id in reader_ids)
+    for producer in pinned:
+        nodes[producer].output_pinned = True
+
+    # Let items of chained batch nodes flow through as soon as each one is ready
+    for upstream, downstream in plan_batch_pipelines(ir_dict):
+        stage = BatchPipelineStage(nodes[downstream].inner_node)
+        nodes[upstream].inner_node.feeds = stage
+        nodes[downstream].inner_node.fed_by = stage
+        logger.debug(
+            f"Pipelining batch items from '{upstream}' into '{downstream}'",
+            extra={"phase": "node_instantiation", "node_id": downstream},
+        )
+
     logger.debug(
         "Node instantiation complete",
         extra={"phase": "node_instantiation", "node_count": len(nodes)},
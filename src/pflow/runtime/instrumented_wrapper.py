@@ -5,7 +5,12 @@ import hashlib
 import json
 import logging
 import time
-from typing import Any, Optional, cast
+from typing import Any, Callable, Optional, cast
+
+from pflow.core.cancellation import WorkflowCancelled, get_cancel_token
+from pflow.runtime.batch_node import PflowBatchNode
+from pflow.runtime.memory_budget import get_memory_budget
+from pflow.runtime.output_liveness import release_outputs
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +42,11 @@ class InstrumentedNodeWrapper:
         self.node_id = node_id
         self.metrics = metrics_collector
         self.trace = trace_collector
+        # Producers whose outputs are dead once this node completes (set by the compiler)
+        self.release_after: tuple[str, ...] = ()
+        # Wrappers of the nodes that read this node's outputs, and whether a declared output does (set by the compiler)
+        self.read_by: tuple[InstrumentedNodeWrapper, ...] = ()
+        self.output_pinned = False
 
         # Copy Flow-required attributes from inner node
         if hasattr(inner_node, "successors"):
@@ -389,6 +399,7 @@ class InstrumentedNodeWrapper:
         shared_after: dict[str, Any],
         success: bool,
         error: str | None = None,
+        bytes_written: int | None = None,
     ) -> None:
         """Record execution trace if collector is present.
 
@@ -398,6 +409,7 @@ class InstrumentedNodeWrapper:
             shared_after: Shared store state after execution
             success: Whether execution succeeded
             error: Error message if execution failed
+            bytes_written: Estimated bytes the node wrote to the shared store
         """
         if not self.trace:
             return
@@ -417,8 +429,28 @@ class InstrumentedNodeWrapper:
             success=success,
             error=error,
             template_resolutions=template_resolutions,
+            bytes_written=bytes_written,
         )
 
+    def _record_bytes_written(self, shared: dict[str, Any], written_before: int, is_planner: bool) -> int | None:
+        """Record the bytes this node wrote to the shared store in metrics.
+
+        Args:
+            shared: The shared store
+            written_before: Bytes accounted to this node before it ran
+            is_planner: Whether this is a planner node
+
+        Returns:
+            Bytes written during this run, or None if the store isn't accounted
+        """
+        budget = get_memory_budget(shared)
+        if budget is None:
+            return None
+        bytes_written = budget.bytes_written(self.node_id) - written_before
+        if self.metrics and not is_planner:
+            self.metrics.record_node_bytes_written(self.node_id, bytes_written)
+        return bytes_written
+
     def _compute_node_config(self) -> dict[str, Any]:
         """Compute the configuration dictionary for the node.
 
@@ -566,6 +598,16 @@ class InstrumentedNodeWrapper:
         if self.node_id not in shared["__execution__"]["completed_nodes"]:
             return False, None
 
+        released = shared["__execution__"].get("released_outputs", [])
+        if self.node_id in released and self._released_outputs_needed(shared, set()):
+            # Outputs were dropped after their last consumer, but a node that still runs reads them
+            logger.debug(f"Node {self.node_id} outputs were released and are read again, re-executing")
+            released.remove(self.node_id)
+            shared["__execution__"]["completed_nodes"].remove(self.node_id)
+            shared["__execution__"]["node_actions"].pop(self.node_id, None)
+            shared["__execution__"]["node_hashes"].pop(self.node_id, None)
+            return False, None
+
         # Validate cache using configuration hash
         node_config = self._compute_node_config()
         current_hash = self._compute_config_hash(node_config)
@@ -581,6 +623,27 @@ class InstrumentedNodeWrapper:
             self._invalidate_cache(shared)
             return False, None
 
+    def _released_outputs_needed(self, shared: dict[str, Any], seen: set[str]) -> bool:
+        """Whether a declared output or a node that will (re-)execute reads this node's outputs.
+
+        Args:
+            shared: The shared store for inter-node communication
+            seen: Node ids already checked (guards against cycles)
+        """
+        seen.add(self.node_id)
+        return self.output_pinned or any(
+            reader._will_execute(shared, seen) for reader in self.read_by if reader.node_id not in seen
+        )
+
+    def _will_execute(self, shared: dict[str, Any], seen: set[str]) -> bool:
+        """Whether this node runs in the current run rather than reusing its checkpointed result."""
+        execution = shared["__execution__"]
+        if self.node_id not in execution["completed_nodes"]:
+            return True
+        if execution["node_hashes"].get(self.node_id) != self._compute_config_hash(self._compute_node_config()):
+            return True
+        return self.node_id in execution.get("released_outputs", []) and self._released_outputs_needed(shared, seen)
+
     def _invalidate_cache(self, shared: dict[str, Any]) -> None:
         """Invalidate cached node data.
 
@@ -592,7 +655,10 @@ class InstrumentedNodeWrapper:
             shared["__modified_nodes__"] = []
         shared["__modified_nodes__"].append(self.node_id)
 
-        # Clear cache entries
+        # Clear cache entries (the re-run's outputs can be released again)
+        released = shared["__execution__"].get("released_outputs", [])
+        if self.node_id in released:
+            released.remove(self.node_id)
         shared["__execution__"]["completed_nodes"].remove(self.node_id)
         shared["__execution__"]["node_actions"].pop(self.node_id, None)
         shared["__execution__"]["node_hashes"].pop(self.node_id, None)
@@ -650,6 +716,11 @@ class InstrumentedNodeWrapper:
         if is_cached:
             return self._handle_cached_execution(shared, cached_action)
 
+        # Don't start nodes once the run is cancelled
+        token = get_cancel_token(shared)
+        if token is not None:
+            token.raise_if_cancelled()
+
         # Call progress callback for node start if present
         callback = shared.get("__progress_callback__")
         if callable(callback):
@@ -658,6 +729,10 @@ class InstrumentedNodeWrapper:
             with contextlib.suppress(Exception):
                 callback(self.node_id, "node_start", None, depth)
 
+        previous_stream_callback = self._install_stream_callback(shared, callback)
+        budget = get_memory_budget(shared)
+        written_before = budget.bytes_written(self.node_id) if budget else 0
+
         try:
             # Execute the inner node
             result = self.inner_node._run(shared)
@@ -676,6 +751,7 @@ class InstrumentedNodeWrapper:
             # Record metrics if collector present
             if self.metrics:
                 self.metrics.record_node_execution(self.node_id, duration_ms, is_planner=is_planner)
+            bytes_written = self._record_bytes_written(shared, written_before, is_planner)
 
             # Capture LLM usage if present
             self._capture_llm_usage(shared, shared_before, duration_ms, is_planner)
@@ -686,22 +762,31 @@ class InstrumentedNodeWrapper:
             # Record trace if collector present
             # Node returning "error" action is a failure, regardless of API warning detection
             trace_success = result != "error"
-            self._record_trace(duration_ms, shared_before, dict(shared), success=trace_success)
+            self._record_trace(
+                duration_ms, shared_before, dict(shared), success=trace_success, bytes_written=bytes_written
+            )
 
             # Call progress callback for node complete if present
             self._call_completion_callback(shared, callback, result, duration_ms)
 
+            # Free outputs no later node or declared output reads
+            if self.release_after and result != "error":
+                release_outputs(shared, self.release_after)
+
             return result
 
-        except Exception as e:
+        except (Exception, WorkflowCancelled) as e:
             # Still record metrics and trace on failure
             duration_ms = (time.perf_counter() - start_time) * 1000
 
             if self.metrics:
                 self.metrics.record_node_execution(self.node_id, duration_ms, is_planner=is_planner)
+            bytes_written = self._record_bytes_written(shared, written_before, is_planner)
 
             # Record trace with error
-            self._record_trace(duration_ms, shared_before, dict(shared), success=False, error=str(e))
+            self._record_trace(
+                duration_ms, shared_before, dict(shared), success=False, error=str(e), bytes_written=bytes_written
+            )
 
             # Record failure in checkpoint
             shared["__execution__"]["failed_node"] = self.node_id
@@ -709,6 +794,41 @@ class InstrumentedNodeWrapper:
             # Re-raise the exception
             raise
 
+        finally:
+            self._restore_stream_callback(shared, previous_stream_callback)
+
+    def _install_stream_callback(self, shared: dict[str, Any], callback: Optional[Any]) -> Optional[Any]:
+        """Expose a per-node ``__stream_callback__`` for nodes that stream output.
+
+        Streaming nodes (e.g. llm with stream: true) call it with each text
+        chunk; chunks are forwarded to the progress callback as ``node_stream``
+        events. Batch nodes get none: interleaved chunks from many items are noise.
+
+        Returns:
+            The previous value, for _restore_stream_callback
+        """
+        previous = shared.get("__stream_callback__")
+        if not callable(callback) or isinstance(self.inner_node, PflowBatchNode):
+            shared.pop("__stream_callback__", None)
+            return previous
+
+        depth = shared.get("_pflow_depth", 0)
+        node_id = self.node_id
+
+        def stream_callback(text: str) -> None:
+            with contextlib.suppress(Exception):
+                callback(node_id, "node_stream", None, depth, text_chunk=text)
+
+        shared["__stream_callback__"] = stream_callback
+        return previous
+
+    @staticmethod
+    def _restore_stream_callback(shared: dict[str, Any], previous: Optional[Callable[[str], None]]) -> None:
+        if previous is None:
+            shared.pop("__stream_callback__", None)
+        else:
+            shared["__stream_callback__"] = previous
+
     def _get_actual_node_class(self) -> type:
         """Get the actual node class by traversing the wrapper chain.
 
@@ -1195,6 +1315,9 @@ class InstrumentedNodeWrapper:
         import copy
 
         new_wrapper = type(self)(copy.copy(self.inner_node), self.node_id, self.metrics, self.trace)
+        new_wrapper.release_after = self.release_after
+        new_wrapper.read_by = self.read_by
+        new_wrapper.output_pinned = self.output_pinned
         if hasattr(self, "successors"):
             new_wrapper.successors = self.successors.copy()
         if hasattr(self, "params"):
@@ -1211,6 +1334,9 @@ class InstrumentedNodeWrapper:
             self.metrics,  # Don't deep copy collectors
             self.trace,  # Don't deep copy collectors
         )
+        new_wrapper.release_after = self.release_after
+        new_wrapper.read_by = self.read_by
+        new_wrapper.output_pinned = self.output_pinned
         if hasattr(self, "successors"):
             new_wrapper.successors = copy.deepcopy(self.successors, memo)
         if hasattr(self, "params"):
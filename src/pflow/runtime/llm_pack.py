@@ -0,0 +1,278 @@
+"""Packing several batch items into one llm call (``batch.pack``).
+
+Short per-item prompts (classify a commit message, tag an issue) pay the
+request overhead and the repeated system prompt once per item. With
+``pack: K`` the batch node sends the prompts of K items as one request and
+splits the JSON array in the answer back into per-item responses:
+
+1. Collect: the batch node runs every item through the normal node chain with
+   a ``PackedCalls`` installed at ``shared["__llm_pack__"]``. The llm node sees
+   it and records its fully resolved request instead of calling the model.
+2. Call: requests with the same model, system prompt, temperature and
+   max_tokens are grouped K at a time into one prompt that asks for a JSON
+   array with one answer per item.
+3. Replay: items run through the chain again. The llm node takes its answer
+   from the packed call, so ``results`` has the same shape as a normal batch.
+   Items without a usable answer (the call failed, the answer didn't parse,
+   the item had images) make their own call as usual.
+
+Token usage of a packed call is split evenly across the items it answered,
+so cost metrics stay comparable with unpacked runs.
+"""
+
+import functools
+import json
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from pflow.core.cancellation import CancellationToken
+from pflow.core.circuit_breaker import CircuitBreakers, guarded_call
+from pflow.core.json_utils import try_parse_json
+
+logger = logging.getLogger(__name__)
+
+# Shared-store key the llm node looks for during collect/replay
+LLM_PACK_KEY = "__llm_pack__"
+
+PACK_INSTRUCTIONS = (
+    "You will answer {count} independent tasks in one response. Treat each task as if it were the only "
+    "one: follow the instructions you were given for each task separately, and never let one task "
+    "affect the answer to another."
+)
+
+ANSWER_FORMAT = (
+    'Respond with only a JSON array holding one object per task, in task order: [{{"id": 1, "answer": ...}}, ...]. '
+    "Each answer is exactly what you would have replied to that task on its own, as a string "
+    "(or as JSON if the task asks for JSON). Include all {count} tasks."
+)
+
+
+@dataclass(frozen=True)
+class PackedRequest:
+    """One resolved llm call, as recorded by the llm node."""
+
+    model: str
+    prompt: str
+    system: Optional[str] = None
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+
+    def group_key(self) -> tuple[Any, ...]:
+        """Requests can share a call only if everything but the prompt matches."""
+        return (self.model, self.system, self.temperature, self.max_tokens)
+
+
+# (request) -> (response text, usage dict)
+PackedCall = Callable[[PackedRequest], tuple[str, dict[str, Any]]]
+
+
+def build_prompt(prompts: list[str]) -> str:
+    """Combine item prompts into one prompt asking for a JSON array of answers."""
+    tasks = "\n\n".join(f'<task id="{number}">\n{prompt}\n</task>' for number, prompt in enumerate(prompts, 1))
+    count = len(prompts)
+    return f"{PACK_INSTRUCTIONS.format(count=count)}\n\n{tasks}\n\n{ANSWER_FORMAT.format(count=count)}"
+
+
+def parse_answers(text: str, count: int) -> list[Optional[str]]:
+    """Split a packed response into per-task answers.
+
+    Accepts the requested ``[{"id": n, "answer": ...}]`` form, or a plain array
+    of exactly ``count`` answers. Answers that aren't strings are returned as
+    JSON text, like an llm response that contains JSON.
+
+    Returns:
+        One entry per task; None where the task has no usable answer
+    """
+    answers: list[Optional[str]] = [None] * count
+    parsed_ok, parsed = try_parse_json(_strip_code_fence(text))
+    if not parsed_ok or not isinstance(parsed, list):
+        return answers
+
+    if parsed and all(isinstance(entry, dict) and "id" in entry for entry in parsed):
+        for entry in parsed:
+            number = entry["id"]
+            if isinstance(number, str) and number.isdigit():
+                number = int(number)
+            if isinstance(number, int) and 1 <= number <= count and answers[number - 1] is None:
+                answers[number - 1] = _answer_text(entry.get("answer"))
+    elif len(parsed) == count:
+        answers = [_answer_text(entry) for entry in parsed]
+    return answers
+
+
+def _strip_code_fence(text: str) -> str:
+    trimmed = text.strip()
+    if trimmed.startswith("```") and trimmed.endswith("```") and "\n" in trimmed:
+        return trimmed[trimmed.find("\n") + 1 : trimmed.rfind("```")].strip()
+    return trimmed
+
+
+def _answer_text(answer: Any) -> Optional[str]:
+    if answer is None:
+        return None
+    if isinstance(answer, str):
+        return answer
+    return json.dumps(answer, ensure_ascii=False)
+
+
+def split_usage(usage: dict[str, Any], count: int) -> list[dict[str, Any]]:
+    """Divide a packed call's token counts across its items (remainders go to the first items)."""
+    shares: list[dict[str, Any]] = [{} for _ in range(count)]
+    for key, value in usage.items():
+        if not isinstance(value, int) or isinstance(value, bool):
+            continue
+        base, remainder = divmod(value, count)
+        for position, share in enumerate(shares):
+            share[key] = base + (1 if position < remainder else 0)
+    return shares
+
+
+def call_model(request: PackedRequest, breakers: Optional[CircuitBreakers] = None) -> tuple[str, dict[str, Any]]:
+    """Send a packed request with the llm library (the default ``PackedCall``).
+
+    Args:
+        request: Packed request
+        breakers: The run's circuit breakers (default: the process-wide registry)
+    """
+    import llm
+
+    from pflow.core.concurrency import concurrency_slot, llm_pool
+
+    kwargs: dict[str, Any] = {}
+    if request.system is not None:
+        kwargs["system"] = request.system
+    if request.temperature is not None:
+        kwargs["temperature"] = request.temperature
+    if request.max_tokens is not None:
+        kwargs["max_tokens"] = request.max_tokens
+
+    model = llm.get_model(request.model)
+    with guarded_call(f"llm:{request.model}", breakers), concurrency_slot(llm_pool(request.model)):
+        response = model.prompt(request.prompt, **kwargs)
+        text = response.text()
+        usage = response.usage()
+
+    if usage is None:
+        return text, {}
+    details = getattr(usage, "details", None) or {}
+    return text, {
+        "input_tokens": usage.input or 0,
+        "output_tokens": usage.output or 0,
+        "cache_creation_input_tokens": details.get("cache_creation_input_tokens", 0),
+        "cache_read_input_tokens": details.get("cache_read_input_tokens", 0),
+    }
+
+
+class PackedCalls:
+    """Collects requests from batch items, answers them K per call and serves the answers.
+
+    Installed in the shared store at LLM_PACK_KEY by the batch node. The llm
+    node calls ``add_request`` while ``collecting`` is True and ``get_answer``
+    afterwards; both are keyed by the item's ``__index__``.
+
+    Args:
+        node_id: Batch node id (used in logs)
+        size: Maximum number of items per call
+        breakers: The run's circuit breakers, for the default ``call_model``
+    """
+
+    def __init__(self, node_id: str, size: int, breakers: Optional[CircuitBreakers] = None) -> None:
+        self.node_id = node_id
+        self.size = size
+        self.breakers = breakers
+        self.collecting = True
+        self.calls = 0
+        self._requests: dict[int, PackedRequest] = {}
+        self._answers: dict[int, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add_request(self, index: int, request: dict[str, Any]) -> None:
+        """Record the resolved request for a batch item (collect phase)."""
+        self._requests[index] = PackedRequest(**request)
+
+    def get_answer(self, index: int) -> Optional[dict[str, Any]]:
+        """Return ``{"text", "usage"}`` for a batch item, or None if it must make its own call."""
+        return self._answers.get(index)
+
+    @property
+    def packed_items(self) -> int:
+        """Number of items answered by packed calls."""
+        return len(self._answers)
+
+    def groups(self) -> list[list[int]]:
+        """Item indices per call: compatible requests in input order, at most ``size`` per call."""
+        by_key: dict[tuple[Any, ...], list[int]] = {}
+        for index in sorted(self._requests):
+            by_key.setdefault(self._requests[index].group_key(), []).append(index)
+        return [
+            indices[start : start + self.size]
+            for indices in by_key.values()
+            for start in range(0, len(indices), self.size)
+        ]
+
+    def run(
+        self,
+        call: Optional[PackedCall] = None,
+        max_workers: int = 1,
+        token: Optional[CancellationToken] = None,
+    ) -> None:
+        """Send the packed calls and store the answers.
+
+        Args:
+            call: Sends one request (default: ``call_model`` with the run's circuit breakers)
+            max_workers: Packed calls to run at once
+            token: Stops sending further calls once cancelled
+
+        Raises:
+            WorkflowCancelled: If the token was cancelled
+        """
+        self.collecting = False
+        send: PackedCall = call or functools.partial(call_model, breakers=self.breakers)
+        # A group of one gains nothing from packing; the item makes its own call
+        groups = [group for group in self.groups() if len(group) > 1]
+        if not groups:
+            return
+
+        def run_group(indices: list[int]) -> None:
+            if token is not None:
+                token.raise_if_cancelled()
+            self._run_group(indices, send)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(groups)))) as executor:
+            for future in [executor.submit(run_group, group) for group in groups]:
+                future.result()
+
+    def _run_group(self, indices: list[int], call: PackedCall) -> None:
+        first = self._requests[indices[0]]
+        request = PackedRequest(
+            model=first.model,
+            prompt=build_prompt([self._requests[index].prompt for index in indices]),
+            system=first.system,
+            temperature=first.temperature,
+            max_tokens=first.max_tokens * len(indices) if first.max_tokens else None,
+        )
+        try:
+            text, usage = call(request)
+        except Exception as e:
+            logger.warning(
+                f"Batch '{self.node_id}': packed call for {len(indices)} items failed, calling them one by one: {e}"
+            )
+            return
+
+        answers = parse_answers(text, len(indices))
+        answered = [(index, answer) for index, answer in zip(indices, answers) if answer is not None]
+        if len(answered) < len(indices):
+            logger.debug(
+                f"Batch '{self.node_id}': {len(indices) - len(answered)} of {len(indices)} packed answers "
+                "missing or unparseable, calling those items one by one",
+                extra={"node_id": self.node_id},
+            )
+        shares = split_usage(usage, len(answered)) if answered else []
+        with self._lock:
+            self.calls += 1
+            for (index, answer), share in zip(answered, shares):
+                self._answers[index] = {"text": answer, "usage": share}
@@ -0,0 +1,250 @@
+"""Size accounting and an optional memory budget for the shared store.
+
+Every value a node writes through ``NamespacedSharedStore`` is sized once,
+when it is written, and the total is kept up to date. The sizes feed
+per-node "bytes written" into metrics and traces.
+
+When a per-run budget is configured and a write would take the store over
+it, large values are spilled to a temporary file and replaced by a
+``SpilledValue`` handle. Handles are loaded back transparently wherever
+values leave the store (the namespaced store, template resolution of single
+keys and whole namespaces, declared outputs, traces and JSON output), so
+nodes, templates and users never see them. Spill files are
+deleted when the run's budget is garbage collected or the process exits.
+
+Sizes are estimates: strings and bytes count their length, containers are
+summed (sampled beyond ``_SAMPLE_ITEMS`` entries) and other objects use
+``sys.getsizeof``. They are meant for budgeting, not exact measurement.
+
+Configuration (environment variables):
+- PFLOW_MEMORY_BUDGET_MB: per-run budget in megabytes (unset = account only,
+  never spill)
+"""
+
+import itertools
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Shared-store key holding the run's MemoryBudget
+MEMORY_BUDGET_KEY = "__memory_budget__"
+
+# Values smaller than this are never spilled (not worth a file round-trip)
+SPILL_MIN_SIZE = 256 * 1024
+
+# Containers larger than this are sized from a sample of their entries
+_SAMPLE_ITEMS = 100
+
+# Nesting depth past which containers are sized with sys.getsizeof instead of walked
+_MAX_DEPTH = 4
+
+# Handles are stored as namespace values (shared[node_id][key]) or inside
+# them, e.g. in a batch node's results list. Materializing the whole store
+# therefore searches down to a result's fields: store, namespace, list, entry
+_HANDLE_DEPTH = 4
+
+
+class SpilledValue:
+    """Handle to a shared-store value that was spilled to disk."""
+
+    def __init__(self, path: Path, size: int, type_name: str) -> None:
+        self.path = path
+        self.size = size
+        self.type_name = type_name
+
+    def load(self) -> Any:
+        """Read the value back from disk."""
+        with open(self.path, "rb") as f:
+            return pickle.load(f)  # noqa: S301 - only files this process wrote
+
+    def __repr__(self) -> str:
+        return f"<spilled {self.type_name}: {self.size} bytes>"
+
+
+def materialize(value: Any, depth: int = _HANDLE_DEPTH) -> Any:
+    """Return the value with spilled values loaded back from disk.
+
+    Dicts and lists that hold handles (a node's namespace, a batch node's
+    results, or the shared store itself) are copied with the handles loaded;
+    anything else is returned as-is.
+
+    Args:
+        value: A single value, a namespace dict or the shared store
+        depth: Container levels to search for handles
+    """
+    if isinstance(value, SpilledValue):
+        return value.load()
+    if depth <= 0 or not isinstance(value, (dict, list)):
+        return value
+    loaded: Any = None
+    entries = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, item in entries:
+        resolved = materialize(item, depth - 1)
+        if resolved is not item:
+            if loaded is None:
+                loaded = dict(value) if isinstance(value, dict) else list(value)
+            loaded[key] = resolved
+    return value if loaded is None else loaded
+
+
+def estimate_size(value: Any, depth: int = 0) -> int:
+    """Cheaply estimate the memory a value holds, in bytes.
+
+    Args:
+        value: Value written to the shared store
+        depth: Current nesting depth (internal)
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return 8
+    if isinstance(value, SpilledValue):
+        return 0
+    if depth >= _MAX_DEPTH:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        entries: Any = value.items()
+        count = len(value)
+        sample = [estimate_size(k, depth + 1) + estimate_size(v, depth + 1) for k, v in _take(entries, _SAMPLE_ITEMS)]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        count = len(value)
+        sample = [estimate_size(item, depth + 1) for item in _take(value, _SAMPLE_ITEMS)]
+    else:
+        return sys.getsizeof(value)
+    if not sample:
+        return 64
+    return 64 + sum(sample) * count // len(sample)
+
+
+def _take(iterable: Any, limit: int) -> list[Any]:
+    items: list[Any] = []
+    for item in iterable:
+        if len(items) >= limit:
+            break
+        items.append(item)
+    return items
+
+
+class MemoryBudget:
+    """Tracks shared-store size for one run and spills values over the budget.
+
+    Thread-safe: parallel batch items write through their own proxies but
+    share the run's budget.
+    """
+
+    def __init__(self, limit_bytes: Optional[int] = None, spill_min_size: int = SPILL_MIN_SIZE) -> None:
+        """Initialize the budget.
+
+        Args:
+            limit_bytes: Budget in bytes, or None to only account
+            spill_min_size: Smallest value that may be spilled
+        """
+        self.limit_bytes = limit_bytes
+        self.spill_min_size = spill_min_size
+        self.total_bytes = 0
+        self.peak_bytes = 0
+        self.spilled_bytes = 0
+        self.spilled_values = 0
+        self.node_bytes: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._spill_dir: Optional[Path] = None
+        self._spill_ids = itertools.count()
+
+    @classmethod
+    def from_env(cls) -> "MemoryBudget":
+        """Create a budget from PFLOW_MEMORY_BUDGET_MB (unset or invalid = no limit)."""
+        raw = os.environ.get("PFLOW_MEMORY_BUDGET_MB")
+        if not raw:
+            return cls()
+        try:
+            megabytes = float(raw)
+        except ValueError:
+            logger.warning(f"Ignoring invalid PFLOW_MEMORY_BUDGET_MB={raw!r}")
+            return cls()
+        return cls(int(megabytes * 1024 * 1024) if megabytes > 0 else None)
+
+    def account(self, namespace: str, value: Any, replaced: Any = None) -> Any:
+        """Account for a write and return the value to store (spilled if over budget).
+
+        Args:
+            namespace: Node id the value is written under
+            value: Value being written
+            replaced: Value being overwritten, if any
+
+        Returns:
+            The value itself, or a SpilledValue handle
+        """
+        size = estimate_size(value)
+        freed = estimate_size(replaced) if replaced is not None else 0
+        with self._lock:
+            self.node_bytes[namespace] = self.node_bytes.get(namespace, 0) + size
+            over_budget = self.limit_bytes is not None and self.total_bytes - freed + size > self.limit_bytes
+        if over_budget and size >= self.spill_min_size:
+            spilled = self._spill(value, size)
+            if spilled is not None:
+                with self._lock:
+                    self.total_bytes -= freed
+                    self.spilled_bytes += size
+                    self.spilled_values += 1
+                return spilled
+        with self._lock:
+            self.total_bytes += size - freed
+            self.peak_bytes = max(self.peak_bytes, self.total_bytes)
+        return value
+
+    def discard(self, values: list[Any]) -> None:
+        """Account for values dropped from the store outside a write (e.g. output release)."""
+        freed = sum(estimate_size(value) for value in values)
+        with self._lock:
+            self.total_bytes = max(0, self.total_bytes - freed)
+
+    def bytes_written(self, namespace: str) -> int:
+        """Return the bytes written under a namespace so far."""
+        return self.node_bytes.get(namespace, 0)
+
+    def usage(self) -> dict[str, Any]:
+        """Return a summary of store size for metrics."""
+        summary: dict[str, Any] = {"current_bytes": self.total_bytes, "peak_bytes": self.peak_bytes}
+        if self.limit_bytes is not None:
+            summary["budget_bytes"] = self.limit_bytes
+        if self.spilled_values:
+            summary["spilled_bytes"] = self.spilled_bytes
+            summary["spilled_values"] = self.spilled_values
+        return summary
+
+    def _spill(self, value: Any, size: int) -> Optional[SpilledValue]:
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Keeping unpicklable {type(value).__name__} in memory: {e}")
+            return None
+        with self._lock:
+            if self._spill_dir is None:
+                self._spill_dir = Path(tempfile.mkdtemp(prefix="pflow-spill-"))
+                weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+            path = self._spill_dir / f"{next(self._spill_ids)}.pkl"
+        try:
+            path.write_bytes(data)
+        except OSError as e:
+            logger.warning(f"Could not spill shared-store value to disk, keeping it in memory: {e}")
+            return None
+        logger.debug(f"Spilled {type(value).__name__} of ~{size} bytes to {path}")
+        return SpilledValue(path, size, type(value).__name__)
+
+
+def get_memory_budget(shared: Any) -> Optional[MemoryBudget]:
+    """Return the run's memory budget from a shared store, if one is installed."""
+    budget = shared.get(MEMORY_BUDGET_KEY) if isinstance(shared, dict) else None
+    return budget if isinstance(budget, MemoryBudget) else None
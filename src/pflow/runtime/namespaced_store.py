@@ -8,6 +8,8 @@ type write to the same keys.
 from collections.abc import Iterator
 from typing import Any, Optional
 
+from .memory_budget import MEMORY_BUDGET_KEY, materialize
+
 
 class NamespacedSharedStore:
     """Proxy that namespaces all node writes while maintaining backward compatibility.
@@ -51,8 +53,12 @@ class NamespacedSharedStore:
         if key.startswith("__") and key.endswith("__"):
             self._parent[key] = value
         else:
-            # Regular keys go to namespace
-            self._parent[self._namespace][key] = value
+            # Regular keys go to namespace, sized (and spilled if over budget) on the way in
+            namespace = self._parent[self._namespace]
+            budget = self._parent.get(MEMORY_BUDGET_KEY)
+            if budget is not None:
+                value = budget.account(self._namespace, value, namespace.get(key))
+            namespace[key] = value
 
     def __getitem__(self, key: str) -> Any:
         """Read with namespace priority, falling back to root.
@@ -75,7 +81,7 @@ class NamespacedSharedStore:
 
         # Check own namespace first (for self-reading nodes if any)
         if key in self._parent[self._namespace]:
-            return self._parent[self._namespace][key]
+            return materialize(self._parent[self._namespace][key])
 
         # Fall back to root level (for CLI inputs, legacy data)
         if key in self._parent:
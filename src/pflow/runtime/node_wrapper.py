@@ -597,6 +597,26 @@ class TemplateAwareNodeWrapper:
         # No template variables present, preserve original type
         return template, False
 
+    def preview_params(self, shared: dict[str, Any]) -> dict[str, Any]:
+        """Resolve the node's params against a shared store without running it.
+
+        Unlike ``_run``, this skips type validation, JSON coercion and error
+        reporting, so it is only suitable for comparing params (e.g. batch
+        deduplication), not for executing with them.
+
+        Args:
+            shared: The shared store to resolve templates against
+
+        Returns:
+            Static params merged with resolved template params
+        """
+        context = self._build_resolution_context(shared)
+        resolved = {
+            key: self._resolve_template_parameter(key, template, context)[0]
+            for key, template in self.template_params.items()
+        }
+        return {**self.static_params, **resolved}
+
     def _format_template_display(self, template: Any) -> str:
         """Format template value for display.
 
@@ -0,0 +1,217 @@
+"""Liveness-based release of node outputs from the shared store.
+
+Every node's namespaced output used to stay in the shared store until the run
+ended, so a workflow that reads a large file, summarizes it and then calls an
+LLM kept the whole file alive (and copied it into every ``dict(shared)``
+snapshot). The compiler now plans, from the template references in node
+params and ``batch.items``, which outputs are dead after each node:
+
+    output of P is dead after node X  <=>  no node reachable from X references P
+                                           and no declared output references P
+
+When X completes successfully, large values in the namespaces of its dead
+producers are dropped (small values such as exit codes, counts and batch
+metadata stay for summaries). Release only happens when the workflow's
+result is fully described by its declared outputs:
+
+- namespacing is enabled and every declared output has a ``source``
+- the run is top-level (sub-workflow output mappings read child namespaces)
+- ``--output-key`` wasn't given (it may name a node namespace)
+
+Released node ids are recorded in the execution checkpoint. A resumed or
+repaired run keeps them completed and re-executes one only if a node that
+still has to run, or a declared output, reads it (see ``plan_output_readers``).
+
+Configuration (environment variables):
+- PFLOW_RELEASE_OUTPUTS: set to "0" to keep all outputs until the run ends
+"""
+
+import logging
+import os
+import re
+from typing import Any, Optional
+
+from .memory_budget import get_memory_budget
+
+logger = logging.getLogger(__name__)
+
+# Shared-store key listing keys that must never be released (e.g. --output-key)
+RETAIN_OUTPUTS_KEY = "__retain_outputs__"
+
+# Values up to this many characters/bytes are kept when a namespace is released
+RETAIN_MAX_SIZE = 1024
+
+# Containers with more entries than this are always released
+_RETAIN_MAX_ITEMS = 64
+
+# First path segment of every "${" occurrence, including inner templates of
+# nested indexes like ${outer[${inner}]} (over-matching only keeps outputs longer)
+_TEMPLATE_ROOT = re.compile(r"\$\{\s*([A-Za-z_][\w-]*)")
+
+
+def plan_output_release(ir_dict: dict[str, Any]) -> Optional[dict[str, tuple[str, ...]]]:
+    """Compute which producers' outputs die once each node completes.
+
+    Args:
+        ir_dict: Validated workflow IR
+
+    Returns:
+        Mapping of node id to producer ids to release after it, or None when
+        outputs must be kept (see module docstring)
+    """
+    if os.environ.get("PFLOW_RELEASE_OUTPUTS", "1") == "0" or not ir_dict.get("enable_namespacing", True):
+        return None
+    outputs = ir_dict.get("outputs") or {}
+    if not outputs or not all(isinstance(config, dict) and config.get("source") for config in outputs.values()):
+        return None
+
+    node_ids = [node["id"] for node in ir_dict.get("nodes", [])]
+    known = set(node_ids)
+    references = _node_references(ir_dict)
+    pinned = _pinned_producers(ir_dict)
+
+    successors: dict[str, set[str]] = {node_id: set() for node_id in node_ids}
+    for edge in ir_dict.get("edges", []):
+        source, target = edge.get("source") or edge.get("from"), edge.get("target") or edge.get("to")
+        if source in successors and target in known:
+            successors[source].add(target)
+    reachable = {node_id: _reachable_from(node_id, successors) for node_id in node_ids}
+
+    plan: dict[str, tuple[str, ...]] = {}
+    for node_id in node_ids:
+        still_read = set().union(*(references[later] for later in reachable[node_id]))
+        dead = tuple(
+            producer
+            for producer in node_ids
+            # Only producers that can have run by now: the node itself or its ancestors
+            if (producer == node_id or node_id in reachable[producer])
+            and producer not in pinned
+            and producer not in still_read
+        )
+        if dead:
+            plan[node_id] = dead
+    return plan
+
+
+def plan_output_readers(ir_dict: dict[str, Any]) -> tuple[dict[str, tuple[str, ...]], set[str]]:
+    """Find who reads each node's output, to decide whether a released node must re-run.
+
+    Args:
+        ir_dict: Validated workflow IR
+
+    Returns:
+        Tuple of (node ids whose templates read each producer, producers read
+        by declared outputs)
+    """
+    readers: dict[str, list[str]] = {}
+    for reader, producers in _node_references(ir_dict).items():
+        for producer in producers:
+            if producer != reader:
+                readers.setdefault(producer, []).append(reader)
+    return {producer: tuple(ids) for producer, ids in readers.items()}, _pinned_producers(ir_dict)
+
+
+def _node_references(ir_dict: dict[str, Any]) -> dict[str, set[str]]:
+    nodes = ir_dict.get("nodes", [])
+    known = {node["id"] for node in nodes}
+    return {node["id"]: referenced_nodes(_node_templates(node), known) for node in nodes}
+
+
+def _pinned_producers(ir_dict: dict[str, Any]) -> set[str]:
+    known = {node["id"] for node in ir_dict.get("nodes", [])}
+    outputs = (ir_dict.get("outputs") or {}).values()
+    sources = [config.get("source") for config in outputs if isinstance(config, dict)]
+    return referenced_nodes([source for source in sources if isinstance(source, str)], known)
+
+
+def release_outputs(shared: dict[str, Any], producers: tuple[str, ...]) -> list[str]:
+    """Drop large values from the given producers' namespaces.
+
+    Namespaces are replaced rather than mutated, so trace snapshots that
+    already reference them are unaffected.
+
+    Args:
+        shared: The workflow's shared store
+        producers: Node ids whose outputs are no longer needed
+
+    Returns:
+        Node ids whose namespaces had values dropped
+    """
+    if shared.get("_pflow_depth", 0):
+        return []
+    retained = set(shared.get(RETAIN_OUTPUTS_KEY) or ())
+    execution = shared.setdefault("__execution__", {})
+    released_before = execution.setdefault("released_outputs", [])
+
+    budget = get_memory_budget(shared)
+
+    released = []
+    for producer in producers:
+        namespace = shared.get(producer)
+        if producer in retained or producer in released_before or not isinstance(namespace, dict):
+            continue
+        kept = {key: value for key, value in namespace.items() if _is_small(value)}
+        if len(kept) == len(namespace):
+            continue
+        shared[producer] = kept
+        if budget is not None:
+            budget.discard([value for key, value in namespace.items() if key not in kept])
+        released_before.append(producer)
+        released.append(producer)
+        logger.debug(f"Released outputs of node '{producer}': {sorted(set(namespace) - set(kept))}")
+    return released
+
+
+def _node_templates(node: dict[str, Any]) -> list[str]:
+    strings: list[str] = []
+    collect_strings(node.get("params", {}), strings)
+    batch = node.get("batch")
+    if isinstance(batch, dict):
+        collect_strings(batch.get("items"), strings)
+    return strings
+
+
+def collect_strings(value: Any, strings: list[str]) -> None:
+    """Append every string inside a (nested) param value to ``strings``."""
+    if isinstance(value, str):
+        strings.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            collect_strings(item, strings)
+    elif isinstance(value, list):
+        for item in value:
+            collect_strings(item, strings)
+
+
+def referenced_nodes(strings: list[str], known: set[str]) -> set[str]:
+    """Return the ids in ``known`` that the templates in ``strings`` read from."""
+    referenced: set[str] = set()
+    for string in strings:
+        if "$" not in string:
+            continue
+        referenced.update(root for root in _TEMPLATE_ROOT.findall(string) if root in known)
+    return referenced
+
+
+def _reachable_from(start: str, successors: dict[str, set[str]]) -> set[str]:
+    seen: set[str] = set()
+    stack = list(successors[start])
+    while stack:
+        node_id = stack.pop()
+        if node_id not in seen:
+            seen.add(node_id)
+            stack.extend(successors[node_id])
+    return seen
+
+
+def _is_small(value: Any, depth: int = 0) -> bool:
+    """Cheap bounded check that a value is small enough to keep after release."""
+    if value is None or isinstance(value, (bool, int, float)):
+        return True
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value) <= RETAIN_MAX_SIZE
+    if isinstance(value, (list, tuple)) and depth < 3 and len(value) <= _RETAIN_MAX_ITEMS:
+        return all(_is_small(item, depth + 1) for item in value)
+    if isinstance(value, dict) and depth < 3 and len(value) <= _RETAIN_MAX_ITEMS:
+        return all(_is_small(item, depth + 1) for item in value.values())
+    return False
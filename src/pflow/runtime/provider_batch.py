@@ -0,0 +1,340 @@
+"""Provider batch-API submission for batched llm nodes (``batch.submit: provider``).
+
+Real-time batches send one request per item and are bound by rate limits.
+Providers also offer asynchronous batch APIs that accept thousands of
+requests in one job, run them within hours and bill them at a discount.
+This module packages the resolved prompts of a batch into such a job:
+
+1. Collect: the batch node runs every item through the normal node chain with
+   a ``ProviderBatch`` installed at ``shared["__llm_provider_batch__"]``. The
+   llm node sees it and records its fully resolved request instead of calling
+   the model.
+2. Submit and poll: the requests go to a backend chosen by model name. The job
+   id is checkpointed before polling, in ``shared["__execution__"]["provider_batches"]``
+   and in a file next to the batch checkpoints (``~/.pflow/cache/batch-checkpoints``),
+   so a repaired, resumed or rerun batch with the same requests re-attaches to
+   the job instead of paying twice, even after the process was killed. The
+   file is deleted once the results are fetched. Polling stops when the run
+   is cancelled; the job keeps running at the provider and the next run
+   re-attaches to it.
+3. Replay: items run through the chain again; the llm node takes its response
+   from the job results, so ``results`` has the same shape as a real-time batch.
+
+Backends are pluggable (``register_batch_backend``); the built-in one uses the
+Anthropic Message Batches API.
+
+Configuration (environment variables):
+- PFLOW_BATCH_BACKEND: backend name to use regardless of model
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from pflow.core.cancellation import CancellationToken
+from pflow.runtime.batch_checkpoint import get_batch_checkpoints
+
+logger = logging.getLogger(__name__)
+
+# Shared-store key the llm node looks for during collect/replay
+PROVIDER_BATCH_KEY = "__llm_provider_batch__"
+
+# Default seconds between job status checks (provider jobs take minutes to hours)
+DEFAULT_POLL_INTERVAL = 30.0
+
+# Anthropic requires max_tokens; used when the node doesn't set one
+DEFAULT_MAX_TOKENS = 8192
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    """One resolved llm call, as submitted to a provider."""
+
+    custom_id: str
+    model: str
+    prompt: str
+    system: Optional[str] = None
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request in a provider job."""
+
+    custom_id: str
+    text: Optional[str] = None
+    usage: dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class BatchBackend(ABC):
+    """Interface to a provider's asynchronous batch API."""
+
+    name: str = "backend"
+
+    @abstractmethod
+    def submit(self, requests: list[BatchRequest]) -> str:
+        """Create a batch job and return its id."""
+
+    @abstractmethod
+    def is_complete(self, job_id: str) -> bool:
+        """Return True once the job has finished (successfully or not)."""
+
+    @abstractmethod
+    def results(self, job_id: str) -> dict[str, BatchResult]:
+        """Return results of a finished job keyed by custom_id."""
+
+
+class AnthropicBatchBackend(BatchBackend):
+    """Backend for the Anthropic Message Batches API.
+
+    Args:
+        client: Anthropic client (default: created from ANTHROPIC_API_KEY or
+            the llm key store; ANTHROPIC_BASE_URL is honored by the SDK)
+    """
+
+    name = "anthropic"
+
+    def __init__(self, client: Any = None) -> None:
+        if client is None:
+            from pflow.core.llm_cache import get_anthropic_client
+
+            client = get_anthropic_client(self._get_api_key())
+        self.client = client
+
+    @staticmethod
+    def _get_api_key() -> Optional[str]:
+        api_key = os.environ.get("ANTHROPIC_API_KEY")
+        if not api_key:
+            try:
+                import llm
+
+                api_key = llm.get_key("", "anthropic", "ANTHROPIC_API_KEY")
+            except Exception as e:
+                logger.debug(f"Failed to retrieve API key using llm library fallback: {e}")
+        return api_key
+
+    @staticmethod
+    def _provider_model_id(model: str) -> str:
+        """Map an llm model name or alias to the Anthropic model id."""
+        try:
+            import llm
+
+            resolved = llm.get_model(model)
+            return str(getattr(resolved, "claude_model_id", None) or resolved.model_id)
+        except Exception:
+            return model.removeprefix("anthropic/")
+
+    def submit(self, requests: list[BatchRequest]) -> str:
+        model_ids = {request.model: self._provider_model_id(request.model) for request in requests}
+        payload = []
+        for request in requests:
+            params: dict[str, Any] = {
+                "model": model_ids[request.model],
+                "max_tokens": request.max_tokens or DEFAULT_MAX_TOKENS,
+                "messages": [{"role": "user", "content": request.prompt}],
+            }
+            if request.system is not None:
+                params["system"] = request.system
+            if request.temperature is not None:
+                # Anthropic accepts 0-1; pflow allows up to 2
+                params["temperature"] = min(request.temperature, 1.0)
+            payload.append({"custom_id": request.custom_id, "params": params})
+
+        batch = self.client.messages.batches.create(requests=payload)
+        return str(batch.id)
+
+    def is_complete(self, job_id: str) -> bool:
+        batch = self.client.messages.batches.retrieve(job_id)
+        return bool(batch.processing_status == "ended")
+
+    def results(self, job_id: str) -> dict[str, BatchResult]:
+        results: dict[str, BatchResult] = {}
+        for entry in self.client.messages.batches.results(job_id):
+            outcome = entry.result
+            if outcome.type == "errored":
+                error = getattr(outcome.error, "error", None)
+                message = getattr(error, "message", None) or "unknown error"
+                results[entry.custom_id] = BatchResult(
+                    entry.custom_id, error=f"Provider batch request failed: {message}"
+                )
+                continue
+            if outcome.type != "succeeded":  # canceled or expired
+                results[entry.custom_id] = BatchResult(entry.custom_id, error=f"Provider batch request {outcome.type}")
+                continue
+            message = outcome.message
+            text = "".join(block.text for block in message.content if getattr(block, "type", None) == "text")
+            usage = message.usage
+            results[entry.custom_id] = BatchResult(
+                entry.custom_id,
+                text=text,
+                usage={
+                    "input_tokens": usage.input_tokens,
+                    "output_tokens": usage.output_tokens,
+                    "cache_creation_input_tokens": usage.cache_creation_input_tokens or 0,
+                    "cache_read_input_tokens": usage.cache_read_input_tokens or 0,
+                },
+            )
+        return results
+
+
+# name -> (matches(model), factory)
+_BACKENDS: dict[str, tuple[Callable[[str], bool], Callable[[], BatchBackend]]] = {}
+_backends_lock = threading.Lock()
+
+
+def register_batch_backend(
+    name: str, factory: Callable[[], BatchBackend], matches: Callable[[str], bool] = lambda model: False
+) -> None:
+    """Register a batch backend (replacing any with the same name).
+
+    Backends registered later are tried first when matching models.
+
+    Args:
+        name: Backend name (selectable with PFLOW_BATCH_BACKEND)
+        factory: Creates the backend when a batch is submitted
+        matches: Returns True for model names this backend serves
+    """
+    with _backends_lock:
+        _BACKENDS.pop(name, None)
+        _BACKENDS[name] = (matches, factory)
+
+
+def unregister_batch_backend(name: str) -> None:
+    """Remove a registered batch backend (no-op if unknown)."""
+    with _backends_lock:
+        _BACKENDS.pop(name, None)
+
+
+def get_batch_backend(model: str) -> BatchBackend:
+    """Create the backend for a model.
+
+    Raises:
+        ValueError: If no backend serves the model
+    """
+    with _backends_lock:
+        override = os.environ.get("PFLOW_BATCH_BACKEND")
+        if override:
+            if override not in _BACKENDS:
+                raise ValueError(
+                    f"PFLOW_BATCH_BACKEND is '{override}', but no such batch backend is registered. "
+                    f"Available: {', '.join(sorted(_BACKENDS))}"
+                )
+            return _BACKENDS[override][1]()
+        # Most recent registration wins, so plugins can take over built-in backends
+        for matches, factory in reversed(_BACKENDS.values()):
+            if matches(model):
+                return factory()
+    raise ValueError(
+        f"No provider batch backend supports model '{model}'. "
+        "Use a Claude model or remove 'submit: provider' to run the batch in real time."
+    )
+
+
+register_batch_backend("anthropic", AnthropicBatchBackend, matches=lambda model: "claude" in model.lower())
+
+
+class ProviderBatch:
+    """Collects requests from batch items, runs them as a provider job and serves the results.
+
+    Installed in the shared store at PROVIDER_BATCH_KEY by the batch node.
+    The llm node calls ``add_request`` while ``collecting`` is True and
+    ``get_result`` afterwards; both are keyed by the item's ``__index__``.
+
+    Args:
+        node_id: Batch node id (used for checkpointing and custom ids)
+    """
+
+    def __init__(self, node_id: str) -> None:
+        self.node_id = node_id
+        self.collecting = True
+        self._requests: dict[int, BatchRequest] = {}
+        self._results: dict[int, BatchResult] = {}
+
+    def add_request(self, index: int, request: dict[str, Any]) -> None:
+        """Record the resolved request for a batch item (collect phase)."""
+        self._requests[index] = BatchRequest(custom_id=f"item-{index}", **request)
+
+    def has_request(self, index: int) -> bool:
+        return index in self._requests
+
+    def get_result(self, index: int) -> dict[str, Any]:
+        """Return ``{"text", "usage", "error"}`` for a batch item (replay phase)."""
+        result = self._results.get(index)
+        if result is None:
+            return {"text": None, "usage": {}, "error": f"No provider batch result for item {index}"}
+        return {"text": result.text, "usage": result.usage, "error": result.error}
+
+    def run(
+        self,
+        checkpoint: dict[str, Any],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        backend: Optional[BatchBackend] = None,
+        token: Optional[CancellationToken] = None,
+    ) -> str:
+        """Submit collected requests (or re-attach to a checkpointed job) and wait for results.
+
+        Args:
+            checkpoint: The run's ``shared["__execution__"]`` dict
+            poll_interval: Seconds between status checks
+            backend: Backend to use (default: chosen from the first request's model)
+            token: The run's cancellation token, checked between status checks
+
+        Returns:
+            The provider job id
+
+        Raises:
+            WorkflowCancelled: If the run is cancelled while the job runs
+        """
+        self.collecting = False
+        if not self._requests:
+            return ""
+
+        requests = [self._requests[index] for index in sorted(self._requests)]
+        backend = backend or get_batch_backend(requests[0].model)
+        fingerprint = self._fingerprint(requests)
+
+        jobs = checkpoint.setdefault("provider_batches", {})
+        # Survives the process: keyed by node and requests, so only the same batch re-attaches
+        persisted = get_batch_checkpoints().open({"provider_job": self.node_id, "fingerprint": fingerprint})
+        saved = jobs.get(self.node_id)
+        if not saved or saved.get("fingerprint") != fingerprint:
+            saved = persisted.load().get(backend.name)
+        if saved and saved.get("fingerprint") == fingerprint and saved.get("backend") == backend.name:
+            job_id = str(saved["job_id"])
+            jobs[self.node_id] = saved
+            logger.info(f"Batch '{self.node_id}' re-attaching to provider job {job_id}")
+        else:
+            job_id = backend.submit(requests)
+            jobs[self.node_id] = {"backend": backend.name, "job_id": job_id, "fingerprint": fingerprint}
+            persisted.save(backend.name, jobs[self.node_id])
+            logger.info(f"Batch '{self.node_id}' submitted {len(requests)} requests as provider job {job_id}")
+
+        while not backend.is_complete(job_id):
+            if token is None:
+                time.sleep(poll_interval)
+                continue
+            token.wait(poll_interval)
+            token.raise_if_cancelled()
+
+        by_custom_id = backend.results(job_id)
+        self._results = {
+            index: by_custom_id.get(request.custom_id, BatchResult(request.custom_id, error="Missing from job results"))
+            for index, request in self._requests.items()
+        }
+        persisted.discard()
+        return job_id
+
+    @staticmethod
+    def _fingerprint(requests: list[BatchRequest]) -> str:
+        """Hash of the submitted requests; a changed prompt means a new job."""
+        encoded = json.dumps([asdict(request) for request in requests], sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
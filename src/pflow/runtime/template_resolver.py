@@ -11,6 +11,7 @@ import re
 from typing import Any, Optional
 
 from pflow.core.json_utils import try_parse_json
+from pflow.runtime.memory_budget import materialize
 
 logger = logging.getLogger(__name__)
 
@@ -243,9 +244,9 @@ class TemplateResolver:
         Returns:
             Tuple of (success, result) where success indicates if key was found
         """
-        # Direct dict access
+        # Direct dict access (loading values spilled over the memory budget)
         if isinstance(value, dict) and key in value:
-            return True, value[key]
+            return True, materialize(value[key])
 
         # JSON string auto-parsing
         if isinstance(value, str):
@@ -426,10 +427,10 @@ class TemplateResolver:
                             extra={"var_name": var_name, "failed_at": part},
                         )
                         return None
-            return value
+            return materialize(value)
         else:
-            # Simple variable lookup
-            return context.get(var_name)
+            # Simple variable lookup (a whole namespace may hold spilled values)
+            return materialize(context.get(var_name))
 
     @staticmethod
     def _convert_to_string(value: Any) -> str:
@@ -4,6 +4,8 @@ import logging
 from pathlib import Path
 from typing import Any
 
+from pflow.core.cancellation import CANCEL_TOKEN_KEY
+from pflow.core.circuit_breaker import CIRCUIT_BREAKERS_KEY
 from pflow.core.markdown_parser import MarkdownParseError, parse_markdown
 from pflow.core.workflow_manager import WorkflowManager
 from pflow.pocketflow import BaseNode
@@ -332,4 +334,12 @@ class WorkflowExecutor(BaseNode):
         if "__registry__" in parent_shared:
             child_storage["__registry__"] = parent_shared["__registry__"]
 
+        # Cancelling the parent run (or its batch) also stops the sub-workflow
+        if CANCEL_TOKEN_KEY in parent_shared:
+            child_storage[CANCEL_TOKEN_KEY] = parent_shared[CANCEL_TOKEN_KEY]
+
+        # The sub-workflow's calls go through the run's circuits and retry budget
+        if CIRCUIT_BREAKERS_KEY in parent_shared:
+            child_storage[CIRCUIT_BREAKERS_KEY] = parent_shared[CIRCUIT_BREAKERS_KEY]
+
         return child_storage
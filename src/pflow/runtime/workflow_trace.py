@@ -10,6 +10,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Callable, ClassVar, Optional
 
+from pflow.runtime.memory_budget import materialize
+
 logger = logging.getLogger(__name__)
 
 # Configurable truncation limits (can be overridden via environment variables)
@@ -62,6 +64,7 @@ class WorkflowTraceCollector:
         success: bool,
         error: Optional[str] = None,
         template_resolutions: Optional[dict[str, Any]] = None,
+        bytes_written: Optional[int] = None,
     ) -> None:
         """Record detailed node execution data.
 
@@ -74,6 +77,7 @@ class WorkflowTraceCollector:
             success: Whether the node executed successfully
             error: Error message if execution failed
             template_resolutions: Template variables resolved during execution
+            bytes_written: Estimated bytes the node wrote to the shared store
         """
         # Build base event
         event = self._build_base_event(node_id, node_type, duration_ms, success, shared_before, shared_after)
@@ -83,6 +87,8 @@ class WorkflowTraceCollector:
             event["error"] = error
         if template_resolutions:
             event["template_resolutions"] = template_resolutions
+        if bytes_written is not None:
+            event["bytes_written"] = bytes_written
 
         # Add LLM-specific data if present
         self._add_llm_data(event, node_id, shared_after)
@@ -391,7 +397,8 @@ class WorkflowTraceCollector:
                 # Include LLM calls but limit size
                 filtered[key] = value[:TRACE_LLM_CALLS_MAX] if len(value) > TRACE_LLM_CALLS_MAX else value
             elif isinstance(value, dict):
-                # Recursively filter nested dicts (for namespaced data)
+                # Recursively filter nested dicts (for namespaced data), with spilled values loaded
+                value = materialize(value)
                 if len(str(value)) > TRACE_DICT_MAX_SIZE:
                     filtered[key] = "<large dict truncated>"
                 else:
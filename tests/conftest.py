@@ -295,6 +295,32 @@ def isolate_pflow_config(tmp_path, monkeypatch, precomputed_core_registry_nodes)
     _patch_mcp_server_manager(monkeypatch, MCPServerManager, test_mcp_servers_path)
     _patch_workflow_manager(monkeypatch, WorkflowManager, test_workflows_path)
 
+    # Fresh planner context cache per test (rendered blocks are cached in memory and on disk)
+    from pflow.planning import context_cache
+
+    monkeypatch.setattr(context_cache, "_context_cache", context_cache.ContextCache(test_pflow_dir / "cache"))
+
+    # Fresh planner result cache per test (otherwise repeated inputs across tests would hit)
+    from pflow.planning import result_cache
+
+    monkeypatch.setattr(
+        result_cache, "_result_cache", result_cache.PlannerResultCache(test_pflow_dir / "cache" / "planner-results")
+    )
+
+    # Batch checkpoints in the test's own cache (results must not leak between tests)
+    from pflow.runtime import batch_checkpoint
+
+    monkeypatch.setattr(
+        batch_checkpoint,
+        "_checkpoints",
+        batch_checkpoint.BatchCheckpoints(test_pflow_dir / "cache" / "batch-checkpoints"),
+    )
+
+    # Fresh circuit breakers per test (failures in one test must not open circuits for the next)
+    from pflow.core import circuit_breaker
+
+    monkeypatch.setattr(circuit_breaker, "_breakers", circuit_breaker.CircuitBreakers())
+
     # Log the paths being used for debugging
     if os.environ.get("DEBUG_TEST_PATHS"):
         print("[test-isolation] Using isolated paths:")
@@ -0,0 +1,223 @@
+"""Tests for cooperative cancellation of running workflows."""
+
+import asyncio
+import copy
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from pflow.core.cancellation import (
+    CANCEL_TOKEN_KEY,
+    CancellationToken,
+    WorkflowCancelled,
+    cancel_active_runs,
+    cancellation_scope,
+    has_active_runs,
+    run_cancellable,
+    run_cancellation,
+)
+from pflow.execution.executor_service import WorkflowExecutorService
+from pflow.nodes.shell.shell import ShellNode
+from pflow.registry import Registry
+from pflow.runtime.compiler import compile_ir_to_flow
+
+
+def cancel_later(token, delay=0.1, reason="stop"):
+    timer = threading.Timer(delay, token.cancel, args=(reason,))
+    timer.start()
+    return timer
+
+
+class TestToken:
+    def test_cancel_reaches_children_and_callbacks_once(self):
+        parent = CancellationToken()
+        child = CancellationToken(parent=parent)
+        calls = []
+
+        with child.on_cancel(lambda: calls.append("child")):
+            assert parent.cancel("done") is True
+            assert parent.cancel("again") is False
+
+        assert child.cancelled
+        assert child.reason == "done"
+        assert calls == ["child"]
+
+    def test_child_of_cancelled_parent_starts_cancelled(self):
+        parent = CancellationToken()
+        parent.cancel("gone")
+
+        assert CancellationToken(parent=parent).cancelled
+
+    def test_callback_runs_immediately_if_already_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        calls = []
+
+        with token.on_cancel(lambda: calls.append(True)):
+            pass
+
+        assert calls == [True]
+
+    def test_callbacks_are_dropped_when_block_exits(self):
+        token = CancellationToken()
+        calls = []
+
+        with token.on_cancel(lambda: calls.append(True)):
+            pass
+        token.cancel()
+
+        assert calls == []
+
+    def test_copies_share_the_token(self):
+        token = CancellationToken()
+        shared = {CANCEL_TOKEN_KEY: token}
+
+        assert copy.deepcopy(shared)[CANCEL_TOKEN_KEY] is token
+        assert copy.copy(token) is token
+
+    def test_raise_if_cancelled_uses_reason(self):
+        token = CancellationToken()
+        token.cancel("interrupted by user")
+
+        with pytest.raises(WorkflowCancelled, match="interrupted by user"):
+            token.raise_if_cancelled()
+
+
+class TestRuns:
+    def test_runs_inherit_the_scope_token(self):
+        scope = CancellationToken()
+        shared: dict = {}
+
+        with cancellation_scope(scope), run_cancellation(shared) as token:
+            scope.cancel("job cancelled")
+
+        assert shared[CANCEL_TOKEN_KEY] is token
+        assert token.reason == "job cancelled"
+
+    def test_cancel_active_runs_only_reaches_runs_in_progress(self):
+        shared: dict = {}
+        with run_cancellation(shared) as token:
+            assert has_active_runs()
+            assert cancel_active_runs("interrupted") == 1
+        assert token.cancelled
+
+        with run_cancellation({}) as later:
+            pass
+        assert cancel_active_runs("interrupted") == 0
+        assert not later.cancelled
+
+    def test_cancelled_token_in_store_is_replaced(self):
+        stale = CancellationToken()
+        stale.cancel()
+        shared = {CANCEL_TOKEN_KEY: stale}
+
+        with run_cancellation(shared) as token:
+            pass
+
+        assert token is not stale
+        assert not token.cancelled
+
+    def test_run_cancellable_cancels_the_coroutine(self):
+        token = CancellationToken()
+        cleaned_up = []
+
+        async def work():
+            try:
+                await asyncio.sleep(5)
+            finally:
+                cleaned_up.append(True)
+
+        cancel_later(token)
+        start = time.monotonic()
+        with pytest.raises(WorkflowCancelled):
+            run_cancellable(work(), token)
+
+        assert time.monotonic() - start < 2
+        assert cleaned_up == [True]
+
+    def test_run_cancellable_without_token(self):
+        async def work():
+            return 42
+
+        assert run_cancellable(work(), None) == 42
+
+
+class TestInFlightWork:
+    def test_shell_command_is_killed(self):
+        token = CancellationToken()
+        node = ShellNode()
+        node.set_params({"command": "sleep 5"})
+
+        cancel_later(token)
+        start = time.monotonic()
+        with pytest.raises(WorkflowCancelled):
+            node.run({CANCEL_TOKEN_KEY: token})
+
+        assert time.monotonic() - start < 2
+
+    @pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX")
+    def test_shell_command_keeps_the_session_in_its_own_group(self):
+        node = ShellNode()
+        node.set_params({"command": f"{sys.executable} -c 'import os; print(os.getsid(0), os.getpgid(0))'"})
+        shared = {CANCEL_TOKEN_KEY: CancellationToken()}
+
+        node.run(shared)
+
+        sid, pgid = (int(value) for value in shared["stdout"].split())
+        # Same session keeps the controlling terminal; its own group can be killed as a whole
+        assert sid == os.getsid(0)
+        assert pgid != os.getpgid(0)
+
+    def test_fail_fast_cancels_items_in_flight(self):
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [
+                {
+                    "id": "run",
+                    "type": "shell",
+                    "batch": {
+                        "items": ["sleep 0.1 && exit 3", "sleep 5", "sleep 5"],
+                        "parallel": True,
+                        "max_concurrent": 3,
+                        "error_handling": "fail_fast",
+                    },
+                    "params": {"command": "${item}"},
+                }
+            ],
+            "edges": [],
+        }
+        flow = compile_ir_to_flow(ir, registry=Registry())
+
+        start = time.monotonic()
+        with pytest.raises(RuntimeError, match="failed at item \\[0\\]"), run_cancellation({}) as token:
+            flow.run({CANCEL_TOKEN_KEY: token})
+
+        assert time.monotonic() - start < 3
+        # fail_fast stops the batch's own items, not the run
+        assert not token.cancelled
+
+    def test_executor_reports_cancelled_run(self):
+        scope = CancellationToken()
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [
+                {"id": "wait", "type": "shell", "params": {"command": "sleep 5"}},
+                {"id": "after", "type": "shell", "params": {"command": "echo never"}},
+            ],
+            "edges": [{"from": "wait", "to": "after"}],
+        }
+        shared: dict = {}
+
+        cancel_later(scope, reason="cancelled by client")
+        start = time.monotonic()
+        with cancellation_scope(scope):
+            result = WorkflowExecutorService().execute_workflow(ir, {}, shared_store=shared)
+
+        assert time.monotonic() - start < 3
+        assert not result.success
+        assert result.errors[0]["category"] == "cancelled"
+        assert "cancelled by client" in result.errors[0]["message"]
+        assert "after" not in shared
@@ -0,0 +1,304 @@
+"""Tests for circuit breakers and the shared retry budget."""
+
+import time
+
+import pytest
+
+from pflow.core import circuit_breaker
+from pflow.core.cancellation import WorkflowCancelled
+from pflow.core.circuit_breaker import (
+    CIRCUIT_BREAKERS_KEY,
+    CircuitBreakers,
+    CircuitOpenError,
+    backoff_delay,
+    get_circuit_breakers,
+    guarded_call,
+    is_dependency_failure,
+    is_retryable,
+    parse_settings,
+)
+from pflow.pocketflow import Node
+from pflow.runtime.batch_node import PflowBatchNode
+
+
+def fail(breakers, key="http:down", times=1):
+    errors = []
+    for _ in range(times):
+        try:
+            with breakers.guard(key):
+                raise ConnectionError("connection refused")
+        except ConnectionError as e:
+            errors.append(e)
+    return errors
+
+
+class TestSettings:
+    def test_parse_skips_malformed_entries(self):
+        settings = parse_settings("threshold=3, cooldown=60,bogus=1,retry_ratio=-1,=2")
+
+        assert settings == {**circuit_breaker.DEFAULT_SETTINGS, "threshold": 3.0, "cooldown": 60.0}
+
+    def test_zero_turns_breakers_off(self, monkeypatch):
+        monkeypatch.setenv("PFLOW_CIRCUIT_BREAKER", "0")
+        breakers = CircuitBreakers.from_env()
+
+        fail(breakers, times=20)
+        with breakers.guard("http:down"):
+            pass
+
+        assert breakers.stats()["circuits"] == {}
+
+    def test_backoff_grows_with_jitter(self):
+        assert backoff_delay(0, 3) == 0
+        assert 0.5 <= backoff_delay(1.0, 0) <= 1.0
+        assert 2.0 <= backoff_delay(1.0, 2) <= 4.0
+        assert backoff_delay(1.0, 20) <= circuit_breaker.MAX_BACKOFF_SECONDS
+
+    def test_retryable_follows_the_cause_chain(self):
+        inner = CircuitOpenError("http:down", 10)
+        try:
+            raise ValueError("friendly message") from inner
+        except ValueError as e:
+            outer = e
+
+        assert not is_retryable(outer)
+        assert is_retryable(ValueError("plain"))
+
+
+class TestCircuit:
+    def test_opens_after_consecutive_failures(self):
+        breakers = CircuitBreakers({"threshold": 3, "cooldown": 30, "retry_ratio": 0.2})
+
+        fail(breakers, times=2)
+        with breakers.guard("http:down"):
+            pass  # A success resets the count
+        errors = fail(breakers, times=3)
+
+        with pytest.raises(CircuitOpenError, match="circuit breaker open"), breakers.guard("http:down"):
+            pytest.fail("call should not run")
+        # Other dependencies are unaffected
+        with breakers.guard("http:up"):
+            pass
+        assert errors[-1].retryable is False
+        assert breakers.stats()["circuits"]["http:down"] == {
+            "state": "open",
+            "failures": 3,
+            "trips": 1,
+            "rejected": 1,
+        }
+
+    def test_probe_after_cooldown_closes_or_reopens(self):
+        breakers = CircuitBreakers({"threshold": 1, "cooldown": 0.05, "retry_ratio": 0.2})
+        fail(breakers)
+        time.sleep(0.1)
+
+        # The failed probe re-opens the circuit at once
+        fail(breakers)
+        with pytest.raises(CircuitOpenError), breakers.guard("http:down"):
+            pass
+        time.sleep(0.1)
+
+        with breakers.guard("http:down"):  # noqa: SIM117
+            # Only one probe at a time
+            with pytest.raises(CircuitOpenError), breakers.guard("http:down"):
+                pass
+        assert breakers.stats()["circuits"]["http:down"]["state"] == "closed"
+
+    def test_failures_reported_without_raising(self):
+        breakers = CircuitBreakers({"threshold": 2, "cooldown": 30, "retry_ratio": 0.2})
+
+        for _ in range(2):
+            with breakers.guard("http:api") as call:
+                call.failed("HTTP 503")
+
+        assert breakers.stats()["circuits"]["http:api"]["state"] == "open"
+
+    def test_cancellation_is_not_a_failure(self):
+        breakers = CircuitBreakers({"threshold": 1, "cooldown": 30, "retry_ratio": 0.2})
+
+        with pytest.raises(WorkflowCancelled), breakers.guard("llm:model"):
+            raise WorkflowCancelled("stop")
+
+        assert breakers.stats()["circuits"]["llm:model"]["state"] == "closed"
+
+    def test_open_circuits_shared_across_runs(self, tmp_path):
+        path = tmp_path / "circuit-breakers.json"
+        settings = {"threshold": 1, "cooldown": 30, "retry_ratio": 0.2}
+        fail(CircuitBreakers(settings, state_path=path))
+
+        with pytest.raises(CircuitOpenError), CircuitBreakers(settings, state_path=path).guard("http:down"):
+            pass
+        # Without state sharing, a new run starts closed
+        with CircuitBreakers(settings).guard("http:down"):
+            pass
+
+
+class StatusError(Exception):
+    """Error raised for an HTTP response, like the provider SDKs' status errors."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TransportError(Exception):
+    """Stands in for httpx.TransportError (matched by class name)."""
+
+
+class ReadTimeout(TransportError):
+    pass
+
+
+class McpError(Exception):
+    """Stands in for the MCP SDK's JSON-RPC error."""
+
+    def __init__(self, code):
+        super().__init__(f"JSON-RPC error {code}")
+        self.error = type("ErrorData", (), {"code": code})()
+
+
+class TaskGroupError(Exception):
+    """Stands in for an ExceptionGroup raised by an anyio task group (Python 3.10 has no builtin)."""
+
+    def __init__(self, exceptions):
+        super().__init__("unhandled errors in a TaskGroup")
+        self.exceptions = exceptions
+
+
+class TestFailureClassification:
+    @pytest.mark.parametrize(
+        "exc",
+        [
+            ConnectionError("refused"),
+            TimeoutError("timed out"),
+            ReadTimeout("read timed out"),
+            StatusError(503),
+            StatusError(429),
+            McpError(-32000),
+        ],
+    )
+    def test_dependency_failures(self, exc):
+        assert is_dependency_failure(exc)
+
+    @pytest.mark.parametrize(
+        "exc",
+        [StatusError(400), StatusError(404), McpError(-32602), ValueError("content policy violation")],
+    )
+    def test_request_errors_are_not_dependency_failures(self, exc):
+        assert not is_dependency_failure(exc)
+
+    def test_wrapped_errors_are_unwrapped(self):
+        try:
+            raise RuntimeError("model call failed") from ReadTimeout("read timed out")
+        except RuntimeError as e:
+            wrapped = e
+
+        assert is_dependency_failure(wrapped)
+        assert is_dependency_failure(TaskGroupError([ValueError("x"), ConnectionError("closed")]))
+
+    def test_bad_requests_never_open_the_circuit(self):
+        breakers = CircuitBreakers({"threshold": 1, "cooldown": 30, "retry_ratio": 0})
+
+        for _ in range(int(circuit_breaker.MIN_RETRY_TOKENS) + 5):
+            with pytest.raises(StatusError) as raised, breakers.guard("llm:model"):
+                raise StatusError(400)
+            # The item keeps its own retries; the budget isn't spent on it
+            assert getattr(raised.value, "retryable", True) is True
+
+        assert breakers.stats()["circuits"]["llm:model"]["state"] == "closed"
+        assert breakers.stats()["retries_denied"] == 0
+
+
+class TestRunScope:
+    def test_run_registry_comes_from_the_shared_store(self):
+        run_breakers = CircuitBreakers()
+
+        assert get_circuit_breakers({CIRCUIT_BREAKERS_KEY: run_breakers}) is run_breakers
+        assert get_circuit_breakers({}) is get_circuit_breakers()
+
+    def test_runs_do_not_open_circuits_for_each_other(self):
+        settings = {"threshold": 1, "cooldown": 30, "retry_ratio": 0.2}
+        first, second = (
+            {CIRCUIT_BREAKERS_KEY: CircuitBreakers(settings)},
+            {CIRCUIT_BREAKERS_KEY: CircuitBreakers(settings)},
+        )
+        fail(get_circuit_breakers(first))
+
+        with pytest.raises(CircuitOpenError), guarded_call("http:down", get_circuit_breakers(first)):
+            pass
+        with guarded_call("http:down", get_circuit_breakers(second)):
+            pass
+        assert get_circuit_breakers().stats()["circuits"] == {}
+
+
+class TestRetryBudget:
+    def test_retries_stop_once_budget_is_spent(self):
+        breakers = CircuitBreakers({"threshold": 1000, "cooldown": 30, "retry_ratio": 0})
+
+        errors = fail(breakers, times=int(circuit_breaker.MIN_RETRY_TOKENS) + 2)
+
+        assert not any(getattr(e, "retryable", True) is False for e in errors[:10])
+        assert all(e.retryable is False for e in errors[10:])
+        assert breakers.stats()["retries_denied"] == 2
+
+    def test_successful_calls_earn_retries(self):
+        breakers = CircuitBreakers({"threshold": 1000, "cooldown": 30, "retry_ratio": 0.5})
+        fail(breakers, times=int(circuit_breaker.MIN_RETRY_TOKENS))
+
+        for _ in range(2):
+            with breakers.guard("http:flaky"):
+                pass
+
+        assert getattr(fail(breakers)[0], "retryable", True) is True
+
+
+class DownstreamNode(Node):
+    """Calls a dependency that is down."""
+
+    def __init__(self):
+        super().__init__(max_retries=3, wait=0.01)
+        self.attempts = 0
+
+    def exec(self, prep_res):
+        with guarded_call("http:down.example.com"):
+            self.attempts += 1
+            raise ConnectionError("connection refused")
+
+    def exec_fallback(self, prep_res, exc):
+        raise RuntimeError(f"failed: {exc}") from exc
+
+
+class TestRetries:
+    @pytest.fixture(autouse=True)
+    def breakers(self, monkeypatch):
+        breakers = CircuitBreakers({"threshold": 5, "cooldown": 30, "retry_ratio": 0.2})
+        monkeypatch.setattr(circuit_breaker, "_breakers", breakers)
+        return breakers
+
+    def test_node_stops_retrying_once_circuit_opens(self):
+        first, second, third = DownstreamNode(), DownstreamNode(), DownstreamNode()
+
+        with pytest.raises(RuntimeError):
+            first.run({})
+        # The 5th failure opens the circuit, so its remaining retry is skipped
+        with pytest.raises(RuntimeError, match="connection refused"):
+            second.run({})
+        with pytest.raises(RuntimeError, match="circuit breaker open"):
+            third.run({})
+
+        assert (first.attempts, second.attempts, third.attempts) == (3, 2, 0)
+
+    def test_batch_items_fail_fast_while_circuit_is_open(self):
+        inner = DownstreamNode()
+        batch = PflowBatchNode(inner, "fetch", {"items": "${data}", "error_handling": "continue", "max_retries": 3})
+        shared = {"data": list(range(50))}
+
+        start = time.monotonic()
+        batch.run(shared)
+
+        assert time.monotonic() - start < 2
+        # Item 0 fails its 3 attempts, and its batch retry opens the circuit (the next retry is skipped)
+        assert inner.attempts == 5
+        errors = shared["fetch"]["errors"]
+        assert len(errors) == 50
+        assert all("circuit breaker open" in e["error"] for e in errors[1:])
@@ -0,0 +1,159 @@
+"""Tests for the process-wide concurrency governor."""
+
+import threading
+import time
+
+import pytest
+
+from pflow.core import concurrency
+from pflow.core.concurrency import ConcurrencyGovernor, http_pool, llm_pool, parse_limits
+from pflow.registry import Registry
+from pflow.runtime.compiler import compile_ir_to_flow
+
+
+class TestPoolNames:
+    def test_llm_models_map_to_providers(self):
+        assert llm_pool("claude-sonnet-4-5") == "llm:anthropic"
+        assert llm_pool("gpt-4o-mini") == "llm:openai"
+        assert llm_pool("gemini-2.5-flash") == "llm:google"
+        assert llm_pool("openrouter/anthropic/claude-3") == "llm:openrouter"
+        assert llm_pool("mistral-large") == "llm:mistral"
+
+    def test_http_pools_are_per_host(self):
+        assert http_pool("https://api.github.com/repos/x") == "http:api.github.com"
+        assert http_pool("not a url") == "http:unknown"
+
+
+class TestLimits:
+    def test_parse_skips_malformed_entries(self):
+        assert parse_limits("llm:anthropic=8, http:*=16,shell=0,bad,cpu=-1,=3") == {
+            "llm:anthropic": 8,
+            "http:*": 16,
+            "shell": 0,
+        }
+
+    def test_exact_names_beat_patterns_and_defaults(self):
+        governor = ConcurrencyGovernor({"llm:anthropic": 2, "http:*": 5})
+
+        assert governor.limit_for("llm:anthropic") == 2
+        assert governor.limit_for("llm:openai") == concurrency.DEFAULT_LIMITS["llm:*"]
+        assert governor.limit_for("http:example.com") == 5
+        assert governor.limit_for("unknown") == 0
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("PFLOW_CONCURRENCY_LIMITS", "shell=3")
+
+        assert ConcurrencyGovernor.from_env().limit_for("shell") == 3
+
+
+class TestSlots:
+    def test_active_slots_never_exceed_limit(self):
+        governor = ConcurrencyGovernor({"shell": 2})
+        release = threading.Event()
+
+        def work(_):
+            with governor.slot("shell"):
+                release.wait(5)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        # Two threads hold the slots; hold them until the other six are queued
+        while governor.usage().get("shell", {}).get("waits", 0) < 6:
+            time.sleep(0.001)
+        assert governor.usage()["shell"]["active"] == 2
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        usage = governor.usage()["shell"]
+        assert usage["peak"] == 2
+        assert usage["active"] == 0
+        assert usage["waits"] == 6
+
+    def test_waiters_are_served_in_arrival_order(self):
+        governor = ConcurrencyGovernor({"cpu": 1})
+        order = []
+        holder = governor.slot("cpu")
+        holder.__enter__()
+
+        def work(i):
+            with governor.slot("cpu"):
+                order.append(i)
+
+        threads = []
+        for i in range(5):
+            threads.append(threading.Thread(target=work, args=(i,)))
+            threads[-1].start()
+            while governor.usage()["cpu"]["waits"] < i + 1:
+                time.sleep(0.001)
+        holder.__exit__(None, None, None)
+        for thread in threads:
+            thread.join(5)
+
+        assert order == [0, 1, 2, 3, 4]
+
+    def test_nested_acquire_in_same_thread_does_not_wait(self):
+        governor = ConcurrencyGovernor({"shell": 1, "cpu": 1})
+
+        with governor.slot("shell"), governor.slot("shell"), governor.slot("cpu"):
+            pass
+
+        assert governor.usage()["shell"]["active"] == 0
+        assert "cpu" not in governor.usage()
+
+    def test_unlimited_pools_are_not_tracked(self):
+        governor = ConcurrencyGovernor({"shell": 0})
+
+        with governor.slot("shell"):
+            pass
+
+        assert governor.usage() == {}
+
+    def test_slot_released_on_error(self):
+        governor = ConcurrencyGovernor({"shell": 1})
+
+        with pytest.raises(ValueError), governor.slot("shell"):
+            raise ValueError
+
+        assert governor.usage()["shell"]["active"] == 0
+
+
+class TestNestedBatches:
+    def test_nested_parallel_batches_share_the_pool(self, monkeypatch):
+        governor = ConcurrencyGovernor({"shell": 2})
+        monkeypatch.setattr(concurrency, "_governor", governor)
+        inner = {
+            "ir_version": "0.1.0",
+            "nodes": [
+                {
+                    "id": "run",
+                    "type": "shell",
+                    "batch": {"items": [1, 2, 3], "parallel": True, "max_concurrent": 3},
+                    "params": {"command": "sleep 0.05"},
+                }
+            ],
+            "edges": [],
+        }
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [
+                {
+                    "id": "outer",
+                    "type": "workflow",
+                    "batch": {"items": ["a", "b", "c"], "parallel": True, "max_concurrent": 3},
+                    "params": {"workflow_ir": inner},
+                }
+            ],
+            "edges": [],
+        }
+        flow = compile_ir_to_flow(ir, registry=Registry())
+        shared: dict = {}
+
+        flow.run(shared)
+
+        assert shared["outer"]["count"] == 3
+        # 9 shell commands from 3x3 batch threads, never more than 2 at once
+        usage = governor.usage()["shell"]
+        assert usage["peak"] == 2
+        assert usage["waits"] > 0
@@ -1,7 +1,9 @@
 """Tests for ExecutionCache class."""
 
 import json
+import sqlite3
 import time
+from contextlib import closing
 from pathlib import Path
 
 import pytest
@@ -21,6 +23,24 @@ def temp_cache_dir(monkeypatch, tmp_path):
     return cache_dir
 
 
+def _raw_entry(cache_dir: Path, execution_id: str) -> dict:
+    """Read a cache entry directly from the database (outputs still encoded)."""
+    with closing(sqlite3.connect(cache_dir / "cache.db")) as conn:
+        row = conn.execute(
+            "SELECT e.execution_id, e.node_type, e.timestamp, e.ttl_hours, e.params, p.outputs "
+            "FROM executions e JOIN payloads p USING (execution_id) WHERE e.execution_id = ?",
+            (execution_id,),
+        ).fetchone()
+    return {
+        "execution_id": row[0],
+        "node_type": row[1],
+        "timestamp": row[2],
+        "ttl_hours": row[3],
+        "params": json.loads(row[4]),
+        "outputs": json.loads(row[5]),
+    }
+
+
 @pytest.fixture
 def cache(temp_cache_dir):
     """Create ExecutionCache instance with temp directory."""
@@ -45,7 +65,7 @@ class TestStore:
     """Test cache storage."""
 
     def test_store_saves_correct_structure(self, cache, temp_cache_dir):
-        """Test cache file has correct JSON structure."""
+        """Test cache entry has correct structure."""
         execution_id = "exec-1234567890-abcd1234"
         node_type = "test-node"
         params = {"param1": "value1", "param2": 42}
@@ -53,9 +73,7 @@ class TestStore:
 
         cache.store(execution_id, node_type, params, outputs)
 
-        cache_file = temp_cache_dir / f"{execution_id}.json"
-        with open(cache_file, encoding="utf-8") as f:
-            data = json.load(f)
+        data = _raw_entry(temp_cache_dir, execution_id)
 
         assert data["execution_id"] == execution_id
         assert data["node_type"] == node_type
@@ -72,9 +90,7 @@ class TestStore:
 
         cache.store(execution_id, "test-node", {}, outputs)
 
-        cache_file = temp_cache_dir / f"{execution_id}.json"
-        with open(cache_file, encoding="utf-8") as f:
-            data = json.load(f)
+        data = _raw_entry(temp_cache_dir, execution_id)
 
         # Binary should be encoded
         assert data["outputs"]["binary_field"]["__type"] == "base64"
@@ -94,9 +110,7 @@ class TestStore:
 
         cache.store(execution_id, "test-node", {}, outputs)
 
-        cache_file = temp_cache_dir / f"{execution_id}.json"
-        with open(cache_file, encoding="utf-8") as f:
-            data = json.load(f)
+        data = _raw_entry(temp_cache_dir, execution_id)
 
         # Check nested binary encoding
         assert data["outputs"]["items"][0]["content"]["__type"] == "base64"
@@ -204,29 +218,133 @@ class TestListCachedExecutions:
         assert result[0]["execution_id"] == exec2
         assert result[1]["execution_id"] == exec1
 
-    def test_list_skips_malformed_files(self, cache, temp_cache_dir):
-        """Test listing skips malformed cache files."""
-        # Create valid execution
+    def test_list_skips_expired_entries(self, cache):
+        """Test listing hides entries past their TTL."""
         valid_id = "exec-1234567890-valid123"
         cache.store(valid_id, "node1", {}, {})
 
-        # Create malformed cache file
-        malformed_file = temp_cache_dir / "exec-9999999999-badfile.json"
-        with open(malformed_file, "w") as f:
-            f.write("{invalid json")
-
-        # Create file with missing keys
-        incomplete_file = temp_cache_dir / "exec-8888888888-incomplete.json"
-        with open(incomplete_file, "w") as f:
-            json.dump({"execution_id": "exec-8888888888-incomplete"}, f)  # Missing node_type
+        expired_cache = ExecutionCache(ttl_hours=0)
+        expired_cache.store("exec-9999999999-expired", "node2", {}, {})
 
         result = cache.list_cached_executions()
 
-        # Should only return valid execution
+        # Should only return live execution
         assert len(result) == 1
         assert result[0]["execution_id"] == valid_id
 
 
+class TestReadFields:
+    """Test path-level field reads."""
+
+    @pytest.fixture
+    def execution_id(self, cache):
+        execution_id = "exec-1234567890-fields12"
+        cache.store(
+            execution_id,
+            "test-node",
+            {},
+            {
+                "result": [{"id": 1, "title": "First", "open": True}, {"id": 2, "title": "Second", "open": False}],
+                "status": "success",
+                "ratio": 0.5,
+                "empty": None,
+                "binary": b"\x00\xff",
+                "nested-key": {"inner": [10, 20]},
+                "json_text": '{"parsed": {"value": 42}}',
+            },
+        )
+        return execution_id
+
+    def test_reads_scalar_and_nested_paths(self, cache, execution_id):
+        """Test scalars, indices, and nested paths are extracted."""
+        result = cache.read_fields(execution_id, ["status", "result[1].title", "result[0].id", "ratio"])
+
+        assert result == {"status": "success", "result[1].title": "Second", "result[0].id": 1, "ratio": 0.5}
+
+    def test_preserves_json_types(self, cache, execution_id):
+        """Test booleans, null, and containers round-trip with their Python types."""
+        result = cache.read_fields(execution_id, ["result[0].open", "result[1].open", "empty", "result[0]"])
+
+        assert result["result[0].open"] is True
+        assert result["result[1].open"] is False
+        assert result["empty"] is None
+        assert result["result[0]"] == {"id": 1, "title": "First", "open": True}
+
+    def test_decodes_binary_values(self, cache, execution_id):
+        """Test binary markers are decoded back to bytes."""
+        result = cache.read_fields(execution_id, ["binary"])
+
+        assert result["binary"] == b"\x00\xff"
+
+    def test_keys_with_special_characters(self, cache, execution_id):
+        """Test keys that need quoting in JSON paths."""
+        result = cache.read_fields(execution_id, ["nested-key.inner[1]"])
+
+        assert result["nested-key.inner[1]"] == 20
+
+    def test_falls_back_to_json_auto_parsing(self, cache, execution_id):
+        """Test paths into JSON strings use TemplateResolver semantics."""
+        result = cache.read_fields(execution_id, ["json_text.parsed.value"])
+
+        assert result["json_text.parsed.value"] == 42
+
+    def test_missing_paths_return_none(self, cache, execution_id):
+        """Test unresolvable paths map to None."""
+        result = cache.read_fields(execution_id, ["missing", "result[5].id", "status.deeper"])
+
+        assert result == {"missing": None, "result[5].id": None, "status.deeper": None}
+
+    def test_unknown_execution_returns_none(self, cache):
+        """Test unknown execution returns None rather than a dict."""
+        assert cache.read_fields("exec-9999999999-nonexist", ["status"]) is None
+
+
+class TestExpiryAndEviction:
+    """Test TTL enforcement and size-capped LRU eviction."""
+
+    def test_retrieve_expired_returns_none(self, temp_cache_dir):
+        """Test expired entries are not returned."""
+        cache = ExecutionCache(ttl_hours=0)
+        cache.store("exec-1234567890-expired1", "test-node", {}, {"result": "x"})
+
+        assert cache.retrieve("exec-1234567890-expired1") is None
+
+    def test_lru_eviction_when_over_size_cap(self, temp_cache_dir):
+        """Test least-recently-used entries are evicted first."""
+        payload = {"data": "x" * 100}
+        cache = ExecutionCache(max_size_bytes=250)
+
+        cache.store("exec-1-first", "node", {}, payload)
+        time.sleep(0.01)
+        cache.store("exec-2-second", "node", {}, payload)
+        time.sleep(0.01)
+        # Access the first entry so the second becomes least recently used
+        assert cache.retrieve("exec-1-first") is not None
+        time.sleep(0.01)
+        cache.store("exec-3-third", "node", {}, payload)
+
+        assert cache.retrieve("exec-1-first") is not None
+        assert cache.retrieve("exec-2-second") is None
+        assert cache.retrieve("exec-3-third") is not None
+
+    def test_newest_entry_is_never_evicted(self, temp_cache_dir):
+        """Test an entry larger than the cap is still stored."""
+        cache = ExecutionCache(max_size_bytes=10)
+        cache.store("exec-1-big", "node", {}, {"data": "x" * 100})
+
+        assert cache.retrieve("exec-1-big") is not None
+
+    def test_cleanup_removes_expired(self, temp_cache_dir):
+        """Test cleanup() purges expired entries."""
+        ExecutionCache().store("exec-1-new", "node", {}, {})
+        ExecutionCache().store("exec-2-old", "node", {}, {})
+        with closing(sqlite3.connect(temp_cache_dir / "cache.db")) as conn, conn:
+            conn.execute("UPDATE executions SET timestamp = 0 WHERE execution_id = 'exec-2-old'")
+
+        assert ExecutionCache().cleanup() == 1
+        assert ExecutionCache().retrieve("exec-1-new") is not None
+
+
 class TestBinaryEncoding:
     """Test binary data encoding/decoding helpers."""
 
@@ -341,10 +459,8 @@ class TestSensitiveParameterMasking:
             outputs={"result": "success"},
         )
 
-        # Read cache file directly
-        cache_file = tmp_path / f"{execution_id}.json"
-        with open(cache_file) as f:
-            cache_data = json.load(f)
+        # Read cache entry directly
+        cache_data = _raw_entry(tmp_path, execution_id)
 
         # Verify sensitive values are masked
         assert cache_data["params"]["api_key"] == "<REDACTED>"
@@ -372,10 +488,8 @@ class TestSensitiveParameterMasking:
             outputs={"result": "success"},
         )
 
-        # Verify cache file exists and has empty params
-        cache_file = tmp_path / f"{execution_id}.json"
-        with open(cache_file) as f:
-            cache_data = json.load(f)
+        # Verify cache entry exists and has empty params
+        cache_data = _raw_entry(tmp_path, execution_id)
 
         assert cache_data["params"] == {}
 
@@ -394,10 +508,8 @@ class TestSensitiveParameterMasking:
             outputs={"result": "success"},
         )
 
-        # Verify cache file exists and has empty params
-        cache_file = tmp_path / f"{execution_id}.json"
-        with open(cache_file) as f:
-            cache_data = json.load(f)
+        # Verify cache entry exists and has empty params
+        cache_data = _raw_entry(tmp_path, execution_id)
 
         assert cache_data["params"] == {}
 
@@ -444,10 +556,8 @@ class TestSensitiveParameterMasking:
             outputs={"result": "success"},
         )
 
-        # Read cache file directly
-        cache_file = tmp_path / f"{execution_id}.json"
-        with open(cache_file) as f:
-            cache_data = json.load(f)
+        # Read cache entry directly
+        cache_data = _raw_entry(tmp_path, execution_id)
 
         # All variations should be masked
         assert cache_data["params"]["API_KEY"] == "<REDACTED>"
@@ -0,0 +1,97 @@
+"""Tests for the process-wide LLM model and client cache."""
+
+from unittest.mock import Mock, patch
+
+import llm
+import pytest
+
+from pflow.core import llm_cache
+
+
+class FakeModel:
+    def __init__(self, name):
+        self.model_id = name
+
+    def prompt(self, text, **kwargs):
+        return f"{self.model_id}: {text}"
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Install the cache over a counting fake llm.get_model."""
+    calls = []
+
+    def fake_get_model(name=None, _skip_async=False):
+        calls.append(name)
+        if name == "missing":
+            raise llm.UnknownModelError(name)
+        return FakeModel(name or "default")
+
+    monkeypatch.setattr(llm, "get_model", fake_get_model)
+    monkeypatch.setattr(llm_cache, "_models", {})
+    llm_cache.install_model_cache()
+    return calls
+
+
+class TestModelCache:
+    def test_model_resolved_once(self, lookups):
+        first = llm.get_model("gpt-4o")
+        second = llm.get_model("gpt-4o")
+
+        assert lookups == ["gpt-4o"]
+        assert first.model_id == second.model_id == "gpt-4o"
+
+    def test_callers_get_independent_copies(self, lookups):
+        traced = llm.get_model("gpt-4o")
+        traced.prompt = lambda text, **kwargs: "intercepted"
+
+        assert llm.get_model("gpt-4o").prompt("hi") == "gpt-4o: hi"
+
+    def test_unknown_models_not_cached(self, lookups):
+        for _ in range(2):
+            with pytest.raises(llm.UnknownModelError):
+                llm.get_model("missing")
+
+        assert lookups == ["missing", "missing"]
+
+    def test_default_model_not_cached(self, lookups):
+        llm.get_model()
+        llm.get_model()
+
+        assert lookups == [None, None]
+
+    def test_install_is_idempotent(self, lookups):
+        installed = llm.get_model
+        llm_cache.install_model_cache()
+
+        assert llm.get_model is installed
+
+
+class TestAnthropicClientCache:
+    @pytest.fixture(autouse=True)
+    def fake_sdk(self, monkeypatch):
+        monkeypatch.setattr(llm_cache, "_clients", {})
+        with patch("anthropic.Anthropic", side_effect=lambda api_key: Mock(api_key=api_key)) as sdk:
+            yield sdk
+
+    def test_one_client_per_key(self, fake_sdk):
+        a1 = llm_cache.get_anthropic_client("key-a")
+        a2 = llm_cache.get_anthropic_client("key-a")
+        b = llm_cache.get_anthropic_client("key-b")
+
+        assert a1 is a2
+        assert b is not a1
+        assert fake_sdk.call_count == 2
+
+    def test_missing_key_uses_environment(self, fake_sdk, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "env-key")
+
+        assert llm_cache.get_anthropic_client(None) is llm_cache.get_anthropic_client("env-key")
+
+    def test_clear_closes_clients(self, fake_sdk):
+        client = llm_cache.get_anthropic_client("key-a")
+
+        llm_cache.clear_llm_caches()
+
+        client.close.assert_called_once()
+        assert llm_cache.get_anthropic_client("key-a") is not client
@@ -3,6 +3,9 @@
 import time
 from unittest.mock import patch
 
+import pytest
+
+from pflow.core.llm_pricing import PROVIDER_BATCH_DISCOUNT
 from pflow.core.metrics import MetricsCollector
 
 
@@ -500,3 +503,74 @@ class TestMetricsCollector:
         assert workflow_metrics["tokens_output"] == 0
         assert workflow_metrics["tokens_total"] == 0
         assert workflow_metrics["models_used"] == []
+
+    def test_streaming_performance_averages_streamed_calls(self):
+        """Streamed calls report time-to-first-token and throughput averages."""
+        collector = MetricsCollector()
+        llm_calls = [
+            {
+                "model": "gpt-4o-mini",
+                "input_tokens": 10,
+                "output_tokens": 50,
+                "time_to_first_token_ms": 200.0,
+                "tokens_per_second": 40.0,
+            },
+            {
+                "model": "gpt-4o-mini",
+                "input_tokens": 10,
+                "output_tokens": 50,
+                "time_to_first_token_ms": 400.0,
+                "tokens_per_second": 60.0,
+            },
+            {"model": "gpt-4o-mini", "input_tokens": 10, "output_tokens": 50},
+        ]
+
+        summary = collector.get_summary(llm_calls)
+
+        assert summary["streaming_performance"] == {
+            "streamed_calls": 2,
+            "avg_time_to_first_token_ms": 300.0,
+            "avg_tokens_per_second": 50.0,
+        }
+
+    def test_no_streaming_performance_without_streamed_calls(self):
+        """The streaming section is omitted when nothing was streamed."""
+        collector = MetricsCollector()
+
+        summary = collector.get_summary([{"model": "gpt-4o-mini", "input_tokens": 10, "output_tokens": 5}])
+
+        assert "streaming_performance" not in summary
+
+    def test_provider_batch_calls_discounted(self):
+        """Calls run through a provider batch API are billed at the batch discount."""
+        collector = MetricsCollector()
+        call = {"model": "gpt-4o-mini", "input_tokens": 1000, "output_tokens": 500}
+
+        realtime = collector.calculate_costs([call])["total_cost_usd"]
+        batched = collector.calculate_costs([{**call, "provider_batch": True}])["total_cost_usd"]
+
+        assert batched == pytest.approx(realtime * PROVIDER_BATCH_DISCOUNT, abs=1e-6)
+
+    def test_speculation_waste_reported_and_counted_in_totals(self):
+        """Discarded speculative planner calls are reported separately but still cost money."""
+        collector = MetricsCollector()
+        used = {"model": "gpt-4o-mini", "input_tokens": 1000, "output_tokens": 500, "is_planner": True}
+        wasted = {**used, "speculative_wasted": True}
+
+        summary = collector.get_summary([used, wasted])
+
+        wasted_cost = collector.calculate_costs([wasted])["total_cost_usd"]
+        assert summary["speculation"] == {
+            "wasted_calls": 1,
+            "wasted_tokens": 1500,
+            "wasted_cost_usd": wasted_cost,
+        }
+        assert summary["total_cost_usd"] == pytest.approx(2 * wasted_cost, abs=1e-6)
+
+    def test_no_speculation_section_without_waste(self):
+        """The speculation section is omitted when no speculative call was discarded."""
+        collector = MetricsCollector()
+
+        summary = collector.get_summary([{"model": "gpt-4o-mini", "input_tokens": 10, "output_tokens": 5}])
+
+        assert "speculation" not in summary
@@ -523,3 +523,37 @@ class TestBatchProgressDisplay:
         # Should not have called _handle_batch_progress (validation fails)
         # The call should have been made for node_start tracking, not batch_progress
         # Since all params must be present, no output should occur for batch_progress
+
+
+class TestStreamDisplay:
+    """Tests for node_stream event handling."""
+
+    @patch("click.style", side_effect=mock_click_style)
+    @patch("click.echo")
+    def test_stream_chunks_written_on_own_lines(self, mock_echo, mock_style):
+        """First chunk ends the node line; completion re-opens it after the output."""
+        controller = OutputController(stdin_tty=True, stdout_tty=True)
+        callback = controller.create_progress_callback()
+
+        callback("answer", "node_start")
+        callback("answer", "node_stream", text_chunk="Hel")
+        callback("answer", "node_stream", text_chunk="lo")
+        callback("answer", "node_complete", duration_ms=1500)
+
+        outputs = [c[0][0] for c in mock_echo.call_args_list]
+        assert outputs == ["  answer...", "", "Hel", "lo", "", "  answer", " ✓ 1.5s"]
+        assert all(c[1].get("err") is True for c in mock_echo.call_args_list)
+
+    @patch("click.style", side_effect=mock_click_style)
+    @patch("click.echo")
+    def test_complete_without_stream_unchanged(self, mock_echo, mock_style):
+        """Nodes that don't stream keep the single-line display."""
+        controller = OutputController(stdin_tty=True, stdout_tty=True)
+        callback = controller.create_progress_callback()
+
+        callback("answer", "node_start")
+        callback("answer", "node_stream", text_chunk="")
+        callback("answer", "node_complete", duration_ms=1500)
+
+        outputs = [c[0][0] for c in mock_echo.call_args_list]
+        assert outputs == ["  answer...", " ✓ 1.5s"]
@@ -0,0 +1,42 @@
+"""Tests for the SQLite helpers shared by the on-disk caches."""
+
+from contextlib import closing
+
+from pflow.core import sqlite_cache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    size_bytes INTEGER NOT NULL
+);
+"""
+
+
+def _insert(conn, key, timestamp, last_accessed, size_bytes=10):
+    conn.execute("INSERT INTO entries VALUES (?, ?, ?, ?)", (key, timestamp, last_accessed, size_bytes))
+
+
+def _keys(conn):
+    return sorted(row[0] for row in conn.execute("SELECT key FROM entries"))
+
+
+def test_connect_creates_directory_schema_and_wal(tmp_path):
+    with closing(sqlite_cache.connect(tmp_path / "nested" / "cache.db", SCHEMA)) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert _keys(conn) == []
+
+
+def test_evict_removes_expired_then_least_recently_used(tmp_path):
+    with closing(sqlite_cache.connect(tmp_path / "cache.db", SCHEMA)) as conn, conn:
+        _insert(conn, "expired", timestamp=0, last_accessed=900)
+        _insert(conn, "old", timestamp=950, last_accessed=100)
+        _insert(conn, "recent", timestamp=950, last_accessed=800)
+        _insert(conn, "new", timestamp=1000, last_accessed=50)
+
+        removed = sqlite_cache.evict(conn, "entries", "key", "timestamp + ? <= ?", (100, 1000), 20, keep="new")
+
+        # "new" was least recently used but is the entry being stored
+        assert removed == 2
+        assert _keys(conn) == ["new", "recent"]
@@ -77,7 +77,7 @@ class TestBinaryDataRoundtrip:
         }
 
         # Mock HTTP response with binary PNG data
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "image/png"}
@@ -193,7 +193,7 @@ class TestBinaryDataRoundtrip:
         }
 
         # Mock JSON response
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "application/json"}
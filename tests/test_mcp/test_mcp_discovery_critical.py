@@ -95,6 +95,20 @@ class TestMCPDiscoveryCritical:
         assert params[0]["type"] == "str"  # Fallback to str (safe default)
         assert params[0]["key"] == "weird_field"
 
+    def test_extract_annotations_keeps_only_set_hints(self):
+        """Test that tool annotations are kept for hedging decisions.
+
+        Hedged batches only repeat MCP tools whose server marks them read-only
+        or idempotent, so hints the server didn't set must not appear as False.
+        """
+        from mcp.types import Tool, ToolAnnotations
+
+        discovery = MCPDiscovery()
+        tool = Tool(name="read", inputSchema={"type": "object"}, annotations=ToolAnnotations(readOnlyHint=True))
+
+        assert discovery._extract_annotations(tool) == {"readOnlyHint": True}
+        assert discovery._extract_annotations(Tool(name="write", inputSchema={"type": "object"})) == {}
+
 
 class TestMCPRegistrarCritical:
     """Test the critical tool registration process."""
@@ -124,6 +138,7 @@ class TestMCPRegistrarCritical:
                     "type": "object",
                     "properties": {"issue_url": {"type": "string"}, "issue_number": {"type": "integer"}},
                 },
+                "annotations": {"readOnlyHint": False, "destructiveHint": False},
             }
 
             entry = registrar._create_registry_entry("github", tool_def)
@@ -150,6 +165,7 @@ class TestMCPRegistrarCritical:
             # Check MCP metadata preserved
             assert interface["mcp_metadata"]["server"] == "github"
             assert interface["mcp_metadata"]["tool"] == "create-issue"
+            assert interface["mcp_metadata"]["annotations"] == {"readOnlyHint": False, "destructiveHint": False}
 
     def test_sync_server_updates_registry(self):
         """Test that syncing a server updates the registry correctly.
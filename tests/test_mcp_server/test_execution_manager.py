@@ -0,0 +1,234 @@
+"""Tests for the MCP server execution manager.
+
+Covers the admission-control guarantees the server relies on when several
+agents share one pflow MCP process: bounded concurrency, per-client limits,
+priority ordering, queue rejection, and cancellation of queued work.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pflow.mcp_server.utils.execution_manager import (
+    ANONYMOUS_CLIENT,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    ExecutionManager,
+    ExecutionRejectedError,
+    client_id_from_context,
+)
+
+
+@pytest.fixture
+def manager():
+    """Execution manager torn down after each test."""
+    managers = []
+
+    def factory(**kwargs):
+        m = ExecutionManager(**kwargs)
+        managers.append(m)
+        return m
+
+    yield factory
+
+    for m in managers:
+        m.shutdown(wait=False)
+
+
+def _blocker():
+    """Return (event, func) where func blocks until the event is set."""
+    release = threading.Event()
+
+    def func():
+        release.wait(timeout=5)
+        return "done"
+
+    return release, func
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestConcurrencyLimits:
+    """Test global and per-client limits."""
+
+    def test_never_exceeds_max_workers(self, manager):
+        m = manager(max_workers=2, max_per_client=10)
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+        futures = [m.submit(work) for _ in range(8)]
+        for f in futures:
+            f.result(timeout=5)
+
+        assert peak == 2
+
+    def test_per_client_limit_lets_other_clients_through(self, manager):
+        m = manager(max_workers=3, max_per_client=1)
+        release, blocking = _blocker()
+
+        first = m.submit(blocking, client_id="agent-a")
+        queued_same_client = m.submit(lambda: "a2", client_id="agent-a")
+        other_client = m.submit(lambda: "b1", client_id="agent-b")
+
+        assert other_client.result(timeout=2) == "b1"
+        assert not queued_same_client.done()
+
+        release.set()
+        assert first.result(timeout=2) == "done"
+        assert queued_same_client.result(timeout=2) == "a2"
+
+
+class TestOrdering:
+    """Test priority ordering of queued jobs."""
+
+    def test_higher_priority_runs_first(self, manager):
+        m = manager(max_workers=1, max_per_client=10)
+        release, blocking = _blocker()
+        order = []
+
+        m.submit(blocking)
+        assert _wait_for(lambda: m.stats()["running"] == 1)
+
+        low = m.submit(lambda: order.append("low"), priority=PRIORITY_LOW)
+        normal = m.submit(lambda: order.append("normal"))
+        high = m.submit(lambda: order.append("high"), priority=PRIORITY_HIGH)
+
+        release.set()
+        for f in (low, normal, high):
+            f.result(timeout=2)
+
+        assert order == ["high", "normal", "low"]
+
+
+class TestAdmissionControl:
+    """Test queue bounds and cancellation."""
+
+    def test_rejects_when_queue_full(self, manager):
+        m = manager(max_workers=1, max_per_client=10, max_queue=1)
+        release, blocking = _blocker()
+
+        m.submit(blocking)
+        assert _wait_for(lambda: m.stats()["running"] == 1)
+        m.submit(lambda: None)
+
+        with pytest.raises(ExecutionRejectedError, match="Server busy"):
+            m.submit(lambda: None)
+
+        release.set()
+
+    def test_cancelled_queued_job_never_runs(self, manager):
+        m = manager(max_workers=1, max_per_client=10)
+        release, blocking = _blocker()
+        ran = []
+
+        m.submit(blocking)
+        assert _wait_for(lambda: m.stats()["running"] == 1)
+        queued = m.submit(lambda: ran.append(True))
+
+        assert queued.cancel()
+        release.set()
+        m.submit(lambda: None).result(timeout=2)
+
+        assert ran == []
+
+    def test_exceptions_propagate_to_caller(self, manager):
+        m = manager(max_workers=1)
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            m.submit(fail).result(timeout=2)
+
+        # Worker slot is released after failure
+        assert m.submit(lambda: "ok").result(timeout=2) == "ok"
+
+    def test_shutdown_rejects_new_work(self, manager):
+        m = manager(max_workers=1)
+        m.shutdown()
+
+        with pytest.raises(ExecutionRejectedError):
+            m.submit(lambda: None)
+
+
+class TestConfiguration:
+    """Test limits read from the environment."""
+
+    def test_limits_read_when_created(self, manager, monkeypatch):
+        monkeypatch.setenv("PFLOW_MCP_MAX_WORKERS", "8")
+        monkeypatch.setenv("PFLOW_MCP_MAX_PER_CLIENT", " 3 ")
+        monkeypatch.setenv("PFLOW_MCP_MAX_QUEUE", "0")
+
+        m = manager()
+
+        assert (m.max_workers, m.max_per_client, m.max_queue) == (8, 3, 0)
+
+    def test_invalid_limits_fall_back_or_clamp(self, manager, monkeypatch, caplog):
+        monkeypatch.setenv("PFLOW_MCP_MAX_WORKERS", "four")
+        monkeypatch.setenv("PFLOW_MCP_MAX_PER_CLIENT", "0")
+        monkeypatch.setenv("PFLOW_MCP_MAX_QUEUE", "")
+
+        m = manager()
+
+        assert (m.max_workers, m.max_per_client, m.max_queue) == (4, 1, 32)
+        assert "PFLOW_MCP_MAX_WORKERS='four'" in caplog.text
+        assert "PFLOW_MCP_MAX_PER_CLIENT=0 is below 1" in caplog.text
+
+    def test_explicit_limits_ignore_the_environment(self, manager, monkeypatch):
+        monkeypatch.setenv("PFLOW_MCP_MAX_WORKERS", "oops")
+
+        assert manager(max_workers=2).max_workers == 2
+
+
+class TestAsyncRun:
+    """Test the asyncio entry point used by MCP tools."""
+
+    def test_run_returns_result(self, manager):
+        m = manager(max_workers=2)
+
+        assert asyncio.run(m.run(lambda: 42)) == 42
+
+    def test_run_executes_on_manager_thread(self, manager):
+        m = manager(max_workers=1)
+
+        thread_name = asyncio.run(m.run(lambda: threading.current_thread().name))
+
+        assert thread_name.startswith("pflow-mcp-exec-")
+
+
+class TestClientIdFromContext:
+    """Test client identification from MCP contexts."""
+
+    def test_none_context_is_anonymous(self):
+        assert client_id_from_context(None) == ANONYMOUS_CLIENT
+
+    def test_prefers_client_id(self):
+        ctx = SimpleNamespace(client_id="agent-7", session=object())
+
+        assert client_id_from_context(ctx) == "agent-7"
+
+    def test_falls_back_to_session_identity(self):
+        session = object()
+        ctx = SimpleNamespace(client_id=None, session=session)
+
+        assert client_id_from_context(ctx) == f"session-{id(session)}"
@@ -0,0 +1,235 @@
+"""Tests for asynchronous workflow jobs in the MCP server.
+
+Jobs wrap a workflow run so agents can start it, poll status, fetch the
+result later, or cancel it. These tests drive the JobRegistry with plain
+callables standing in for workflow execution.
+"""
+
+import threading
+import time
+
+import pytest
+
+from pflow.core.cancellation import run_cancellation
+from pflow.mcp_server.utils.execution_manager import ExecutionManager
+from pflow.mcp_server.utils.jobs import (
+    JOB_CANCELLED,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JobRegistry,
+    format_job_status,
+)
+
+
+@pytest.fixture
+def manager():
+    m = ExecutionManager(max_workers=1, max_per_client=10)
+    yield m
+    m.shutdown(wait=False)
+
+
+@pytest.fixture
+def registry(manager):
+    return JobRegistry(manager=manager)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class TestJobLifecycle:
+    """Test jobs moving through their states."""
+
+    def test_completed_job_keeps_result(self, registry):
+        job = registry.start(lambda output: "Workflow completed", "greeter", "agent-a")
+
+        finished = registry.wait(job.job_id, timeout=2)
+
+        assert finished.status == JOB_COMPLETED
+        assert finished.result == "Workflow completed"
+        assert finished.finished_at is not None
+
+    def test_failed_job_keeps_error(self, registry):
+        def run(output):
+            raise RuntimeError("Node 'fetch' failed")
+
+        job = registry.start(run, "greeter", "agent-a")
+        finished = registry.wait(job.job_id, timeout=2)
+
+        assert finished.status == JOB_FAILED
+        assert finished.error == "Node 'fetch' failed"
+        assert finished.result is None
+
+    def test_unknown_job_returns_none(self, registry):
+        assert registry.get("job-missing") is None
+        assert registry.wait("job-missing", timeout=0) is None
+        assert registry.cancel("job-missing") is None
+
+    def test_wait_returns_running_job_after_timeout(self, registry):
+        release = threading.Event()
+        job = registry.start(lambda output: release.wait(5) and "done", "slow", "agent-a")
+
+        assert _wait_for(lambda: job.status == JOB_RUNNING)
+        assert registry.wait(job.job_id, timeout=0.05).status == JOB_RUNNING
+
+        release.set()
+        assert registry.wait(job.job_id, timeout=2).status == JOB_COMPLETED
+
+
+class TestProgress:
+    """Test progress recorded from executor callback events."""
+
+    def test_callback_updates_job_and_notifier(self, registry):
+        notified = []
+
+        def run(output):
+            callback = output.create_node_callback()
+            callback("fetch", "node_start", None, 0)
+            callback("fetch", "node_complete", 12.34, 0)
+            callback("summarize", "node_start", None, 0)
+            callback("summarize", "batch_progress", None, 0, batch_current=3, batch_total=10)
+            callback("inner", "node_complete", 1.0, 1)
+            return "ok"
+
+        job = registry.start(run, "pipeline", "agent-a", notifier=notified.append)
+        registry.wait(job.job_id, timeout=2)
+
+        assert job.current_node == "summarize"
+        assert job.nodes_completed == 1  # nested nodes don't count
+        assert job.batch_progress == (3, 10)
+        assert len(job.events) == 5
+        assert notified[1] == {
+            "job_id": job.job_id,
+            "node_id": "fetch",
+            "event": "node_complete",
+            "depth": 0,
+            "duration_ms": 12.3,
+        }
+
+    def test_stream_chunks_notified_but_not_recorded(self, registry):
+        notified = []
+
+        def run(output):
+            callback = output.create_node_callback()
+            callback("answer", "node_start", None, 0)
+            callback("answer", "node_stream", None, 0, text_chunk="Hel")
+            callback("answer", "node_stream", None, 0, text_chunk="lo")
+            return "ok"
+
+        job = registry.start(run, "pipeline", "agent-a", notifier=notified.append)
+        registry.wait(job.job_id, timeout=2)
+
+        assert [p.get("text") for p in notified if p["event"] == "node_stream"] == ["Hel", "lo"]
+        assert [e["event"] for e in job.events] == ["node_start"]
+
+    def test_notifier_errors_do_not_fail_job(self, registry):
+        def broken_notifier(payload):
+            raise ConnectionError("client went away")
+
+        def run(output):
+            output.create_node_callback()("fetch", "node_start", None, 0)
+            return "ok"
+
+        job = registry.start(run, "pipeline", "agent-a", notifier=broken_notifier)
+
+        assert registry.wait(job.job_id, timeout=2).status == JOB_COMPLETED
+
+    def test_status_shows_current_node_and_batch(self, registry):
+        release = threading.Event()
+
+        def run(output):
+            callback = output.create_node_callback()
+            callback("summarize", "node_start", None, 0)
+            callback("summarize", "batch_progress", None, 0, batch_current=4, batch_total=8)
+            release.wait(5)
+            return "ok"
+
+        job = registry.start(run, "pipeline", "agent-a")
+        assert _wait_for(lambda: job.batch_progress is not None)
+
+        status = format_job_status(job)
+        release.set()
+
+        assert f"Job {job.job_id}: running" in status
+        assert "Current node: summarize" in status
+        assert "Batch progress: 4/8" in status
+
+
+class TestCancellation:
+    """Test cancelling queued and running jobs."""
+
+    def test_cancel_queued_job_never_runs(self, registry):
+        release = threading.Event()
+        ran = []
+        blocker = registry.start(lambda output: release.wait(5) and "done", "slow", "agent-a")
+        assert _wait_for(lambda: blocker.status == JOB_RUNNING)
+
+        queued = registry.start(lambda output: ran.append(True) or "ok", "queued", "agent-a")
+        assert queued.status == JOB_QUEUED
+
+        assert registry.cancel(queued.job_id).status == JOB_CANCELLED
+        release.set()
+        registry.wait(blocker.job_id, timeout=2)
+        # Let the worker drain the queue
+        after = registry.start(lambda output: "after", "next", "agent-a")
+        assert registry.wait(after.job_id, timeout=2).status == JOB_COMPLETED
+
+        assert ran == []
+        assert queued.status == JOB_CANCELLED
+
+    def test_cancel_running_job_discards_result(self, registry):
+        release = threading.Event()
+        job = registry.start(lambda output: release.wait(5) and "done", "slow", "agent-a")
+        assert _wait_for(lambda: job.status == JOB_RUNNING)
+
+        registry.cancel(job.job_id)
+        release.set()
+        job.future.result(timeout=2)
+
+        assert job.status == JOB_CANCELLED
+        assert job.result is None
+
+    def test_cancel_running_job_cancels_its_workflow_run(self, registry):
+        started = threading.Event()
+
+        def run(output):
+            # Stands in for WorkflowExecutorService, which installs the run token
+            with run_cancellation({}) as token:
+                started.set()
+                return "stopped" if token.wait(5) else "done"
+
+        job = registry.start(run, "slow", "agent-a")
+        assert started.wait(2)
+
+        registry.cancel(job.job_id)
+        job.future.result(timeout=2)
+
+        assert job.cancel_token.cancelled
+        assert job.status == JOB_CANCELLED
+
+    def test_cancel_finished_job_is_noop(self, registry):
+        job = registry.start(lambda output: "done", "quick", "agent-a")
+        registry.wait(job.job_id, timeout=2)
+
+        assert registry.cancel(job.job_id).status == JOB_COMPLETED
+
+
+class TestRetention:
+    """Test bounded retention of finished jobs."""
+
+    def test_oldest_finished_jobs_are_dropped(self, manager):
+        registry = JobRegistry(max_finished=2, manager=manager)
+        jobs = [registry.start(lambda output, i=i: str(i), f"wf-{i}", "agent-a") for i in range(3)]
+        for job in jobs:
+            job.future.result(timeout=2)
+
+        assert registry.get(jobs[0].job_id) is None
+        assert registry.get(jobs[1].job_id) is not None
+        assert registry.get(jobs[2].job_id) is not None
@@ -0,0 +1,189 @@
+"""Tests for MCP server warm mode caches.
+
+Warm mode keeps registry, workflow and validation snapshots in memory
+across tool calls. These tests verify that cached data is reused while
+files are unchanged, invalidated when they change, and that callers get
+isolated copies.
+"""
+
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from pflow.core import workflow_manager as wm_module
+from pflow.core.workflow_manager import WorkflowManager
+from pflow.mcp_server.utils import warm_state
+from pflow.mcp_server.utils.warm_state import (
+    FingerprintCache,
+    IndexedWorkflowManager,
+    SnapshotRegistry,
+    cached_validation,
+    enable_warm_mode,
+    get_registry,
+    get_workflow_manager,
+    reset_warm_state,
+)
+from pflow.registry import Registry
+
+WORKFLOW_CONTENT = """# Greeter
+
+Say hello.
+
+## Steps
+
+### greet
+
+Echo a greeting.
+
+- type: shell
+
+```shell command
+echo hello
+```
+"""
+
+
+@pytest.fixture(autouse=True)
+def clean_warm_state(monkeypatch):
+    """Ensure every test starts cold with empty caches."""
+    monkeypatch.delenv(warm_state.WARM_MODE_ENV_VAR, raising=False)
+    reset_warm_state()
+    yield
+    reset_warm_state()
+
+
+def _bump_mtime(path: Path) -> None:
+    """Force a visible mtime change regardless of filesystem granularity."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestWarmModeToggle:
+    """Test how warm mode is enabled."""
+
+    def test_cold_by_default(self):
+        assert type(get_registry()) is Registry
+        assert type(get_workflow_manager()) is WorkflowManager
+
+    def test_enable_warm_mode(self):
+        enable_warm_mode()
+
+        assert isinstance(get_registry(), SnapshotRegistry)
+        assert isinstance(get_workflow_manager(), IndexedWorkflowManager)
+
+    def test_environment_variable(self, monkeypatch):
+        monkeypatch.setenv(warm_state.WARM_MODE_ENV_VAR, "1")
+
+        assert isinstance(get_registry(), SnapshotRegistry)
+
+
+class TestFingerprintCache:
+    """Test the fingerprint-keyed cache primitive."""
+
+    def test_reuses_value_while_fingerprint_matches(self):
+        cache = FingerprintCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get_or_compute("k", (1, 1), compute) == 1
+        assert cache.get_or_compute("k", (1, 1), compute) == 1
+        assert cache.get_or_compute("k", (2, 1), compute) == 2
+
+    def test_bounded_entries_evict_oldest(self):
+        cache = FingerprintCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.get_or_compute(key, None, lambda k=key: k)
+
+        assert len(cache) == 2
+        assert cache.get_or_compute("a", None, lambda: "recomputed") == "recomputed"
+
+
+class TestSnapshotRegistry:
+    """Test registry snapshot reuse and invalidation."""
+
+    @pytest.fixture
+    def registry_path(self, tmp_path):
+        path = tmp_path / "registry.json"
+        path.write_text(json.dumps({"nodes": {"node-a": {"module": "pflow.nodes.a"}}}))
+        return path
+
+    def test_reuses_snapshot_until_file_changes(self, registry_path):
+        with patch.object(Registry, "_load_from_file", wraps=Registry(registry_path)._load_from_file) as loader:
+            SnapshotRegistry(registry_path).load(include_filtered=True)
+            SnapshotRegistry(registry_path).load(include_filtered=True)
+            assert loader.call_count == 1
+
+            registry_path.write_text(json.dumps({"nodes": {"node-b": {"module": "pflow.nodes.b"}}}))
+            _bump_mtime(registry_path)
+            nodes = SnapshotRegistry(registry_path).load(include_filtered=True)
+
+        assert loader.call_count == 2
+        assert list(nodes) == ["node-b"]
+
+    def test_callers_get_isolated_top_level_dict(self, registry_path):
+        first = SnapshotRegistry(registry_path).load(include_filtered=True)
+        first.pop("node-a")
+
+        assert "node-a" in SnapshotRegistry(registry_path).load(include_filtered=True)
+
+
+class TestIndexedWorkflowManager:
+    """Test workflow index reuse and invalidation."""
+
+    def test_reuses_parse_until_file_changes(self, tmp_path):
+        workflow_file = tmp_path / "greeter.pflow.md"
+        workflow_file.write_text(WORKFLOW_CONTENT)
+
+        with patch.object(wm_module, "parse_markdown", wraps=wm_module.parse_markdown) as parser:
+            IndexedWorkflowManager(tmp_path).list_all()
+            IndexedWorkflowManager(tmp_path).load("greeter")
+            assert parser.call_count == 1
+
+            workflow_file.write_text(WORKFLOW_CONTENT.replace("Say hello.", "Say hello loudly."))
+            _bump_mtime(workflow_file)
+            loaded = IndexedWorkflowManager(tmp_path).load("greeter")
+
+        assert parser.call_count == 2
+        assert loaded["description"] == "Say hello loudly."
+
+    def test_callers_get_isolated_ir(self, tmp_path):
+        (tmp_path / "greeter.pflow.md").write_text(WORKFLOW_CONTENT)
+
+        first = IndexedWorkflowManager(tmp_path).load("greeter")
+        first["ir"]["nodes"].clear()
+
+        assert IndexedWorkflowManager(tmp_path).load("greeter")["ir"]["nodes"]
+
+
+class TestCachedValidation:
+    """Test validation result reuse."""
+
+    def test_cold_mode_always_validates(self, tmp_path):
+        registry = Registry(tmp_path / "registry.json")
+        calls = []
+
+        for _ in range(2):
+            cached_validation({"nodes": []}, registry, lambda: calls.append(1) or ([], []))
+
+        assert len(calls) == 2
+
+    def test_warm_mode_reuses_result_for_identical_ir(self, tmp_path):
+        enable_warm_mode()
+        registry = Registry(tmp_path / "registry.json")
+        calls = []
+
+        def validate():
+            calls.append(1)
+            return (["error"], [])
+
+        assert cached_validation({"nodes": [1]}, registry, validate) == (["error"], [])
+        assert cached_validation({"nodes": [1]}, registry, validate) == (["error"], [])
+        cached_validation({"nodes": [2]}, registry, validate)
+
+        assert len(calls) == 2
@@ -0,0 +1,13 @@
+"""Shared fixtures for GitHub node tests."""
+
+import pytest
+
+from src.pflow.nodes.github import gh_client
+
+
+@pytest.fixture(autouse=True)
+def reset_gh_auth_cache():
+    """Forget cached auth probes: tests mock subprocess.run and expect the probe call."""
+    gh_client.reset_gh_auth_cache()
+    yield
+    gh_client.reset_gh_auth_cache()
@@ -0,0 +1,159 @@
+"""Tests for shared GitHub CLI access (auth probe and issue batching)."""
+
+import json
+import subprocess
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.pflow.nodes.github import gh_client
+from src.pflow.nodes.github.get_issue import GetIssueNode
+from src.pflow.nodes.github.gh_client import IssueBatcher, ensure_gh_authenticated
+
+
+def graphql_issue(number):
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "body": "",
+        "state": "OPEN",
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-02T00:00:00Z",
+        "author": {"__typename": "User", "login": "octocat", "id": "U_1", "name": "Octo Cat"},
+        "labels": {"nodes": [{"id": "L_1", "name": "bug", "description": "", "color": "d73a4a"}]},
+        "assignees": {"nodes": []},
+    }
+
+
+class TestAuthProbe:
+    def test_probe_runs_once_for_many_checks(self):
+        with patch("subprocess.run", return_value=MagicMock(returncode=0)) as mock_run:
+            for _ in range(5):
+                ensure_gh_authenticated()
+
+        mock_run.assert_called_once_with(["gh", "auth", "status"], capture_output=True, text=True, timeout=10)
+
+    def test_concurrent_checks_share_one_probe(self):
+        def slow_probe(*args, **kwargs):
+            time.sleep(0.05)
+            return MagicMock(returncode=0)
+
+        with patch("subprocess.run", side_effect=slow_probe) as mock_run:
+            threads = [threading.Thread(target=ensure_gh_authenticated) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert mock_run.call_count == 1
+
+    def test_failures_are_not_remembered(self):
+        with patch("subprocess.run", return_value=MagicMock(returncode=1)), pytest.raises(ValueError):
+            ensure_gh_authenticated()
+
+        with patch("subprocess.run", return_value=MagicMock(returncode=0)) as mock_run:
+            ensure_gh_authenticated()
+
+        mock_run.assert_called_once()
+
+    def test_token_change_reprobes(self, monkeypatch):
+        with patch("subprocess.run", return_value=MagicMock(returncode=0)) as mock_run:
+            ensure_gh_authenticated()
+            monkeypatch.setenv("GH_TOKEN", "other-token")
+            ensure_gh_authenticated()
+
+        assert mock_run.call_count == 2
+
+    def test_expired_probe_reruns(self, monkeypatch):
+        monkeypatch.setattr(gh_client._auth_probe, "ttl_seconds", 0)
+
+        with patch("subprocess.run", return_value=MagicMock(returncode=0)) as mock_run:
+            ensure_gh_authenticated()
+            ensure_gh_authenticated()
+
+        assert mock_run.call_count == 2
+
+
+class TestIssueBatcher:
+    def test_uncontended_lookup_uses_single_fetch(self):
+        batcher = IssueBatcher()
+
+        with patch("subprocess.run") as mock_run:
+            assert batcher.fetch("owner/repo", "1", lambda: {"number": 1}) == {"number": 1}
+
+        mock_run.assert_not_called()
+
+    def test_queued_lookups_coalesce_into_one_graphql_call(self):
+        batcher = IssueBatcher()
+        release = threading.Event()
+        results: dict[str, object] = {}
+
+        def first_fetch():
+            release.wait(5)
+            return {"number": 1}
+
+        response = {
+            "data": {"repository": {"i0": graphql_issue(2), "i1": None, "i2": graphql_issue(4)}},
+            "errors": [
+                {"path": ["repository", "i1"], "message": "Could not resolve to an Issue with the number of 3."}
+            ],
+        }
+
+        def lookup(number, fetch_one):
+            try:
+                results[number] = batcher.fetch("owner/repo", number, fetch_one)
+            except subprocess.CalledProcessError as e:
+                results[number] = e
+
+        with patch("subprocess.run", return_value=MagicMock(returncode=1, stdout=json.dumps(response))) as mock_run:
+            threads = [threading.Thread(target=lookup, args=("1", first_fetch))]
+            threads[0].start()
+            for number in ("2", "3", "4"):
+                threads.append(threading.Thread(target=lookup, args=(number, lambda: pytest.fail("fetched alone"))))
+                threads[-1].start()
+                # Queue in a known order behind the in-flight lookup
+                while len(batcher._pending.get("owner/repo", [])) < len(threads) - 1:
+                    time.sleep(0.001)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:3] == ["gh", "api", "graphql"]
+        assert "owner=owner" in cmd and "name=repo" in cmd
+        assert results["1"] == {"number": 1}
+        assert results["2"]["author"] == {"id": "U_1", "is_bot": False, "login": "octocat", "name": "Octo Cat"}
+        assert results["2"]["labels"] == [{"id": "L_1", "name": "bug", "description": "", "color": "d73a4a"}]
+        assert results["4"]["number"] == 4
+        assert results["3"].stderr.startswith("Could not resolve to an Issue")
+        assert not batcher._busy
+
+    def test_lookups_without_repo_let_gh_fill_in_the_current_repo(self):
+        batcher = IssueBatcher()
+        batch = [gh_client._Lookup("2", lambda: pytest.fail("fetched alone")), gh_client._Lookup("4", lambda: None)]
+        response = {"data": {"repository": {"i0": graphql_issue(2), "i1": graphql_issue(4)}}}
+
+        with patch("subprocess.run", return_value=MagicMock(returncode=0, stdout=json.dumps(response))) as mock_run:
+            batcher._fetch_many(None, batch)
+
+        cmd = mock_run.call_args[0][0]
+        # Placeholders must be sent with -F: gh leaves them as-is in -f values
+        assert cmd[cmd.index("owner={owner}") - 1] == "-F"
+        assert cmd[cmd.index("name={repo}") - 1] == "-F"
+        assert [lookup.result["number"] for lookup in batch] == [2, 4]
+
+    def test_get_issue_node_goes_through_batcher(self):
+        node = GetIssueNode()
+        view = MagicMock(returncode=0, stdout=json.dumps({"number": 7}))
+
+        with (
+            patch.object(gh_client._issue_batcher, "fetch", wraps=gh_client._issue_batcher.fetch) as fetch,
+            patch("subprocess.run", return_value=view),
+        ):
+            result = node.exec({"issue_number": "7", "repo": None})
+
+        assert result == {"issue_data": {"number": 7}}
+        assert fetch.call_args[0][:2] == (None, "7")
@@ -68,7 +68,7 @@ class TestHttpNode:
     # Test Criteria 2: GET request without body → method set to GET
     def test_auto_detect_get_method(self):
         """Test that method defaults to GET when no body is provided."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "OK"
@@ -94,7 +94,7 @@ class TestHttpNode:
     # Test Criteria 3: POST request with body → method set to POST
     def test_auto_detect_post_method(self):
         """Test that method defaults to POST when body is provided."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 201
             mock_response.text = "Created"
@@ -119,7 +119,7 @@ class TestHttpNode:
     # Test Criteria 4: Bearer token auth → Authorization header added
     def test_bearer_token_authentication(self):
         """Test that auth_token adds Bearer Authorization header."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "Authenticated"
@@ -142,7 +142,7 @@ class TestHttpNode:
     # Test Criteria 5: API key auth → X-API-Key header added
     def test_api_key_authentication(self):
         """Test that api_key adds X-API-Key header."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "API Key Valid"
@@ -165,7 +165,7 @@ class TestHttpNode:
     # Test Criteria 6: JSON body serialization → Content-Type set
     def test_json_body_serialization(self):
         """Test that dict body sets Content-Type and uses json parameter."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "OK"
@@ -190,7 +190,7 @@ class TestHttpNode:
     # Test Criteria 7: JSON response parsing → dict returned
     def test_json_response_parsing(self):
         """Test that JSON responses are parsed to dict."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "application/json"}
@@ -211,7 +211,7 @@ class TestHttpNode:
     # Test Criteria 8: Plain text response → string returned
     def test_plain_text_response(self):
         """Test that plain text responses are returned as strings."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "text/plain"}
@@ -232,7 +232,7 @@ class TestHttpNode:
     # Test Criteria 9: 200 status → default action
     def test_200_status_returns_default(self):
         """Test that 200 status returns 'default' action."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "text/plain"}
@@ -253,7 +253,7 @@ class TestHttpNode:
     # Test Criteria 10: 404 status → error action
     def test_404_status_returns_error(self):
         """Test that 404 status returns 'error' action."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 404
             mock_response.headers = {"content-type": "text/plain"}
@@ -275,7 +275,7 @@ class TestHttpNode:
     # Test Criteria 11: 500 status → error action
     def test_500_status_returns_error(self):
         """Test that 500 status returns 'error' action."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 500
             mock_response.headers = {"content-type": "text/plain"}
@@ -297,7 +297,7 @@ class TestHttpNode:
     # Test Criteria 12: Timeout exception → ValueError raised
     def test_timeout_raises_value_error(self):
         """Test that timeout exception raises ValueError with actionable message."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_request.side_effect = Timeout("Request timed out")
 
             node = HttpNode(wait=0)  # Set wait=0 to speed up test
@@ -315,7 +315,7 @@ class TestHttpNode:
     # Test Criteria 13: Connection error → ValueError raised
     def test_connection_error_raises_value_error(self):
         """Test that connection error raises ValueError with helpful message."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_request.side_effect = RequestsConnectionError("Connection refused")
 
             node = HttpNode(wait=0)  # Set wait=0 to speed up test
@@ -333,7 +333,7 @@ class TestHttpNode:
     # Test Criteria 15: Parameter fallback params → default used
     def test_parameter_fallback_to_params(self):
         """Test that params are used when not in shared."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "OK"
@@ -374,7 +374,7 @@ class TestHttpNode:
     # The node handles HTTP errors as valid responses, not exceptions
     def test_401_status_returns_error(self):
         """Test that 401 status returns error action with auth info."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 401
             mock_response.headers = {"content-type": "text/plain"}
@@ -396,7 +396,7 @@ class TestHttpNode:
     # NOTE: This is actually for HTTP status codes, not exceptions
     def test_404_status_with_response(self):
         """Test that 404 status provides response data."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 404
             mock_response.headers = {"content-type": "application/json"}
@@ -418,7 +418,7 @@ class TestHttpNode:
     # Test Criteria 19: Response stored in shared → all keys present
     def test_response_stored_in_shared(self):
         """Test that all response data is stored in shared."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 201
             mock_response.headers = {"content-type": "application/json", "x-request-id": "abc123"}
@@ -447,7 +447,7 @@ class TestHttpNode:
     # Test Criteria 20: Large payload handling → processes successfully
     def test_large_payload_handling(self):
         """Test that large payloads are handled correctly."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             # Create a large response
             large_data = {"items": [{"id": i, "data": f"item_{i}" * 100} for i in range(1000)]}
             mock_response = Mock()
@@ -476,7 +476,7 @@ class TestHttpNode:
     # Test Criteria 21: Empty response handling → empty string returned
     def test_empty_response_handling(self):
         """Test that empty responses are handled correctly."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 204  # No Content
             mock_response.headers = {"content-type": "text/plain"}
@@ -498,7 +498,7 @@ class TestHttpNode:
 
     def test_custom_headers(self):
         """Test that custom headers are added to request."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "OK"
@@ -523,7 +523,7 @@ class TestHttpNode:
 
     def test_query_parameters(self):
         """Test that query parameters are passed to request."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "Results"
@@ -547,7 +547,7 @@ class TestHttpNode:
 
     def test_string_body_handling(self):
         """Test that string bodies are sent as data, not JSON."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "OK"
@@ -569,7 +569,7 @@ class TestHttpNode:
 
     def test_custom_api_key_header(self):
         """Test that custom API key header name can be used."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "OK"
@@ -595,7 +595,7 @@ class TestHttpNode:
 
     def test_malformed_json_fallback(self):
         """Test that malformed JSON responses fall back to text."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "application/json"}
@@ -617,7 +617,7 @@ class TestHttpNode:
 
     def test_retry_mechanism(self):
         """Test that retry mechanism works with transient failures."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             # First two calls fail, third succeeds
             mock_request.side_effect = [
                 RequestsConnectionError("Connection failed"),
@@ -644,7 +644,7 @@ class TestHttpNode:
 
     def test_retry_exhaustion(self):
         """Test that retries are exhausted and error is raised."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             # All calls fail
             mock_request.side_effect = RequestsConnectionError("Connection failed")
 
@@ -662,7 +662,7 @@ class TestHttpNode:
 
     def test_explicit_method_override(self):
         """Test that explicit method overrides auto-detection."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.text = "OK"
@@ -687,7 +687,7 @@ class TestHttpNode:
 
     def test_general_request_exception(self):
         """Test that general request exceptions are handled."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_request.side_effect = RequestException("General request error")
 
             node = HttpNode(wait=0)  # Set wait=0 to speed up test
@@ -702,7 +702,7 @@ class TestHttpNode:
 
     def test_non_request_exception_handling(self):
         """Test handling of non-request exceptions."""
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_request.side_effect = RuntimeError("Unexpected error")
 
             node = HttpNode(wait=0)  # Set wait=0 to speed up test
@@ -28,7 +28,7 @@ class TestHttpBinarySupport:
         This is the most common use case (downloading images).
         If this breaks, all image downloads corrupt.
         """
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "image/png"}
@@ -56,7 +56,7 @@ class TestHttpBinarySupport:
         This was the bug that started this whole task.
         If regression happens, this test fails immediately.
         """
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "image/png"}
@@ -94,7 +94,7 @@ class TestHttpBinarySupport:
         ]
 
         for content_type in binary_types:
-            with patch("requests.request") as mock_request:
+            with patch("requests.Session.request") as mock_request:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.headers = {"content-type": content_type}
@@ -117,7 +117,7 @@ class TestHttpBinarySupport:
         text_types = ["text/html", "text/plain", "text/css", "text/javascript"]
 
         for content_type in text_types:
-            with patch("requests.request") as mock_request:
+            with patch("requests.Session.request") as mock_request:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.headers = {"content-type": content_type}
@@ -139,7 +139,7 @@ class TestHttpBinarySupport:
 
         JSON responses are very common. If this breaks, many workflows fail.
         """
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "application/json"}
@@ -165,7 +165,7 @@ class TestHttpBinarySupport:
         Real servers often send: "image/png; charset=utf-8"
         Must use substring matching, not exact match.
         """
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "image/png; charset=utf-8"}
@@ -191,7 +191,7 @@ class TestHttpBinarySupport:
         # Use larger binary data with varied bytes to test encoding robustness
         test_data = bytes(range(256)) + b"\x00" * 100 + b"\xff" * 100
 
-        with patch("requests.request") as mock_request:
+        with patch("requests.Session.request") as mock_request:
             mock_response = Mock()
             mock_response.status_code = 200
             mock_response.headers = {"content-type": "application/octet-stream"}
@@ -0,0 +1,149 @@
+"""Tests for the HTTP node's pooled sessions."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from pflow.nodes.http import HttpNode
+from pflow.nodes.http.session_pool import HttpSessionPool
+
+
+@pytest.fixture
+def pool():
+    p = HttpSessionPool(pool_size=4, max_pool_size=16)
+    yield p
+    p.close()
+
+
+@pytest.fixture
+def local_server():
+    """HTTP/1.1 server that reports the client port of each request."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = str(self.client_address[1]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            if self.path == "/cookie":
+                self.send_header("Set-Cookie", "session=abc")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestSessionSelection:
+    """Test which requests share a session."""
+
+    def test_same_host_shares_session(self, pool):
+        first = pool.get_session("https://api.example.com/a")
+        second = pool.get_session("https://API.example.com/b?x=1")
+
+        assert first is second
+
+    def test_different_hosts_get_different_sessions(self, pool):
+        assert pool.get_session("https://a.example.com") is not pool.get_session("https://b.example.com")
+        assert pool.get_session("http://a.example.com") is not pool.get_session("https://a.example.com")
+
+    def test_credentials_isolate_sessions(self, pool):
+        anonymous = pool.get_session("https://api.example.com")
+        alice = pool.get_session("https://api.example.com", headers={"Authorization": "Bearer alice"})
+        bob = pool.get_session("https://api.example.com", headers={"authorization": "Bearer bob"})
+
+        assert len({id(anonymous), id(alice), id(bob)}) == 3
+        assert pool.get_session("https://api.example.com", headers={"Authorization": "Bearer alice"}) is alice
+
+    def test_custom_credential_header(self, pool):
+        headers_a = {"X-Service-Key": "a", "Accept": "application/json"}
+        headers_b = {"X-Service-Key": "b", "Accept": "application/json"}
+
+        # Not a credential header by default
+        assert pool.get_session("https://api.example.com", headers_a) is pool.get_session(
+            "https://api.example.com", headers_b
+        )
+
+        credentials = frozenset({"x-service-key"})
+        assert pool.get_session("https://api.example.com", headers_a, credentials) is not pool.get_session(
+            "https://api.example.com", headers_b, credentials
+        )
+
+    def test_pool_grows_for_larger_batches(self, pool):
+        session = pool.get_session("https://api.example.com")
+        assert session.get_adapter("https://api.example.com")._pool_maxsize == 4
+
+        grown = pool.get_session("https://api.example.com", pool_size=12)
+        capped = pool.get_session("https://api.example.com", pool_size=500)
+
+        assert grown is session is capped
+        assert session.get_adapter("https://api.example.com")._pool_maxsize == 16
+
+
+class TestConnectionReuse:
+    """Test behavior against a real local server."""
+
+    def test_sequential_requests_reuse_connection(self, pool, local_server):
+        session = pool.get_session(local_server)
+
+        ports = {session.get(f"{local_server}/item/{i}", timeout=5).text for i in range(5)}
+
+        assert len(ports) == 1
+
+    def test_cookies_are_not_persisted(self, pool, local_server):
+        session = pool.get_session(local_server)
+
+        session.get(f"{local_server}/cookie", timeout=5)
+
+        assert len(session.cookies) == 0
+
+    def test_node_requests_share_connection(self, local_server):
+        ports = set()
+        for i in range(3):
+            node = HttpNode()
+            node.set_params({"url": f"{local_server}/item/{i}"})
+            shared = {}
+            node.run(shared)
+            ports.add(shared["response"])
+
+        assert len(ports) == 1
+
+
+class TestHttpNodeUsesPool:
+    """Test the HTTP node's use of the pool."""
+
+    def test_api_key_header_selects_session(self):
+        response = Mock(status_code=200, headers={"content-type": "text/plain"}, text="ok")
+        response.elapsed.total_seconds.return_value = 0.1
+        pool = HttpSessionPool()
+
+        with (
+            patch("pflow.nodes.http.http.get_session_pool", return_value=pool),
+            patch.object(requests.Session, "request", return_value=response),
+        ):
+            for key in ("key-a", "key-b"):
+                node = HttpNode()
+                node.set_params({"url": "https://api.example.com", "api_key": key, "api_key_header": "X-Token"})
+                node.run({})
+
+        assert len(pool) == 2
+
+    def test_batch_concurrency_sizes_pool(self):
+        node = HttpNode()
+        node.set_params({"url": "https://api.example.com"})
+
+        prep_res = node.prep({"__batch_concurrency__": 25})
+
+        assert prep_res["pool_size"] == 25
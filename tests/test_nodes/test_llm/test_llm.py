@@ -687,3 +687,93 @@ class TestPostStoresStringResponse:
 
             assert isinstance(shared["response"], str)
             assert shared["response"] == prose
+
+
+class TestStreaming:
+    """stream: true forwards chunks as they arrive and records first-token timing."""
+
+    @staticmethod
+    def _streaming_model(chunks, usage=None):
+        mock_response = Mock()
+        mock_response.__iter__ = Mock(return_value=iter(chunks))
+        mock_response.usage.return_value = usage
+        mock_model = Mock()
+        mock_model.prompt.return_value = mock_response
+        return mock_model, mock_response
+
+    def test_chunks_forwarded_and_joined(self):
+        mock_model, mock_response = self._streaming_model(["Hel", "lo"])
+        received = []
+
+        with patch("pflow.nodes.llm.llm.llm.get_model", return_value=mock_model):
+            node = LLMNode()
+            node.set_params({"prompt": "Test", "stream": True})
+            shared = {"__stream_callback__": received.append}
+
+            action = node.run(shared)
+
+        assert action == "default"
+        assert received == ["Hel", "lo"]
+        assert shared["response"] == "Hello"
+        mock_model.prompt.assert_called_with("Test", stream=True, temperature=1.0)
+        mock_response.text.assert_not_called()
+
+    def test_streams_without_callback(self):
+        mock_model, _ = self._streaming_model(["a", "b"])
+
+        with patch("pflow.nodes.llm.llm.llm.get_model", return_value=mock_model):
+            node = LLMNode()
+            node.set_params({"prompt": "Test", "stream": True})
+            shared = {}
+
+            node.run(shared)
+
+        assert shared["response"] == "ab"
+
+    def test_callback_errors_do_not_fail_node(self):
+        mock_model, _ = self._streaming_model(["a", "b"])
+
+        def broken(_chunk):
+            raise RuntimeError("display gone")
+
+        with patch("pflow.nodes.llm.llm.llm.get_model", return_value=mock_model):
+            node = LLMNode()
+            node.set_params({"prompt": "Test", "stream": True})
+            shared = {"__stream_callback__": broken}
+
+            assert node.run(shared) == "default"
+
+        assert shared["response"] == "ab"
+
+    def test_usage_includes_stream_timing(self):
+        usage = Mock(input=10, output=50, details={})
+        mock_model, _ = self._streaming_model(["x"] * 5, usage=usage)
+
+        with (
+            patch("pflow.nodes.llm.llm.llm.get_model", return_value=mock_model),
+            patch("pflow.nodes.llm.llm.time.perf_counter", side_effect=[100.0, 100.25, 102.25]),
+        ):
+            node = LLMNode()
+            node.set_params({"prompt": "Test", "stream": True})
+            shared = {}
+
+            node.run(shared)
+
+        assert shared["llm_usage"]["time_to_first_token_ms"] == 250.0
+        assert shared["llm_usage"]["tokens_per_second"] == 25.0
+
+    def test_non_streaming_usage_has_no_stream_timing(self):
+        mock_response = Mock()
+        mock_response.text.return_value = "ok"
+        mock_response.usage.return_value = Mock(input=1, output=2, details={})
+
+        with patch("pflow.nodes.llm.llm.llm.get_model") as mock_get_model:
+            mock_get_model.return_value.prompt.return_value = mock_response
+            node = LLMNode()
+            node.set_params({"prompt": "Test"})
+            shared = {}
+
+            node.run(shared)
+
+        assert "time_to_first_token_ms" not in shared["llm_usage"]
+        assert "tokens_per_second" not in shared["llm_usage"]
@@ -0,0 +1,118 @@
+"""Tests for per-thread stdout/stderr capture used by the code node."""
+
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pflow.nodes.python.output_capture import capture_output
+from pflow.nodes.python.python_code import PythonCodeNode
+
+
+def _patch_streams(monkeypatch):
+    """Replace the process streams with inspectable buffers.
+
+    Called inside the test body: pytest's own capture resets sys.stdout
+    after fixtures run.
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "stderr", stderr)
+    return stdout, stderr
+
+
+class TestCaptureOutput:
+    """Test the capture context manager."""
+
+    def test_captures_current_thread(self, monkeypatch):
+        real_streams = _patch_streams(monkeypatch)
+        with capture_output() as (out, err):
+            print("hello")
+            sys.stderr.write("oops")
+
+        assert out.getvalue() == "hello\n"
+        assert err.getvalue() == "oops"
+        assert real_streams[0].getvalue() == ""
+
+    def test_real_streams_used_after_capture(self, monkeypatch):
+        real_streams = _patch_streams(monkeypatch)
+        with capture_output():
+            print("captured")
+
+        print("after")
+        sys.stderr.write("after")
+
+        assert real_streams[0].getvalue() == "after\n"
+        assert real_streams[1].getvalue() == "after"
+
+    def test_other_threads_write_to_real_stream(self, monkeypatch):
+        real_streams = _patch_streams(monkeypatch)
+        inside = threading.Event()
+        done = threading.Event()
+
+        def capturing():
+            with capture_output() as (out, _):
+                print("captured")
+                inside.set()
+                done.wait(timeout=5)
+            return out.getvalue()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(capturing)
+            inside.wait(timeout=5)
+            print("from main thread")
+            done.set()
+            captured = future.result(timeout=5)
+
+        assert captured == "captured\n"
+        assert real_streams[0].getvalue() == "from main thread\n"
+
+    def test_nested_capture_restores_outer_buffer(self, monkeypatch):
+        real_streams = _patch_streams(monkeypatch)
+        with capture_output() as (outer, _):
+            print("a")
+            with capture_output() as (inner, _):
+                print("b")
+            print("c")
+
+        assert outer.getvalue() == "a\nc\n"
+        assert inner.getvalue() == "b\n"
+        assert real_streams[0].getvalue() == ""
+
+    def test_concurrent_captures_are_isolated(self, monkeypatch):
+        real_streams = _patch_streams(monkeypatch)
+        barrier = threading.Barrier(8)
+
+        def work(n):
+            with capture_output() as (out, _):
+                barrier.wait(timeout=5)
+                for _ in range(50):
+                    print(n)
+            return n, out.getvalue()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(work, range(8)))
+
+        for n, output in results:
+            assert output == f"{n}\n" * 50
+        assert real_streams[0].getvalue() == ""
+
+
+class TestParallelCodeNodes:
+    """Code nodes running concurrently each get only their own output."""
+
+    def test_parallel_nodes_capture_own_stdout(self):
+        code = "import time\nn: int\nfor _ in range(20):\n    print(n)\n    time.sleep(0.001)\nresult: int = n"
+
+        def run(n):
+            node = PythonCodeNode()
+            node.set_params({"code": code, "inputs": {"n": n}})
+            shared: dict = {}
+            node.run(shared)
+            return n, shared["stdout"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(run, range(16)))
+
+        for n, stdout in results:
+            assert stdout == f"{n}\n" * 20
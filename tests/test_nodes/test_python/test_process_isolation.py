@@ -0,0 +1,175 @@
+"""Tests for process-isolated code execution (``isolation: process``).
+
+Uses one small worker pool per module; forkserver start-up is the slow
+part, so tests share warm workers the way real batches do.
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from pflow.nodes.python import process_pool
+from pflow.nodes.python.process_pool import CodeProcessPool
+from pflow.nodes.python.python_code import PythonCodeNode
+
+
+@pytest.fixture(scope="module")
+def pool():
+    p = CodeProcessPool(max_workers=2)
+    yield p
+    p.close()
+
+
+@pytest.fixture(autouse=True)
+def use_pool(pool):
+    with patch("pflow.nodes.python.python_code.get_code_process_pool", return_value=pool):
+        yield
+
+
+def run_isolated(shared: dict, **params) -> str:
+    """Helper: run a code node in process isolation, return action string."""
+    node = PythonCodeNode()
+    node.set_params({"isolation": "process", **params})
+    return node.run(shared)
+
+
+class TestProcessExecution:
+    """Results and output capture match in-process execution."""
+
+    def test_result_stdout_and_stderr(self):
+        shared: dict = {}
+        action = run_isolated(
+            shared,
+            code='import sys\nprint("hi")\nsys.stderr.write("warn")\ndata: list\nresult: list = data[::-1]',
+            inputs={"data": [1, 2, 3]},
+        )
+
+        assert action == "default"
+        assert shared["result"] == [3, 2, 1]
+        assert shared["stdout"] == "hi\n"
+        assert shared["stderr"] == "warn"
+
+    def test_binary_inputs_round_trip(self):
+        shared: dict = {}
+        payload = bytearray(range(256)) * 1000
+
+        run_isolated(shared, code="blob: bytearray\nresult: bytes = bytes(blob[:4])", inputs={"blob": payload})
+
+        assert shared["result"] == b"\x00\x01\x02\x03"
+
+    def test_workers_are_reused(self):
+        pids = set()
+        for _ in range(3):
+            shared: dict = {}
+            run_isolated(shared, code="import os\nresult: int = os.getpid()")
+            pids.add(shared["result"])
+
+        assert len(pids) == 1
+
+    def test_concurrent_calls_use_separate_processes(self, pool):
+        barrier_code = "import os, time\ntime.sleep(0.2)\nresult: int = os.getpid()"
+        pids = []
+
+        def call():
+            pids.append(pool.run(barrier_code, {}, timeout=5)["result"])
+
+        threads = [threading.Thread(target=call) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(set(pids)) == 2
+
+    def test_missing_result_assignment(self):
+        shared: dict = {}
+
+        action = run_isolated(shared, code="result: int\nx = 5")
+
+        assert action == "error"
+        assert "must set 'result' variable" in shared["error"]
+
+
+class TestProcessErrors:
+    """Errors from worker processes are reported like in-process errors."""
+
+    def test_timeout_kills_worker_and_pool_recovers(self):
+        shared: dict = {}
+
+        action = run_isolated(shared, code="while True:\n    pass\nresult: int = 0", timeout=0.2)
+
+        assert action == "error"
+        assert "timed out" in shared["error"]
+
+        shared = {}
+        assert run_isolated(shared, code="result: int = 7") == "default"
+        assert shared["result"] == 7
+
+    def test_runtime_error_keeps_line_number(self):
+        shared: dict = {}
+
+        action = run_isolated(shared, code="x: int = 1\ny: int = 0\nresult: int = x / y")
+
+        assert action == "error"
+        assert "ZeroDivisionError" in shared["error"]
+        assert "Location: line 3 in code block" in shared["error"]
+
+    def test_name_error_identifies_variable(self):
+        shared: dict = {}
+
+        run_isolated(shared, code="result: int = undefined_var")
+
+        assert "Undefined variable 'undefined_var'" in shared["error"]
+
+    def test_sys_exit_does_not_reach_parent(self):
+        shared: dict = {}
+
+        action = run_isolated(shared, code="import sys\nsys.exit(3)\nresult: int = 0")
+
+        assert action == "error"
+        assert "sys.exit(3)" in shared["error"]
+
+    def test_unpicklable_result(self):
+        shared: dict = {}
+
+        action = run_isolated(shared, code="import threading\nresult: object = threading.Lock()")
+
+        assert action == "error"
+        assert "can't be returned from a process-isolated code node" in shared["error"]
+
+    def test_unpicklable_input(self):
+        shared: dict = {}
+
+        action = run_isolated(shared, code="lock: object\nresult: int = 1", inputs={"lock": threading.Lock()})
+
+        assert action == "error"
+        assert "must be picklable" in shared["error"]
+
+
+class TestIsolationParameter:
+    """Parameter validation and defaults."""
+
+    def test_invalid_isolation_rejected(self):
+        node = PythonCodeNode()
+        node.set_params({"code": "result: int = 1", "isolation": "container"})
+
+        with pytest.raises(ValueError, match="Invalid isolation"):
+            node.prep({})
+
+    def test_thread_isolation_is_default(self):
+        node = PythonCodeNode()
+        node.set_params({"code": "result: int = 1"})
+
+        assert node.prep({})["isolation"] == "thread"
+
+    def test_closed_pool_rejects_work(self):
+        closed = CodeProcessPool(max_workers=1)
+        closed.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            closed.run("result: int = 1", {}, timeout=1)
+
+    def test_default_pool_is_shared(self):
+        with patch.object(process_pool, "_pool", None), patch.object(process_pool.atexit, "register"):
+            assert process_pool.get_code_process_pool() is process_pool.get_code_process_pool()
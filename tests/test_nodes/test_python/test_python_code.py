@@ -4,9 +4,12 @@ Organized by what matters to users and downstream consumers, not by
 internal implementation structure (prep/exec/post).
 """
 
+from unittest.mock import patch
+
 import pytest
 
-from pflow.nodes.python.python_code import PythonCodeNode, _extract_error_location
+from pflow.nodes.python import python_code
+from pflow.nodes.python.python_code import PythonCodeNode, _compile_code, _extract_error_location
 
 
 def run_code_node(shared: dict, **params) -> str:
@@ -511,3 +514,42 @@ class TestErrorLocationWorkflowLine:
 
         assert "Location: line 3 in code block" in location
         assert "Source: raise ValueError" in location
+
+
+# ======================================================================
+# Compile cache: identical code is parsed and compiled once
+# ======================================================================
+
+
+class TestCompileCache:
+    """Batches run the same code per item; parsing must not repeat."""
+
+    def test_same_code_parsed_once_across_instances(self):
+        code = "data: list\nresult: int = len(data)  # compile-cache-test"
+        _compile_code.cache_clear()
+
+        with patch.object(python_code.ast, "parse", wraps=python_code.ast.parse) as parse:
+            for i in range(5):
+                shared: dict = {}
+                run_code_node(shared, code=code, inputs={"data": list(range(i))})
+                assert shared["result"] == i
+
+        assert parse.call_count == 1
+
+    def test_cached_annotations_are_not_shared_mutably(self):
+        code = "x: int\nresult: int = x"
+        node = PythonCodeNode()
+        node.set_params({"code": code, "inputs": {"x": 1}})
+
+        node.prep({})["annotations"]["result"] = "str"
+
+        assert _compile_code(code).annotations["result"] == "int"
+
+    def test_syntax_errors_are_not_cached(self):
+        _compile_code.cache_clear()
+
+        for _ in range(2):
+            with pytest.raises(SyntaxError):
+                run_code_node({}, code="result = [", inputs={})
+
+        assert _compile_code.cache_info().currsize == 0
@@ -0,0 +1,164 @@
+"""Tests for the planner context cache."""
+
+import copy
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pflow.core.workflow_manager import WorkflowManager
+from pflow.planning import context_builder, context_cache
+from pflow.planning.context_builder import build_nodes_context, build_planning_context, build_workflows_context
+from pflow.planning.context_cache import MAX_DISK_AGE_SECONDS, ContextCache, workflow_library_fingerprint
+from pflow.registry import Registry
+from tests.shared.markdown_utils import ir_to_markdown
+
+REGISTRY = {
+    "read-file": {
+        "module": "pflow.nodes.file.read_file",
+        "interface": {
+            "description": "Read a file",
+            "inputs": [],
+            "outputs": [{"key": "content", "type": "str", "description": "File content"}],
+            "params": [{"key": "file_path", "type": "str", "description": "Path to read"}],
+            "actions": ["default"],
+        },
+    },
+    "llm": {
+        "module": "pflow.nodes.llm.llm",
+        "interface": {
+            "description": "Call an LLM",
+            "inputs": [],
+            "outputs": [{"key": "response", "type": "str", "description": "Model response"}],
+            "params": [{"key": "prompt", "type": "str", "description": "Prompt"}],
+            "actions": ["default"],
+        },
+    },
+}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ContextCache(tmp_path / "context")
+    monkeypatch.setattr(context_cache, "_context_cache", cache)
+    return cache
+
+
+class TestContextCache:
+    def test_built_once_then_served_from_memory(self, cache):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "text"
+
+        assert cache.get_or_build("nodes", {"a": 1}, build) == "text"
+        assert cache.get_or_build("nodes", {"a": 1}, build) == "text"
+        assert len(calls) == 1
+
+    def test_served_from_disk_across_processes(self, cache, tmp_path):
+        cache.get_or_build("nodes", {"a": 1}, lambda: "text")
+
+        fresh = ContextCache(tmp_path / "context")
+
+        assert fresh.get_or_build("nodes", {"a": 1}, lambda: "rebuilt") == "text"
+
+    def test_changed_inputs_rebuild(self, cache):
+        cache.get_or_build("nodes", {"a": 1}, lambda: "one")
+
+        assert cache.get_or_build("nodes", {"a": 2}, lambda: "two") == "two"
+
+    def test_disk_disabled_by_env(self, cache, monkeypatch):
+        monkeypatch.setenv("PFLOW_PLANNER_CONTEXT_CACHE", "0")
+
+        cache.get_or_build("nodes", {"a": 1}, lambda: "text")
+
+        assert not cache.cache_dir.exists()
+
+    def test_stale_disk_entries_pruned_on_first_write(self, cache, tmp_path):
+        cache.get_or_build("nodes", {"a": 1}, lambda: "old")
+        (stale,) = cache.cache_dir.glob("*.md")
+        past = time.time() - MAX_DISK_AGE_SECONDS - 60
+        os.utime(stale, (past, past))
+
+        ContextCache(tmp_path / "context").get_or_build("nodes", {"a": 2}, lambda: "new")
+
+        assert stale not in list(cache.cache_dir.glob("*.md"))
+        assert len(list(cache.cache_dir.glob("*.md"))) == 1
+
+    def test_disk_entries_beyond_limit_pruned_least_recently_used_first(self, cache, tmp_path, monkeypatch):
+        monkeypatch.setattr(context_cache, "MAX_DISK_ENTRIES", 2)
+        for value in range(3):
+            cache.get_or_build("nodes", {"a": value}, lambda: "text")
+        now = time.time()
+        for age, path in enumerate(sorted(cache.cache_dir.glob("*.md"))):
+            os.utime(path, (now - age * 60, now - age * 60))
+        oldest = sorted(cache.cache_dir.glob("*.md"))[-1]
+
+        ContextCache(tmp_path / "context").get_or_build("nodes", {"a": 3}, lambda: "text")
+
+        remaining = list(cache.cache_dir.glob("*.md"))
+        assert len(remaining) == 2
+        assert oldest not in remaining
+
+
+class TestCachedContextBlocks:
+    def test_nodes_context_identical_and_not_reprocessed(self, cache):
+        first = build_nodes_context(registry_metadata=copy.deepcopy(REGISTRY))
+
+        with patch.object(context_builder, "_process_nodes", side_effect=AssertionError("re-rendered")):
+            second = build_nodes_context(registry_metadata=copy.deepcopy(REGISTRY))
+
+        assert second == first
+        assert "read-file - Read a file" in first
+
+    def test_node_sections_cached_individually(self, cache):
+        # Fresh copies, like a registry loaded per request (formatting annotates params in place)
+        build_planning_context(["read-file"], [], copy.deepcopy(REGISTRY), saved_workflows=[])
+
+        with patch.object(context_builder, "_format_node_section_enhanced", return_value="### fresh") as formatter:
+            context = build_planning_context(["llm", "read-file"], [], copy.deepcopy(REGISTRY), saved_workflows=[])
+
+        # Only the newly selected node is rendered; read-file comes from the cache
+        formatter.assert_called_once()
+        assert formatter.call_args.args[0] == "llm"
+        assert "### read-file" in context
+
+    def test_workflows_context_follows_library_changes(self, cache, tmp_path):
+        manager = WorkflowManager(tmp_path / "workflows")
+        assert build_workflows_context(workflow_manager=manager) == ""
+
+        ir = {"nodes": [{"id": "fetch", "type": "shell", "params": {"command": "gh issue list"}}], "edges": []}
+        manager.save("fetch-issues", ir_to_markdown(ir, title="Fetch issues", description="Fetch open issues"))
+
+        assert "fetch-issues" in build_workflows_context(workflow_manager=manager)
+
+    def test_library_fingerprint_ignores_non_managers(self):
+        assert workflow_library_fingerprint(object()) is None
+
+    def test_nodes_context_keyed_on_registry_fingerprint(self, cache, tmp_path):
+        registry = Registry(tmp_path / "registry.json")
+        registry.save(copy.deepcopy(REGISTRY))
+        metadata = registry.load(include_filtered=True)
+        first = build_nodes_context(registry_metadata=metadata, registry_fingerprint=registry.fingerprint)
+
+        with patch.object(context_cache, "fingerprint", wraps=context_cache.fingerprint) as hashed:
+            second = build_nodes_context(registry_metadata=metadata, registry_fingerprint=registry.fingerprint)
+
+        assert second == first
+        # The key is the fingerprint, not the registry metadata
+        (call,) = hashed.call_args_list
+        assert call.args[1] == [["registry", registry.fingerprint], None]
+
+    def test_registry_fingerprint_changes_on_save(self, tmp_path):
+        registry = Registry(tmp_path / "registry.json")
+        registry.save(copy.deepcopy(REGISTRY))
+        registry.load(include_filtered=True)
+        before = registry.fingerprint
+
+        registry.save({"llm": REGISTRY["llm"]})
+        registry.load(include_filtered=True)
+
+        assert before is not None
+        assert registry.fingerprint != before
@@ -0,0 +1,143 @@
+"""Tests for the planner result cache."""
+
+import time
+from unittest.mock import Mock
+
+import click
+import pytest
+
+from pflow.cli import main
+from pflow.core.workflow_manager import WorkflowManager
+from pflow.planning import result_cache
+from pflow.planning.result_cache import PlannerResultCache, normalize_user_input
+from tests.shared.markdown_utils import ir_to_markdown
+
+REGISTRY = {"read-file": {"module": "pflow.nodes.file.read_file", "interface": {"description": "Read a file"}}}
+
+PLANNER_OUTPUT = {
+    "success": True,
+    "workflow_ir": {"nodes": [{"id": "read", "type": "read-file", "params": {"file_path": "${path}"}}], "edges": []},
+    "execution_params": {"path": "README.md"},
+    "missing_params": None,
+    "error": None,
+    "workflow_metadata": {"suggested_name": "read-readme"},
+    "workflow_source": {"found": False},
+}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = PlannerResultCache(tmp_path / "results")
+    monkeypatch.setattr(result_cache, "_result_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return WorkflowManager(tmp_path / "workflows")
+
+
+class TestKeys:
+    def test_whitespace_is_normalized_but_case_kept(self):
+        assert normalize_user_input("  read  README.md\n") == "read README.md"
+        assert normalize_user_input("read readme.md") != normalize_user_input("read README.md")
+
+    def test_key_covers_registry_library_and_model(self, cache, manager):
+        key = cache.make_key("read README.md", REGISTRY, manager, "model-a")
+
+        assert cache.make_key(" read   README.md ", REGISTRY, manager, "model-a") == key
+        assert cache.make_key("read README.md", {}, manager, "model-a") != key
+        assert cache.make_key("read README.md", REGISTRY, manager, "model-b") != key
+
+        ir = {"nodes": [{"id": "fetch", "type": "shell", "params": {"command": "gh issue list"}}], "edges": []}
+        manager.save("fetch-issues", ir_to_markdown(ir, title="Fetch issues", description="Fetch open issues"))
+        assert cache.make_key("read README.md", REGISTRY, manager, "model-a") != key
+
+    def test_unfingerprintable_library_is_not_cached(self, cache):
+        assert cache.make_key("read README.md", REGISTRY, Mock(), "model-a") is None
+
+
+class TestStorage:
+    def test_round_trip_with_cache_chunks(self, cache):
+        chunks = {"planner_extended_blocks": [{"text": "context"}]}
+        assert cache.store("k", "read README.md", PLANNER_OUTPUT, chunks)
+
+        assert cache.get("k") == {"planner_output": PLANNER_OUTPUT, "cache_chunks": chunks}
+
+    def test_failed_results_not_stored(self, cache):
+        assert not cache.store("k", "read README.md", {**PLANNER_OUTPUT, "success": False})
+        assert cache.get("k") is None
+
+    def test_expired_entries_ignored(self, tmp_path):
+        cache = PlannerResultCache(tmp_path / "results", ttl_hours=0.0001)
+        cache.store("k", "read README.md", PLANNER_OUTPUT)
+
+        time.sleep(0.5)
+
+        assert cache.get("k") is None
+
+    def test_least_recently_used_evicted_over_size_cap(self, tmp_path):
+        cache = PlannerResultCache(tmp_path / "results")
+        cache.store("old", "a", PLANNER_OUTPUT)
+        cache.store("used", "b", PLANNER_OUTPUT)
+        cache.get("used")
+        cache.max_size_bytes = 1  # Room for nothing but the entry being stored
+
+        cache.store("new", "c", PLANNER_OUTPUT)
+
+        assert cache.get("old") is None
+        assert cache.get("used") is None
+        assert cache.get("new") is not None
+
+
+class TestCliIntegration:
+    @pytest.fixture
+    def ctx(self):
+        ctx = click.Context(click.Command("pflow"))
+        ctx.obj = {"planner_model": "model-a", "output_format": "text"}
+        return ctx
+
+    def run_planner(self, ctx, manager, planner_output=PLANNER_OUTPUT):
+        """Run the CLI planner path with a fake flow; returns the flow factory and executed outputs."""
+        flow = Mock()
+        flow.run.side_effect = lambda shared: shared.update(
+            planner_output=planner_output, planner_extended_blocks=[{"text": "context"}]
+        )
+        factory = Mock(return_value=flow)
+        executed = []
+
+        def fake_process(ctx, shared, *args):
+            executed.append((shared["planner_output"], shared.get("planner_extended_blocks")))
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(main, "_setup_planner_execution", lambda *a: (None, None, Mock(), _shared(manager)))
+            mp.setattr(main, "_process_planner_result", fake_process)
+            main._execute_planner_and_workflow(ctx, "read README.md", None, None, False, factory, False, 60, False)
+        return factory, executed
+
+    def test_repeat_request_skips_planner(self, ctx, cache, manager):
+        first_factory, first = self.run_planner(ctx, manager)
+        second_factory, second = self.run_planner(ctx, manager)
+
+        assert first_factory.call_count == 1
+        assert second_factory.call_count == 0
+        assert second == first == [(PLANNER_OUTPUT, [{"text": "context"}])]
+
+    def test_bypass_flag_replans_and_refreshes(self, ctx, cache, manager):
+        self.run_planner(ctx, manager)
+        ctx.obj["no_planner_cache"] = True
+        refreshed = {**PLANNER_OUTPUT, "execution_params": {"path": "CHANGELOG.md"}}
+
+        factory, _ = self.run_planner(ctx, manager, refreshed)
+
+        assert factory.call_count == 1
+        ctx.obj["no_planner_cache"] = False
+        _, served = self.run_planner(ctx, manager)
+        assert served[0][0] == refreshed
+
+    def test_stdin_requests_not_cached(self, cache, manager):
+        assert main._planner_result_cache_key("read it", "piped data", _shared(manager), "model-a") is None
+
+
+def _shared(manager):
+    return {"user_input": "read README.md", "workflow_manager": manager, "stdin_data": None}
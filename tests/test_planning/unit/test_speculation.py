@@ -0,0 +1,162 @@
+"""Tests for speculative execution of planner stages."""
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from pflow.planning import create_planner_flow
+from pflow.planning.debug import TraceCollector
+from pflow.planning.nodes import ParameterDiscoveryNode, WorkflowDiscoveryNode
+from pflow.planning.speculation import SPECULATION_KEY, SpeculativeNode, speculative_chain
+from pflow.pocketflow import Flow, Node
+
+
+class FakeStage(Node):
+    """Planner-like stage: one fake LLM call per exec, recorded where the debug interceptor would."""
+
+    def __init__(
+        self, name: str, action: str = "", reads: str = "user_input", fail_speculatively: bool = False
+    ) -> None:
+        super().__init__()
+        self.name = name
+        self.action = action
+        self.reads = reads
+        self.fail_speculatively = fail_speculatively
+        self.exec_threads: list[str] = []
+
+    def prep(self, shared: dict[str, Any]) -> dict[str, Any]:
+        self._llm_calls = shared.get("__llm_calls__")
+        return {"input": shared.get(self.reads)}
+
+    def exec(self, prep_res: dict[str, Any]) -> str:
+        self.exec_threads.append(threading.current_thread().name)
+        if self.fail_speculatively and threading.current_thread().name == "planner-speculation":
+            raise RuntimeError("LLM unavailable")
+        if self._llm_calls is not None:
+            self._llm_calls.append({"node_id": self.name, "input_tokens": 10, "output_tokens": 5})
+        return f"{self.name}({prep_res['input']})"
+
+    def post(self, shared: dict[str, Any], prep_res: dict[str, Any], exec_res: str) -> str:
+        shared[self.name] = exec_res
+        return self.action
+
+
+def build_flow(discovery_action: str, **stage_kwargs: Any) -> tuple[Flow, FakeStage, FakeStage]:
+    """discovery --not_found--> params --> browse; discovery --found_existing--> reuse."""
+    discovery = FakeStage("discovery", action=discovery_action)
+    params = FakeStage("params", **stage_kwargs)
+    browse = FakeStage("browse", reads="params")
+    reuse = FakeStage("reuse")
+
+    discovery, params_node, browse_node = speculative_chain(discovery, params, browse)
+    discovery - "not_found" >> params_node
+    discovery - "found_existing" >> reuse
+    params_node >> browse_node
+    return Flow(start=discovery), params, browse
+
+
+def wait_for(condition: Any, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+class TestSpeculativeChain:
+    def test_path_b_adopts_speculative_results(self):
+        flow, params, browse = build_flow("not_found")
+        shared: dict[str, Any] = {"user_input": "fetch issues", "__llm_calls__": []}
+
+        flow.run(shared)
+
+        assert shared["params"] == "params(fetch issues)"
+        assert shared["browse"] == "browse(params(fetch issues))"
+        # Each stage ran exactly once, in the speculation thread
+        assert params.exec_threads == ["planner-speculation"]
+        assert browse.exec_threads == ["planner-speculation"]
+        assert [c["node_id"] for c in shared["__llm_calls__"]] == ["discovery", "params", "browse"]
+        assert not any(c.get("speculative_wasted") for c in shared["__llm_calls__"])
+        assert SPECULATION_KEY not in shared
+
+    def test_path_a_discards_and_records_waste(self):
+        flow, _, _ = build_flow("found_existing")
+        shared: dict[str, Any] = {"user_input": "fetch issues", "__llm_calls__": []}
+
+        flow.run(shared)
+
+        assert "params" not in shared
+        assert "browse" not in shared
+        wait_for(lambda: any(c.get("speculative_wasted") for c in shared["__llm_calls__"]))
+        wasted = [c["node_id"] for c in shared["__llm_calls__"] if c.get("speculative_wasted")]
+        assert set(wasted) <= {"params", "browse"}
+        assert "params" in wasted
+
+    def test_changed_inputs_rerun_stage(self):
+        # params reads a key discovery writes, so the speculative inputs are stale
+        flow, params, _ = build_flow("not_found", reads="discovery")
+        shared: dict[str, Any] = {"user_input": "fetch issues", "__llm_calls__": []}
+
+        flow.run(shared)
+
+        assert shared["params"] == "params(discovery(fetch issues))"
+        assert params.exec_threads == ["planner-speculation", "MainThread"]
+        wasted = [c for c in shared["__llm_calls__"] if c.get("speculative_wasted")]
+        assert [c["node_id"] for c in wasted][:1] == ["params"]
+
+    def test_speculative_failure_falls_back_to_real_run(self):
+        flow, params, _ = build_flow("not_found", fail_speculatively=True)
+        shared: dict[str, Any] = {"user_input": "fetch issues"}
+
+        flow.run(shared)
+
+        assert shared["params"] == "params(fetch issues)"
+        assert params.exec_threads == ["planner-speculation", "MainThread"]
+
+
+class TestPlannerFlowWiring:
+    def test_speculative_mode_wraps_discovery_chain(self):
+        flow = create_planner_flow(wait=0, model="anthropic/claude-sonnet-4-5", speculative=True)
+
+        start = flow.start_node
+        assert isinstance(start, SpeculativeNode)
+        assert isinstance(start.node, WorkflowDiscoveryNode)
+        assert [type(node.node).__name__ for node in start.chain] == [
+            "WorkflowDiscoveryNode",
+            "ParameterDiscoveryNode",
+            "RequirementsAnalysisNode",
+            "ComponentBrowsingNode",
+        ]
+        assert start.successors["not_found"] is start.chain[1]
+        assert isinstance(start.chain[1].node, ParameterDiscoveryNode)
+
+    def test_default_mode_is_sequential(self):
+        flow = create_planner_flow(wait=0, model="anthropic/claude-sonnet-4-5")
+
+        assert isinstance(flow.start_node, WorkflowDiscoveryNode)
+
+
+class TestTraceCollectorThreads:
+    def test_interception_state_is_per_thread(self):
+        trace = TraceCollector("input")
+        trace.current_node = "WorkflowDiscoveryNode"
+        seen: list[Any] = []
+
+        def other_thread() -> None:
+            seen.append(getattr(trace, "current_node", "Unknown"))
+            trace.current_node = "ParameterDiscoveryNode"
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+
+        assert seen == ["Unknown"]
+        assert trace.current_node == "WorkflowDiscoveryNode"
+
+    def test_deleted_attribute_raises(self):
+        trace = TraceCollector("input")
+        del trace.current_node
+
+        with pytest.raises(AttributeError):
+            _ = trace.current_node
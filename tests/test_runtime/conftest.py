@@ -0,0 +1,140 @@
+"""Shared fixtures for batch tests: test nodes compiled from a temporary registry."""
+
+import importlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from pflow.nodes.llm import LLMNode
+from pflow.pocketflow import Node
+from pflow.registry.registry import Registry
+from pflow.runtime import compile_ir_to_flow
+from pflow.runtime.batch_node import PflowBatchNode
+from pflow.runtime.namespaced_wrapper import NamespacedNodeWrapper
+from pflow.runtime.node_wrapper import TemplateAwareNodeWrapper
+
+# Values each FetchNode run was called with, values that fail, and events
+# StepNode waits on or sets (reset per test by the batch_nodes fixture)
+CALLS: list[Any] = []
+BROKEN: set[str] = set()
+EVENTS: dict[str, threading.Event] = {}
+LOCK = threading.Lock()
+
+
+class FetchNode(Node):
+    """Test node that records its calls.
+
+    Interface:
+    - Params: url: str  # Value to fetch; values in BROKEN raise
+    - Writes: shared["response"]: str  # The fetched value
+    """
+
+    def prep(self, shared: dict[str, Any]) -> Any:
+        return self.params["url"]
+
+    def exec(self, prep_res: Any) -> Any:
+        with LOCK:
+            CALLS.append(prep_res)
+        if prep_res in BROKEN:
+            raise ValueError(f"fetch of {prep_res} failed")
+        return f"body of {prep_res}"
+
+    def post(self, shared: dict[str, Any], prep_res: Any, exec_res: Any) -> str:
+        shared["response"] = exec_res
+        return "default"
+
+
+class StepNode(Node):
+    """Test node that can wait for and signal events.
+
+    Interface:
+    - Params: value: Any  # Value to return
+    - Params: wait: str  # Event to wait for (optional)
+    - Params: signal: str  # Event to set (optional)
+    - Writes: shared["result"]: Any  # The value
+    - Writes: shared["waited"]: bool  # Whether the awaited event was set
+    """
+
+    def prep(self, shared: dict[str, Any]) -> Any:
+        return self.params
+
+    def exec(self, prep_res: Any) -> Any:
+        waited = EVENTS[prep_res["wait"]].wait(5) if prep_res.get("wait") else None
+        if prep_res.get("signal"):
+            EVENTS[prep_res["signal"]].set()
+        if prep_res["value"] == "fail":
+            raise ValueError("step failed")
+        return prep_res["value"], waited
+
+    def post(self, shared: dict[str, Any], prep_res: Any, exec_res: Any) -> str:
+        shared["result"], shared["waited"] = exec_res
+        return "default"
+
+
+@pytest.fixture
+def batch_nodes():
+    """The module the registry loads FetchNode and StepNode from, with their state reset."""
+    # The registry imports this file under its package path, a separate module object
+    module = importlib.import_module("tests.test_runtime.conftest")
+    module.CALLS.clear()
+    module.BROKEN.clear()
+    module.EVENTS.clear()
+    module.EVENTS["gate"] = threading.Event()
+    yield module
+    module.EVENTS["gate"].set()  # Never leave a worker blocked
+
+
+@pytest.fixture
+def registry(batch_nodes):
+    """Temporary registry with the "fetch" (FetchNode) and "step" (StepNode) node types."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        registry = Registry(Path(tmpdir) / "registry.json")
+        node = {"module": "tests.test_runtime.conftest", "file_path": str(Path(__file__)), "type": "core"}
+        registry.save({
+            "fetch": {
+                **node,
+                "class_name": "FetchNode",
+                "interface": {"params": [], "outputs": [{"name": "response", "type": "str"}]},
+            },
+            "step": {
+                **node,
+                "class_name": "StepNode",
+                "interface": {"params": [], "outputs": [{"name": "result", "type": "any"}]},
+            },
+        })
+        yield registry
+
+
+@pytest.fixture
+def run_batch(registry) -> Callable[..., dict[str, Any]]:
+    """Run a single "fetch" batch node with id "get" over items (as "link") and return its output."""
+
+    def run(items: Any, params: dict[str, Any], **batch: Any) -> dict[str, Any]:
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [
+                {"id": "get", "type": "fetch", "batch": {"items": items, "as": "link", **batch}, "params": params}
+            ],
+            "edges": [],
+        }
+        shared: dict[str, Any] = {}
+        compile_ir_to_flow(ir, registry=registry, validate=False).run(shared)
+        return shared["get"]
+
+    return run
+
+
+@pytest.fixture
+def make_llm_batch() -> Callable[..., PflowBatchNode]:
+    """Build the real llm node chain (template and namespace wrappers) inside a batch over ``${items}``."""
+
+    def make(node_id: str = "classify", model: str = "fake-model", **batch_config: Any) -> PflowBatchNode:
+        chain = NamespacedNodeWrapper(TemplateAwareNodeWrapper(LLMNode(), node_id), node_id)
+        batch = PflowBatchNode(chain, node_id, {"items": "${items}", **batch_config})
+        batch.set_params({"prompt": "label: ${item}", "model": model})
+        return batch
+
+    return make
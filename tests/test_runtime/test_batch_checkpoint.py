@@ -0,0 +1,113 @@
+"""Tests for resuming batches from per-item checkpoints (batch.checkpoint)."""
+
+import os
+import time
+
+import pytest
+
+from pflow.registry.registry import Registry
+from pflow.runtime import compile_ir_to_flow
+from pflow.runtime.batch_checkpoint import MAX_CHECKPOINT_AGE_SECONDS, BatchCheckpoint, get_batch_checkpoints
+from pflow.runtime.compiler import CompilationError
+
+
+@pytest.fixture
+def run(run_batch):
+    """Run the checkpointed fetch batch (FetchNode and registry come from conftest)."""
+
+    def run(items, url="${link}", **batch):
+        return run_batch(items, {"url": url}, checkpoint=True, **batch)
+
+    return run
+
+
+def checkpoint_files():
+    return list(get_batch_checkpoints().directory.glob("*.jsonl"))
+
+
+ITEMS = ["a", "b", "c", "d"]
+
+
+def test_rerun_after_failure_only_runs_remaining_items(run, batch_nodes):
+    batch_nodes.BROKEN.add("c")
+    with pytest.raises(ValueError, match="fetch of c failed"):
+        run(ITEMS)
+    assert batch_nodes.CALLS == ["a", "b", "c"]
+    batch_nodes.BROKEN.clear()
+    batch_nodes.CALLS.clear()
+
+    output = run(ITEMS)
+
+    assert batch_nodes.CALLS == ["c", "d"]
+    assert [r["response"] for r in output["results"]] == [f"body of {item}" for item in ITEMS]
+    assert [r["item"] for r in output["results"]] == ITEMS
+    assert output["success_count"] == 4
+    assert output["batch_metadata"]["resumed_count"] == 2
+    # The batch finished, so the next run starts fresh
+    assert checkpoint_files() == []
+
+
+def test_parallel_rerun_retries_only_failed_items(run, batch_nodes):
+    batch_nodes.BROKEN.update({"b", "d"})
+    first = run(ITEMS, parallel=True, error_handling="continue")
+    assert first["error_count"] == 2
+    assert len(checkpoint_files()) == 1
+    batch_nodes.BROKEN.clear()
+    batch_nodes.CALLS.clear()
+
+    output = run(ITEMS, parallel=True, error_handling="continue")
+
+    assert sorted(batch_nodes.CALLS) == ["b", "d"]
+    assert output["error_count"] == 0
+    assert output["batch_metadata"]["resumed_count"] == 2
+
+
+def test_changed_params_start_a_fresh_checkpoint(run, batch_nodes):
+    batch_nodes.BROKEN.add("d")
+    run(ITEMS, error_handling="continue")
+    batch_nodes.BROKEN.clear()
+    batch_nodes.CALLS.clear()
+
+    output = run(ITEMS, url="${link}/v2", error_handling="continue")
+
+    assert sorted(batch_nodes.CALLS) == ["a/v2", "b/v2", "c/v2", "d/v2"]
+    assert output["batch_metadata"]["resumed_count"] == 0
+
+
+def test_checkpoint_skips_cut_off_lines(tmp_path):
+    checkpoint = BatchCheckpoint(tmp_path / "batch.jsonl")
+    checkpoint.save("k1", {"response": 1})
+    checkpoint.save("k2", {"response": 2})
+    # A process killed mid-write leaves half a line
+    with open(checkpoint.path, "a", encoding="utf-8") as f:
+        f.write('{"key": "k3", "res')
+
+    assert checkpoint.load() == {"k1": {"response": 1}, "k2": {"response": 2}}
+
+
+def test_stale_checkpoint_is_discarded(tmp_path):
+    checkpoint = BatchCheckpoint(tmp_path / "batch.jsonl")
+    checkpoint.save("k1", {"response": 1})
+    stale = time.time() - MAX_CHECKPOINT_AGE_SECONDS - 60
+    os.utime(checkpoint.path, (stale, stale))
+
+    assert checkpoint.load() == {}
+    assert not checkpoint.path.exists()
+
+
+def test_checkpoint_with_provider_submit_is_rejected():
+    ir = {
+        "ir_version": "0.1.0",
+        "nodes": [
+            {
+                "id": "classify",
+                "type": "llm",
+                "batch": {"items": [1, 2], "submit": "provider", "checkpoint": True},
+                "params": {"prompt": "x", "model": "fake-model"},
+            }
+        ],
+        "edges": [],
+    }
+
+    with pytest.raises(CompilationError, match="submit: provider"):
+        compile_ir_to_flow(ir, registry=Registry(), validate=False)
@@ -0,0 +1,71 @@
+"""Tests for running identical batch items once (batch.dedupe)."""
+
+import pytest
+
+from pflow.runtime.batch_node import PflowBatchNode
+
+
+@pytest.fixture
+def calls(batch_nodes):
+    """Values FetchNode (from conftest) was called with."""
+    batch_nodes.BROKEN.add("fail")
+    return batch_nodes.CALLS
+
+
+LINKS = [
+    {"url": "a", "title": "First"},
+    {"url": "b", "title": "Second"},
+    {"url": "a", "title": "First again"},
+    {"url": "c", "title": "Third"},
+    {"url": "b", "title": "Second again"},
+]
+
+
+@pytest.fixture
+def run(run_batch):
+    """Run the fetch batch over LINKS-style items (FetchNode and registry come from conftest)."""
+
+    def run(items, **batch):
+        return run_batch(items, {"url": "${link.url}"}, **batch)
+
+    return run
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_items_with_identical_params_run_once(run, calls, parallel):
+    output = run(LINKS, dedupe=True, parallel=parallel)
+
+    assert sorted(calls) == ["a", "b", "c"]
+    assert [r["response"] for r in output["results"]] == [f"body of {link['url']}" for link in LINKS]
+    # Duplicates keep their own item
+    assert [r["item"] for r in output["results"]] == LINKS
+    assert output["success_count"] == 5
+    assert output["batch_metadata"]["deduplicated_count"] == 2
+
+
+def test_failed_run_is_reported_for_each_duplicate(run, calls):
+    items = [{"url": "fail"}, {"url": "a"}, {"url": "fail"}]
+
+    output = run(items, dedupe=True, error_handling="continue")
+
+    assert calls == ["fail", "a"]
+    assert output["results"][0] is None
+    assert output["results"][2] is None
+    assert sorted(e["index"] for e in output["errors"]) == [0, 2]
+    assert output["errors"][1]["item"] == {"url": "fail"}
+
+
+def test_items_run_every_time_without_dedupe(run, calls):
+    output = run(LINKS)
+
+    assert calls == ["a", "b", "a", "c", "b"]
+    assert "deduplicated_count" not in output["batch_metadata"]
+
+
+def test_nodes_without_templates_compare_items(batch_nodes):
+    inner = batch_nodes.FetchNode()
+    inner.set_params({"url": "static"})
+    batch = PflowBatchNode(inner, "get", {"items": "${data}", "dedupe": True})
+    batch._shared = {}
+
+    assert batch._duplicate_groups([{"k": 1}, {"k": 2}, {"k": 1}, {"k": 1}]) == {0: [2, 3]}
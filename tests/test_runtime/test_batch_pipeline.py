@@ -0,0 +1,135 @@
+"""Tests for item-level pipelining between consecutive batch nodes."""
+
+from typing import Any
+
+import pytest
+
+from pflow.runtime import compile_ir_to_flow
+from pflow.runtime.batch_pipeline import plan_batch_pipelines
+
+
+def chained_ir(first_items, second=None, third=None):
+    nodes = [
+        {
+            "id": "fetch",
+            "type": "step",
+            "batch": {"items": first_items, "parallel": True, "error_handling": "continue"},
+            "params": {"value": "${item.v}", "wait": "${item.wait}"},
+        },
+        {
+            "id": "summarize",
+            "type": "step",
+            "batch": {"items": "${fetch.results}", "parallel": True},
+            "params": second or {"value": "${item.result}", "signal": "gate"},
+        },
+    ]
+    edges = [{"from": "fetch", "to": "summarize"}]
+    if third:
+        nodes.append({"id": "publish", "type": "step", "batch": {"items": "${summarize.results}"}, "params": third})
+        edges.append({"from": "summarize", "to": "publish"})
+    return {"ir_version": "0.1.0", "nodes": nodes, "edges": edges}
+
+
+ITEMS = [{"v": 0, "wait": "gate"}, {"v": 1, "wait": ""}, {"v": 2, "wait": ""}]
+
+
+class TestPlan:
+    def test_chained_batches_detected(self):
+        ir = chained_ir(ITEMS, third={"value": "${item.result}"})
+
+        assert plan_batch_pipelines(ir) == [("fetch", "summarize"), ("summarize", "publish")]
+
+    def test_not_pipelined_when_downstream_reads_upstream_directly(self):
+        ir = chained_ir(ITEMS, second={"value": "${fetch.count}"})
+
+        assert plan_batch_pipelines(ir) == []
+
+    def test_not_pipelined_with_branches_provider_submit_dedupe_pack_or_checkpoint(self, monkeypatch):
+        branched = chained_ir(ITEMS)
+        branched["nodes"].append({"id": "other", "type": "step", "params": {"value": 1}})
+        branched["edges"].append({"from": "fetch", "to": "other", "action": "error"})
+        assert plan_batch_pipelines(branched) == []
+
+        provider = chained_ir(ITEMS)
+        provider["nodes"][1]["batch"]["submit"] = "provider"
+        assert plan_batch_pipelines(provider) == []
+
+        deduplicated = chained_ir(ITEMS)
+        deduplicated["nodes"][0]["batch"]["dedupe"] = True
+        assert plan_batch_pipelines(deduplicated) == []
+
+        packed = chained_ir(ITEMS)
+        packed["nodes"][1]["batch"]["pack"] = 5
+        assert plan_batch_pipelines(packed) == []
+
+        checkpointed = chained_ir(ITEMS)
+        checkpointed["nodes"][0]["batch"]["checkpoint"] = True
+        assert plan_batch_pipelines(checkpointed) == []
+
+        monkeypatch.setenv("PFLOW_PIPELINE_BATCHES", "0")
+        assert plan_batch_pipelines(chained_ir(ITEMS)) == []
+
+
+class TestExecution:
+    def test_downstream_items_start_before_upstream_finishes(self, registry):
+        flow = compile_ir_to_flow(chained_ir(ITEMS), registry=registry, validate=False)
+        shared: dict[str, Any] = {}
+
+        flow.run(shared)
+
+        # fetch[0] only finishes once a summarize item has run, i.e. while fetch was still running
+        assert shared["fetch"]["results"][0]["waited"] is True
+        assert [r["result"] for r in shared["summarize"]["results"]] == [0, 1, 2]
+        assert [r["item"] for r in shared["summarize"]["results"]] == shared["fetch"]["results"]
+        assert shared["summarize"]["batch_metadata"]["pipelined"] is True
+        assert "pipelined" not in shared["fetch"]["batch_metadata"]
+
+    def test_three_stage_chain_keeps_order(self, registry):
+        items = [{"v": i, "wait": ""} for i in range(8)]
+        ir = chained_ir(items, third={"value": "${item.result}"})
+        flow = compile_ir_to_flow(ir, registry=registry, validate=False)
+        shared: dict[str, Any] = {}
+
+        flow.run(shared)
+
+        assert [r["result"] for r in shared["publish"]["results"]] == list(range(8))
+        assert shared["publish"]["batch_metadata"]["pipelined"] is True
+
+    def test_upstream_failures_flow_through_as_none_items(self, registry):
+        items = [{"v": "fail", "wait": ""}, {"v": 1, "wait": ""}]
+        ir = chained_ir(items)
+        ir["nodes"][1]["batch"]["error_handling"] = "continue"
+        ir["nodes"][1]["params"] = {"value": "${item}"}
+        flow = compile_ir_to_flow(ir, registry=registry, validate=False)
+        shared: dict[str, Any] = {}
+
+        flow.run(shared)
+
+        assert shared["fetch"]["results"][0] is None
+        assert shared["summarize"]["count"] == 2
+        assert shared["summarize"]["results"][1]["item"] == shared["fetch"]["results"][1]
+
+    def test_disabled_pipeline_runs_stages_in_turn(self, registry, batch_nodes, monkeypatch):
+        monkeypatch.setenv("PFLOW_PIPELINE_BATCHES", "0")
+        batch_nodes.EVENTS["gate"].set()
+        flow = compile_ir_to_flow(chained_ir(ITEMS), registry=registry, validate=False)
+        shared: dict[str, Any] = {}
+
+        flow.run(shared)
+
+        assert [r["result"] for r in shared["summarize"]["results"]] == [0, 1, 2]
+        assert "pipelined" not in shared["summarize"]["batch_metadata"]
+
+    def test_upstream_fail_fast_cancels_prefetched_items(self, registry):
+        items = [{"v": "fail", "wait": "gate"}, {"v": 1, "wait": ""}]
+        ir = chained_ir(items)
+        ir["nodes"][0]["batch"]["error_handling"] = "fail_fast"
+        flow = compile_ir_to_flow(ir, registry=registry, validate=False)
+        shared: dict[str, Any] = {}
+
+        with pytest.raises(ValueError, match="step failed"):
+            flow.run(shared)
+
+        assert "summarize" not in shared
+        stage = flow.start_node.inner_node.feeds
+        assert not stage._active and stage._executor is None
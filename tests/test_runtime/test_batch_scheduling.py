@@ -0,0 +1,292 @@
+"""Tests for longest-first ordering and hedged items in parallel batches."""
+
+import threading
+import time
+
+import pytest
+
+from pflow.core.cancellation import get_cancel_token
+from pflow.mcp.manager import MCPServerManager
+from pflow.registry import Registry
+from pflow.runtime import batch_scheduling
+from pflow.runtime.batch_node import PflowBatchNode
+from pflow.runtime.batch_scheduling import (
+    HedgePolicy,
+    Hedger,
+    TimingHistory,
+    longest_first,
+    percentile,
+)
+from pflow.runtime.compiler import CompilationError, compile_ir_to_flow
+
+
+@pytest.fixture(autouse=True)
+def timing_history(tmp_path, monkeypatch):
+    history = TimingHistory(tmp_path / "batch-timings.json")
+    monkeypatch.setattr(batch_scheduling, "_timing_history", history)
+    return history
+
+
+class TestOrdering:
+    def test_recorded_times_beat_input_size(self):
+        items = ["a", "bbbbbbbb", "cc"]
+
+        assert longest_first(items, {0: 900.0, 1: 10.0, 2: 50.0}) == [0, 2, 1]
+
+    def test_input_size_without_history(self):
+        assert longest_first(["aa", "aaaaaa", "a", {"k": "v"}], {}) == [3, 1, 0, 2]
+
+    def test_missing_times_are_scaled_from_known_items(self):
+        # Item 0 took 10ms for 1 char, so the 50-char item 1 is expected to take ~500ms
+        items = ["a", "x" * 50, "bb"]
+
+        assert longest_first(items, {0: 10.0, 2: 100.0}) == [1, 2, 0]
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 95) == 95.0
+        assert percentile([3.0], 99) == 3.0
+
+
+class TestTimingHistory:
+    def test_times_are_blended_and_persisted(self, tmp_path):
+        path = tmp_path / "timings.json"
+        TimingHistory(path).record({"a": 100.0})
+        history = TimingHistory(path)
+        history.record({"a": 300.0, "b": 5.0})
+
+        assert TimingHistory(path).lookup(["a", "b", "c"]) == {"a": 200.0, "b": 5.0}
+
+    def test_disabled_by_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PFLOW_BATCH_TIMINGS", "0")
+        path = tmp_path / "timings.json"
+
+        TimingHistory(path).record({"a": 1.0})
+
+        assert not path.exists()
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "timings.json"
+        path.write_text("{not json")
+
+        assert TimingHistory(path).lookup(["a"]) == {}
+
+
+class TestHedgePolicy:
+    def test_from_config(self):
+        assert HedgePolicy.from_config(False) is None
+        assert HedgePolicy.from_config(True).percentile == 95.0
+        policy = HedgePolicy.from_config({"percentile": 90, "max_hedges": 3})
+        assert (policy.percentile, policy.delay, policy.budget(100)) == (90.0, None, 3)
+
+    def test_budget_defaults_to_a_tenth_of_the_items(self):
+        assert HedgePolicy().budget(45) == 5
+        assert HedgePolicy().budget(3) == 1
+
+    def test_delay_waits_for_enough_samples(self):
+        policy = HedgePolicy(percentile=50)
+
+        assert policy.hedge_after([100.0] * 4) is None
+        assert policy.hedge_after([100.0, 200.0, 300.0, 400.0, 500.0]) == pytest.approx(0.3)
+        assert HedgePolicy(delay=1.5).hedge_after([]) == 1.5
+
+
+def attempts_where_first_hangs():
+    """Attempt function whose first call straggles until cancelled; later calls return at once."""
+    calls = []
+    cancelled = threading.Event()
+
+    def attempt(token):
+        calls.append(token)
+        if len(calls) == 1:
+            if token.wait(5):
+                cancelled.set()
+            return None, {"error": "cancelled"}, 0.0, None
+        return {"response": "hedge"}, None, 1.0, {"model": "gpt-4o-mini", "input_tokens": 1000, "output_tokens": 0}
+
+    return attempt, calls, cancelled
+
+
+class TestHedger:
+    def test_straggler_is_hedged_and_loser_cancelled(self):
+        attempt, _, cancelled = attempts_where_first_hangs()
+        hedger = Hedger(HedgePolicy(delay=0.05), item_count=1, workers=1, seed_ms=[])
+
+        start = time.monotonic()
+        result, error, _, _ = hedger.run(attempt, None)
+        hedger.shutdown()
+
+        assert time.monotonic() - start < 2
+        assert (result, error) == ({"response": "hedge"}, None)
+        assert cancelled.wait(2)
+        stats = hedger.stats()
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+        assert stats["wasted_ms"] > 0
+        assert stats["wasted_cost_usd"] > 0
+
+    def test_budget_limits_hedges(self):
+        hedger = Hedger(HedgePolicy(delay=0.0, max_hedges=0), item_count=1, workers=1, seed_ms=[])
+
+        _, error, _, _ = hedger.run(lambda token: ({"ok": True}, None, 1.0, None), None)
+        hedger.shutdown()
+
+        assert error is None
+        assert hedger.stats()["hedged"] == 0
+
+    def test_no_hedge_until_enough_items_finished(self):
+        attempt, calls, _ = attempts_where_first_hangs()
+        # Percentile delay with no samples: the straggler is never hedged, so cancel it from outside
+        hedger = Hedger(HedgePolicy(), item_count=10, workers=1, seed_ms=[])
+        threading.Timer(0.3, lambda: calls[0].cancel()).start()
+
+        _, error, _, _ = hedger.run(attempt, None)
+        hedger.shutdown()
+
+        assert error is not None
+        assert len(calls) == 1
+
+    def test_earlier_runs_seed_the_delay(self):
+        attempt, calls, _ = attempts_where_first_hangs()
+        hedger = Hedger(HedgePolicy(), item_count=10, workers=1, seed_ms=[10.0] * 5)
+
+        result, _, _, _ = hedger.run(attempt, None)
+        hedger.shutdown()
+
+        assert result == {"response": "hedge"}
+        assert len(calls) == 2
+
+
+class StragglerNode:
+    """Inner node that hangs on one item until its attempt is cancelled, once."""
+
+    def __init__(self, node_id, slow_item):
+        self.node_id = node_id
+        self.slow_item = slow_item
+        self.order = []
+        self.hung = threading.Event()
+        self.lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _run(self, shared):
+        item = shared["item"]
+        with self.lock:
+            self.order.append(item)
+            hang = item == self.slow_item and not self.hung.is_set()
+            if hang:
+                self.hung.set()
+        if hang:
+            get_cancel_token(shared).wait(5)
+        else:
+            time.sleep(0.01)
+        shared[self.node_id] = {"response": item}
+        return "default"
+
+
+class TestBatchNode:
+    def run_batch(self, inner, config, items):
+        batch = PflowBatchNode(inner, "fetch", {"items": "${data}", "parallel": True, **config})
+        shared = {"data": items}
+        prep = batch.prep(shared)
+        batch.post(shared, prep, batch._exec(prep))
+        return shared["fetch"]
+
+    def test_hedged_straggler_keeps_result_order(self):
+        inner = StragglerNode("fetch", slow_item=7)
+
+        start = time.monotonic()
+        output = self.run_batch(inner, {"max_concurrent": 4, "hedge": {"delay": 0.1}}, list(range(10)))
+
+        assert time.monotonic() - start < 3
+        assert [r["response"] for r in output["results"]] == list(range(10))
+        assert output["success_count"] == 10
+        hedging = output["batch_metadata"]["hedging"]
+        assert hedging["hedged"] >= 1
+        assert hedging["hedge_wins"] >= 1
+
+    def test_longest_first_uses_recorded_times(self, timing_history):
+        inner = StragglerNode("fetch", slow_item=None)
+        config = {"max_concurrent": 1, "order": "longest_first"}
+        self.run_batch(inner, config, ["a", "b", "c"])
+        # Make "b" the slowest item on record
+        batch = PflowBatchNode(inner, "fetch", {"items": "${data}", **config})
+        keys, _ = batch._recorded_timings(["a", "b", "c"])
+        timing_history.record({keys[1]: 10_000.0})
+        inner.order.clear()
+
+        output = self.run_batch(inner, config, ["a", "b", "c"])
+
+        assert inner.order[0] == "b"
+        assert [r["response"] for r in output["results"]] == ["a", "b", "c"]
+        assert output["batch_metadata"]["order"] == "longest_first"
+
+    def test_plain_batches_skip_the_timing_history(self, timing_history):
+        self.run_batch(StragglerNode("fetch", slow_item=None), {}, ["a"])
+
+        assert not timing_history.path.exists()
+
+
+def test_hedging_non_idempotent_http_is_rejected():
+    ir = {
+        "ir_version": "0.1.0",
+        "nodes": [
+            {
+                "id": "post",
+                "type": "http",
+                "batch": {"items": [1, 2], "parallel": True, "hedge": True},
+                "params": {"url": "https://example.com", "method": "POST"},
+            }
+        ],
+        "edges": [],
+    }
+
+    with pytest.raises(CompilationError, match="send POST requests twice"):
+        compile_ir_to_flow(ir, registry=Registry(), validate=False)
+
+
+def mcp_hedge_ir():
+    return {
+        "ir_version": "0.1.0",
+        "nodes": [
+            {
+                "id": "tool",
+                "type": "mcp-files-tool",
+                "batch": {"items": [1, 2], "parallel": True, "hedge": True},
+                "params": {},
+            }
+        ],
+        "edges": [],
+    }
+
+
+def mcp_registry(tmp_path, annotations):
+    registry = Registry(tmp_path / "registry.json")
+    registry.save({
+        "mcp-files-tool": {
+            "class_name": "MCPNode",
+            "module": "pflow.nodes.mcp.node",
+            "file_path": "virtual://mcp",
+            "interface": {
+                "inputs": [],
+                "params": [],
+                "outputs": [{"key": "result", "type": "any"}],
+                "mcp_metadata": {"server": "files", "tool": "tool", "annotations": annotations},
+            },
+        }
+    })
+    return registry
+
+
+@pytest.mark.parametrize("annotations", [{}, {"readOnlyHint": False, "destructiveHint": True}])
+def test_hedging_side_effecting_mcp_tool_is_rejected(tmp_path, annotations):
+    with pytest.raises(CompilationError, match="would call MCP tool 'mcp-files-tool' twice"):
+        compile_ir_to_flow(mcp_hedge_ir(), registry=mcp_registry(tmp_path, annotations), validate=False)
+
+
+@pytest.mark.parametrize("annotations", [{"readOnlyHint": True}, {"idempotentHint": True}])
+def test_hedging_read_only_or_idempotent_mcp_tool_is_accepted(tmp_path, monkeypatch, annotations):
+    monkeypatch.setattr(MCPServerManager, "list_servers", lambda self: ["files"])
+    compile_ir_to_flow(mcp_hedge_ir(), registry=mcp_registry(tmp_path, annotations), validate=False)
@@ -14,6 +14,7 @@ from pflow.pocketflow import Node
 from pflow.registry.registry import Registry
 from pflow.runtime import compile_ir_to_flow
 from pflow.runtime.batch_node import PflowBatchNode
+from pflow.runtime.compiler import CompilationError
 from pflow.runtime.instrumented_wrapper import InstrumentedNodeWrapper
 from pflow.runtime.namespaced_wrapper import NamespacedNodeWrapper
 from pflow.runtime.node_wrapper import TemplateAwareNodeWrapper
@@ -246,6 +247,41 @@ class TestBatchConfigParsing:
         assert batch_wrapper.item_alias == "item"  # Default
         assert batch_wrapper.error_handling == "fail_fast"  # Default
 
+    def test_provider_submit_rejected_for_non_llm_nodes(self, test_registry):
+        """submit: provider is only accepted on llm nodes."""
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [
+                {
+                    "id": "batch",
+                    "type": "value-node",
+                    "batch": {"items": [1, 2], "submit": "provider"},
+                },
+            ],
+            "edges": [],
+        }
+
+        with pytest.raises(CompilationError, match="only supported for llm nodes"):
+            compile_ir_to_flow(ir, registry=test_registry, validate=False)
+
+    @pytest.mark.parametrize(
+        ("batch", "message"),
+        [
+            ({"items": [1, 2], "parallel": True, "hedge": True}, "only supported for llm, http and MCP nodes"),
+            ({"items": [1, 2], "hedge": True}, "requires parallel: true"),
+        ],
+    )
+    def test_hedge_rejected_for_unsafe_batches(self, test_registry, batch, message):
+        """hedge needs parallel items and a node whose call can safely run twice."""
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [{"id": "batch", "type": "value-node", "batch": batch}],
+            "edges": [],
+        }
+
+        with pytest.raises(CompilationError, match=message):
+            compile_ir_to_flow(ir, registry=test_registry, validate=False)
+
 
 class TestBatchExecutionIntegration:
     """End-to-end tests for batch execution through compiler."""
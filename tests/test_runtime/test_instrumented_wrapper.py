@@ -719,3 +719,50 @@ class TestEdgeCases:
 
         # Should record 0.0 duration
         metrics.record_node_execution.assert_called_once_with("test_node", 0.0, is_planner=False)
+
+
+class StreamingNode(Node):
+    """Node that streams chunks through the runtime-provided callback."""
+
+    def _run(self, shared):
+        on_chunk = shared.get("__stream_callback__")
+        if on_chunk is not None:
+            for chunk in ("Hel", "lo"):
+                on_chunk(chunk)
+        return "done"
+
+
+class TestStreamCallback:
+    """Test the per-node stream callback installed around execution."""
+
+    def test_chunks_forwarded_as_node_stream_events(self):
+        progress = Mock()
+        wrapper = InstrumentedNodeWrapper(StreamingNode(), "answer")
+        shared = {"__progress_callback__": progress, "_pflow_depth": 1}
+
+        wrapper._run(shared)
+
+        progress.assert_any_call("answer", "node_stream", None, 1, text_chunk="Hel")
+        progress.assert_any_call("answer", "node_stream", None, 1, text_chunk="lo")
+        assert "__stream_callback__" not in shared
+
+    def test_no_stream_callback_without_progress(self):
+        seen = []
+
+        class ProbeNode(Node):
+            def _run(self, shared):
+                seen.append(shared.get("__stream_callback__"))
+                return "done"
+
+        InstrumentedNodeWrapper(ProbeNode(), "probe")._run({})
+
+        assert seen == [None]
+
+    def test_stream_callback_removed_after_error(self):
+        wrapper = InstrumentedNodeWrapper(ErrorNode(), "failing")
+        shared = {"__progress_callback__": Mock()}
+
+        with pytest.raises(ValueError):
+            wrapper._run(shared)
+
+        assert "__stream_callback__" not in shared
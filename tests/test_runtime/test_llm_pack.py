@@ -0,0 +1,164 @@
+"""Tests for packing several llm batch items into one call (``batch.pack``)."""
+
+import json
+import re
+import threading
+from typing import Any
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pflow.registry import Registry
+from pflow.runtime.compiler import CompilationError, compile_ir_to_flow
+from pflow.runtime.llm_pack import PackedCalls, build_prompt, parse_answers, split_usage
+
+TASK = re.compile(r'<task id="(\d+)">\n(.*?)\n</task>', re.DOTALL)
+
+
+class FakeModel:
+    """Answers packed prompts with a JSON array and single prompts with plain text.
+
+    Prompts containing "SKIP" are left out of packed answers; a packed prompt
+    containing "GARBLE" gets an answer that isn't JSON.
+    """
+
+    def __init__(self):
+        self.prompts: list[str] = []
+        self.lock = threading.Lock()
+
+    def prompt(self, prompt, **kwargs):
+        with self.lock:
+            self.prompts.append(prompt)
+        tasks = TASK.findall(prompt)
+        if not tasks:
+            text = prompt.upper()
+        elif "GARBLE" in prompt:
+            text = "Sure! Here are the answers..."
+        else:
+            text = json.dumps([{"id": int(n), "answer": task.upper()} for n, task in tasks if "SKIP" not in task])
+        response = Mock()
+        response.text.return_value = text
+        response.usage.return_value = Mock(input=100, output=10, details={})
+        return response
+
+    @property
+    def packed_calls(self):
+        return [p for p in self.prompts if "<task" in p]
+
+    @property
+    def single_calls(self):
+        return [p for p in self.prompts if "<task" not in p]
+
+
+@pytest.fixture
+def model():
+    fake = FakeModel()
+    with patch("llm.get_model", return_value=fake):
+        yield fake
+
+
+class TestParsing:
+    def test_answers_matched_by_id(self):
+        text = '```json\n[{"id": 2, "answer": "b"}, {"id": 1, "answer": {"label": "a"}}]\n```'
+
+        assert parse_answers(text, 3) == ['{"label": "a"}', "b", None]
+
+    def test_plain_array_must_match_task_count(self):
+        assert parse_answers('["a", "b"]', 2) == ["a", "b"]
+        assert parse_answers('["a"]', 2) == [None, None]
+
+    def test_unparseable_answer(self):
+        assert parse_answers("Here you go: a, b", 2) == [None, None]
+
+    def test_prompt_numbers_tasks(self):
+        prompt = build_prompt(["first", "second"])
+
+        assert TASK.findall(prompt) == [("1", "first"), ("2", "second")]
+        assert "JSON array" in prompt
+
+    def test_usage_split_keeps_totals(self):
+        shares = split_usage({"input_tokens": 10, "output_tokens": 3}, 3)
+
+        assert [s["input_tokens"] for s in shares] == [4, 3, 3]
+        assert sum(s["output_tokens"] for s in shares) == 3
+
+
+class TestPackedCalls:
+    def test_groups_split_by_settings_and_size(self):
+        packed = PackedCalls("classify", size=2)
+        for index, model_name in enumerate(["a", "a", "b", "a", "a"]):
+            packed.add_request(index, {"model": model_name, "prompt": str(index)})
+
+        assert packed.groups() == [[0, 1], [3, 4], [2]]
+
+    def test_failed_call_leaves_items_unanswered(self):
+        packed = PackedCalls("classify", size=5)
+        for index in range(3):
+            packed.add_request(index, {"model": "m", "prompt": str(index)})
+
+        packed.run(call=Mock(side_effect=RuntimeError("rate limited")))
+
+        assert packed.packed_items == 0
+        assert packed.get_answer(0) is None
+
+
+class TestBatchPacking:
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_items_answered_in_packed_calls(self, model, make_llm_batch, parallel):
+        shared: dict[str, Any] = {"items": [f"item{i}" for i in range(7)]}
+
+        make_llm_batch(pack=3, parallel=parallel)._run(shared)
+
+        output = shared["classify"]
+        assert [r["response"] for r in output["results"]] == [f"LABEL: ITEM{i}" for i in range(7)]
+        assert [r["item"] for r in output["results"]] == shared["items"]
+        # 3 + 3 packed; the last item alone makes a plain call
+        assert len(model.packed_calls) == 2
+        assert len(model.single_calls) == 1
+        assert output["batch_metadata"]["packing"] == {
+            "size": 3,
+            "calls": 2,
+            "packed_items": 6,
+            "unpacked_items": 1,
+        }
+
+    def test_unanswered_items_fall_back_to_own_call(self, model, make_llm_batch):
+        shared: dict[str, Any] = {"items": ["a", "SKIP", "c", "GARBLE", "e"]}
+
+        make_llm_batch(pack=3)._run(shared)
+
+        output = shared["classify"]
+        assert [r["response"] for r in output["results"]] == [
+            "LABEL: A",
+            "LABEL: SKIP",
+            "LABEL: C",
+            "LABEL: GARBLE",
+            "LABEL: E",
+        ]
+        assert sorted(model.single_calls) == ["label: GARBLE", "label: SKIP", "label: e"]
+        assert output["batch_metadata"]["packing"]["packed_items"] == 2
+
+    def test_usage_split_across_packed_items(self, model, make_llm_batch):
+        shared: dict[str, Any] = {"items": ["a", "b"]}
+
+        make_llm_batch(pack=2)._run(shared)
+
+        calls = shared["__llm_calls__"]
+        assert len(calls) == 2
+        assert all(call["packed"] and call["input_tokens"] == 50 for call in calls)
+        assert sum(call["output_tokens"] for call in calls) == 10
+
+
+@pytest.mark.parametrize(
+    ("node", "message"),
+    [
+        ({"type": "shell", "batch": {"items": [1, 2], "pack": 5}}, "only supported for llm nodes"),
+        ({"type": "llm", "batch": {"items": [1, 2], "pack": 5, "submit": "provider"}}, "submit: provider"),
+    ],
+)
+def test_pack_rejected_for_unsupported_batches(node, message):
+    params = {"prompt": "x", "model": "fake-model"}
+    ir = {"ir_version": "0.1.0", "nodes": [{"id": "classify", "params": params, **node}], "edges": []}
+
+    with pytest.raises(CompilationError, match=message):
+        compile_ir_to_flow(ir, registry=Registry(), validate=False)
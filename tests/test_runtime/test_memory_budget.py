@@ -0,0 +1,205 @@
+"""Tests for shared-store size accounting and the per-run memory budget."""
+
+from unittest.mock import Mock
+
+from pflow.core.metrics import MetricsCollector
+from pflow.registry import Registry
+from pflow.runtime.compiler import compile_ir_to_flow
+from pflow.runtime.memory_budget import (
+    MEMORY_BUDGET_KEY,
+    MemoryBudget,
+    SpilledValue,
+    estimate_size,
+    get_memory_budget,
+    materialize,
+)
+from pflow.runtime.namespaced_store import NamespacedSharedStore
+from pflow.runtime.output_liveness import release_outputs
+from pflow.runtime.output_resolver import populate_declared_outputs
+from pflow.runtime.template_resolver import TemplateResolver
+
+LARGE = "x" * 2000
+
+
+class TestEstimateSize:
+    def test_strings_and_scalars(self):
+        assert estimate_size("abc") == 3
+        assert estimate_size(b"abcd") == 4
+        assert estimate_size(42) == estimate_size(None) == 8
+
+    def test_containers_sum_their_entries(self):
+        assert estimate_size(["a" * 100] * 10) >= 1000
+        assert estimate_size({"body": LARGE}) >= 2000
+
+    def test_large_containers_are_sampled(self):
+        rows = ["row"] * 100_000
+
+        assert 300_000 <= estimate_size(rows) <= 300_100
+
+
+class TestAccounting:
+    def test_writes_accounted_per_node(self):
+        budget = MemoryBudget()
+        shared = {MEMORY_BUDGET_KEY: budget}
+
+        NamespacedSharedStore(shared, "fetch")["body"] = LARGE
+        NamespacedSharedStore(shared, "fetch")["status"] = 200
+        NamespacedSharedStore(shared, "parse")["items"] = ["a", "b"]
+
+        assert budget.bytes_written("fetch") == 2008
+        assert budget.bytes_written("parse") > 0
+        assert budget.total_bytes == budget.peak_bytes
+
+    def test_overwrites_replace_previous_size(self):
+        budget = MemoryBudget()
+        store = NamespacedSharedStore({MEMORY_BUDGET_KEY: budget}, "node")
+
+        store["body"] = LARGE
+        store["body"] = "small"
+
+        assert budget.total_bytes == 5
+        assert budget.peak_bytes == 2000
+        assert budget.bytes_written("node") == 2005
+
+    def test_special_keys_not_accounted(self):
+        budget = MemoryBudget()
+
+        NamespacedSharedStore({MEMORY_BUDGET_KEY: budget}, "node")["__warnings__"] = {"node": LARGE}
+
+        assert budget.total_bytes == 0
+
+    def test_released_outputs_leave_the_total(self):
+        budget = MemoryBudget()
+        shared = {MEMORY_BUDGET_KEY: budget}
+        NamespacedSharedStore(shared, "fetch")["body"] = LARGE
+
+        release_outputs(shared, ("fetch",))
+
+        assert budget.total_bytes == 0
+
+
+class TestSpilling:
+    def test_values_over_budget_spill_and_read_back(self):
+        budget = MemoryBudget(limit_bytes=3000, spill_min_size=1000)
+        shared = {MEMORY_BUDGET_KEY: budget}
+        store = NamespacedSharedStore(shared, "fetch")
+
+        store["first"] = LARGE
+        store["second"] = LARGE
+
+        assert shared["fetch"]["first"] == LARGE
+        assert isinstance(shared["fetch"]["second"], SpilledValue)
+        assert budget.total_bytes == 2000
+        assert budget.usage()["spilled_values"] == 1
+        # Reads through the store and templates see the original value
+        assert store["second"] == LARGE
+        assert TemplateResolver.resolve_value("fetch.second", shared) == LARGE
+        assert TemplateResolver.resolve_template("${fetch.second}", shared) == LARGE
+
+    def test_whole_namespace_reads_load_spilled_values(self):
+        budget = MemoryBudget(limit_bytes=10, spill_min_size=1000)
+        shared = {MEMORY_BUDGET_KEY: budget}
+        NamespacedSharedStore(shared, "producer")["stdout"] = LARGE
+        assert isinstance(shared["producer"]["stdout"], SpilledValue)
+        workflow_ir = {"outputs": {"everything": {"source": "${producer}"}}}
+
+        populate_declared_outputs(shared, workflow_ir)
+
+        assert TemplateResolver.resolve_value("producer", shared) == {"stdout": LARGE}
+        assert TemplateResolver.resolve_template("${producer}", shared) == {"stdout": LARGE}
+        assert shared["everything"] == {"stdout": LARGE}
+        # The store itself keeps the handle
+        assert isinstance(shared["producer"]["stdout"], SpilledValue)
+
+    def test_spilled_batch_results_reach_downstream_nodes(self):
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [
+                {
+                    "id": "b",
+                    "type": "shell",
+                    "batch": {"items": [1, 2, 3]},
+                    "params": {"command": "head -c 2000 /dev/zero | tr '\\0' x"},
+                },
+                {"id": "count", "type": "shell", "params": {"stdin": "${b.results}", "command": "wc -c"}},
+            ],
+            "edges": [{"from": "b", "to": "count"}],
+        }
+        budget = MemoryBudget(limit_bytes=100, spill_min_size=1000)
+        shared = {MEMORY_BUDGET_KEY: budget}
+
+        compile_ir_to_flow(ir, registry=Registry()).run(shared)
+
+        # The aggregate is spilled as a whole, never the items inside it
+        assert isinstance(shared["b"]["results"], SpilledValue)
+        assert [r["stdout"] for r in materialize(shared["b"]["results"])] == ["x" * 2000] * 3
+        assert budget.bytes_written("b") >= 6000
+        # The downstream node got the values (as JSON), not handle reprs
+        assert int(shared["count"]["stdout"]) > 6000
+
+    def test_handles_inside_lists_are_loaded(self):
+        budget = MemoryBudget(limit_bytes=10, spill_min_size=1000)
+        shared = {MEMORY_BUDGET_KEY: budget}
+        NamespacedSharedStore(shared, "producer")["stdout"] = LARGE
+        handle = shared["producer"]["stdout"]
+        results = [{"stdout": handle, "item": 1}, {"stdout": "small", "item": 2}]
+
+        assert materialize(results) == [{"stdout": LARGE, "item": 1}, {"stdout": "small", "item": 2}]
+        assert materialize({"b": {"results": results}})["b"]["results"][0]["stdout"] == LARGE
+        assert results[0]["stdout"] is handle
+
+    def test_small_values_never_spill(self):
+        budget = MemoryBudget(limit_bytes=10, spill_min_size=1000)
+        shared = {MEMORY_BUDGET_KEY: budget}
+
+        NamespacedSharedStore(shared, "node")["body"] = "x" * 500
+
+        assert shared["node"]["body"] == "x" * 500
+        assert budget.total_bytes == 500
+
+    def test_unpicklable_values_stay_in_memory(self):
+        budget = MemoryBudget(limit_bytes=10, spill_min_size=0)
+        shared = {MEMORY_BUDGET_KEY: budget}
+        handle = lambda: None
+
+        NamespacedSharedStore(shared, "node")["callback"] = handle
+
+        assert shared["node"]["callback"] is handle
+
+    def test_budget_from_env(self, monkeypatch):
+        assert MemoryBudget.from_env().limit_bytes is None
+
+        monkeypatch.setenv("PFLOW_MEMORY_BUDGET_MB", "1.5")
+        assert MemoryBudget.from_env().limit_bytes == 1572864
+
+        monkeypatch.setenv("PFLOW_MEMORY_BUDGET_MB", "lots")
+        assert MemoryBudget.from_env().limit_bytes is None
+
+
+class TestReporting:
+    def test_bytes_written_reach_metrics_and_trace(self):
+        ir = {
+            "ir_version": "0.1.0",
+            "nodes": [{"id": "read", "type": "shell", "params": {"command": "head -c 3000 /dev/zero | tr '\\0' x"}}],
+            "edges": [],
+        }
+        metrics = MetricsCollector()
+        trace = Mock()
+        flow = compile_ir_to_flow(ir, registry=Registry(), metrics_collector=metrics, trace_collector=trace)
+        shared = {MEMORY_BUDGET_KEY: MemoryBudget()}
+
+        flow.run(shared)
+
+        assert metrics.workflow_node_bytes["read"] >= 3000
+        assert trace.record_node_execution.call_args.kwargs["bytes_written"] == metrics.workflow_node_bytes["read"]
+
+        metrics.record_shared_store_usage(get_memory_budget(shared).usage())
+        summary = metrics.get_summary([])
+        assert summary["shared_store"]["peak_bytes"] >= 3000
+        assert summary["metrics"]["workflow"]["node_bytes_written"] == {"read": metrics.workflow_node_bytes["read"]}
+
+    def test_no_usage_section_without_writes(self):
+        metrics = MetricsCollector()
+        metrics.record_shared_store_usage(MemoryBudget().usage())
+
+        assert "shared_store" not in metrics.get_summary([])
@@ -0,0 +1,145 @@
+"""Tests for liveness-based release of node outputs."""
+
+from pflow.registry import Registry
+from pflow.runtime.compiler import compile_ir_to_flow
+from pflow.runtime.output_liveness import (
+    RETAIN_OUTPUTS_KEY,
+    plan_output_readers,
+    plan_output_release,
+    release_outputs,
+)
+
+
+def node(node_id, **params):
+    return {"id": node_id, "type": "shell", "params": params}
+
+
+def chain_ir(outputs=None):
+    """read -> summarize -> answer, each reading the previous node."""
+    return {
+        "ir_version": "0.1.0",
+        "nodes": [
+            node("read", command="head -c 5000 /dev/zero | tr '\\0' x"),
+            node("summarize", command="wc -c", stdin="${read.stdout}"),
+            node("answer", command="cat", stdin="chars: ${summarize.stdout}"),
+        ],
+        "edges": [{"from": "read", "to": "summarize"}, {"from": "summarize", "to": "answer"}],
+        "outputs": {"result": {"source": "${answer.stdout}"}} if outputs is None else outputs,
+    }
+
+
+class TestPlan:
+    def test_outputs_die_after_last_consumer(self):
+        # Already-released producers are listed again; release_outputs skips them
+        assert plan_output_release(chain_ir()) == {"summarize": ("read",), "answer": ("read", "summarize")}
+
+    def test_unread_outputs_die_immediately(self):
+        ir = chain_ir()
+        ir["nodes"][2]["params"]["stdin"] = "static"
+
+        assert plan_output_release(ir)["summarize"] == ("read", "summarize")
+
+    def test_declared_outputs_pin_producers(self):
+        ir = chain_ir({"raw": {"source": "${read.stdout}"}, "result": {"source": "${answer.stdout}"}})
+
+        assert plan_output_release(ir) == {"answer": ("summarize",)}
+
+    def test_branch_consumers_keep_outputs_alive(self):
+        ir = chain_ir()
+        ir["nodes"].append(node("report", command="cat", stdin="${read.stdout}"))
+        ir["edges"].append({"from": "summarize", "to": "report", "action": "error"})
+
+        plan = plan_output_release(ir)
+
+        # read is still needed on the error branch after summarize, and dead once either branch runs
+        assert "read" not in plan.get("summarize", ())
+        assert "read" in plan["answer"]
+        assert "read" in plan["report"]
+
+    def test_nested_index_templates_count_as_references(self):
+        ir = chain_ir()
+        ir["nodes"][2]["params"]["stdin"] = "${summarize.lines[${read.stdout}]}"
+
+        assert "read" not in plan_output_release(ir).get("summarize", ())
+
+    def test_disabled_without_declared_sources(self, monkeypatch):
+        assert plan_output_release(chain_ir({})) is None
+        assert plan_output_release(chain_ir({"result": {"description": "no source"}})) is None
+        assert plan_output_release({**chain_ir(), "enable_namespacing": False}) is None
+
+        monkeypatch.setenv("PFLOW_RELEASE_OUTPUTS", "0")
+        assert plan_output_release(chain_ir()) is None
+
+
+class TestRelease:
+    def test_large_values_dropped_small_kept(self):
+        namespace = {"stdout": "x" * 5000, "exit_code": 0, "rows": list(range(1000)), "meta": {"count": 3}}
+        shared = {"read": namespace}
+
+        assert release_outputs(shared, ("read",)) == ["read"]
+
+        assert shared["read"] == {"exit_code": 0, "meta": {"count": 3}}
+        # Replaced, not mutated: earlier snapshots keep their view
+        assert "stdout" in namespace
+        assert shared["__execution__"]["released_outputs"] == ["read"]
+
+    def test_retained_and_nested_runs_untouched(self):
+        shared = {"read": {"stdout": "x" * 5000}, RETAIN_OUTPUTS_KEY: ["read"]}
+        assert release_outputs(shared, ("read",)) == []
+
+        nested = {"read": {"stdout": "x" * 5000}, "_pflow_depth": 1}
+        assert release_outputs(nested, ("read",)) == []
+
+
+class TestCompiledWorkflow:
+    def test_large_output_released_and_result_intact(self):
+        flow = compile_ir_to_flow(chain_ir(), registry=Registry())
+        shared: dict = {}
+
+        flow.run(shared)
+
+        assert shared["result"].strip() == "chars: 5000"
+        assert "stdout" not in shared["read"]
+        assert shared["read"]["exit_code"] == 0
+        assert shared["__execution__"]["released_outputs"] == ["read"]
+
+    def test_resumed_run_keeps_released_nodes_completed(self):
+        flow = compile_ir_to_flow(chain_ir(), registry=Registry())
+        shared: dict = {}
+        flow.run(shared)
+        shared["__cache_hits__"] = []
+
+        compile_ir_to_flow(chain_ir(), registry=Registry()).run(shared)
+
+        # Nothing left to run reads read's stdout, so it isn't executed again
+        assert shared["__cache_hits__"] == ["read", "summarize", "answer"]
+        assert shared["__execution__"]["released_outputs"] == ["read"]
+
+    def test_repaired_reader_reexecutes_released_producer(self):
+        shared: dict = {}
+        compile_ir_to_flow(chain_ir(), registry=Registry()).run(shared)
+        shared["__cache_hits__"] = []
+        repaired = chain_ir()
+        repaired["nodes"][1]["params"]["command"] = "wc -c | tr -d ' '"
+
+        compile_ir_to_flow(repaired, registry=Registry()).run(shared)
+
+        # summarize changed and reads read.stdout, so read runs again to recreate it
+        assert "read" not in shared["__cache_hits__"]
+        assert shared["result"].strip() == "chars: 5000"
+        assert shared["__execution__"]["released_outputs"] == ["read"]
+
+    def test_new_declared_output_reexecutes_released_producer(self):
+        shared: dict = {}
+        compile_ir_to_flow(chain_ir(), registry=Registry()).run(shared)
+        repaired = chain_ir({"raw": {"source": "${read.stdout}"}, "result": {"source": "${answer.stdout}"}})
+
+        compile_ir_to_flow(repaired, registry=Registry()).run(shared)
+
+        assert shared["raw"] == "x" * 5000
+
+    def test_plan_output_readers(self):
+        ir = chain_ir({"raw": {"source": "${read.stdout}"}})
+
+        assert plan_output_readers(ir) == ({"read": ("summarize",), "summarize": ("answer",)}, {"read"})
+        assert plan_output_readers(chain_ir({"result": {"description": "no source"}}))[1] == set()
@@ -0,0 +1,316 @@
+"""Tests for provider batch-API submission (``batch.submit: provider``).
+
+The end-to-end tests run the real llm node chain against a local fake of
+the Anthropic Message Batches API; the rest use an in-memory backend.
+"""
+
+import functools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+from anthropic import Anthropic, DefaultHttpxClient
+
+from pflow.core.cancellation import CancellationToken, WorkflowCancelled
+from pflow.runtime import provider_batch
+from pflow.runtime.batch_checkpoint import get_batch_checkpoints
+from pflow.runtime.batch_node import PflowBatchNode
+from pflow.runtime.provider_batch import (
+    AnthropicBatchBackend,
+    BatchBackend,
+    BatchRequest,
+    BatchResult,
+    ProviderBatch,
+    get_batch_backend,
+    register_batch_backend,
+    unregister_batch_backend,
+)
+
+
+class FakeBatchAPI(BaseHTTPRequestHandler):
+    """Minimal Message Batches endpoint: jobs end after one status poll."""
+
+    jobs: dict[str, dict[str, Any]]
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _send_json(self, body: Any) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _batch(self, job_id: str, ended: bool) -> dict[str, Any]:
+        host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+        return {
+            "id": job_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2025-01-01T00:00:00Z",
+            "expires_at": "2025-01-02T00:00:00Z",
+            "ended_at": "2025-01-01T00:01:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{host}/v1/messages/batches/{job_id}/results" if ended else None,
+        }
+
+    def do_POST(self) -> None:
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        job_id = f"msgbatch_{len(self.jobs) + 1}"
+        self.jobs[job_id] = {"requests": body["requests"], "polls": 0}
+        self._send_json(self._batch(job_id, ended=False))
+
+    def do_GET(self) -> None:
+        parts = self.path.strip("/").split("/")
+        job = self.jobs[parts[3]]
+        if parts[-1] != "results":
+            job["polls"] += 1
+            self._send_json(self._batch(parts[3], ended=job["polls"] > 1))
+            return
+
+        lines = []
+        for request in job["requests"]:
+            prompt = request["params"]["messages"][0]["content"]
+            if "FAIL" in prompt:
+                result = {
+                    "type": "errored",
+                    "error": {"type": "error", "error": {"type": "api_error", "message": "boom"}},
+                }
+            else:
+                result = {
+                    "type": "succeeded",
+                    "message": {
+                        "id": "msg_1",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": request["params"]["model"],
+                        "content": [{"type": "text", "text": prompt.upper()}],
+                        "stop_reason": "end_turn",
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": 10, "output_tokens": 3},
+                    },
+                }
+            lines.append(json.dumps({"custom_id": request["custom_id"], "result": result}))
+        data = "\n".join(lines).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/binary")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def fake_api():
+    handler = type("Handler", (FakeBatchAPI,), {"jobs": {}})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, handler.jobs
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def anthropic_backend(fake_api):
+    server, _ = fake_api
+    client = Anthropic(
+        api_key="test-key",
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        max_retries=0,
+        http_client=DefaultHttpxClient(trust_env=False),  # Talk to the local server, never a proxy
+    )
+    backend = AnthropicBatchBackend(client=client)
+    register_batch_backend("fake-anthropic", lambda: backend, matches=lambda model: model == "claude-fake")
+    yield backend
+    unregister_batch_backend("fake-anthropic")
+
+
+@pytest.fixture
+def provider_llm_batch(make_llm_batch):
+    """Real llm node chain (from conftest) submitted through the fake Anthropic backend."""
+    return functools.partial(make_llm_batch, model="claude-fake", submit="provider", poll_interval=0)
+
+
+class TestAnthropicBackend:
+    """End to end against a fake Message Batches server."""
+
+    def test_results_mapped_back_in_order(self, fake_api, anthropic_backend, provider_llm_batch):
+        _, jobs = fake_api
+        shared: dict[str, Any] = {"items": ["a", "b", "c"]}
+
+        provider_llm_batch()._run(shared)
+
+        output = shared["classify"]
+        assert [r["response"] for r in output["results"]] == ["LABEL: A", "LABEL: B", "LABEL: C"]
+        assert [r["item"] for r in output["results"]] == ["a", "b", "c"]
+        assert output["success_count"] == 3
+        assert output["batch_metadata"]["execution_mode"] == "provider"
+        assert output["batch_metadata"]["provider_job_id"] == "msgbatch_1"
+        assert len(jobs) == 1
+        assert jobs["msgbatch_1"]["requests"][0]["params"]["max_tokens"] == provider_batch.DEFAULT_MAX_TOKENS
+
+    def test_usage_recorded_as_provider_batch(self, anthropic_backend, provider_llm_batch):
+        shared: dict[str, Any] = {"items": ["a", "b"]}
+
+        provider_llm_batch()._run(shared)
+
+        calls = shared["__llm_calls__"]
+        assert len(calls) == 2
+        assert all(call["provider_batch"] and call["input_tokens"] == 10 for call in calls)
+
+    def test_errored_requests_reported_per_item(self, anthropic_backend, provider_llm_batch):
+        shared: dict[str, Any] = {"items": ["ok", "FAIL"]}
+
+        provider_llm_batch(error_handling="continue")._run(shared)
+
+        output = shared["classify"]
+        assert output["results"][0]["response"] == "LABEL: OK"
+        assert output["error_count"] == 1
+        assert output["errors"][0]["index"] == 1
+        assert "Provider batch request failed: boom" in output["errors"][0]["error"]
+
+    def test_errored_request_fails_fast(self, anthropic_backend, provider_llm_batch):
+        shared: dict[str, Any] = {"items": ["FAIL"]}
+
+        with pytest.raises(RuntimeError, match="boom"):
+            provider_llm_batch()._run(shared)
+
+    def test_job_id_checkpointed_and_reused(self, fake_api, anthropic_backend, provider_llm_batch):
+        _, jobs = fake_api
+        shared: dict[str, Any] = {"items": ["a"], "__execution__": {}}
+
+        provider_llm_batch()._run(shared)
+        checkpoint = shared["__execution__"]["provider_batches"]["classify"]
+        assert checkpoint["job_id"] == "msgbatch_1"
+
+        # A resumed run with the same prompts re-attaches instead of submitting again
+        provider_llm_batch()._run(shared)
+
+        assert len(jobs) == 1
+
+
+class RecordingBackend(BatchBackend):
+    """In-memory backend that echoes prompts."""
+
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.submitted: list[list[BatchRequest]] = []
+
+    def submit(self, requests: list[BatchRequest]) -> str:
+        self.submitted.append(requests)
+        return f"job-{len(self.submitted)}"
+
+    def is_complete(self, job_id: str) -> bool:
+        return True
+
+    def results(self, job_id: str) -> dict[str, BatchResult]:
+        requests = self.submitted[int(job_id.split("-")[1]) - 1]
+        return {r.custom_id: BatchResult(r.custom_id, text=r.prompt, usage={"input_tokens": 1}) for r in requests}
+
+
+class TestProviderBatch:
+    """Collect/run/replay bookkeeping and backend selection."""
+
+    def test_changed_prompts_resubmit(self):
+        backend = RecordingBackend()
+        checkpoint: dict[str, Any] = {}
+
+        for prompt in ("one", "one", "two"):
+            batch = ProviderBatch("node")
+            batch.add_request(0, {"model": "m", "prompt": prompt})
+            batch.run(checkpoint, poll_interval=0, backend=backend)
+
+        assert [requests[0].prompt for requests in backend.submitted] == ["one", "two"]
+
+    def test_cancel_stops_polling(self):
+        class PendingBackend(RecordingBackend):
+            def is_complete(self, job_id: str) -> bool:
+                return False
+
+        batch = ProviderBatch("node")
+        batch.add_request(0, {"model": "m", "prompt": "p"})
+        token = CancellationToken()
+        threading.Timer(0.1, token.cancel, args=("interrupted",)).start()
+        start = time.monotonic()
+
+        with pytest.raises(WorkflowCancelled, match="interrupted"):
+            batch.run({}, poll_interval=30, backend=PendingBackend(), token=token)
+
+        assert time.monotonic() - start < 5
+
+    def test_new_process_reattaches_to_persisted_job(self):
+        class PendingBackend(RecordingBackend):
+            done = False
+
+            def is_complete(self, job_id: str) -> bool:
+                return self.done
+
+        backend = PendingBackend()
+        token = CancellationToken()
+        token.cancel("killed")
+        first = ProviderBatch("node")
+        first.add_request(0, {"model": "m", "prompt": "p"})
+        with pytest.raises(WorkflowCancelled):
+            first.run({}, poll_interval=0, backend=backend, token=token)
+
+        # A later process has no in-memory checkpoint, only the file
+        backend.done = True
+        second = ProviderBatch("node")
+        second.add_request(0, {"model": "m", "prompt": "p"})
+        job_id = second.run({}, poll_interval=0, backend=backend)
+
+        assert job_id == "job-1"
+        assert len(backend.submitted) == 1
+        assert second.get_result(0)["text"] == "p"
+        # Fetched results remove the file, so a later rerun submits a new job
+        assert list(get_batch_checkpoints().directory.glob("*.jsonl")) == []
+
+    def test_missing_result_is_item_error(self):
+        class DroppingBackend(RecordingBackend):
+            def results(self, job_id: str) -> dict[str, BatchResult]:
+                return {}
+
+        batch = ProviderBatch("node")
+        batch.add_request(0, {"model": "m", "prompt": "p"})
+        batch.run({}, poll_interval=0, backend=DroppingBackend())
+
+        assert "Missing" in batch.get_result(0)["error"]
+
+    def test_non_llm_inner_node_rejected(self):
+        class EchoNode:
+            def _run(self, shared: dict[str, Any]) -> str:
+                shared["echo"] = {"value": shared["item"]}
+                return "default"
+
+        batch = PflowBatchNode(EchoNode(), "echo", {"items": "${items}", "submit": "provider"})
+
+        with pytest.raises(ValueError, match="only supported for llm nodes"):
+            batch._run({"items": [1]})
+
+    def test_backend_selected_by_model(self):
+        register_batch_backend("recording", RecordingBackend, matches=lambda model: model.startswith("rec-"))
+        try:
+            assert isinstance(get_batch_backend("rec-model"), RecordingBackend)
+            with pytest.raises(ValueError, match="No provider batch backend supports model 'gpt-4o'"):
+                get_batch_backend("gpt-4o")
+        finally:
+            unregister_batch_backend("recording")
+
+    def test_backend_override_from_env(self, monkeypatch):
+        register_batch_backend("recording", RecordingBackend)
+        monkeypatch.setenv("PFLOW_BATCH_BACKEND", "recording")
+        try:
+            assert isinstance(get_batch_backend("gpt-4o"), RecordingBackend)
+            monkeypatch.setenv("PFLOW_BATCH_BACKEND", "missing")
+            with pytest.raises(ValueError, match="no such batch backend"):
+                get_batch_backend("gpt-4o")
+        finally:
+            unregister_batch_backend("recording")